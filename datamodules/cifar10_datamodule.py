@@ -14,6 +14,8 @@ from torchvision.datasets import CIFAR10
 from torchvision import transforms
 import pytorch_lightning as pl
 
+from datamodules.cifar_cache import MemmapCIFAR10, build_cifar10_cache
+
 
 class CIFAR10DataModule(pl.LightningDataModule):
     """
@@ -77,6 +79,8 @@ class CIFAR10DataModule(pl.LightningDataModule):
         # Download if not already done
         CIFAR10(self.data_dir, train=True, download=True)
         CIFAR10(self.data_dir, train=False, download=True)
+        # Decode once into the shared memory-mapped store
+        build_cifar10_cache(self.data_dir)
     
     def setup(self, stage: Optional[str] = None):
         """
@@ -89,7 +93,7 @@ class CIFAR10DataModule(pl.LightningDataModule):
         """
         # Load datasets only if they haven't been loaded already
         if stage == 'fit' or stage is None:
-            cifar_full = CIFAR10(self.data_dir, train=True, transform=self.train_transforms)
+            cifar_full = MemmapCIFAR10(self.data_dir, train=True, transform=self.train_transforms)
             
             # Calculate split sizes
             val_size = int(len(cifar_full) * self.val_split)
@@ -106,7 +110,7 @@ class CIFAR10DataModule(pl.LightningDataModule):
             self.cifar_val.dataset.transform = self.test_transforms
         
         if stage == 'test' or stage is None:
-            self.cifar_test = CIFAR10(self.data_dir, train=False, transform=self.test_transforms)
+            self.cifar_test = MemmapCIFAR10(self.data_dir, train=False, transform=self.test_transforms)
     
     def train_dataloader(self):
         """Create the training dataloader."""
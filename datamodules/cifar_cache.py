@@ -0,0 +1,300 @@
+"""
+Shared, memory-mapped CIFAR-10 store for the CIFAR datamodules.
+
+torchvision's CIFAR10 unpickles and decodes the batch files into a private
+array in every process, so N concurrent sweep jobs hold N copies of the
+dataset. This module decodes the dataset once into plain ``.npy`` files:
+
+    <cache_dir>/train_images.npy   uint8 [50000, 32, 32, 3] (HWC, as torchvision)
+    <cache_dir>/train_labels.npy   int64 [50000]
+    <cache_dir>/test_images.npy    uint8 [10000, 32, 32, 3]
+    <cache_dir>/test_labels.npy    int64 [10000]
+    <cache_dir>/manifest.json      shapes, dtypes and SHA-256 checksums, written last
+
+Every reader opens the arrays read-only with ``mmap_mode='r'``, so all jobs on
+a host share one page-cache copy and no process owns a private one.
+
+The store lives in ``<data_dir>/cifar10_npy`` by default and is built on first
+use; it can also be prebuilt from the command line:
+
+    python datamodules/cifar_cache.py --data_dir data/cifar10
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import warnings
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import torch
+from PIL import Image
+from torch.utils.data import Dataset
+
+
+CACHE_SUBDIR = 'cifar10_npy'
+FORMAT_VERSION = 1
+SPLITS = ('train', 'test')
+IMAGE_DTYPE = np.uint8
+LABEL_DTYPE = np.int64
+
+# Bytes hashed per read when computing checksums
+_HASH_CHUNK = 1 << 22
+
+
+def default_cache_dir(data_dir: str) -> str:
+    """Location of the store for a CIFAR-10 data directory."""
+    return os.path.join(data_dir, CACHE_SUBDIR)
+
+
+def _split_name(train: bool) -> str:
+    return 'train' if train else 'test'
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_manifest(cache_dir: str) -> Optional[Dict]:
+    """Manifest of a complete store, or None if it is missing, stale or truncated."""
+    try:
+        with open(os.path.join(cache_dir, 'manifest.json')) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format_version') != FORMAT_VERSION:
+        return None
+    for entry in manifest['files'].values():
+        path = os.path.join(cache_dir, entry['file'])
+        if not os.path.exists(path) or os.path.getsize(path) != entry['bytes']:
+            return None
+    return manifest
+
+
+def _save_array(cache_dir: str, name: str, array: np.ndarray) -> Dict:
+    """Write one array atomically and describe it for the manifest."""
+    path = os.path.join(cache_dir, name)
+    # Unique temporary name so concurrent builders never write the same file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, np.ascontiguousarray(array))
+    entry = {
+        'file': name,
+        'shape': list(array.shape),
+        'dtype': np.dtype(array.dtype).name,
+        'bytes': os.path.getsize(tmp_path),
+        'sha256': _sha256(tmp_path),
+    }
+    os.replace(tmp_path, path)
+    return entry
+
+
+def build_cifar10_cache(
+    data_dir: str = 'data/cifar10',
+    cache_dir: Optional[str] = None,
+    download: bool = True,
+    overwrite: bool = False,
+) -> str:
+    """Decode CIFAR-10 into the memory-mappable store, once.
+
+    Args:
+        data_dir (str): torchvision CIFAR-10 root (downloaded there if needed)
+        cache_dir (Optional[str]): Output directory. Default: ``<data_dir>/cifar10_npy``
+        download (bool): Download the raw dataset if it is missing
+        overwrite (bool): Rebuild even if a complete store exists
+
+    Returns:
+        str: The cache directory
+    """
+    cache_dir = cache_dir or default_cache_dir(data_dir)
+    if not overwrite and _read_manifest(cache_dir) is not None:
+        return cache_dir
+
+    import torchvision
+
+    splits = {}
+    for split in SPLITS:
+        dataset = torchvision.datasets.CIFAR10(root=data_dir, train=split == 'train', download=download)
+        splits[split] = (dataset.data, dataset.targets)
+    return write_cifar10_cache(cache_dir, splits)
+
+
+def write_cifar10_cache(cache_dir: str, splits: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> str:
+    """Write decoded splits into a store, replacing any existing one.
+
+    Args:
+        cache_dir (str): Output directory
+        splits (Dict[str, Tuple[np.ndarray, np.ndarray]]): ``{'train': (images, labels),
+            'test': (images, labels)}`` with HWC uint8 images
+
+    Returns:
+        str: The cache directory
+    """
+    if set(splits) != set(SPLITS):
+        raise ValueError(f"Expected splits {SPLITS}, got {tuple(splits)}")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    files = {}
+    for split, (images, labels) in splits.items():
+        images = np.asarray(images, dtype=IMAGE_DTYPE)
+        labels = np.asarray(labels, dtype=LABEL_DTYPE)
+        if images.ndim != 4 or images.shape[-1] != 3 or len(images) != len(labels):
+            raise ValueError(f"{split}: expected [N, H, W, 3] images and N labels, got {images.shape} and {labels.shape}")
+        files[f'{split}_images'] = _save_array(cache_dir, f'{split}_images.npy', images)
+        files[f'{split}_labels'] = _save_array(cache_dir, f'{split}_labels.npy', labels)
+
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'format_version': FORMAT_VERSION,
+            'dataset': 'cifar10',
+            'classes': 10,
+            'files': files,
+        }, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return cache_dir
+
+
+def verify_cifar10_cache(cache_dir: str) -> bool:
+    """Recompute the checksums of a store and compare them with its manifest."""
+    manifest = _read_manifest(cache_dir)
+    if manifest is None:
+        return False
+    return all(
+        _sha256(os.path.join(cache_dir, entry['file'])) == entry['sha256']
+        for entry in manifest['files'].values()
+    )
+
+
+def open_cifar10_cache(
+    data_dir: str = 'data/cifar10',
+    train: bool = True,
+    cache_dir: Optional[str] = None,
+    build: bool = True,
+    verify: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Read-only memory maps of one split's images and labels.
+
+    Args:
+        data_dir (str): torchvision CIFAR-10 root
+        train (bool): Training split if True, test split otherwise
+        cache_dir (Optional[str]): Store directory. Default: ``<data_dir>/cifar10_npy``
+        build (bool): Build the store if it does not exist yet
+        verify (bool): Check the SHA-256 checksums before opening (reads every page)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: uint8 images [N, 32, 32, 3] and int64 labels [N]
+    """
+    cache_dir = cache_dir or default_cache_dir(data_dir)
+    if build:
+        build_cifar10_cache(data_dir, cache_dir)
+    manifest = _read_manifest(cache_dir)
+    if manifest is None:
+        raise ValueError(f"No complete CIFAR-10 store at '{cache_dir}'; run build_cifar10_cache first")
+    if verify and not verify_cifar10_cache(cache_dir):
+        raise ValueError(f"Checksum mismatch in the CIFAR-10 store at '{cache_dir}'")
+
+    split = _split_name(train)
+    arrays = []
+    for kind in ('images', 'labels'):
+        entry = manifest['files'][f'{split}_{kind}']
+        array = np.load(os.path.join(cache_dir, entry['file']), mmap_mode='r')
+        if list(array.shape) != entry['shape'] or array.dtype.name != entry['dtype']:
+            raise ValueError(f"'{entry['file']}' does not match the manifest in '{cache_dir}'")
+        arrays.append(array)
+    return arrays[0], arrays[1]
+
+
+def as_tensor(array: np.ndarray) -> torch.Tensor:
+    """Zero-copy tensor view of a read-only memory map (it must not be written to)."""
+    with warnings.catch_warnings():
+        # torch warns about every non-writable array; the views are never written
+        warnings.filterwarnings('ignore', message='The given NumPy array is not writable')
+        return torch.from_numpy(array)
+
+
+class MemmapCIFAR10(Dataset):
+    """Drop-in replacement for ``torchvision.datasets.CIFAR10`` backed by the store.
+
+    Samples are PIL images passed through ``transform``, exactly as with
+    torchvision, but the pixels come from a shared read-only memory map. The
+    map is opened lazily in each process, so pickling the dataset into
+    DataLoader workers copies nothing.
+
+    Args:
+        root (str): torchvision CIFAR-10 root
+        train (bool): Training split if True, test split otherwise
+        transform (Optional[callable]): Transform applied to the PIL image
+        target_transform (Optional[callable]): Transform applied to the label
+        cache_dir (Optional[str]): Store directory. Default: ``<root>/cifar10_npy``
+    """
+
+    def __init__(
+        self,
+        root: str = 'data/cifar10',
+        train: bool = True,
+        transform=None,
+        target_transform=None,
+        cache_dir: Optional[str] = None,
+    ):
+        self.root = root
+        self.train = train
+        self.transform = transform
+        self.target_transform = target_transform
+        self.cache_dir = cache_dir or default_cache_dir(root)
+        build_cifar10_cache(root, self.cache_dir)
+        self._arrays = None
+
+    def _open(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._arrays is None:
+            self._arrays = open_cifar10_cache(self.root, self.train, self.cache_dir, build=False)
+        return self._arrays
+
+    @property
+    def data(self) -> np.ndarray:
+        """Read-only uint8 images [N, 32, 32, 3]."""
+        return self._open()[0]
+
+    @property
+    def targets(self) -> np.ndarray:
+        """Read-only int64 labels [N]."""
+        return self._open()[1]
+
+    def __getstate__(self):
+        # Memory maps are reopened in the receiving process
+        state = self.__dict__.copy()
+        state['_arrays'] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def __getitem__(self, index: int):
+        images, labels = self._open()
+        image = Image.fromarray(np.asarray(images[index]))
+        target = int(labels[index])
+        if self.transform is not None:
+            image = self.transform(image)
+        if self.target_transform is not None:
+            target = self.target_transform(target)
+        return image, target
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Prebuild the memory-mapped CIFAR-10 store')
+    parser.add_argument('--data_dir', default='data/cifar10', help='torchvision CIFAR-10 root')
+    parser.add_argument('--cache_dir', default=None, help='Output directory (default: <data_dir>/cifar10_npy)')
+    parser.add_argument('--overwrite', action='store_true', help='Rebuild an existing store')
+    parser.add_argument('--verify', action='store_true', help='Check the checksums afterwards')
+    args = parser.parse_args()
+
+    cache_dir = build_cifar10_cache(args.data_dir, args.cache_dir, overwrite=args.overwrite)
+    print(f"CIFAR-10 store: {cache_dir}")
+    if args.verify:
+        print("Checksums OK" if verify_cifar10_cache(cache_dir) else "Checksum mismatch")
@@ -0,0 +1,287 @@
+"""
+Packed, pre-tokenized WikiText cache for the GPT-2 training scripts.
+
+The first request for a split tokenizes it once, concatenates every line into
+one token stream and stores the result next to an index and metadata file:
+
+    <cache_dir>/<name>.bin        flat uint16 token stream (memory-mapped)
+    <cache_dir>/<name>.idx.npy    int64 token offset of every non-empty line
+    <cache_dir>/<name>.json       metadata, written last to mark completion
+
+``PackedTokenDataset`` then serves fixed-length causal-LM blocks straight from
+the memory map: every example is ``block_size`` real tokens, nothing is padded,
+and later runs start without touching the tokenizer.
+
+The cache can be prebuilt from the command line:
+
+    python datamodules/wikitext_cache.py --config wikitext-103-raw-v1 --splits train validation
+"""
+
+import argparse
+import itertools
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+
+# Cache location relative to the working directory (see default_cache_dir)
+CACHE_SUBDIR = os.path.join('.cache', 'packed')
+TOKEN_DTYPE = np.uint16
+FORMAT_VERSION = 1
+
+# Lines tokenized and written per chunk while building
+_WRITE_CHUNK = 10_000
+
+
+def default_cache_dir() -> str:
+    """Cache directory under the current working directory, resolved at call time."""
+    return os.path.abspath(CACHE_SUBDIR)
+
+
+def cache_prefix(
+    split: str,
+    dataset_config: str = "wikitext-103-raw-v1",
+    tokenizer_name: str = "gpt2",
+    cache_dir: Optional[str] = None,
+    max_lines: Optional[int] = None,
+) -> str:
+    """Path prefix of the cache files for one split (``cache_dir`` defaults to ``default_cache_dir()``)."""
+    cache_dir = cache_dir or default_cache_dir()
+    name = f"{dataset_config}-{split}-{tokenizer_name.replace('/', '_')}"
+    if max_lines is not None:
+        name += f"-lines{max_lines}"
+    return os.path.join(cache_dir, name)
+
+
+def _read_metadata(prefix: str) -> Optional[Dict]:
+    """Metadata of a complete cache, or None if it is missing, stale or truncated."""
+    try:
+        with open(prefix + ".json") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if metadata.get("format_version") != FORMAT_VERSION:
+        return None
+    expected_bytes = metadata["num_tokens"] * np.dtype(TOKEN_DTYPE).itemsize
+    if not os.path.exists(prefix + ".bin") or os.path.getsize(prefix + ".bin") != expected_bytes:
+        return None
+    return metadata
+
+
+def build_packed_cache(
+    split: str,
+    dataset_config: str = "wikitext-103-raw-v1",
+    tokenizer_name: str = "gpt2",
+    cache_dir: Optional[str] = None,
+    hf_cache_dir: Optional[str] = None,
+    max_lines: Optional[int] = None,
+    num_proc: Optional[int] = None,
+    overwrite: bool = False,
+) -> str:
+    """Tokenize a WikiText split into a packed uint16 token file, once.
+
+    Args:
+        split (str): Dataset split ("train", "validation" or "test")
+        dataset_config (str): WikiText configuration, e.g. "wikitext-2-raw-v1"
+        tokenizer_name (str): HuggingFace tokenizer. Its vocabulary must fit in uint16
+        cache_dir (Optional[str]): Directory for the packed files. Default: ``default_cache_dir()``
+        hf_cache_dir (Optional[str]): HuggingFace cache for the raw dataset and tokenizer
+        max_lines (Optional[int]): Only pack the first ``max_lines`` lines of the split
+        num_proc (Optional[int]): Worker processes for tokenization
+        overwrite (bool): Rebuild even if a complete cache exists
+
+    Returns:
+        str: Cache prefix, to be passed to ``PackedTokenDataset``
+    """
+    prefix = cache_prefix(split, dataset_config, tokenizer_name, cache_dir, max_lines)
+    if not overwrite and _read_metadata(prefix) is not None:
+        return prefix
+
+    from datasets import load_dataset
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_name, cache_dir=hf_cache_dir)
+    if len(tokenizer) > np.iinfo(TOKEN_DTYPE).max + 1:
+        raise ValueError(
+            f"Tokenizer '{tokenizer_name}' has {len(tokenizer)} tokens, too many for {np.dtype(TOKEN_DTYPE).name}"
+        )
+
+    dataset = load_dataset("wikitext", dataset_config, split=split, cache_dir=hf_cache_dir)
+    if max_lines is not None:
+        dataset = dataset.select(range(min(max_lines, len(dataset))))
+
+    # WikiText lines keep their trailing newlines, so concatenating the
+    # per-line tokens reproduces the running text
+    def tokenize(batch):
+        input_ids = tokenizer(batch["text"])["input_ids"]
+        return {"input_ids": input_ids, "length": [len(ids) for ids in input_ids]}
+
+    tokenized = dataset.map(
+        tokenize,
+        batched=True,
+        remove_columns=dataset.column_names,
+        num_proc=num_proc,
+        desc=f"Tokenizing {dataset_config}/{split}",
+    )
+
+    lengths = np.asarray(tokenized["length"], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    num_tokens = int(offsets[-1])
+    if num_tokens == 0:
+        raise ValueError(f"{dataset_config}/{split} contains no tokens")
+
+    os.makedirs(os.path.dirname(prefix), exist_ok=True)
+    # Unique temporary name so concurrent builders never write the same file
+    tmp_path = f"{prefix}.bin.{os.getpid()}.tmp"
+    tokens = np.memmap(tmp_path, dtype=TOKEN_DTYPE, mode="w+", shape=(num_tokens,))
+    for start in range(0, len(tokenized), _WRITE_CHUNK):
+        chunk = tokenized[start:start + _WRITE_CHUNK]["input_ids"]
+        stop = int(offsets[min(start + _WRITE_CHUNK, len(tokenized))])
+        tokens[offsets[start]:stop] = np.fromiter(
+            itertools.chain.from_iterable(chunk), dtype=TOKEN_DTYPE, count=stop - int(offsets[start])
+        )
+    tokens.flush()
+    del tokens
+
+    # Every file is moved into place only when complete; the metadata goes last
+    idx_path = prefix + ".idx.npy"
+    tmp_idx_path = f"{idx_path}.{os.getpid()}.tmp"
+    with open(tmp_idx_path, "wb") as f:
+        np.save(f, offsets[:-1][lengths > 0])
+    os.replace(tmp_idx_path, idx_path)
+    os.replace(tmp_path, prefix + ".bin")
+
+    metadata_path = prefix + ".json"
+    tmp_metadata_path = f"{metadata_path}.{os.getpid()}.tmp"
+    with open(tmp_metadata_path, "w") as f:
+        json.dump({
+            "format_version": FORMAT_VERSION,
+            "dataset": "wikitext",
+            "dataset_config": dataset_config,
+            "split": split,
+            "max_lines": max_lines,
+            "tokenizer": tokenizer_name,
+            "vocab_size": len(tokenizer),
+            "dtype": np.dtype(TOKEN_DTYPE).name,
+            "num_tokens": num_tokens,
+            "num_lines": int((lengths > 0).sum()),
+        }, f, indent=2)
+    os.replace(tmp_metadata_path, metadata_path)
+    return prefix
+
+
+class PackedTokenDataset(Dataset):
+    """Fixed-length causal-LM blocks read from a packed token file.
+
+    Blocks are consecutive, non-overlapping ``block_size`` windows of the token
+    stream (a trailing partial block is dropped). The file is memory-mapped
+    lazily in each process, so the dataset is cheap to pickle into DataLoader
+    workers and only the requested pages are ever read.
+
+    Args:
+        prefix (str): Cache prefix returned by ``build_packed_cache``
+        block_size (int): Tokens per example. Default: 128
+        max_blocks (Optional[int]): Only expose the first ``max_blocks`` blocks
+    """
+
+    def __init__(self, prefix: str, block_size: int = 128, max_blocks: Optional[int] = None):
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive, got {block_size}")
+        metadata = _read_metadata(prefix)
+        if metadata is None:
+            raise ValueError(f"No complete packed token cache at '{prefix}'; run build_packed_cache first")
+
+        self.prefix = prefix
+        self.metadata = metadata
+        self.block_size = block_size
+        self.num_blocks = metadata["num_tokens"] // block_size
+        if max_blocks is not None:
+            self.num_blocks = min(self.num_blocks, max_blocks)
+        if self.num_blocks == 0:
+            raise ValueError(
+                f"'{prefix}' holds {metadata['num_tokens']} tokens, fewer than one block of {block_size}"
+            )
+        self._tokens = None
+
+    @property
+    def tokens(self) -> np.memmap:
+        """Read-only memory map of the whole token stream."""
+        if self._tokens is None:
+            self._tokens = np.memmap(self.prefix + ".bin", dtype=TOKEN_DTYPE, mode="r")
+        return self._tokens
+
+    def line_offsets(self) -> np.ndarray:
+        """Token offsets of the non-empty source lines."""
+        return np.load(self.prefix + ".idx.npy", mmap_mode="r")
+
+    def __getstate__(self):
+        # Memory maps are reopened in the receiving process
+        state = self.__dict__.copy()
+        state["_tokens"] = None
+        return state
+
+    def __len__(self) -> int:
+        return self.num_blocks
+
+    def __getitem__(self, index: int) -> Dict[str, torch.Tensor]:
+        if index < 0:
+            index += self.num_blocks
+        if not 0 <= index < self.num_blocks:
+            raise IndexError(f"Block {index} out of range for {self.num_blocks} blocks")
+        start = index * self.block_size
+        # The model's labels are shifted internally, so they equal the inputs
+        input_ids = torch.from_numpy(self.tokens[start:start + self.block_size].astype(np.int64))
+        return {"input_ids": input_ids, "labels": input_ids}
+
+
+def load_packed_wikitext(
+    split: str,
+    block_size: int = 128,
+    max_blocks: Optional[int] = None,
+    **build_kwargs,
+) -> PackedTokenDataset:
+    """Packed WikiText blocks for one split, building the cache on first use.
+
+    Args:
+        split (str): Dataset split
+        block_size (int): Tokens per example
+        max_blocks (Optional[int]): Limit on the number of blocks
+        **build_kwargs: Passed to ``build_packed_cache`` (dataset_config,
+            tokenizer_name, cache_dir, hf_cache_dir, max_lines, num_proc)
+
+    Returns:
+        PackedTokenDataset: Dataset of {"input_ids", "labels"} blocks
+    """
+    prefix = build_packed_cache(split, **build_kwargs)
+    return PackedTokenDataset(prefix, block_size=block_size, max_blocks=max_blocks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prebuild the packed WikiText token cache")
+    parser.add_argument("--config", default="wikitext-103-raw-v1", help="WikiText configuration")
+    parser.add_argument("--splits", nargs="+", default=["train", "validation"], help="Splits to pack")
+    parser.add_argument("--tokenizer", default="gpt2", help="HuggingFace tokenizer name")
+    parser.add_argument("--cache_dir", default=None, help="Output directory (default: ./.cache/packed)")
+    parser.add_argument("--hf_cache_dir", default=None, help="HuggingFace cache directory")
+    parser.add_argument("--max_lines", type=int, default=None, help="Only pack the first N lines of each split")
+    parser.add_argument("--num_proc", type=int, default=None, help="Tokenization processes")
+    parser.add_argument("--overwrite", action="store_true", help="Rebuild existing caches")
+    args = parser.parse_args()
+
+    for split in args.splits:
+        prefix = build_packed_cache(
+            split,
+            dataset_config=args.config,
+            tokenizer_name=args.tokenizer,
+            cache_dir=args.cache_dir,
+            hf_cache_dir=args.hf_cache_dir,
+            max_lines=args.max_lines,
+            num_proc=args.num_proc,
+            overwrite=args.overwrite,
+        )
+        metadata = _read_metadata(prefix)
+        print(f"{split}: {metadata['num_tokens']:,} tokens -> {prefix}.bin")
@@ -190,39 +190,42 @@ def benchmark_unit(unit_class, input_tensor, alpha_range, device, batch_size, in
     norm_str = f" ({norm_config})" if norm_config else ""
     print(f"Benchmarking {unit_class.__name__}{norm_str}...")
     
-    for alpha in alpha_range:
-        # Create base unit with current alpha
-        base_unit = unit_class(
+    # One unit serves every alpha: its projections are shared across the sweep
+    base_unit = unit_class(
+        input_dim=input_dim,
+        output_dim=output_dim,
+        alpha=0.5,
+        use_gate_norm=use_gate_norm
+    ).to(device)
+    
+    # Wrap with pre/post normalization if needed
+    if pre_norm or post_norm:
+        model = PrePostNormWrapper(
+            module=base_unit,
             input_dim=input_dim,
             output_dim=output_dim,
-            alpha=float(alpha),
-            use_gate_norm=use_gate_norm
+            pre_norm=pre_norm,
+            post_norm=post_norm
         ).to(device)
-        
-        # Wrap with pre/post normalization if needed
-        if pre_norm or post_norm:
-            model = PrePostNormWrapper(
-                module=base_unit,
-                input_dim=input_dim,
-                output_dim=output_dim,
-                pre_norm=pre_norm,
-                post_norm=post_norm
-            ).to(device)
-        else:
-            model = base_unit
-        
-        # Ensure evaluation mode
-        model.eval()
-        
-        # Forward pass for statistics
-        with torch.no_grad():
-            output = model(input_tensor)
-            
+    else:
+        model = base_unit
+    
+    # Ensure evaluation mode
+    model.eval()
+    
+    # Outputs for every alpha from a single forward: [len(alpha_range), batch, output_dim]
+    alphas = [float(alpha) for alpha in alpha_range]
+    with torch.no_grad():
+        grid_output = model.forward_alpha_grid(input_tensor, alphas)
+    grid_latency = benchmark_latency(lambda x: model.forward_alpha_grid(x, alphas), input_tensor)
+    
+    for alpha, output in zip(alpha_range, grid_output):
         # Calculate statistics
         mean_val = output.mean().item()
         std_val = output.std().item()
         
-        # Measure latency
+        # Measure single-alpha latency on the same unit (no rebuild)
+        base_unit.alpha_fixed.fill_(float(alpha))
         latency = benchmark_latency(model, input_tensor)
         
         results["alpha"].append(alpha)
@@ -232,6 +235,9 @@ def benchmark_unit(unit_class, input_tensor, alpha_range, device, batch_size, in
         
         print(f"  α={alpha:.1f}: mean={mean_val:.4f}, std={std_val:.4f}, latency={latency:.3f} ms")
     
+    print(f"  alpha grid ({len(alphas)} values, one forward): latency={grid_latency:.3f} ms")
+    results["grid_latency_ms"] = grid_latency
+    
     return results
 
 
@@ -18,7 +18,7 @@ import random
 
 # Add the parent directory to the path to import paGating
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from paGating import paMishU, paGLU, paGTU, paSwishU, paReGLU, paGELU, paSiLU
+from paGating import paMishU, paGLU, paGTU, paSwishU, paReGLU, paGELU, paSiLU, PaddingIndex
 
 # Parse command line arguments
 parser = argparse.ArgumentParser(description='Test paGating units in a transformer model')
@@ -31,6 +31,8 @@ parser.add_argument('--seq_len', type=int, default=16, help='Sequence length (de
 parser.add_argument('--d_model', type=int, default=64, help='Model dimension (default: 64)')
 parser.add_argument('--n_head', type=int, default=4, help='Number of attention heads (default: 4)')
 parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+parser.add_argument('--variable_length', action='store_true',
+                    help='Pad sequences of random length and run the FFNs on real tokens only')
 args = parser.parse_args()
 
 # Set seed for reproducibility
@@ -58,7 +60,10 @@ class TransformerLayerWithPaGating(nn.Module):
         
         self.unit = unit_map[unit_name](d_model, d_model, alpha=alpha)
         
-    def forward(self, x, mask=None):
+    def forward(self, x, mask=None, padding_index=None):
+        if padding_index is not None:
+            return self._forward_packed(x, padding_index, mask)
+        
         # Self-attention block
         attn_output, _ = self.self_attn(x, x, x, attn_mask=mask)
         x = self.norm1(x + attn_output)
@@ -68,6 +73,22 @@ class TransformerLayerWithPaGating(nn.Module):
         x = self.norm2(x + ff_output)
         
         return x
+    
+    def _forward_packed(self, x, padding_index, mask=None):
+        """Forward on a packed [num_tokens, d_model] residual stream.
+        
+        Only attention needs the padded layout; the norms and the paGating
+        FFN are per-token and run on the real tokens only.
+        """
+        padded = padding_index.repad(x)
+        attn_output, _ = self.self_attn(
+            padded, padded, padded, attn_mask=mask, key_padding_mask=~padding_index.mask
+        )
+        x = self.norm1(x + padding_index.unpad(attn_output))
+        
+        x = self.norm2(x + self.unit(x))
+        
+        return x
 
 # Simple transformer model for sequence classification
 class SimpleTransformer(nn.Module):
@@ -82,15 +103,27 @@ class SimpleTransformer(nn.Module):
         
         self.classifier = nn.Linear(d_model, num_classes)
         
-    def forward(self, x):
+    def forward(self, x, attention_mask=None):
         # x shape: [batch_size, seq_len, 1]
-        x = self.embedding(x)
-        
-        for layer in self.layers:
-            x = layer(x)
-        
-        # Global average pooling
-        x = x.mean(dim=1)
+        if attention_mask is None:
+            x = self.embedding(x)
+            
+            for layer in self.layers:
+                x = layer(x)
+            
+            # Global average pooling
+            x = x.mean(dim=1)
+        else:
+            # Keep the residual stream packed across all layers
+            padding_index = PaddingIndex(attention_mask)
+            x = self.embedding(padding_index.unpad(x))
+            
+            for layer in self.layers:
+                x = layer(x, padding_index=padding_index)
+            
+            # Average pooling over the real tokens
+            lengths = padding_index.lengths.unsqueeze(1).to(x.dtype)
+            x = padding_index.repad(x).sum(dim=1) / lengths
         
         # Classification head
         return self.classifier(x)
@@ -117,17 +150,46 @@ def generate_synthetic_data(num_samples, seq_len):
     
     return data, labels
 
+def generate_variable_length_data(num_samples, seq_len):
+    # Same task on sequences of random length, zero-padded to seq_len
+    data, labels, masks = [], [], []
+    
+    for _ in range(num_samples):
+        length = np.random.randint(max(seq_len // 4, 1), seq_len + 1)
+        seq = np.zeros((seq_len, 1), dtype=np.float32)
+        seq[:length] = np.random.normal(0, 1, (length, 1))
+        mask = np.zeros(seq_len, dtype=bool)
+        mask[:length] = True
+        
+        data.append(seq)
+        labels.append(1 if np.sum(seq) > 0 else 0)
+        masks.append(mask)
+    
+    data = torch.tensor(np.array(data))
+    masks = torch.tensor(np.array(masks))
+    labels = torch.tensor(np.array(labels), dtype=torch.long)
+    
+    return data, masks, labels
+
+def split_batch(batch, device):
+    # Batches are (inputs, targets) or (inputs, attention_mask, targets)
+    batch = [tensor.to(device) for tensor in batch]
+    if len(batch) == 3:
+        return batch[0], batch[1], batch[2]
+    return batch[0], None, batch[1]
+
 def main():
     print(f"Testing {args.unit} with alpha={args.alpha} in a transformer model")
     
     # Generate synthetic data
-    train_data, train_labels = generate_synthetic_data(1000, args.seq_len)
-    test_data, test_labels = generate_synthetic_data(200, args.seq_len)
+    if args.variable_length:
+        train_dataset = TensorDataset(*generate_variable_length_data(1000, args.seq_len))
+        test_dataset = TensorDataset(*generate_variable_length_data(200, args.seq_len))
+    else:
+        train_dataset = TensorDataset(*generate_synthetic_data(1000, args.seq_len))
+        test_dataset = TensorDataset(*generate_synthetic_data(200, args.seq_len))
     
     # Create data loaders
-    train_dataset = TensorDataset(train_data, train_labels)
-    test_dataset = TensorDataset(test_data, test_labels)
-    
     train_loader = DataLoader(train_dataset, batch_size=args.batch_size, shuffle=True)
     test_loader = DataLoader(test_dataset, batch_size=args.batch_size)
     
@@ -159,11 +221,11 @@ def main():
         correct = 0
         total = 0
         
-        for inputs, targets in train_loader:
-            inputs, targets = inputs.to(device), targets.to(device)
+        for batch in train_loader:
+            inputs, attention_mask, targets = split_batch(batch, device)
             
             optimizer.zero_grad()
-            outputs = model(inputs)
+            outputs = model(inputs, attention_mask)
             loss = criterion(outputs, targets)
             loss.backward()
             optimizer.step()
@@ -189,9 +251,9 @@ def main():
     total = 0
     
     with torch.no_grad():
-        for inputs, targets in test_loader:
-            inputs, targets = inputs.to(device), targets.to(device)
-            outputs = model(inputs)
+        for batch in test_loader:
+            inputs, attention_mask, targets = split_batch(batch, device)
+            outputs = model(inputs, attention_mask)
             loss = criterion(outputs, targets)
             
             test_loss += loss.item()
@@ -0,0 +1,28 @@
+"""
+Lightning callback that drives step-based alpha schedulers.
+"""
+
+import pytorch_lightning as pl
+from pytorch_lightning.callbacks import Callback
+
+from paGating.alpha_schedulers import step_alpha_schedulers
+
+
+class AlphaSchedulerCallback(Callback):
+    """
+    Callback that advances every alpha scheduler in the model once per optimizer step.
+    
+    Schedulers such as CosineAlphaScheduler and LinearRampScheduler only change
+    when they are stepped. This callback sets them to ``trainer.global_step``
+    (which counts optimizer steps, so gradient accumulation is handled) after
+    every training batch, and once at the start of training so resumed runs
+    continue from the right point of the schedule.
+    """
+    
+    def on_train_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule):
+        """Called when training begins."""
+        step_alpha_schedulers(pl_module, trainer.global_step)
+    
+    def on_train_batch_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule, outputs, batch, batch_idx):
+        """Called when the train batch ends."""
+        step_alpha_schedulers(pl_module, trainer.global_step)
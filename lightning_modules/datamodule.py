@@ -11,6 +11,8 @@ import torchvision
 import torchvision.transforms as transforms
 import pytorch_lightning as pl
 
+from datamodules.cifar_cache import MemmapCIFAR10, build_cifar10_cache
+
 
 class CIFAR10DataModule(pl.LightningDataModule):
     """
@@ -94,6 +96,9 @@ class CIFAR10DataModule(pl.LightningDataModule):
             train=False, 
             download=True
         )
+        
+        # Decode once into the shared memory-mapped store
+        build_cifar10_cache(self.data_dir)
     
     def setup(self, stage: Optional[str] = None):
         """
@@ -105,7 +110,7 @@ class CIFAR10DataModule(pl.LightningDataModule):
         """
         # Load training data if needed for training or validation
         if stage == 'fit' or stage is None:
-            full_train_dataset = torchvision.datasets.CIFAR10(
+            full_train_dataset = MemmapCIFAR10(
                 root=self.data_dir,
                 train=True,
                 transform=self.train_transforms
@@ -127,7 +132,7 @@ class CIFAR10DataModule(pl.LightningDataModule):
             # Create a dataset that applies the correct transforms
             self.val_dataset = _TransformedSubset(
                 self.val_dataset, 
-                torchvision.datasets.CIFAR10(
+                MemmapCIFAR10(
                     root=self.data_dir,
                     train=True,
                     transform=self.test_transforms
@@ -136,7 +141,7 @@ class CIFAR10DataModule(pl.LightningDataModule):
         
         # Load test data if needed for testing
         if stage == 'test' or stage is None:
-            self.test_dataset = torchvision.datasets.CIFAR10(
+            self.test_dataset = MemmapCIFAR10(
                 root=self.data_dir,
                 train=False,
                 transform=self.test_transforms
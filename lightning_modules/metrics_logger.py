@@ -39,10 +39,16 @@ class MetricsCsvLogger(Callback):
         # Create output directory
         os.makedirs(os.path.join(output_dir, unit_name), exist_ok=True)
     
+    def _epoch_row(self, trainer: pl.Trainer) -> Dict[str, Any]:
+        """Metrics row of the current epoch, created by whichever hook runs first."""
+        epoch = trainer.current_epoch + 1  # 1-indexed epoch for readability
+        if not self.metrics or self.metrics[-1]["epoch"] != epoch:
+            self.metrics.append({"epoch": epoch})
+        return self.metrics[-1]
+    
     def on_train_epoch_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule):
         """Called when the train epoch ends."""
-        epoch = trainer.current_epoch
-        metrics_dict = {"epoch": epoch + 1}  # 1-indexed epoch for readability
+        metrics_dict = self._epoch_row(trainer)
 
         # Get metrics from callback_metrics
         callback_metrics = trainer.callback_metrics
@@ -70,17 +76,15 @@ class MetricsCsvLogger(Callback):
             metrics_dict["alpha"] = self.alpha_value
             self.has_alpha = True
         
-        self.metrics.append(metrics_dict)
         self._save_metrics()
     
     def on_validation_epoch_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule):
         """Called when the validation epoch ends."""
-        # Get current metrics
-        if not self.metrics:
+        if trainer.sanity_checking:
             return
         
-        # Get the latest metrics dict (from current epoch)
-        metrics_dict = self.metrics[-1]
+        # Validation runs before on_train_epoch_end, so it may open the epoch's row
+        metrics_dict = self._epoch_row(trainer)
         
         # Get logged metrics from callback_metrics
         callback_metrics = trainer.callback_metrics
@@ -123,12 +127,14 @@ class MetricsCsvLogger(Callback):
             if "test_acc" not in header:
                 header.append("test_acc")
         
-        # Write to CSV
-        with open(filepath, "w", newline="") as f:
+        # Write to CSV (replaced atomically, since sweep schedulers read it during training)
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", newline="") as f:
             writer = csv.DictWriter(f, fieldnames=header)
             writer.writeheader()
             for metrics_dict in self.metrics:
                 writer.writerow({k: metrics_dict.get(k, "") for k in header})
+        os.replace(tmp_path, filepath)
         
         print(f"Saved metrics to {filepath}")
     
@@ -153,6 +159,15 @@ class MetricsCsvLogger(Callback):
             # Add test metrics to header and save
             self._save_metrics()
             
+    def state_dict(self) -> Dict[str, Any]:
+        """Epoch history, stored in checkpoints so a resumed run keeps a complete CSV."""
+        return {"metrics": self.metrics, "has_alpha": self.has_alpha}
+    
+    def load_state_dict(self, state_dict: Dict[str, Any]):
+        """Restore the epoch history of the run being resumed."""
+        self.metrics = list(state_dict.get("metrics", []))
+        self.has_alpha = state_dict.get("has_alpha", self.has_alpha)
+    
     def get_metrics_as_dict(self) -> Dict[str, Any]:
         """
         Returns a dictionary with model configuration and metrics.
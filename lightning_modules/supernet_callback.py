@@ -0,0 +1,36 @@
+"""
+Lightning callback that samples the supernet branch of every training step.
+"""
+
+from typing import Optional
+
+import pytorch_lightning as pl
+import torch
+from pytorch_lightning.callbacks import Callback
+
+from paGating.supernet import sample_supernet_branch
+
+
+class SupernetSamplingCallback(Callback):
+    """
+    Callback that draws one supernet branch per optimizer step for the whole model.
+
+    All paGatingSupernet layers use the same drawn unit for the forward and
+    backward passes of a step, so every step trains a homogeneous model on the
+    shared weights. With gradient accumulation the branch is kept for all
+    batches that contribute to one optimizer step.
+
+    Args:
+        seed (Optional[int]): Seed of the branch draws (default: global torch RNG)
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__()
+        self.generator = None
+        if seed is not None:
+            self.generator = torch.Generator().manual_seed(seed)
+
+    def on_train_batch_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule, batch, batch_idx):
+        """Called when the train batch begins."""
+        if batch_idx % trainer.accumulate_grad_batches == 0:
+            sample_supernet_branch(pl_module, self.generator)
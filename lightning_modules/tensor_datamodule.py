@@ -0,0 +1,253 @@
+"""
+Tensor-resident CIFAR-10 DataModule.
+
+The torchvision pipeline converts every image to PIL and runs RandomCrop,
+RandomHorizontalFlip, ToTensor and Normalize one sample at a time, which
+makes the DataLoader the bottleneck for small CNNs on CPU. This module keeps
+the whole dataset as one uint8 tensor of shape [N, 3, 32, 32] and applies
+the same augmentations as vectorized operations on whole minibatches:
+
+    crop       zero-pad by 4 and gather one random 32x32 window per image
+    flip       horizontal flip of a random half of the batch
+    normalize  one fused multiply-add per element while converting to float
+
+Batches are produced in the training process itself (no worker processes),
+optionally directly on the training device. On CPU the images are a zero-copy
+view of the shared memory-mapped store (``datamodules/cifar_cache.py``), and
+the train/val splits are index tensors into it, so concurrent jobs share one
+page-cache copy of the pixels.
+"""
+
+import os
+from typing import Iterator, Optional, Tuple, Union
+
+import torch
+import torch.nn.functional as F
+import pytorch_lightning as pl
+
+from datamodules.cifar_cache import as_tensor, build_cifar10_cache, open_cifar10_cache
+
+
+CIFAR10_MEAN = (0.4914, 0.4822, 0.4465)
+CIFAR10_STD = (0.2470, 0.2435, 0.2616)
+
+
+def random_crop(images: torch.Tensor, padding: int = 4, generator: Optional[torch.Generator] = None) -> torch.Tensor:
+    """Zero-pad a batch and take one random crop of the original size per image.
+
+    Args:
+        images (torch.Tensor): Batch of shape [B, C, H, W] (any dtype)
+        padding (int): Padding on every side
+        generator (Optional[torch.Generator]): Random generator for the offsets
+
+    Returns:
+        torch.Tensor: Cropped batch of shape [B, C, H, W]
+    """
+    batch_size, channels, height, width = images.shape
+    padded = F.pad(images, (padding, padding, padding, padding))
+    device = images.device
+
+    offset_y = torch.randint(0, 2 * padding + 1, (batch_size,), generator=generator).to(device)
+    offset_x = torch.randint(0, 2 * padding + 1, (batch_size,), generator=generator).to(device)
+    rows = (offset_y[:, None] + torch.arange(height, device=device))[:, None, :, None]
+    cols = (offset_x[:, None] + torch.arange(width, device=device))[:, None, None, :]
+    batch = torch.arange(batch_size, device=device)[:, None, None, None]
+    channel = torch.arange(channels, device=device)[None, :, None, None]
+    return padded[batch, channel, rows, cols]
+
+
+def random_flip(images: torch.Tensor, generator: Optional[torch.Generator] = None) -> torch.Tensor:
+    """Flip a random half of the batch horizontally."""
+    flip = (torch.rand(images.shape[0], generator=generator) < 0.5).to(images.device)
+    return torch.where(flip[:, None, None, None], images.flip(-1), images)
+
+
+class TensorBatchLoader:
+    """Iterable over ready (images, labels) batches of a uint8 image tensor.
+
+    Args:
+        images (torch.Tensor): uint8 images of shape [N, 3, H, W]
+        labels (torch.Tensor): int64 labels of shape [N]
+        batch_size (int): Batch size
+        indices (Optional[torch.Tensor]): Iterate over these samples only (default: all)
+        mean (Tuple[float, ...]): Per-channel normalization mean
+        std (Tuple[float, ...]): Per-channel normalization std
+        shuffle (bool): Reshuffle every epoch
+        augment (bool): Random crop (padding 4) and horizontal flip
+        drop_last (bool): Drop the last incomplete batch
+        seed (int): Seed of the shuffling/augmentation generator
+    """
+
+    def __init__(
+        self,
+        images: torch.Tensor,
+        labels: torch.Tensor,
+        batch_size: int,
+        indices: Optional[torch.Tensor] = None,
+        mean: Tuple[float, ...] = CIFAR10_MEAN,
+        std: Tuple[float, ...] = CIFAR10_STD,
+        shuffle: bool = False,
+        augment: bool = False,
+        drop_last: bool = False,
+        seed: int = 42,
+    ):
+        if images.dtype != torch.uint8:
+            raise ValueError(f"images must be uint8, got {images.dtype}")
+        self.images = images
+        self.labels = labels
+        self.indices = indices
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.augment = augment
+        self.drop_last = drop_last
+        self.generator = torch.Generator().manual_seed(seed)
+
+        # (x / 255 - mean) / std == x * scale + shift
+        std_t = torch.tensor(std, dtype=torch.float32, device=images.device).view(1, -1, 1, 1)
+        mean_t = torch.tensor(mean, dtype=torch.float32, device=images.device).view(1, -1, 1, 1)
+        self.scale = 1.0 / (255.0 * std_t)
+        self.shift = -mean_t / std_t
+
+    @property
+    def dataset(self) -> torch.Tensor:
+        """The iterated samples (for code that reads ``len(loader.dataset)``)."""
+        return self.images if self.indices is None else self.indices
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return len(self.dataset) // self.batch_size
+        return (len(self.dataset) + self.batch_size - 1) // self.batch_size
+
+    def transform(self, images: torch.Tensor) -> torch.Tensor:
+        """Augment (if enabled) and normalize a uint8 batch into float32."""
+        if self.augment:
+            images = random_flip(random_crop(images, generator=self.generator), generator=self.generator)
+        return torch.addcmul(self.shift, images.float(), self.scale)
+
+    def __iter__(self) -> Iterator[Tuple[torch.Tensor, torch.Tensor]]:
+        num_samples = len(self.dataset)
+        if self.shuffle:
+            order = torch.randperm(num_samples, generator=self.generator).to(self.images.device)
+            if self.indices is not None:
+                order = self.indices[order]
+        else:
+            order = self.indices
+
+        for batch in range(len(self)):
+            start = batch * self.batch_size
+            stop = min(start + self.batch_size, num_samples)
+            if order is None:
+                images, labels = self.images[start:stop], self.labels[start:stop]
+            else:
+                index = order[start:stop]
+                images, labels = self.images[index], self.labels[index]
+            yield self.transform(images), labels
+
+
+class TensorCIFAR10DataModule(pl.LightningDataModule):
+    """
+    CIFAR-10 DataModule that keeps the dataset in memory as uint8 tensors.
+
+    Splits, augmentation and normalization match ``CIFAR10DataModule`` in
+    ``lightning_modules/datamodule.py``; only where and how they run differs.
+
+    Args:
+        data_dir: Directory to store the dataset (default: 'data/cifar10')
+        batch_size: Batch size for the loaders (default: 128)
+        val_split: Proportion of training data to use for validation (default: 0.1)
+        seed: Random seed for the split, shuffling and augmentation (default: 42)
+        augment: Random crop and flip on training batches (default: True)
+        device: Device holding the tensors and producing batches (default: 'cpu')
+        cache_dir: Memory-mapped store directory (default: '<data_dir>/cifar10_npy')
+    """
+
+    def __init__(
+        self,
+        data_dir: str = 'data/cifar10',
+        batch_size: int = 128,
+        val_split: float = 0.1,
+        seed: int = 42,
+        augment: bool = True,
+        device: Union[str, torch.device] = 'cpu',
+        cache_dir: Optional[str] = None,
+    ):
+        super().__init__()
+        self.data_dir = data_dir
+        self.batch_size = batch_size
+        self.val_split = val_split
+        self.seed = seed
+        self.augment = augment
+        self.device = torch.device(device)
+        self.cache_dir = cache_dir
+
+        os.makedirs(data_dir, exist_ok=True)
+
+        self.mean = CIFAR10_MEAN
+        self.std = CIFAR10_STD
+
+        self.train_data = None
+        self.val_data = None
+        self.test_data = None
+        self._epoch_seed = 0
+
+    def prepare_data(self):
+        """Download CIFAR-10 and build the memory-mapped store if not already available."""
+        build_cifar10_cache(self.data_dir, self.cache_dir)
+
+    def _load(self, train: bool) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Split as ([N, 3, 32, 32] uint8, [N] int64) tensors."""
+        images, labels = open_cifar10_cache(self.data_dir, train, self.cache_dir)
+        # NCHW view of the HWC store; only a non-CPU device gets its own copy
+        images = as_tensor(images).permute(0, 3, 1, 2)
+        labels = as_tensor(labels)
+        return images.to(self.device), labels.to(self.device)
+
+    def setup(self, stage: Optional[str] = None):
+        """
+        Load the splits into memory.
+
+        Args:
+            stage: Stage for which to set up the data ('fit', 'validate', 'test')
+        """
+        if stage in ('fit', None):
+            # Every fit starts the same shuffle/augmentation stream, also when a
+            # resident datamodule is reused across runs (warm sweep workers)
+            self._epoch_seed = 0
+
+        if (stage in ('fit', 'validate') or stage is None) and self.train_data is None:
+            images, labels = self._load(train=True)
+
+            # Same permutation as random_split(..., generator=manual_seed(seed))
+            train_size = int((1 - self.val_split) * len(images))
+            permutation = torch.randperm(len(images), generator=torch.Generator().manual_seed(self.seed))
+            train_index = permutation[:train_size].to(self.device)
+            val_index = permutation[train_size:].to(self.device)
+
+            # Splits index the shared images instead of copying them
+            self.train_data = (images, labels, train_index)
+            self.val_data = (images, labels, val_index)
+
+        if (stage == 'test' or stage is None) and self.test_data is None:
+            self.test_data = self._load(train=False) + (None,)
+
+    def _loader(self, data, shuffle: bool, augment: bool, seed: int) -> TensorBatchLoader:
+        images, labels, indices = data
+        return TensorBatchLoader(
+            images, labels, self.batch_size, indices=indices,
+            mean=self.mean, std=self.std,
+            shuffle=shuffle, augment=augment, seed=seed,
+        )
+
+    def train_dataloader(self):
+        """Shuffled, augmented training batches."""
+        # A fresh seed per call, so reloading dataloaders does not repeat epochs
+        self._epoch_seed += 1
+        return self._loader(self.train_data, shuffle=True, augment=self.augment, seed=self.seed + self._epoch_seed)
+
+    def val_dataloader(self):
+        """Validation batches (no augmentation)."""
+        return self._loader(self.val_data, shuffle=False, augment=False, seed=self.seed)
+
+    def test_dataloader(self):
+        """Test batches (no augmentation)."""
+        return self._loader(self.test_data, shuffle=False, augment=False, seed=self.seed)
@@ -14,6 +14,8 @@ import torchvision
 import torchvision.transforms as transforms
 import pytorch_lightning as pl
 
+from datamodules.cifar_cache import MemmapCIFAR10, build_cifar10_cache
+
 
 class CIFAR10DataModule(pl.LightningDataModule):
     """
@@ -73,6 +75,8 @@ class CIFAR10DataModule(pl.LightningDataModule):
         # Download
         torchvision.datasets.CIFAR10(self.data_dir, train=True, download=True)
         torchvision.datasets.CIFAR10(self.data_dir, train=False, download=True)
+        # Decode once into the shared memory-mapped store
+        build_cifar10_cache(self.data_dir)
     
     def setup(self, stage: Optional[str] = None) -> None:
         """
@@ -82,7 +86,7 @@ class CIFAR10DataModule(pl.LightningDataModule):
             stage: Current stage ('fit', 'validate', 'test', or 'predict')
         """
         # Load the training dataset
-        train_dataset = torchvision.datasets.CIFAR10(
+        train_dataset = MemmapCIFAR10(
             self.data_dir, train=True, transform=self.train_transform
         )
         
@@ -98,7 +102,7 @@ class CIFAR10DataModule(pl.LightningDataModule):
         )
         
         # Load the test dataset
-        self.cifar_test = torchvision.datasets.CIFAR10(
+        self.cifar_test = MemmapCIFAR10(
             self.data_dir, train=False, transform=self.test_transform
         )
     
@@ -1,4 +1,5 @@
 """Patch a HuggingFace GPT-2 model so its MLP uses paGating units."""
+import torch
 import torch.nn as nn
 import sys
 import os
@@ -6,10 +7,12 @@ import os
 # Add the project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from transformers import GPT2LMHeadModel
-from paGating import paGLU
+from transformers import GPT2LMHeadModel, TrainerCallback
+from paGating import PaddingIndex, paGLU
 from paGating import alpha_schedulers
 
+MLP_MODES = ("stacked", "replace")
+
 def _parse_alpha_mode(alpha_mode: str):
     if alpha_mode.startswith("static_"):
         return float(alpha_mode.split("_")[1]), None
@@ -19,28 +22,169 @@ def _parse_alpha_mode(alpha_mode: str):
         return 0.0, "cosine"
     raise ValueError(f"Unsupported alpha_mode: {alpha_mode}")
 
-def patch_gpt2_with_pagating(model: GPT2LMHeadModel, alpha_mode: str):
+def param_matched_d_ff(d_ff: int, multiple_of: int = 64) -> int:
+    """Hidden size of a gated MLP with the parameter count of a 2-matrix MLP.
+
+    A stock MLP has 2 * d_model * d_ff weights, a gated one 3 * d_model * d_ff',
+    so d_ff' = 2/3 * d_ff, rounded up to a multiple of ``multiple_of``
+    (3072 -> 2048 for GPT-2 small).
+    """
+    hidden = int(2 * d_ff / 3)
+    return multiple_of * ((hidden + multiple_of - 1) // multiple_of)
+
+class _PaddingState:
+    """Attention mask of the current GPT-2 forward, shared by the patched MLPs.
+
+    A forward pre-hook on ``model.transformer`` records ``attention_mask``; the
+    first MLP to run builds a ``PaddingIndex`` that the remaining blocks reuse.
+    The mask is kept until the next forward so that recomputation in backward
+    (gradient checkpointing) sees the same index.
+    """
+
+    def __init__(self):
+        self.mask = None
+        self.index = None
+
+    def pre_hook(self, module, args, kwargs):
+        self.mask = kwargs.get("attention_mask")
+        self.index = None
+
+    def index_for(self, hidden_states: torch.Tensor):
+        if self.mask is None or self.mask.dim() != 2:
+            return None
+        seq_len = hidden_states.shape[1]
+        if self.index is None or self.index.batch_shape[1] != seq_len:
+            # With a KV cache the mask also covers past positions
+            self.index = PaddingIndex(self.mask[:, -seq_len:])
+        return None if self.index.dense else self.index
+
+
+def _run_unpadded(ffn, x: torch.Tensor, padding_state) -> torch.Tensor:
+    """Apply a per-token FFN to the real tokens only (zeros at pad positions)."""
+    index = padding_state.index_for(x) if padding_state is not None else None
+    if index is None:
+        return ffn(x)
+    return index.repad(ffn(index.unpad(x)))
+
+def patch_gpt2_with_pagating(
+    model: GPT2LMHeadModel,
+    alpha_mode: str,
+    recompute: bool = False,
+    mlp_mode: str = "stacked",
+    init_from_pretrained: bool = True,
+    param_matched: bool = False,
+    alpha_schedule_steps: int = 20000,
+    unpad: bool = False,
+):
+    """Replace every GPT-2 MLP with a paGLU-gated MLP.
+
+    Two layouts are available:
+        - "stacked": fc_in(d_model→d_ff) → paGLU(d_ff→d_ff) → fc_out. Adds two
+          d_ff×d_ff GEMMs per block on top of the stock MLP.
+        - "replace": paGLU(d_model→d_ff) → fc_out, SwiGLU-style. The unit is the
+          expansion itself (one fused value/gate GEMM), so FLOPs and parameters
+          are 1.5x the stock MLP, or equal to it with ``param_matched``.
+
+    Args:
+        model: HuggingFace GPT-2 model, patched in place
+        alpha_mode: "static_<value>", "learnable" or "scheduler_cosine"
+        recompute: Recompute the paGLU units in backward instead of storing
+            their intermediates (see ``paGating.set_recompute``)
+        mlp_mode: "stacked" (default) or "replace"
+        init_from_pretrained: In "replace" mode, initialize the value path from
+            the pretrained ``c_fc`` and ``fc_out`` from ``c_proj`` (HF Conv1D
+            weights are transposed; with ``param_matched`` the first d_ff'
+            hidden units are kept). The gate path starts from default init.
+        param_matched: In "replace" mode, shrink d_ff to ``param_matched_d_ff``
+            so the patched MLP has the stock parameter count and FLOPs
+        alpha_schedule_steps: Length of the "scheduler_cosine" schedule. The
+            schedulers only advance when stepped, e.g. by
+            ``AlphaSchedulerTrainerCallback``
+        unpad: Run the patched MLPs on the real tokens only, using the
+            ``attention_mask`` passed to the model. MLP outputs at pad
+            positions are zero; real-token outputs are unchanged
+    """
+    if mlp_mode not in MLP_MODES:
+        raise ValueError(f"Unsupported mlp_mode: {mlp_mode}. Choose from {MLP_MODES}")
     alpha_init, scheduler_name = _parse_alpha_mode(alpha_mode)
+    padding_state = None
+    if unpad:
+        padding_state = _PaddingState()
+        model.transformer.register_forward_pre_hook(padding_state.pre_hook, with_kwargs=True)
+
+    def make_unit(input_dim: int, output_dim: int, fused: bool = False):
+        if scheduler_name:
+            # Use the scheduler as the alpha parameter
+            alpha_scheduler = alpha_schedulers.CosineAlphaScheduler(max_steps=alpha_schedule_steps)
+            return paGLU(input_dim=input_dim, output_dim=output_dim, alpha=alpha_scheduler,
+                         fused=fused, recompute=recompute)
+        # Use static or learnable alpha
+        return paGLU(input_dim=input_dim, output_dim=output_dim, alpha=alpha_init,
+                     fused=fused, recompute=recompute)
 
     class PaGatingMLP(nn.Module):
         def __init__(self, d_model: int, d_ff: int):
             super().__init__()
             self.fc_in = nn.Linear(d_model, d_ff)
-            if scheduler_name:
-                # Use the scheduler as the alpha parameter
-                alpha_scheduler = alpha_schedulers.CosineAlphaScheduler(max_steps=20000)
-                self.act = paGLU(input_dim=d_ff, output_dim=d_ff, alpha=alpha_scheduler)
-            else:
-                # Use static or learnable alpha
-                self.act = paGLU(input_dim=d_ff, output_dim=d_ff, alpha=alpha_init)
+            self.act = make_unit(d_ff, d_ff)
             self.fc_out = nn.Linear(d_ff, d_model)
 
-        def forward(self, x):
+        def ffn(self, x):
             return self.fc_out(self.act(self.fc_in(x)))
 
+        def forward(self, x):
+            return _run_unpadded(self.ffn, x, padding_state)
+
+    class PaGatingExpansionMLP(nn.Module):
+        def __init__(self, d_model: int, d_ff: int, dropout: float):
+            super().__init__()
+            self.act = make_unit(d_model, d_ff, fused=True)
+            self.fc_out = nn.Linear(d_ff, d_model)
+            self.dropout = nn.Dropout(dropout)
+
+        @torch.no_grad()
+        def load_pretrained(self, c_fc, c_proj):
+            # Conv1D stores weights as [in, out]; nn.Linear expects [out, in]
+            d_ff = self.fc_out.in_features
+            self.act.fused_proj.weight[:d_ff].copy_(c_fc.weight[:, :d_ff].t())
+            self.act.fused_proj.bias[:d_ff].copy_(c_fc.bias[:d_ff])
+            self.fc_out.weight.copy_(c_proj.weight[:d_ff].t())
+            self.fc_out.bias.copy_(c_proj.bias)
+
+        def ffn(self, x):
+            return self.dropout(self.fc_out(self.act(x)))
+
+        def forward(self, x):
+            return _run_unpadded(self.ffn, x, padding_state)
+
     for blk in model.transformer.h:
         d_model = blk.mlp.c_fc.nx
         d_ff = blk.mlp.c_fc.nf
-        blk.mlp = PaGatingMLP(d_model, d_ff)
+        if mlp_mode == "stacked":
+            blk.mlp = PaGatingMLP(d_model, d_ff)
+            continue
+
+        hidden = param_matched_d_ff(d_ff) if param_matched else d_ff
+        mlp = PaGatingExpansionMLP(d_model, hidden, model.config.resid_pdrop)
+        mlp.to(device=blk.mlp.c_fc.weight.device, dtype=blk.mlp.c_fc.weight.dtype)
+        if init_from_pretrained:
+            mlp.load_pretrained(blk.mlp.c_fc, blk.mlp.c_proj)
+        blk.mlp = mlp
+
+    return model
+
+
+class AlphaSchedulerTrainerCallback(TrainerCallback):
+    """Advance the α schedulers of a patched model once per optimizer step.
+
+    The schedulers are set to ``state.global_step``, so gradient accumulation
+    and resuming from a checkpoint keep the schedule in sync with training.
+    """
+
+    def on_train_begin(self, args, state, control, model=None, **kwargs):
+        if model is not None:
+            alpha_schedulers.step_alpha_schedulers(model, state.global_step)
 
-    return model 
\ No newline at end of file
+    def on_step_end(self, args, state, control, model=None, **kwargs):
+        if model is not None:
+            alpha_schedulers.step_alpha_schedulers(model, state.global_step)
@@ -0,0 +1,486 @@
+"""
+Pre-norm transformer built from paGating feed-forward blocks.
+
+The building blocks are:
+
+- ``MultiHeadAttention``: fused QKV projection on top of
+  ``F.scaled_dot_product_attention``, with causal and non-causal masking,
+  key padding masks, cross-attention and an optional ``KVCache``.
+- ``paGatingFFN``: a paGating unit with fused value/gate projection
+  (d_model -> d_ff) followed by the d_ff -> d_model down projection.
+- ``paTransformerBlock``: pre-norm self-attention, optional cross-attention
+  and FFN, each with a residual connection. Encoder blocks are non-causal,
+  decoder blocks causal.
+- ``paTransformer``: a stack of blocks described by ``paTransformerConfig``,
+  optionally with token/position embeddings and a (tied) LM head.
+
+``ffn_type="gelu"`` swaps the FFN for a standard GELU MLP, which gives an
+equivalent vanilla transformer for comparisons.
+"""
+
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+# Add the project root to Python path if needed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from paGating import activation_map
+
+
+FFN_TYPES = ("pagating", "gelu")
+
+
+def gated_d_ff(d_model: int, multiple_of: int = 64) -> int:
+    """Hidden size of a gated FFN with the parameters of a 4x GELU MLP.
+
+    A GELU MLP has 2 * d_model * 4d_model weights, a gated FFN 3 * d_model * d_ff,
+    so d_ff = 8/3 * d_model, rounded up to a multiple of ``multiple_of``.
+    """
+    hidden = int(8 * d_model / 3)
+    return multiple_of * ((hidden + multiple_of - 1) // multiple_of)
+
+
+class paTransformerConfig:
+    """Configuration of a paTransformer stack.
+
+    Args:
+        d_model (int): Model dimension
+        n_heads (int): Attention heads; must divide d_model
+        n_layers (int): Number of blocks
+        d_ff (Optional[int]): FFN hidden size. Default: ``gated_d_ff(d_model)`` for
+            paGating FFNs and 4 * d_model for GELU FFNs, which have equal parameter counts
+        unit (str): paGating unit of the FFN (a key of ``paGating.activation_map``)
+        alpha (Union[float, str]): Fixed alpha or "learnable"
+        use_gate_norm (bool): Whether the paGating units normalize their gate
+        ffn_type (str): "pagating" or "gelu" (vanilla baseline)
+        causal (bool): Causal (decoder) or bidirectional (encoder) self-attention
+        cross_attention (bool): Add cross-attention over an encoder memory
+        dropout (float): Residual and FFN dropout
+        attn_dropout (float): Attention-probability dropout
+        bias (bool): Biases in attention and output projections
+        norm_eps (float): LayerNorm epsilon
+        vocab_size (Optional[int]): If set, add token/position embeddings and an LM head
+        max_seq_len (int): Number of learned positions (with ``vocab_size``)
+        tie_embeddings (bool): Share the LM head with the token embedding
+    """
+
+    def __init__(
+        self,
+        d_model: int = 512,
+        n_heads: int = 8,
+        n_layers: int = 6,
+        d_ff: Optional[int] = None,
+        unit: str = "paGLU",
+        alpha: Union[float, str] = 0.5,
+        use_gate_norm: bool = False,
+        ffn_type: str = "pagating",
+        causal: bool = True,
+        cross_attention: bool = False,
+        dropout: float = 0.0,
+        attn_dropout: float = 0.0,
+        bias: bool = True,
+        norm_eps: float = 1e-5,
+        vocab_size: Optional[int] = None,
+        max_seq_len: int = 1024,
+        tie_embeddings: bool = True,
+    ):
+        if d_model % n_heads != 0:
+            raise ValueError(f"d_model ({d_model}) must be divisible by n_heads ({n_heads})")
+        if ffn_type not in FFN_TYPES:
+            raise ValueError(f"Unknown ffn_type '{ffn_type}'. Available options: {list(FFN_TYPES)}")
+        if ffn_type == "pagating" and unit not in activation_map:
+            raise ValueError(f"Unknown unit '{unit}'. Available options: {list(activation_map)}")
+
+        self.d_model = d_model
+        self.n_heads = n_heads
+        self.n_layers = n_layers
+        if d_ff is None:
+            d_ff = gated_d_ff(d_model) if ffn_type == "pagating" else 4 * d_model
+        self.d_ff = d_ff
+        self.unit = unit
+        self.alpha = alpha
+        self.use_gate_norm = use_gate_norm
+        self.ffn_type = ffn_type
+        self.causal = causal
+        self.cross_attention = cross_attention
+        self.dropout = dropout
+        self.attn_dropout = attn_dropout
+        self.bias = bias
+        self.norm_eps = norm_eps
+        self.vocab_size = vocab_size
+        self.max_seq_len = max_seq_len
+        self.tie_embeddings = tie_embeddings
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Configuration as a JSON-serializable dictionary."""
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> "paTransformerConfig":
+        """Rebuild a configuration saved with ``to_dict``."""
+        return cls(**config)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.__dict__.items())
+        return f"paTransformerConfig({fields})"
+
+
+class KVCache:
+    """Keys and values of the past positions of one block.
+
+    Self-attention keys/values grow by one entry per decoded position; the
+    cross-attention projections of the encoder memory are computed once and
+    reused for every step.
+    """
+
+    def __init__(self):
+        self.key: Optional[torch.Tensor] = None
+        self.value: Optional[torch.Tensor] = None
+        self.memory_key: Optional[torch.Tensor] = None
+        self.memory_value: Optional[torch.Tensor] = None
+
+    @property
+    def length(self) -> int:
+        """Number of cached positions."""
+        return 0 if self.key is None else self.key.shape[2]
+
+    def update(self, key: torch.Tensor, value: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Append new keys/values of shape (batch, heads, new, head_dim) and return all of them."""
+        if self.key is not None:
+            key = torch.cat([self.key, key], dim=2)
+            value = torch.cat([self.value, value], dim=2)
+        self.key, self.value = key, value
+        return key, value
+
+
+def _attention_mask(
+    q_len: int,
+    k_len: int,
+    causal: bool,
+    key_padding_mask: Optional[torch.Tensor],
+    device: torch.device,
+) -> Tuple[Optional[torch.Tensor], bool]:
+    """SDPA ``attn_mask`` (True = attend) and ``is_causal`` for one attention call.
+
+    Queries are the last ``q_len`` of ``k_len`` positions, so with a KV cache
+    the causal mask is offset by the number of cached positions.
+    """
+    if key_padding_mask is None:
+        if not causal or q_len == 1:
+            return None, False
+        if q_len == k_len:
+            # Let SDPA pick its causal kernels
+            return None, True
+
+    mask = None
+    if causal:
+        mask = torch.ones(q_len, k_len, dtype=torch.bool, device=device).tril(diagonal=k_len - q_len)
+    if key_padding_mask is not None:
+        keys = key_padding_mask.bool()[:, None, None, :]
+        mask = keys if mask is None else keys & mask
+    return mask, False
+
+
+class MultiHeadAttention(nn.Module):
+    """Multi-head attention on ``F.scaled_dot_product_attention``.
+
+    Args:
+        d_model (int): Model dimension
+        n_heads (int): Number of heads
+        dropout (float): Attention-probability dropout (training only)
+        bias (bool): Projection biases
+        cross (bool): Cross-attention (queries from x, keys/values from memory)
+    """
+
+    def __init__(self, d_model: int, n_heads: int, dropout: float = 0.0, bias: bool = True, cross: bool = False):
+        super().__init__()
+        if d_model % n_heads != 0:
+            raise ValueError(f"d_model ({d_model}) must be divisible by n_heads ({n_heads})")
+        self.d_model = d_model
+        self.n_heads = n_heads
+        self.head_dim = d_model // n_heads
+        self.dropout = dropout
+        self.cross = cross
+
+        if cross:
+            self.q_proj = nn.Linear(d_model, d_model, bias=bias)
+            self.kv_proj = nn.Linear(d_model, 2 * d_model, bias=bias)
+        else:
+            # One GEMM for queries, keys and values
+            self.qkv_proj = nn.Linear(d_model, 3 * d_model, bias=bias)
+        self.out_proj = nn.Linear(d_model, d_model, bias=bias)
+
+    def _heads(self, x: torch.Tensor) -> torch.Tensor:
+        # [B, T, D] -> [B, H, T, head_dim]
+        return x.unflatten(-1, (self.n_heads, self.head_dim)).transpose(1, 2)
+
+    def forward(
+        self,
+        x: torch.Tensor,
+        memory: Optional[torch.Tensor] = None,
+        key_padding_mask: Optional[torch.Tensor] = None,
+        causal: bool = False,
+        cache: Optional[KVCache] = None,
+    ) -> torch.Tensor:
+        """
+        Args:
+            x (torch.Tensor): Queries' input of shape (batch, q_len, d_model)
+            memory (Optional[torch.Tensor]): Encoder output (batch, m_len, d_model)
+                for cross-attention; may be omitted once cached
+            key_padding_mask (Optional[torch.Tensor]): (batch, k_len) mask, True/1 for
+                real keys. With a cache, k_len includes the cached positions
+            causal (bool): Mask future positions (self-attention only)
+            cache (Optional[KVCache]): Cache updated in place
+
+        Returns:
+            torch.Tensor: Output of shape (batch, q_len, d_model)
+        """
+        batch_size, q_len, _ = x.shape
+
+        if self.cross:
+            q = self._heads(self.q_proj(x))
+            if cache is not None and cache.memory_key is not None:
+                k, v = cache.memory_key, cache.memory_value
+            else:
+                if memory is None:
+                    raise ValueError("Cross-attention needs an encoder memory")
+                k, v = (self._heads(t) for t in self.kv_proj(memory).chunk(2, dim=-1))
+                if cache is not None:
+                    cache.memory_key, cache.memory_value = k, v
+            causal = False
+        else:
+            q, k, v = (self._heads(t) for t in self.qkv_proj(x).chunk(3, dim=-1))
+            if cache is not None:
+                k, v = cache.update(k, v)
+
+        attn_mask, is_causal = _attention_mask(q_len, k.shape[2], causal, key_padding_mask, x.device)
+        if key_padding_mask is not None and not self.cross:
+            # Every query may attend to itself, so fully padded rows stay finite
+            k_len = k.shape[2]
+            query_pos = torch.arange(k_len - q_len, k_len, device=x.device)
+            attn_mask = attn_mask | (query_pos[:, None] == torch.arange(k_len, device=x.device))
+
+        out = F.scaled_dot_product_attention(
+            q, k, v,
+            attn_mask=attn_mask,
+            dropout_p=self.dropout if self.training else 0.0,
+            is_causal=is_causal,
+        )
+        return self.out_proj(out.transpose(1, 2).reshape(batch_size, q_len, self.d_model))
+
+
+class paGatingFFN(nn.Module):
+    """Feed-forward block: fused paGating expansion followed by a down projection.
+
+    Args:
+        d_model (int): Model dimension
+        d_ff (int): Hidden dimension
+        unit (str): paGating unit name
+        alpha (Union[float, str]): Fixed alpha or "learnable"
+        use_gate_norm (bool): Whether the unit normalizes its gate
+        norm_eps (float): Gate-norm epsilon
+        dropout (float): Output dropout
+        bias (bool): Bias of the down projection
+    """
+
+    def __init__(
+        self,
+        d_model: int,
+        d_ff: int,
+        unit: str = "paGLU",
+        alpha: Union[float, str] = 0.5,
+        use_gate_norm: bool = False,
+        norm_eps: float = 1e-5,
+        dropout: float = 0.0,
+        bias: bool = True,
+    ):
+        super().__init__()
+        # Value and gate projections run as one d_model -> 2 * d_ff GEMM
+        self.unit = activation_map[unit](
+            input_dim=d_model,
+            output_dim=d_ff,
+            alpha=alpha,
+            use_gate_norm=use_gate_norm,
+            norm_eps=norm_eps,
+            fused=True,
+        )
+        self.down_proj = nn.Linear(d_ff, d_model, bias=bias)
+        self.dropout = nn.Dropout(dropout)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.dropout(self.down_proj(self.unit(x)))
+
+
+class GELUFFN(nn.Module):
+    """Standard transformer MLP (Linear -> GELU -> Linear), the vanilla baseline."""
+
+    def __init__(self, d_model: int, d_ff: int, dropout: float = 0.0, bias: bool = True):
+        super().__init__()
+        self.up_proj = nn.Linear(d_model, d_ff, bias=bias)
+        self.down_proj = nn.Linear(d_ff, d_model, bias=bias)
+        self.dropout = nn.Dropout(dropout)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.dropout(self.down_proj(F.gelu(self.up_proj(x))))
+
+
+def build_ffn(config: paTransformerConfig) -> nn.Module:
+    """Feed-forward block for a configuration."""
+    if config.ffn_type == "gelu":
+        return GELUFFN(config.d_model, config.d_ff, dropout=config.dropout, bias=config.bias)
+    return paGatingFFN(
+        config.d_model,
+        config.d_ff,
+        unit=config.unit,
+        alpha=config.alpha,
+        use_gate_norm=config.use_gate_norm,
+        norm_eps=config.norm_eps,
+        dropout=config.dropout,
+        bias=config.bias,
+    )
+
+
+class paTransformerBlock(nn.Module):
+    """Pre-norm transformer block with a paGating FFN.
+
+    x = x + SelfAttn(LN(x));  x = x + CrossAttn(LN(x), memory);  x = x + FFN(LN(x))
+
+    Args:
+        config (paTransformerConfig): Block configuration
+    """
+
+    def __init__(self, config: paTransformerConfig):
+        super().__init__()
+        self.causal = config.causal
+
+        self.norm1 = nn.LayerNorm(config.d_model, eps=config.norm_eps)
+        self.self_attn = MultiHeadAttention(config.d_model, config.n_heads, config.attn_dropout, config.bias)
+
+        self.norm_cross = None
+        self.cross_attn = None
+        if config.cross_attention:
+            self.norm_cross = nn.LayerNorm(config.d_model, eps=config.norm_eps)
+            self.cross_attn = MultiHeadAttention(
+                config.d_model, config.n_heads, config.attn_dropout, config.bias, cross=True
+            )
+
+        self.norm2 = nn.LayerNorm(config.d_model, eps=config.norm_eps)
+        self.ffn = build_ffn(config)
+        self.dropout = nn.Dropout(config.dropout)
+
+    def forward(
+        self,
+        x: torch.Tensor,
+        attention_mask: Optional[torch.Tensor] = None,
+        memory: Optional[torch.Tensor] = None,
+        memory_mask: Optional[torch.Tensor] = None,
+        cache: Optional[KVCache] = None,
+    ) -> torch.Tensor:
+        """
+        Args:
+            x (torch.Tensor): Input of shape (batch, seq_len, d_model)
+            attention_mask (Optional[torch.Tensor]): (batch, past + seq_len) mask of real tokens
+            memory (Optional[torch.Tensor]): Encoder output for cross-attention
+            memory_mask (Optional[torch.Tensor]): (batch, m_len) mask of real memory positions
+            cache (Optional[KVCache]): KV cache of this block, updated in place
+
+        Returns:
+            torch.Tensor: Output of shape (batch, seq_len, d_model)
+        """
+        x = x + self.dropout(self.self_attn(
+            self.norm1(x), key_padding_mask=attention_mask, causal=self.causal, cache=cache
+        ))
+        if self.cross_attn is not None:
+            x = x + self.dropout(self.cross_attn(
+                self.norm_cross(x), memory=memory, key_padding_mask=memory_mask, cache=cache
+            ))
+        return x + self.ffn(self.norm2(x))
+
+
+class paTransformer(nn.Module):
+    """Stack of ``paTransformerBlock`` layers.
+
+    Without ``vocab_size`` the stack maps (batch, seq_len, d_model) features to
+    features of the same shape. With ``vocab_size`` it maps token ids to logits,
+    using learned absolute positions (offset by the cache length when decoding).
+
+    Args:
+        config (paTransformerConfig): Stack configuration
+    """
+
+    def __init__(self, config: paTransformerConfig):
+        super().__init__()
+        self.config = config
+
+        self.token_embedding = None
+        self.position_embedding = None
+        self.lm_head = None
+        if config.vocab_size is not None:
+            self.token_embedding = nn.Embedding(config.vocab_size, config.d_model)
+            self.position_embedding = nn.Embedding(config.max_seq_len, config.d_model)
+            nn.init.normal_(self.token_embedding.weight, std=0.02)
+            nn.init.normal_(self.position_embedding.weight, std=0.02)
+            self.lm_head = nn.Linear(config.d_model, config.vocab_size, bias=False)
+            if config.tie_embeddings:
+                self.lm_head.weight = self.token_embedding.weight
+        self.embed_dropout = nn.Dropout(config.dropout)
+
+        self.layers = nn.ModuleList([paTransformerBlock(config) for _ in range(config.n_layers)])
+        self.final_norm = nn.LayerNorm(config.d_model, eps=config.norm_eps)
+
+    def init_cache(self) -> List[KVCache]:
+        """Empty KV cache with one entry per block."""
+        return [KVCache() for _ in self.layers]
+
+    def forward(
+        self,
+        x: torch.Tensor,
+        attention_mask: Optional[torch.Tensor] = None,
+        memory: Optional[torch.Tensor] = None,
+        memory_mask: Optional[torch.Tensor] = None,
+        cache: Optional[List[KVCache]] = None,
+    ) -> torch.Tensor:
+        """
+        Args:
+            x (torch.Tensor): Token ids (batch, seq_len) if the config has a
+                vocabulary, else features (batch, seq_len, d_model)
+            attention_mask (Optional[torch.Tensor]): (batch, past + seq_len) mask, True/1
+                for real tokens
+            memory (Optional[torch.Tensor]): Encoder output for cross-attention blocks
+            memory_mask (Optional[torch.Tensor]): Mask of real memory positions
+            cache (Optional[List[KVCache]]): Cache from ``init_cache``, updated in place
+
+        Returns:
+            torch.Tensor: Logits (batch, seq_len, vocab_size) or features
+            (batch, seq_len, d_model)
+        """
+        if cache is not None and len(cache) != len(self.layers):
+            raise ValueError(f"Expected a cache with {len(self.layers)} entries, got {len(cache)}")
+
+        if self.token_embedding is not None:
+            past = cache[0].length if cache is not None else 0
+            seq_len = x.shape[1]
+            if past + seq_len > self.config.max_seq_len:
+                raise ValueError(
+                    f"Sequence of {past + seq_len} positions exceeds max_seq_len={self.config.max_seq_len}"
+                )
+            positions = torch.arange(past, past + seq_len, device=x.device)
+            x = self.token_embedding(x) + self.position_embedding(positions)
+        h = self.embed_dropout(x)
+
+        for index, layer in enumerate(self.layers):
+            h = layer(
+                h,
+                attention_mask=attention_mask,
+                memory=memory,
+                memory_mask=memory_mask,
+                cache=cache[index] if cache is not None else None,
+            )
+        h = self.final_norm(h)
+
+        return self.lm_head(h) if self.lm_head is not None else h
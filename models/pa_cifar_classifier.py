@@ -47,8 +47,16 @@ class paActivationBlock(nn.Module):
         pre_norm (bool): Whether to use layer normalization before the activation
         post_norm (bool): Whether to use layer normalization after the activation
         norm_eps (float): Epsilon value for normalization layers
+        layout (str): How feature maps are fed to the unit:
+            - "nhwc": run the unit on the NHWC permute view of the input and
+              return a channels-last view of its output (no copies for
+              channels-last input)
+            - "flatten": legacy [B, H*W, C] transpose round-trip
+            Default: "nhwc"
     """
     
+    LAYOUTS = ("nhwc", "flatten")
+    
     def __init__(
         self,
         in_channels: int,
@@ -59,11 +67,16 @@ class paActivationBlock(nn.Module):
         pre_norm: bool = False,
         post_norm: bool = False,
         norm_eps: float = 1e-5,
+        layout: str = "nhwc",
     ):
         super().__init__()
         
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Unknown layout '{layout}'. Available options: {list(self.LAYOUTS)}")
+        
         self.in_channels = in_channels
         self.out_channels = out_channels
+        self.layout = layout
         
         # Create the paGating unit
         self.pa_unit = pa_unit_class(
@@ -91,7 +104,10 @@ class paActivationBlock(nn.Module):
         """
         Forward pass through the activation block.
         
-        For convolutional feature maps, we reshape to [B, C, H*W] for the paGating unit,
+        By default the paGating unit runs on the [B, H, W, C] view of the feature
+        map. For channels-last input that view is contiguous, and the output is
+        returned as a channels-last [B, C, H, W] view, so no copies are made.
+        With layout="flatten", we reshape to [B, C, H*W] for the paGating unit,
         then reshape back to [B, C, H, W].
         
         Args:
@@ -100,6 +116,11 @@ class paActivationBlock(nn.Module):
         Returns:
             torch.Tensor: Output tensor of shape [B, C, H, W]
         """
+        if self.layout == "nhwc":
+            # Linear layers and LayerNorms act on the last (channel) dimension
+            out = self.module(x.permute(0, 2, 3, 1))
+            return out.permute(0, 3, 1, 2)
+        
         batch_size, channels, height, width = x.shape
         
         # Reshape to [B, C, H*W] and transpose to [B, H*W, C]
@@ -129,6 +150,8 @@ class paCIFARClassifier(nn.Module):
         post_norm (bool): Whether to use layer normalization after the activation
         norm_eps (float): Epsilon value for normalization layers
         num_classes (int): Number of output classes
+        layout (str): Feature-map layout used by the activation blocks ("nhwc" or "flatten")
+        channels_last (bool): Keep weights and activations in channels-last memory format
     """
     
     def __init__(
@@ -140,9 +163,13 @@ class paCIFARClassifier(nn.Module):
         post_norm: bool = False,
         norm_eps: float = 1e-5,
         num_classes: int = 10,
+        layout: str = "nhwc",
+        channels_last: bool = False,
     ):
         super().__init__()
         
+        self.channels_last = channels_last
+        
         # Store configuration
         self.config = {
             "pa_unit_class": pa_unit_class.__name__,
@@ -152,6 +179,8 @@ class paCIFARClassifier(nn.Module):
             "post_norm": post_norm,
             "norm_eps": norm_eps,
             "num_classes": num_classes,
+            "layout": layout,
+            "channels_last": channels_last,
         }
         
         # First convolutional layer
@@ -164,7 +193,8 @@ class paCIFARClassifier(nn.Module):
             use_gate_norm=use_gate_norm,
             pre_norm=pre_norm,
             post_norm=post_norm,
-            norm_eps=norm_eps
+            norm_eps=norm_eps,
+            layout=layout
         )
         self.pool1 = nn.MaxPool2d(2)
         
@@ -178,7 +208,8 @@ class paCIFARClassifier(nn.Module):
             use_gate_norm=use_gate_norm,
             pre_norm=pre_norm,
             post_norm=post_norm,
-            norm_eps=norm_eps
+            norm_eps=norm_eps,
+            layout=layout
         )
         self.pool2 = nn.MaxPool2d(2)
         
@@ -192,7 +223,8 @@ class paCIFARClassifier(nn.Module):
             use_gate_norm=use_gate_norm,
             pre_norm=pre_norm,
             post_norm=post_norm,
-            norm_eps=norm_eps
+            norm_eps=norm_eps,
+            layout=layout
         )
         self.pool3 = nn.MaxPool2d(2)
         
@@ -206,7 +238,8 @@ class paCIFARClassifier(nn.Module):
             use_gate_norm=use_gate_norm,
             pre_norm=pre_norm,
             post_norm=post_norm,
-            norm_eps=norm_eps
+            norm_eps=norm_eps,
+            layout=layout
         )
         self.pool4 = nn.MaxPool2d(2)
         
@@ -216,6 +249,10 @@ class paCIFARClassifier(nn.Module):
         
         # Dropout for regularization
         self.dropout = nn.Dropout(0.5)
+        
+        if channels_last:
+            # Store conv weights in NHWC order to match the activations
+            self.to(memory_format=torch.channels_last)
     
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         """
@@ -227,6 +264,9 @@ class paCIFARClassifier(nn.Module):
         Returns:
             torch.Tensor: Logits of shape [B, num_classes]
         """
+        if self.channels_last:
+            x = x.contiguous(memory_format=torch.channels_last)
+        
         # First block
         x = self.conv1(x)
         x = self.pablock1(x)
@@ -249,7 +289,7 @@ class paCIFARClassifier(nn.Module):
         
         # Global pooling
         x = self.global_pool(x)
-        x = x.view(x.size(0), -1)
+        x = x.reshape(x.size(0), -1)
         x = self.dropout(x)
         
         # Fully connected layer
@@ -270,6 +310,8 @@ def create_model(
     post_norm: bool = False,
     norm_eps: float = 1e-5,
     num_classes: int = 10,
+    layout: str = "nhwc",
+    channels_last: bool = False,
 ) -> paCIFARClassifier:
     """
     Create a paCIFARClassifier with the specified configuration.
@@ -282,6 +324,8 @@ def create_model(
         post_norm (bool): Whether to use layer normalization after the activation
         norm_eps (float): Epsilon value for normalization layers
         num_classes (int): Number of output classes
+        layout (str): Feature-map layout used by the activation blocks
+        channels_last (bool): Keep weights and activations in channels-last memory format
         
     Returns:
         paCIFARClassifier: Configured model
@@ -310,7 +354,9 @@ def create_model(
         pre_norm=pre_norm,
         post_norm=post_norm,
         norm_eps=norm_eps,
-        num_classes=num_classes
+        num_classes=num_classes,
+        layout=layout,
+        channels_last=channels_last
     )
     
     return model
@@ -28,15 +28,18 @@ class SimpleCIFARCNN(nn.Module):
     paGating activation units.
     """
     
-    def __init__(self, activation_unit, num_classes: int = 10):
+    def __init__(self, activation_unit, num_classes: int = 10, channels_last: bool = False):
         """
         Initialize the CNN model.
         
         Args:
             activation_unit: paGating unit to use for activation
             num_classes: Number of output classes (default: 10 for CIFAR-10)
+            channels_last: Run the convolutional stages in channels-last memory
+                format so the paGating2D adapters work on copy-free NHWC views
         """
         super().__init__()
+        self.channels_last = channels_last
         
         # Check if the activation unit is already a paGating2D
         if not isinstance(activation_unit, paGating2D):
@@ -51,9 +54,9 @@ class SimpleCIFARCNN(nn.Module):
                 alpha = 0.5  # Default alpha
             
             # Create 2D adapters for different layers
-            self.pa1 = paGating2D(unit_class, 32, 32, alpha)
-            self.pa2 = paGating2D(unit_class, 64, 64, alpha)
-            self.pa3 = paGating2D(unit_class, 128, 128, alpha)
+            self.pa1 = paGating2D(unit_class, 32, 32, alpha, channels_last=channels_last)
+            self.pa2 = paGating2D(unit_class, 64, 64, alpha, channels_last=channels_last)
+            self.pa3 = paGating2D(unit_class, 128, 128, alpha, channels_last=channels_last)
             
             # For the fully connected layer, we can use the original unit
             if hasattr(activation_unit, 'clone'):
@@ -75,19 +78,22 @@ class SimpleCIFARCNN(nn.Module):
                 activation_unit.pa_unit.__class__,
                 32, 32, 
                 alpha,
-                activation_unit.pa_unit.use_gate_norm
+                activation_unit.pa_unit.use_gate_norm,
+                channels_last=channels_last
             )
             self.pa2 = paGating2D(
                 activation_unit.pa_unit.__class__,
                 64, 64, 
                 alpha,
-                activation_unit.pa_unit.use_gate_norm
+                activation_unit.pa_unit.use_gate_norm,
+                channels_last=channels_last
             )
             self.pa3 = paGating2D(
                 activation_unit.pa_unit.__class__,
                 128, 128, 
                 alpha,
-                activation_unit.pa_unit.use_gate_norm
+                activation_unit.pa_unit.use_gate_norm,
+                channels_last=channels_last
             )
             self.pa4 = activation_unit.pa_unit.__class__(
                 input_dim=256, 
@@ -116,6 +122,10 @@ class SimpleCIFARCNN(nn.Module):
         self.dropout = nn.Dropout(0.5)
         self.fc2 = nn.Linear(256, num_classes)
         
+        if channels_last:
+            # Store conv weights in NHWC order to match the activations
+            self.to(memory_format=torch.channels_last)
+        
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         """
         Forward pass of the CNN.
@@ -126,6 +136,9 @@ class SimpleCIFARCNN(nn.Module):
         Returns:
             Logits of shape (B, num_classes)
         """
+        if self.channels_last:
+            x = x.contiguous(memory_format=torch.channels_last)
+        
         # First convolutional block
         x = self.conv1(x)
         x = self.pa1(x)
@@ -15,21 +15,31 @@ from paGating.paSwishU import paSwishU
 from paGating.paUnit import paUnit
 # from .paSiLUU import paSiLUU # Commented out - File not found
 from .paSiLU import paSiLU
-from .paGRU import PaGRUCell
+from .paGRU import PaGRU, PaGRUCell
 from .alpha_schedulers import (
+    StepAlphaScheduler,
     CosineAlphaScheduler,
     LinearRampScheduler,
     EntropyBasedAlpha,
-    ConfidenceBasedAlpha
+    ConfidenceBasedAlpha,
+    step_alpha_schedulers
 )
 from .norms import (
     GateNorm,
+    GateRMSNorm,
     PrePostNormWrapper
 )
 from .cnn_adapters import (
     paGating2D,
     create_paGating2D
 )
+from .base import set_recompute
+from .fused_ops import gated_blend
+from .freeze import freeze, FrozenPaGating
+from .quantization import quantize, quantization_error
+from .supernet import paGatingSupernet, prune_supernets, sample_supernet_branch, set_supernet_branch
+from .ensemble import AlphaEnsemble, EnsembleTrainer, init_learnable_alpha
+from .unpad import PaddingIndex, UnpaddedFFN
 
 __version__ = "0.1.0"
 
@@ -53,14 +63,33 @@ __all__ = [
     'paMishU',
     'paSiLU',
     # 'paSiLUU', # Also comment out from __all__ if it was there
+    'StepAlphaScheduler',
     'CosineAlphaScheduler',
     'LinearRampScheduler',
+    'step_alpha_schedulers',
     'EntropyBasedAlpha',
     'ConfidenceBasedAlpha',
     'GateNorm',
+    'GateRMSNorm',
     'PrePostNormWrapper',
     'activation_map',
     'paGating2D',
     'create_paGating2D',
     'PaGRUCell',
+    'PaGRU',
+    'gated_blend',
+    'set_recompute',
+    'freeze',
+    'FrozenPaGating',
+    'quantize',
+    'quantization_error',
+    'paGatingSupernet',
+    'set_supernet_branch',
+    'sample_supernet_branch',
+    'prune_supernets',
+    'AlphaEnsemble',
+    'EnsembleTrainer',
+    'init_learnable_alpha',
+    'PaddingIndex',
+    'UnpaddedFFN',
 ]
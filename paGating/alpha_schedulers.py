@@ -13,7 +13,8 @@ Schedulers can be based on:
 """
 
 import math
-from typing import Union, Callable, Optional, Dict, Any
+from abc import ABC, abstractmethod
+from typing import Union, Callable, Optional, Dict, Any, List
 
 import torch
 import torch.nn as nn
@@ -78,7 +79,66 @@ class LearnableAlpha:
         return [self.alpha_param]
 
 
-class CosineAlphaScheduler:
+class StepAlphaScheduler(nn.Module, ABC):
+    """Base class for step-driven alpha schedules.
+    
+    The whole schedule is precomputed into a table, and the current alpha is
+    kept in a 0-dim buffer that follows the owning module across ``.to()``
+    calls. Calling the scheduler returns that buffer, so a forward pass does
+    no host allocation or host-to-device copy; ``step()``/``set_step()``
+    refresh it with a device-side copy from the table. Both buffers are
+    non-persistent, so checkpoints keep their existing keys.
+    
+    Subclasses must implement ``_schedule()`` (the class is abstract, so an
+    incomplete subclass fails on construction), call ``_register_schedule()`` at the
+    end of their constructor and may clamp ``current_step`` in ``set_step``.
+    Steps past the end of the table use its last entry.
+    """
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self.current_step = 0
+    
+    def _register_schedule(self) -> None:
+        table = torch.tensor(self._schedule(), dtype=torch.float32)
+        self.register_buffer('schedule', table, persistent=False)
+        self.register_buffer('alpha', table[0].clone(), persistent=False)
+    
+    @abstractmethod
+    def _schedule(self) -> List[float]:
+        """Return alpha for steps 0, 1, ..., last scheduled step."""
+    
+    def _sync(self) -> None:
+        index = min(self.current_step, self.schedule.numel() - 1)
+        with torch.no_grad():
+            self.alpha.copy_(self.schedule[index])
+    
+    def step(self) -> None:
+        """Increment the current step counter."""
+        self.set_step(self.current_step + 1)
+    
+    def set_step(self, step: int) -> None:
+        """Manually set the current step.
+        
+        Args:
+            step (int): Step to set
+        """
+        self.current_step = max(0, step)
+        self._sync()
+    
+    def forward(self, x: Optional[torch.Tensor] = None) -> torch.Tensor:
+        """Return the current alpha value.
+        
+        Args:
+            x (Optional[torch.Tensor]): Ignored, included for API consistency
+            
+        Returns:
+            torch.Tensor: Scalar tensor with current alpha value (a buffer, do not modify in place)
+        """
+        return self.alpha
+
+
+class CosineAlphaScheduler(StepAlphaScheduler):
     """Scheduler that follows a cosine decay curve based on training progress.
     
     Formula: α(t) = 0.5 * (1 + cos(π * t / T))
@@ -88,6 +148,7 @@ class CosineAlphaScheduler:
     - T: Maximum number of steps
     
     This produces a smooth curve from 1 to 0 over the course of training.
+    The T + 1 values are precomputed (see :class:`StepAlphaScheduler`).
     
     Args:
         max_steps (int): Total number of steps in the schedule
@@ -104,50 +165,75 @@ class CosineAlphaScheduler:
         max_alpha: float = 1.0,
         reverse: bool = False
     ) -> None:
+        super().__init__()
         self.max_steps = max_steps
         self.min_alpha = min_alpha
         self.max_alpha = max_alpha
         self.reverse = reverse
-        self.current_step = 0
-    
-    def step(self) -> None:
-        """Increment the current step counter."""
-        self.current_step = min(self.current_step + 1, self.max_steps)
+        self._register_schedule()
     
-    def __call__(self, x: Optional[torch.Tensor] = None) -> torch.Tensor:
-        """Calculate the current alpha value based on cosine schedule.
-        
-        Args:
-            x (Optional[torch.Tensor]): Ignored, included for API consistency
-            
-        Returns:
-            torch.Tensor: Scalar tensor with current alpha value
-        """
+    def _schedule(self) -> List[float]:
         if self.max_steps <= 0:
-            return torch.tensor(self.max_alpha if self.reverse else self.min_alpha)
-        
-        # Calculate raw cosine value (ranges from 1 at step 0 to -1 at max_steps)
-        cosine = math.cos(math.pi * self.current_step / self.max_steps)
-        
-        # Convert to alpha range [0, 1]
-        alpha = 0.5 * (1 + cosine)
-        
-        # Scale to [min_alpha, max_alpha]
-        alpha = self.min_alpha + (self.max_alpha - self.min_alpha) * alpha
+            return [self.max_alpha if self.reverse else self.min_alpha]
         
-        # Reverse if needed
-        if self.reverse:
-            alpha = self.max_alpha - alpha + self.min_alpha
-            
-        return torch.tensor(alpha, dtype=torch.float32)
+        values = []
+        for step in range(self.max_steps + 1):
+            # Raw cosine value ranges from 1 at step 0 to -1 at max_steps
+            cosine = math.cos(math.pi * step / self.max_steps)
+            # Convert to alpha range [0, 1], then scale to [min_alpha, max_alpha]
+            alpha = self.min_alpha + (self.max_alpha - self.min_alpha) * 0.5 * (1 + cosine)
+            if self.reverse:
+                alpha = self.max_alpha - alpha + self.min_alpha
+            values.append(alpha)
+        return values
     
     def set_step(self, step: int) -> None:
         """Manually set the current step.
         
         Args:
-            step (int): Step to set
+            step (int): Step to set, clamped to [0, max_steps]
         """
-        self.current_step = min(max(0, step), self.max_steps)
+        super().set_step(min(step, max(self.max_steps, 0)))
+    
+    def extra_repr(self) -> str:
+        return f'max_steps={self.max_steps}, min_alpha={self.min_alpha}, max_alpha={self.max_alpha}, reverse={self.reverse}'
+
+
+def _pool_features(x: torch.Tensor, pooled_dim: Optional[int]) -> torch.Tensor:
+    """Average-pool the last dimension of x down to ``pooled_dim`` features."""
+    if pooled_dim is None or pooled_dim >= x.size(-1):
+        return x
+    leading = x.shape[:-1]
+    pooled = F.adaptive_avg_pool1d(x.reshape(-1, 1, x.size(-1)), pooled_dim)
+    return pooled.reshape(*leading, pooled_dim)
+
+
+def _logits(x: torch.Tensor, temperature: float, pooled_dim: Optional[int]) -> torch.Tensor:
+    z = _pool_features(x, pooled_dim)
+    return z if temperature == 1.0 else z / temperature
+
+
+def _entropy(z: torch.Tensor, chunk_size: int) -> torch.Tensor:
+    """Softmax entropy over the last dimension, in chunks of ``chunk_size`` features.
+
+    H = lse(z) - Σ softmax(z) z, accumulated like an online softmax: a running
+    max m, s = Σ exp(z - m) and t = Σ exp(z - m) z, rescaled whenever m grows.
+    """
+    m = s = t = None
+    for chunk in z.split(chunk_size, dim=-1):
+        chunk_max = chunk.amax(dim=-1)
+        new_m = chunk_max if m is None else torch.maximum(m, chunk_max)
+        weights = (chunk - new_m.unsqueeze(-1)).exp_()
+        chunk_s = weights.sum(dim=-1)
+        chunk_t = torch.einsum('...d,...d->...', weights, chunk)
+        if m is None:
+            s, t = chunk_s, chunk_t
+        else:
+            rescale = (m - new_m).exp_()
+            s = s * rescale + chunk_s
+            t = t * rescale + chunk_t
+        m = new_m
+    return m + s.log() - t / s
 
 
 class EntropyBasedAlpha:
@@ -160,12 +246,25 @@ class EntropyBasedAlpha:
     
     Where entropy is normalized by log(dim) to range [0, 1]
     
+    The entropy is computed from the log-sum-exp of the logits z,
+    H = lse(z) - Σ softmax(z) z, accumulated over chunks of ``chunk_size``
+    features with a running max, so neither ``probs`` nor ``log(probs)`` is
+    built: the temporaries are at most ``chunk_size`` wide per token (autograd
+    still keeps what it needs for backward). Alpha is computed per token: for
+    inputs of shape (..., dim) the result has shape (...), which paGating
+    units broadcast over features.
+    
     Args:
         scale (float, optional): Scaling factor for the entropy. Default: 1.0
         temperature (float, optional): Temperature for softmax. Lower values 
             make the softmax more peaked. Default: 1.0
         min_alpha (float, optional): Minimum alpha value. Default: 0.0
         max_alpha (float, optional): Maximum alpha value. Default: 1.0
+        pooled_dim (Optional[int], optional): If set, average-pool the features
+            down to this many values before computing the entropy, which makes
+            alpha much cheaper than the unit for wide inputs. Default: None
+        chunk_size (int, optional): Features processed at a time when
+            computing the entropy. Default: 1024
     """
     
     def __init__(
@@ -173,38 +272,37 @@ class EntropyBasedAlpha:
         scale: float = 1.0,
         temperature: float = 1.0,
         min_alpha: float = 0.0,
-        max_alpha: float = 1.0
+        max_alpha: float = 1.0,
+        pooled_dim: Optional[int] = None,
+        chunk_size: int = 1024
     ) -> None:
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
         self.scale = scale
         self.temperature = temperature
         self.min_alpha = min_alpha
         self.max_alpha = max_alpha
+        self.pooled_dim = pooled_dim
+        self.chunk_size = chunk_size
     
     def __call__(self, x: torch.Tensor) -> torch.Tensor:
         """Calculate alpha based on the entropy of the input.
         
         Args:
-            x (torch.Tensor): Input tensor
+            x (torch.Tensor): Input tensor of shape (..., dim)
             
         Returns:
-            torch.Tensor: Batch of alpha values corresponding to input entropy
+            torch.Tensor: Per-token alpha values of shape (...)
         """
-        # Apply softmax to get probability distribution
-        probs = F.softmax(x / self.temperature, dim=-1)
-        
-        # Calculate entropy: -sum(p * log(p))
-        # Adding small epsilon to avoid log(0)
-        entropy = -torch.sum(probs * torch.log(probs + 1e-10), dim=-1)
+        z = _logits(x, self.temperature, self.pooled_dim)
+        entropy = _entropy(z, self.chunk_size)
         
         # Normalize by maximum possible entropy (log of dimension)
-        log_dim = math.log(x.size(-1))
-        normalized_entropy = entropy / log_dim
+        normalized_entropy = entropy / math.log(z.size(-1))
         
         # Scale and clip to [min_alpha, max_alpha]
         alpha = self.scale * normalized_entropy
-        alpha = torch.clamp(alpha, min=self.min_alpha, max=self.max_alpha)
-        
-        return alpha
+        return torch.clamp(alpha, min=self.min_alpha, max=self.max_alpha)
 
 
 class ConfidenceBasedAlpha:
@@ -215,11 +313,17 @@ class ConfidenceBasedAlpha:
     
     Formula: α = scale * (1 - max(softmax(x)))
     
+    The maximum probability is exp(max(z) - lse(z)), so no softmax is
+    computed at all. Alpha is computed per token: for inputs of shape
+    (..., dim) the result has shape (...).
+    
     Args:
         scale (float, optional): Scaling factor for the confidence. Default: 1.0
         temperature (float, optional): Temperature for softmax. Default: 1.0
         min_alpha (float, optional): Minimum alpha value. Default: 0.0
         max_alpha (float, optional): Maximum alpha value. Default: 1.0
+        pooled_dim (Optional[int], optional): If set, average-pool the features
+            down to this many values before computing the confidence. Default: None
     """
     
     def __init__(
@@ -227,42 +331,41 @@ class ConfidenceBasedAlpha:
         scale: float = 1.0,
         temperature: float = 1.0,
         min_alpha: float = 0.0,
-        max_alpha: float = 1.0
+        max_alpha: float = 1.0,
+        pooled_dim: Optional[int] = None
     ) -> None:
         self.scale = scale
         self.temperature = temperature
         self.min_alpha = min_alpha
         self.max_alpha = max_alpha
+        self.pooled_dim = pooled_dim
     
     def __call__(self, x: torch.Tensor) -> torch.Tensor:
         """Calculate alpha based on the confidence of predictions.
         
         Args:
-            x (torch.Tensor): Input tensor
+            x (torch.Tensor): Input tensor of shape (..., dim)
             
         Returns:
-            torch.Tensor: Batch of alpha values corresponding to prediction confidence
+            torch.Tensor: Per-token alpha values of shape (...)
         """
-        # Apply softmax to get probability distribution
-        probs = F.softmax(x / self.temperature, dim=-1)
+        z = _logits(x, self.temperature, self.pooled_dim)
         
-        # Get max probability as confidence measure
-        confidence = torch.max(probs, dim=-1)[0]
+        # Max probability as confidence measure
+        confidence = torch.exp(z.amax(dim=-1) - torch.logsumexp(z, dim=-1))
         
-        # Alpha is inversely related to confidence
+        # Alpha is inversely related to confidence, clipped to [min_alpha, max_alpha]
         alpha = self.scale * (1 - confidence)
-        
-        # Clip to [min_alpha, max_alpha]
-        alpha = torch.clamp(alpha, min=self.min_alpha, max=self.max_alpha)
-        
-        return alpha
+        return torch.clamp(alpha, min=self.min_alpha, max=self.max_alpha)
 
 
-class LinearRampScheduler:
+class LinearRampScheduler(StepAlphaScheduler):
     """Scheduler that linearly increases alpha from start to end over warmup steps.
     
     Formula: α(t) = min_alpha + (max_alpha - min_alpha) * min(t / warmup_steps, 1)
     
+    The warmup_steps + 1 values are precomputed (see :class:`StepAlphaScheduler`).
+    
     Args:
         warmup_steps (int): Number of steps for the linear warmup
         min_alpha (float, optional): Starting alpha value. Default: 0.0
@@ -278,46 +381,53 @@ class LinearRampScheduler:
         max_alpha: float = 1.0,
         reverse: bool = False
     ) -> None:
+        super().__init__()
         self.warmup_steps = warmup_steps
         self.min_alpha = min_alpha
         self.max_alpha = max_alpha
         self.reverse = reverse
-        self.current_step = 0
+        self._register_schedule()
     
-    def step(self) -> None:
-        """Increment the current step counter."""
-        self.current_step += 1
-    
-    def __call__(self, x: Optional[torch.Tensor] = None) -> torch.Tensor:
-        """Calculate the current alpha value based on linear schedule.
-        
-        Args:
-            x (Optional[torch.Tensor]): Ignored, included for API consistency
-            
-        Returns:
-            torch.Tensor: Scalar tensor with current alpha value
-        """
+    def _schedule(self) -> List[float]:
         if self.warmup_steps <= 0:
-            return torch.tensor(self.max_alpha if self.reverse else self.min_alpha)
-        
-        # Calculate progress ratio (capped at 1.0)
-        progress = min(self.current_step / self.warmup_steps, 1.0)
+            return [self.max_alpha if self.reverse else self.min_alpha]
         
-        # Calculate alpha based on progress
-        if self.reverse:
-            alpha = self.max_alpha - progress * (self.max_alpha - self.min_alpha)
-        else:
-            alpha = self.min_alpha + progress * (self.max_alpha - self.min_alpha)
-            
-        return torch.tensor(alpha, dtype=torch.float32)
+        values = []
+        for step in range(self.warmup_steps + 1):
+            progress = step / self.warmup_steps
+            if self.reverse:
+                values.append(self.max_alpha - progress * (self.max_alpha - self.min_alpha))
+            else:
+                values.append(self.min_alpha + progress * (self.max_alpha - self.min_alpha))
+        return values
+    
+    def extra_repr(self) -> str:
+        return f'warmup_steps={self.warmup_steps}, min_alpha={self.min_alpha}, max_alpha={self.max_alpha}, reverse={self.reverse}'
+
+
+def step_alpha_schedulers(model: nn.Module, step: Optional[int] = None) -> int:
+    """Advance every step-driven alpha scheduler registered in a model.
     
-    def set_step(self, step: int) -> None:
-        """Manually set the current step.
-        
-        Args:
-            step (int): Step to set
-        """
-        self.current_step = max(0, step)
+    Schedulers passed as ``alpha`` to a paGating unit are registered as its
+    submodules, so they are found by walking ``model.modules()``.
+    
+    Args:
+        model (nn.Module): Model containing paGating units
+        step (Optional[int]): Global step to set; if None, each scheduler is
+            advanced by one step
+            
+    Returns:
+        int: Number of schedulers updated
+    """
+    count = 0
+    for module in model.modules():
+        if isinstance(module, StepAlphaScheduler):
+            if step is None:
+                module.step()
+            else:
+                module.set_step(step)
+            count += 1
+    return count
 
 
 def get_scheduler(name: str, **kwargs) -> Callable:
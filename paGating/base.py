@@ -9,9 +9,21 @@ of the gating mechanism.
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from typing import Union, Callable, Optional, Dict, Any
+from typing import Union, Callable, Optional, Dict, Any, Sequence, Tuple
 
-from .norms import GateNorm
+from torch.utils.checkpoint import checkpoint
+
+from .norms import build_gate_norm
+from .fused_ops import gated_blend, resolve_activation
+
+
+def _is_compiling() -> bool:
+    """Whether the module is being scripted or compiled, where Python-side
+    specialization on tensor values is not possible."""
+    if torch.jit.is_scripting():
+        return True
+    compiler = getattr(torch, 'compiler', None)
+    return compiler is not None and hasattr(compiler, 'is_compiling') and compiler.is_compiling()
 
 
 class paGatingBase(nn.Module):
@@ -35,12 +47,33 @@ class paGatingBase(nn.Module):
             - float: Fixed value between 0 and 1
             - "learnable": Creates a learnable parameter initialized to 0.5
             - Callable: Function that computes alpha dynamically (e.g., based on input)
-        use_gate_norm (bool): Whether to apply GateNorm to the gating pathway
+        use_gate_norm (Union[bool, str]): Normalization of the gating pathway:
+            False for none, True or "layer" for GateNorm, "rms" for GateRMSNorm
         norm_eps (float): Epsilon for numerical stability in normalization
+        fused (bool): If True, store the value and gate projections as a single
+            ``[2 * output_dim, input_dim]`` linear layer (``fused_proj``) so both
+            paths are computed with one GEMM and split without copying.
+            Checkpoints saved with separate ``value_proj``/``gate_proj`` weights
+            load transparently. Default: False
+        memory_efficient (bool): If True, compute the gating epilogue with a custom
+            autograd function that saves only the value and pre-activation gate
+            for backward and recomputes the activation there. Only used when the
+            activation is one of ``fused_ops.SUPPORTED_ACTIVATIONS``. Default: False
+        recompute (bool): If True, keep only the input during training and recompute
+            both projections, the activation and GateNorm in backward
+            (activation checkpointing at unit granularity). Trades one extra
+            unit forward for not storing the projection outputs. Toggle it
+            model-wide with :func:`set_recompute`. Default: False
             
     Note:
         When α=0, the unit performs a simple linear projection: output = A(x)
         When α=1, the unit performs full gating: output = A(x) * activation_fn(B(x))
+        
+        With a fixed α these regimes are detected once and dispatched to
+        specialized paths (the gate path is skipped entirely for α=0). The
+        classification is cached against the ``alpha_fixed`` buffer and is
+        invalidated when the buffer is mutated in place or replaced. Set
+        ``specialize_alpha = False`` to always run the generic blend.
     """
     
     def __init__(
@@ -49,26 +82,42 @@ class paGatingBase(nn.Module):
         output_dim: int,
         activation_fn: Callable,
         alpha: Union[float, str, Callable] = 0.5,
-        use_gate_norm: bool = False,
+        use_gate_norm: Union[bool, str] = False,
         norm_eps: float = 1e-5,
+        fused: bool = False,
+        memory_efficient: bool = False,
+        recompute: bool = False,
     ) -> None:
         super().__init__()
         
+        self.input_dim = input_dim
+        self.output_dim = output_dim
+        self.fused = fused
+        
         # Linear projections for value and gate paths
-        self.value_proj = nn.Linear(input_dim, output_dim)
-        self.gate_proj = nn.Linear(input_dim, output_dim)
+        if fused:
+            # Rows [0, output_dim) hold the value path, [output_dim, 2 * output_dim) the gate path
+            self.fused_proj = nn.Linear(input_dim, 2 * output_dim)
+            self.value_proj = None
+            self.gate_proj = None
+        else:
+            self.fused_proj = None
+            self.value_proj = nn.Linear(input_dim, output_dim)
+            self.gate_proj = nn.Linear(input_dim, output_dim)
         
-        # Store activation function
+        # Store activation function and the matching fused epilogue (if any)
         self.activation_fn = activation_fn
+        self.memory_efficient = memory_efficient
+        self.recompute = recompute
+        self.epilogue_activation = resolve_activation(activation_fn)
         
         # Optional gate normalization
         self.use_gate_norm = use_gate_norm
-        if use_gate_norm:
-            self.gate_norm = GateNorm(output_dim, eps=norm_eps)
-        else:
-            self.gate_norm = None
+        self.gate_norm = build_gate_norm(use_gate_norm, output_dim, eps=norm_eps)
         
         # Handle alpha parameter based on type
+        self.specialize_alpha = True
+        self._alpha_regime_cache = None
         self.alpha_fn = None
         self.alpha_param = None
         
@@ -107,6 +156,101 @@ class paGatingBase(nn.Module):
         else:
             return self.alpha_fixed
     
+    def _fixed_alpha_regime(self) -> Optional[Tuple[str, float, float]]:
+        """Classify a fixed alpha into the 'zero', 'one' or 'fixed' regime.
+        
+        The result is cached together with the buffer object and its version
+        counter, so in-place updates (``alpha_fixed.fill_``, ``load_state_dict``)
+        and buffer replacement (``.to()``, reassignment) trigger a re-check.
+        
+        Returns:
+            Optional[Tuple[str, float, float]]: (regime, α, 1 - α), or None when
+            α is learnable, callable, or specialization is disabled
+        """
+        alpha_fixed = self._buffers.get('alpha_fixed')
+        if alpha_fixed is None or not self.specialize_alpha or _is_compiling():
+            return None
+        
+        cache = self._alpha_regime_cache
+        if cache is None or cache[0] is not alpha_fixed or cache[1] != alpha_fixed._version:
+            alpha = float(alpha_fixed)
+            if alpha == 0.0:
+                regime = 'zero'
+            elif alpha == 1.0:
+                regime = 'one'
+            else:
+                regime = 'fixed'
+            cache = (alpha_fixed, alpha_fixed._version, regime, alpha, 1.0 - alpha)
+            self._alpha_regime_cache = cache
+        
+        return cache[2:]
+    
+    def project_value(self, x: torch.Tensor) -> torch.Tensor:
+        """Compute only the value path A(x), skipping the gate projection.
+        
+        Args:
+            x (torch.Tensor): Input tensor of shape (..., input_dim)
+            
+        Returns:
+            torch.Tensor: Value path of shape (..., output_dim)
+        """
+        if self.fused_proj is not None:
+            bias = self.fused_proj.bias
+            return F.linear(
+                x,
+                self.fused_proj.weight[:self.output_dim],
+                bias[:self.output_dim] if bias is not None else None,
+            )
+        return self.value_proj(x)
+    
+    def project(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Compute the value path A(x) and the pre-activation gate path B(x).
+        
+        With ``fused=True`` both paths come from a single GEMM and are returned
+        as views into the same output tensor.
+        
+        Args:
+            x (torch.Tensor): Input tensor of shape (..., input_dim)
+            
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor]: (value, gate), each of shape (..., output_dim)
+        """
+        if self.fused_proj is not None:
+            value, gate = self.fused_proj(x).chunk(2, dim=-1)
+            return value, gate
+        return self.value_proj(x), self.gate_proj(x)
+    
+    def _load_from_state_dict(
+        self, state_dict, prefix, local_metadata, strict,
+        missing_keys, unexpected_keys, error_msgs
+    ):
+        """Translate between the split and fused projection layouts on load."""
+        fused_keys = [prefix + 'fused_proj.' + name for name in ('weight', 'bias')]
+        split_keys = [
+            (prefix + 'value_proj.' + name, prefix + 'gate_proj.' + name)
+            for name in ('weight', 'bias')
+        ]
+        
+        if self.fused_proj is not None:
+            # Legacy checkpoint with separate value/gate projections
+            for fused_key, (value_key, gate_key) in zip(fused_keys, split_keys):
+                if fused_key not in state_dict and value_key in state_dict and gate_key in state_dict:
+                    state_dict[fused_key] = torch.cat(
+                        [state_dict.pop(value_key), state_dict.pop(gate_key)], dim=0
+                    )
+        else:
+            # Fused checkpoint loaded into a module with separate projections
+            for fused_key, (value_key, gate_key) in zip(fused_keys, split_keys):
+                if fused_key in state_dict and value_key not in state_dict:
+                    value, gate = state_dict.pop(fused_key).chunk(2, dim=0)
+                    state_dict[value_key] = value
+                    state_dict[gate_key] = gate
+        
+        super()._load_from_state_dict(
+            state_dict, prefix, local_metadata, strict,
+            missing_keys, unexpected_keys, error_msgs
+        )
+    
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         """Forward pass for paGating units.
         
@@ -118,23 +262,78 @@ class paGatingBase(nn.Module):
         Returns:
             torch.Tensor: Output tensor of shape (batch_size, output_dim)
         """
-        # Compute value path A(x)
-        value = self.value_proj(x)
+        if self.recompute and self.training and torch.is_grad_enabled():
+            # Only x is saved; the unit's intermediates are rebuilt in backward
+            return checkpoint(self._forward, x, use_reentrant=False)
+        return self._forward(x)
+    
+    def _forward(self, x: torch.Tensor) -> torch.Tensor:
+        """Unit computation without the recompute wrapper; subclasses override this."""
+        # α=0: plain linear layer, the gate path is skipped entirely
+        regime = self._fixed_alpha_regime()
+        if regime is not None and regime[0] == 'zero':
+            return self.project_value(x)
+        
+        # Compute value path A(x) and gate path B(x)
+        value, gate = self.project(x)
+        
+        return self._gate_and_blend(value, gate, x)
+    
+    def _gate_and_blend(
+        self,
+        value: torch.Tensor,
+        gate: torch.Tensor,
+        x: torch.Tensor,
+        normalize: bool = True,
+    ) -> torch.Tensor:
+        """Activate the gate path and blend it with the value path.
+        
+        Args:
+            value (torch.Tensor): Value path A(x)
+            gate (torch.Tensor): Pre-activation gate path B(x)
+            x (torch.Tensor): Unit input, used for callable alpha
+            normalize (bool): Whether to apply GateNorm (if enabled)
+            
+        Returns:
+            torch.Tensor: value * (α * activation_fn(gate) + (1 - α))
+        """
+        use_gate_norm = normalize and self.use_gate_norm and self.gate_norm is not None
+        
+        regime = self._fixed_alpha_regime()
+        if regime is not None:
+            # Fixed alpha: α and 1 - α were precomputed as Python floats
+            regime_name, alpha, one_minus_alpha = regime
+            if regime_name == 'zero':
+                return value
+        else:
+            # Get alpha value (learnable or computed)
+            alpha = self.get_alpha(x)
+            
+            # Ensure alpha has the right shape for broadcasting
+            if alpha.dim() == 0:
+                alpha = alpha.view(1, 1)
+            elif alpha.dim() == x.dim() - 1:
+                # Per-token alpha of shape x.shape[:-1] broadcasts over features
+                alpha = alpha.unsqueeze(-1)
+        
+        if self.memory_efficient and self.epilogue_activation is not None:
+            if not use_gate_norm:
+                return gated_blend(value, gate, alpha, self.epilogue_activation)
+            # GateNorm sits between activation and blend, so only the blend is fused
+            gate_activated = self.gate_norm(self.activation_fn(gate))
+            return gated_blend(value, gate_activated, alpha, 'identity')
         
-        # Compute gate path B(x)
-        gate = self.gate_proj(x)
         gate_activated = self.activation_fn(gate)
         
         # Apply gate normalization if enabled
-        if self.use_gate_norm and self.gate_norm is not None:
+        if use_gate_norm:
             gate_activated = self.gate_norm(gate_activated)
         
-        # Get alpha value (could be static, learnable, or computed)
-        alpha = self.get_alpha(x)
-        
-        # Ensure alpha has the right shape for broadcasting
-        if alpha.dim() == 0:
-            alpha = alpha.view(1, 1)
+        if regime is not None:
+            if regime_name == 'one':
+                # Pure GLU-style gating
+                return value * gate_activated
+            return value * gate_activated.mul(alpha).add_(one_minus_alpha)
         
         # Compute partially gated output
         # output = value * (α * gate_activated + (1 - α))
@@ -142,6 +341,48 @@ class paGatingBase(nn.Module):
         
         return output
     
+    def _activated_paths(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Compute the value path and the activated (and normalized) gate path.
+        
+        Args:
+            x (torch.Tensor): Input tensor of shape (..., input_dim)
+            
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor]: Value path and activated gate path
+        """
+        value, gate = self.project(x)
+        gate_activated = self.activation_fn(gate)
+        if self.use_gate_norm and self.gate_norm is not None:
+            gate_activated = self.gate_norm(gate_activated)
+        return value, gate_activated
+    
+    def forward_alpha_grid(
+        self, x: torch.Tensor, alphas: Union[Sequence[float], torch.Tensor]
+    ) -> torch.Tensor:
+        """Evaluate the unit for several α values with a single forward.
+        
+        The output is affine in α: value * (1 + α * (g - 1)), so both
+        projections, the activation and GateNorm are computed once and only
+        the blend is broadcast over the α vector. The unit's own α is ignored.
+        
+        Args:
+            x (torch.Tensor): Input tensor of shape (..., input_dim)
+            alphas (Union[Sequence[float], torch.Tensor]): α values, 1-D
+            
+        Returns:
+            torch.Tensor: Outputs of shape (len(alphas), ..., output_dim); slice
+            ``i`` equals the output of this unit with α = alphas[i]
+        """
+        value, gate_activated = self._activated_paths(x)
+        alphas = torch.as_tensor(alphas, dtype=value.dtype, device=value.device)
+        if alphas.dim() != 1:
+            raise ValueError(f"alphas must be 1-D, got shape {tuple(alphas.shape)}")
+        
+        # output(α) = value + α * value * (g - 1)
+        delta = value * (gate_activated - 1.0)
+        alphas = alphas.view(-1, *([1] * value.dim()))
+        return torch.addcmul(value.unsqueeze(0), alphas, delta.unsqueeze(0))
+    
     def get_config(self) -> Dict[str, Any]:
         """Get configuration of the module for serialization.
         
@@ -149,9 +390,12 @@ class paGatingBase(nn.Module):
             Dict[str, Any]: Configuration dictionary
         """
         config = {
-            "input_dim": self.value_proj.in_features,
-            "output_dim": self.value_proj.out_features,
+            "input_dim": self.input_dim,
+            "output_dim": self.output_dim,
             "use_gate_norm": self.use_gate_norm,
+            "fused": self.fused,
+            "memory_efficient": self.memory_efficient,
+            "recompute": self.recompute,
         }
         
         # Add alpha configuration
@@ -182,5 +426,26 @@ class paGatingBase(nn.Module):
             output_dim=config["output_dim"],
             alpha=config["alpha"],
             use_gate_norm=config["use_gate_norm"],
+            fused=config["fused"],
+            memory_efficient=config["memory_efficient"],
+            recompute=config["recompute"],
             # activation_fn is handled by the subclass constructor
-        )
\ No newline at end of file
+        )
+
+
+def set_recompute(model: nn.Module, enabled: bool = True) -> int:
+    """Enable or disable unit-level recompute for every paGating unit in a model.
+    
+    Args:
+        model (nn.Module): Model (or single unit) to update in place
+        enabled (bool): Whether units recompute their intermediates in backward
+        
+    Returns:
+        int: Number of paGating units updated
+    """
+    count = 0
+    for module in model.modules():
+        if isinstance(module, paGatingBase):
+            module.recompute = enabled
+            count += 1
+    return count
@@ -20,13 +20,23 @@ class paGating2D(nn.Module):
     This adapter applies a paGating unit to each spatial location of a 
     convolutional feature map, preserving the spatial dimensions.
     
+    The unit runs directly on an NHWC view of the feature map, so no reshape
+    is needed: for ``torch.channels_last`` inputs the view is free, and the
+    output is returned as a channels-last NCHW view of the unit's result
+    without copying. Downstream convolutions and pooling keep that memory
+    format, so a model stays channels-last end to end after the first adapter.
+    
     Args:
         unit_class: The paGating unit class to instantiate
         in_channels: Number of input channels
         out_channels: Number of output channels
         alpha: Alpha value for the paGating unit
-        use_gate_norm: Whether to use gate normalization
+        use_gate_norm: Gate normalization (True or "layer" for GateNorm, "rms" for GateRMSNorm)
         norm_eps: Epsilon for gate normalization
+        channels_last: If True, convert inputs that are not already channels-last
+            once on entry, so the unit always reads a contiguous NHWC view
+        recompute: If True, the unit keeps only its input during training and
+            recomputes projections, activation and GateNorm in backward
         **kwargs: Additional keyword arguments for the paGating unit
     """
     
@@ -36,8 +46,10 @@ class paGating2D(nn.Module):
         in_channels: int,
         out_channels: int,
         alpha: Union[float, str, Callable, torch.Tensor] = 0.5,
-        use_gate_norm: bool = False,
+        use_gate_norm: Union[bool, str] = False,
         norm_eps: float = 1e-5,
+        channels_last: bool = False,
+        recompute: bool = False,
         **kwargs
     ):
         super().__init__()
@@ -53,11 +65,13 @@ class paGating2D(nn.Module):
             alpha=alpha,
             use_gate_norm=use_gate_norm,
             norm_eps=norm_eps,
+            recompute=recompute,
             **kwargs
         )
         
         self.in_channels = in_channels
         self.out_channels = out_channels
+        self.channels_last = channels_last
     
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         """
@@ -69,19 +83,17 @@ class paGating2D(nn.Module):
         Returns:
             Output tensor of shape (batch, out_channels, height, width)
         """
-        # Get input dimensions
-        batch_size, channels, height, width = x.shape
-        
-        # Reshape to (batch * height * width, channels)
-        x_flat = x.permute(0, 2, 3, 1).reshape(-1, channels)
+        if self.channels_last and not x.is_contiguous(memory_format=torch.channels_last):
+            x = x.contiguous(memory_format=torch.channels_last)
         
-        # Apply paGating unit
-        out_flat = self.pa_unit(x_flat)
+        # (batch, height, width, channels) view; contiguous for channels-last input
+        x_nhwc = x.permute(0, 2, 3, 1)
         
-        # Reshape back to (batch, out_channels, height, width)
-        out = out_flat.reshape(batch_size, height, width, self.out_channels).permute(0, 3, 1, 2)
+        # Apply paGating unit over the channel dimension
+        out_nhwc = self.pa_unit(x_nhwc)
         
-        return out
+        # (batch, out_channels, height, width) view in channels-last memory format
+        return out_nhwc.permute(0, 3, 1, 2)
     
     def clone(self) -> 'paGating2D':
         """Create a new instance with the same configuration."""
@@ -96,7 +108,11 @@ class paGating2D(nn.Module):
             out_channels=self.out_channels,
             alpha=alpha,
             use_gate_norm=self.pa_unit.use_gate_norm,
-            norm_eps=getattr(self.pa_unit, 'norm_eps', 1e-5)
+            norm_eps=getattr(self.pa_unit, 'norm_eps', 1e-5),
+            channels_last=self.channels_last,
+            fused=getattr(self.pa_unit, 'fused', False),
+            memory_efficient=getattr(self.pa_unit, 'memory_efficient', False),
+            recompute=getattr(self.pa_unit, 'recompute', False)
         )
 
 
@@ -106,8 +122,10 @@ def create_paGating2D(
     in_channels: int,
     out_channels: int,
     alpha: Union[float, str, Callable] = 0.5,
-    use_gate_norm: bool = False,
-    norm_eps: float = 1e-5
+    use_gate_norm: Union[bool, str] = False,
+    norm_eps: float = 1e-5,
+    channels_last: bool = False,
+    **kwargs
 ) -> paGating2D:
     """
     Create a paGating2D adapter for a specific unit.
@@ -117,8 +135,10 @@ def create_paGating2D(
         in_channels: Number of input channels
         out_channels: Number of output channels
         alpha: Alpha value for the paGating unit
-        use_gate_norm: Whether to use gate normalization
+        use_gate_norm: Gate normalization (True or "layer" for GateNorm, "rms" for GateRMSNorm)
         norm_eps: Epsilon for gate normalization
+        channels_last: Whether the adapter converts inputs to channels-last
+        **kwargs: Additional keyword arguments for the paGating unit
         
     Returns:
         paGating2D adapter for the specified unit
@@ -136,5 +156,7 @@ def create_paGating2D(
         out_channels=out_channels,
         alpha=alpha,
         use_gate_norm=use_gate_norm,
-        norm_eps=norm_eps
+        norm_eps=norm_eps,
+        channels_last=channels_last,
+        **kwargs
     ) 
\ No newline at end of file
@@ -0,0 +1,343 @@
+"""
+Vectorized training of paGating model variants.
+
+An α sweep trains many small models that share an architecture and differ
+only in α (or their initialization). Run one by one, each of them
+under-utilizes the hardware. ``AlphaEnsemble`` instead stacks the parameters
+and buffers of N structurally identical models with
+``torch.func.stack_module_state`` and evaluates all of them with
+``vmap(functional_call)``: a single batched forward and backward per step over
+a shared batch. ``EnsembleTrainer`` adds the optimization loop, per-member
+metrics and per-member checkpoints.
+
+Members remain fully independent: the summed loss gives each member exactly
+its own gradient, and element-wise optimizers (SGD, Adam, AdamW) update the
+stacked tensors exactly like N separate optimizers would. Anything that
+couples elements across the stacked dimension, such as global-norm gradient
+clipping, does not have this property.
+"""
+
+import copy
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.func import functional_call, stack_module_state, vmap
+
+from .base import paGatingBase
+
+
+# paGatingBase attributes that are incompatible with vmap, with their
+# vmap-safe values. The α regime cache reads the (batched) α buffer as a
+# Python float, and the fused autograd Function and checkpoint have no
+# batching rule.
+_VMAP_SAFE_FLAGS = {
+    'specialize_alpha': False,
+    'memory_efficient': False,
+    'recompute': False,
+}
+
+
+def _set_unit_flags(model: nn.Module, flags: Dict[str, Dict[str, bool]]) -> None:
+    for name, module in model.named_modules():
+        if name in flags:
+            for attr, value in flags[name].items():
+                setattr(module, attr, value)
+
+
+def init_learnable_alpha(model: nn.Module, alpha: float, eps: float = 1e-3) -> int:
+    """Start every learnable α of a model at ``alpha``.
+
+    Learnable α is ``sigmoid(alpha_param)``, so the parameters are set to
+    logit(α); α is clipped to ``[eps, 1 - eps]`` to keep 0 and 1 finite. This
+    makes learnable-α ensemble members differ in their starting α rather than
+    only in their random initialization.
+
+    Args:
+        model (nn.Module): Model whose learnable α parameters are set in place
+        alpha (float): Initial α in [0, 1]
+        eps (float): Clipping margin for α. Default: 1e-3
+
+    Returns:
+        int: Number of α parameters that were set
+    """
+    if not 0 <= alpha <= 1:
+        raise ValueError(f"Alpha must be between 0 and 1, got {alpha}")
+    clipped = min(max(alpha, eps), 1 - eps)
+    logit = torch.logit(torch.tensor(clipped)).item()
+    count = 0
+    with torch.no_grad():
+        for module in model.modules():
+            param = getattr(module, 'alpha_param', None)
+            if isinstance(param, nn.Parameter):
+                param.fill_(logit)
+                count += 1
+    return count
+
+
+class AlphaEnsemble:
+    """N structurally identical models evaluated as one vectorized model.
+
+    The members' parameters and buffers are stacked along a new leading
+    dimension; calling the ensemble on a batch returns the outputs of every
+    member stacked the same way. The input models are not modified.
+
+    Args:
+        models (Sequence[nn.Module]): Members; they must have identical
+            parameter and buffer names and shapes (typically the same
+            architecture built with different α values)
+        names (Optional[Sequence[str]]): Member names used for metrics and
+            checkpoint files. Default: "member_0", "member_1", ...
+        randomness (str): vmap randomness mode. "different" (default) draws
+            independent dropout masks per member, "same" shares them
+    """
+
+    def __init__(
+        self,
+        models: Sequence[nn.Module],
+        names: Optional[Sequence[str]] = None,
+        randomness: str = "different",
+    ) -> None:
+        models = list(models)
+        if not models:
+            raise ValueError("AlphaEnsemble needs at least one model")
+        names = [f"member_{i}" for i in range(len(models))] if names is None else list(names)
+        if len(names) != len(models):
+            raise ValueError(f"Got {len(names)} names for {len(models)} models")
+
+        reference = self._signature(models[0])
+        for index, model in enumerate(models[1:], start=1):
+            if self._signature(model) != reference:
+                raise ValueError(
+                    f"Model {index} does not match the parameters and buffers of model 0; "
+                    "ensemble members must share an architecture"
+                )
+
+        # Remember the unit flags so exported members get them back
+        self._unit_flags = {
+            name: {attr: getattr(module, attr) for attr in _VMAP_SAFE_FLAGS}
+            for name, module in models[0].named_modules()
+            if isinstance(module, paGatingBase)
+        }
+
+        # Stateless template on the meta device; the stacked tensors are bound
+        # to it for every call
+        self._template = copy.deepcopy(models[0]).to('meta')
+        _set_unit_flags(self._template, {name: _VMAP_SAFE_FLAGS for name in self._unit_flags})
+
+        self.params, self.buffers = stack_module_state(models)
+        self.names = names
+        self.randomness = randomness
+        self.training = models[0].training
+        self._template.train(self.training)
+
+    @staticmethod
+    def _signature(model: nn.Module) -> List[Tuple[str, torch.Size, torch.dtype]]:
+        tensors = list(model.named_parameters()) + list(model.named_buffers())
+        return [(name, tensor.shape, tensor.dtype) for name, tensor in tensors]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _member_forward(self, params: Dict[str, torch.Tensor], buffers: Dict[str, torch.Tensor],
+                        x: torch.Tensor) -> torch.Tensor:
+        return functional_call(self._template, (params, buffers), (x,))
+
+    def __call__(self, x: torch.Tensor) -> torch.Tensor:
+        """Run every member on the same input.
+
+        Args:
+            x (torch.Tensor): Input batch, shared by all members
+
+        Returns:
+            torch.Tensor: Outputs of shape (num_members, *member_output_shape)
+        """
+        return vmap(self._member_forward, in_dims=(0, 0, None), randomness=self.randomness)(
+            self.params, self.buffers, x
+        )
+
+    def parameters(self) -> List[torch.Tensor]:
+        """Stacked trainable tensors, to be passed to an optimizer."""
+        return [param for param in self.params.values() if param.requires_grad]
+
+    def train(self, mode: bool = True) -> "AlphaEnsemble":
+        self.training = mode
+        self._template.train(mode)
+        return self
+
+    def eval(self) -> "AlphaEnsemble":
+        return self.train(False)
+
+    def to(self, device=None, dtype=None) -> "AlphaEnsemble":
+        """Move the stacked tensors. Create optimizers only after moving."""
+        def move(tensor: torch.Tensor) -> torch.Tensor:
+            moved_dtype = dtype if dtype is not None and tensor.is_floating_point() else None
+            return tensor.detach().to(device=device, dtype=moved_dtype)
+
+        self.params = {
+            name: move(param).requires_grad_(param.requires_grad)
+            for name, param in self.params.items()
+        }
+        self.buffers = {name: move(buffer) for name, buffer in self.buffers.items()}
+        return self
+
+    @torch.no_grad()
+    def member(self, index: int) -> nn.Module:
+        """Materialize one member as a regular, independent model.
+
+        Args:
+            index (int): Member index
+
+        Returns:
+            nn.Module: Copy of the member architecture holding its current
+            parameters and buffers, with the original unit flags restored
+        """
+        if not 0 <= index < len(self):
+            raise ValueError(f"Member index {index} out of range for {len(self)} members")
+        device = next(iter(self.params.values())).device
+        model = copy.deepcopy(self._template).to_empty(device=device)
+        for name, tensor in list(model.named_parameters()) + list(model.named_buffers()):
+            source = self.params[name] if name in self.params else self.buffers[name]
+            tensor.copy_(source[index])
+        _set_unit_flags(model, self._unit_flags)
+        return model.train(self.training)
+
+    def members(self) -> List[nn.Module]:
+        """Materialize every member (see ``member``)."""
+        return [self.member(index) for index in range(len(self))]
+
+    def save_checkpoints(self, directory: str, metrics: Optional[Sequence[Dict]] = None) -> List[str]:
+        """Save one checkpoint per member.
+
+        Each file ``<directory>/<name>.pt`` holds the member's ``state_dict``,
+        its name and, if given, its entry of ``metrics``.
+
+        Args:
+            directory (str): Output directory, created if needed
+            metrics (Optional[Sequence[Dict]]): Per-member metrics, in member order
+
+        Returns:
+            List[str]: Paths of the written checkpoints
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for index, name in enumerate(self.names):
+            path = os.path.join(directory, f"{name}.pt")
+            torch.save({
+                "name": name,
+                "state_dict": self.member(index).state_dict(),
+                "metrics": metrics[index] if metrics is not None else None,
+            }, path)
+            paths.append(path)
+        return paths
+
+
+class EnsembleTrainer:
+    """Train the members of an ``AlphaEnsemble`` in lock step on one data stream.
+
+    Args:
+        ensemble (AlphaEnsemble): Ensemble to train (move it to its device first)
+        loss_fn (Callable): Per-member loss ``loss_fn(outputs, targets)`` returning
+            a scalar. Default: cross-entropy
+        optimizer_cls (Type[torch.optim.Optimizer]): Optimizer class applied to the
+            stacked tensors; use an element-wise one to keep members independent.
+            Default: AdamW
+        **optimizer_kwargs: Passed to ``optimizer_cls`` (e.g. lr, weight_decay)
+    """
+
+    def __init__(
+        self,
+        ensemble: AlphaEnsemble,
+        loss_fn: Callable[[torch.Tensor, torch.Tensor], torch.Tensor] = F.cross_entropy,
+        optimizer_cls: Type[torch.optim.Optimizer] = torch.optim.AdamW,
+        **optimizer_kwargs,
+    ) -> None:
+        self.ensemble = ensemble
+        self.loss_fn = loss_fn
+        self.optimizer = optimizer_cls(ensemble.parameters(), **optimizer_kwargs)
+        self.device = next(iter(ensemble.params.values())).device
+
+    def _metrics(self, outputs: torch.Tensor, targets: torch.Tensor) -> Dict[str, torch.Tensor]:
+        """Per-member loss (and accuracy for class targets), each of shape (num_members,)."""
+        metrics = {"loss": vmap(self.loss_fn, in_dims=(0, None))(outputs, targets)}
+        if not targets.is_floating_point() and outputs.dim() == targets.dim() + 2:
+            metrics["accuracy"] = (outputs.argmax(dim=-1) == targets).float().flatten(1).mean(dim=1)
+        return metrics
+
+    def train_step(self, inputs: torch.Tensor, targets: torch.Tensor) -> Dict[str, torch.Tensor]:
+        """One optimizer step of every member on the same batch.
+
+        Returns:
+            Dict[str, torch.Tensor]: Detached per-member metrics of shape (num_members,)
+        """
+        self.ensemble.train()
+        inputs, targets = inputs.to(self.device), targets.to(self.device)
+        metrics = self._metrics(self.ensemble(inputs), targets)
+
+        self.optimizer.zero_grad(set_to_none=True)
+        # Member losses are independent, so the sum yields each member's own gradient
+        metrics["loss"].sum().backward()
+        self.optimizer.step()
+        return {name: value.detach() for name, value in metrics.items()}
+
+    @torch.no_grad()
+    def evaluate(self, loader: Iterable) -> Dict[str, List[float]]:
+        """Sample-weighted per-member metrics over a data loader."""
+        self.ensemble.eval()
+        totals: Dict[str, torch.Tensor] = {}
+        count = 0
+        for inputs, targets in loader:
+            inputs, targets = inputs.to(self.device), targets.to(self.device)
+            batch_metrics = self._metrics(self.ensemble(inputs), targets)
+            for name, value in batch_metrics.items():
+                totals[name] = totals.get(name, 0) + value * targets.shape[0]
+            count += targets.shape[0]
+        return {name: (total / max(count, 1)).tolist() for name, total in totals.items()}
+
+    def train_epoch(self, loader: Iterable) -> Dict[str, List[float]]:
+        """One pass over ``loader``; returns sample-weighted per-member training metrics."""
+        totals: Dict[str, torch.Tensor] = {}
+        count = 0
+        for inputs, targets in loader:
+            batch_metrics = self.train_step(inputs, targets)
+            for name, value in batch_metrics.items():
+                totals[name] = totals.get(name, 0) + value * targets.shape[0]
+            count += targets.shape[0]
+        return {name: (total / max(count, 1)).tolist() for name, total in totals.items()}
+
+    def fit(
+        self,
+        train_loader: Iterable,
+        epochs: int,
+        val_loader: Optional[Iterable] = None,
+        checkpoint_dir: Optional[str] = None,
+    ) -> List[Dict]:
+        """Train all members for ``epochs`` epochs.
+
+        Args:
+            train_loader (Iterable): Yields (inputs, targets) batches
+            epochs (int): Number of epochs
+            val_loader (Optional[Iterable]): Evaluated after every epoch
+            checkpoint_dir (Optional[str]): If given, per-member checkpoints with
+                their final metrics are written here at the end
+
+        Returns:
+            List[Dict]: Final metrics per member (name plus "train_<metric>",
+            "val_<metric>" values and their per-epoch "history")
+        """
+        results = [{"name": name, "history": []} for name in self.ensemble.names]
+        for epoch in range(epochs):
+            epoch_metrics = {f"train_{k}": v for k, v in self.train_epoch(train_loader).items()}
+            if val_loader is not None:
+                epoch_metrics.update({f"val_{k}": v for k, v in self.evaluate(val_loader).items()})
+
+            for index, result in enumerate(results):
+                member_metrics = {name: values[index] for name, values in epoch_metrics.items()}
+                result.update(member_metrics)
+                result["history"].append({"epoch": epoch, **member_metrics})
+
+        if checkpoint_dir is not None:
+            self.ensemble.save_checkpoints(checkpoint_dir, results)
+        return results
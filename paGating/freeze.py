@@ -0,0 +1,266 @@
+"""
+Inference freezing for paGating models.
+
+This module provides a deployment transform that folds every constant in a
+trained paGating model into its weights:
+
+1. Fixed and learnable α are evaluated once (``sigmoid(alpha_param)`` for
+   learnable units) and baked into the frozen unit.
+2. GateNorm's (or GateRMSNorm's) affine parameters and α are folded into a single
+   per-feature scale and shift applied to the normalized gate.
+3. The affine part of a ``PrePostNormWrapper`` pre-norm is folded into the
+   downstream projections, which is exact because both are affine maps.
+4. Units whose α is effectively 0 are reduced to a plain ``nn.Linear``.
+
+The resulting graph is smaller and simpler, which also makes ONNX export
+cheaper.
+"""
+
+import copy
+from typing import Callable, Optional
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from .base import paGatingBase
+from .norms import GateRMSNorm, PrePostNormWrapper, rms_norm
+from .paGTU import paGTU
+
+
+class FrozenPaGating(nn.Module):
+    """Inference-only paGating unit with all α-dependent constants folded.
+
+    Computes: output = v(A(x)) * [gate_scale * norm(activation_fn(B(x))) + gate_shift]
+    where v is the value activation (identity, or tanh for paGTU) and norm is
+    an optional non-affine normalization. With ``gate_scale=None`` the unit
+    performs pure gating: output = v(A(x)) * norm(activation_fn(B(x))).
+
+    Args:
+        proj (nn.Linear): Fused projection with value rows first, then gate rows
+        activation_fn (Callable): Activation for the gating path
+        gate_scale (Optional[torch.Tensor]): Scalar or per-feature scale
+        gate_shift (Optional[torch.Tensor]): Scalar or per-feature shift
+        norm_eps (Optional[float]): Epsilon of the gate normalization, None to disable it
+        norm_type (str): "layer" (mean-centered) or "rms" gate normalization
+        value_activation (Optional[Callable]): Activation applied to the value path
+    """
+
+    def __init__(
+        self,
+        proj: nn.Linear,
+        activation_fn: Callable,
+        gate_scale: Optional[torch.Tensor] = None,
+        gate_shift: Optional[torch.Tensor] = None,
+        norm_eps: Optional[float] = None,
+        norm_type: str = "layer",
+        value_activation: Optional[Callable] = None,
+    ) -> None:
+        super().__init__()
+        self.proj = proj
+        self.output_dim = proj.out_features // 2
+        self.activation_fn = activation_fn
+        self.value_activation = value_activation
+        self.norm_eps = norm_eps
+        self.norm_type = norm_type
+
+        if gate_scale is None:
+            self.register_buffer('gate_scale', None)
+            self.register_buffer('gate_shift', None)
+        else:
+            self.register_buffer('gate_scale', gate_scale.detach().clone())
+            self.register_buffer('gate_shift', gate_shift.detach().clone())
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """Forward pass of the frozen unit.
+
+        Args:
+            x (torch.Tensor): Input tensor of shape (..., input_dim)
+
+        Returns:
+            torch.Tensor: Output tensor of shape (..., output_dim)
+        """
+        value, gate = self.proj(x).chunk(2, dim=-1)
+
+        if self.value_activation is not None:
+            value = self.value_activation(value)
+
+        gate = self.activation_fn(gate)
+
+        if self.norm_eps is not None:
+            if self.norm_type == "rms":
+                gate = rms_norm(gate, (self.output_dim,), eps=self.norm_eps)
+            else:
+                gate = F.layer_norm(gate, (self.output_dim,), eps=self.norm_eps)
+
+        if self.gate_scale is None:
+            return value * gate
+
+        return value * torch.addcmul(self.gate_shift, gate, self.gate_scale)
+
+    def extra_repr(self) -> str:
+        s = f'in_features={self.proj.in_features}, out_features={self.output_dim}'
+        if self.norm_eps is not None:
+            s += f', norm_type={self.norm_type}, norm_eps={self.norm_eps}'
+        if self.gate_scale is None:
+            s += ', full_gating=True'
+        return s
+
+
+def _fold_pre_norm(wrapper: PrePostNormWrapper) -> None:
+    """Fold the pre-norm affine of a wrapper into the wrapped module's projections.
+
+    LayerNorm(x) = n(x) * γ + β, so W(n * γ + β) + b = (W diag(γ)) n + (W β + b).
+    """
+    norm = wrapper.pre_norm_layer
+    if norm is None or not norm.elementwise_affine:
+        return
+
+    module = wrapper.module
+    if isinstance(module, paGatingBase):
+        projections = [module.fused_proj] if module.fused_proj is not None else [
+            module.value_proj, module.gate_proj
+        ]
+    elif isinstance(module, nn.Linear):
+        projections = [module]
+    else:
+        # Unknown downstream module, folding would not be exact
+        return
+
+    gamma = norm.weight.detach()
+    beta = norm.bias.detach() if norm.bias is not None else None
+
+    with torch.no_grad():
+        for proj in projections:
+            if beta is not None:
+                shift = F.linear(beta, proj.weight)
+                if proj.bias is None:
+                    proj.bias = nn.Parameter(shift)
+                else:
+                    proj.bias.add_(shift)
+            proj.weight.mul_(gamma)
+
+    wrapper.pre_norm_layer = nn.LayerNorm(
+        norm.normalized_shape, eps=norm.eps, elementwise_affine=False
+    ).to(gamma.device)
+
+
+def _fused_linear(unit: paGatingBase) -> nn.Linear:
+    """Return a standalone fused [2 * output_dim, input_dim] projection of a unit."""
+    if unit.fused_proj is not None:
+        return copy.deepcopy(unit.fused_proj)
+
+    weight = torch.cat([unit.value_proj.weight, unit.gate_proj.weight], dim=0).detach()
+    proj = nn.Linear(unit.input_dim, 2 * unit.output_dim, device=weight.device, dtype=weight.dtype)
+    with torch.no_grad():
+        proj.weight.copy_(weight)
+        proj.bias.copy_(torch.cat([unit.value_proj.bias, unit.gate_proj.bias], dim=0))
+    return proj
+
+
+def _value_linear(unit: paGatingBase) -> nn.Linear:
+    """Return a standalone copy of a unit's value projection."""
+    if unit.fused_proj is None:
+        return copy.deepcopy(unit.value_proj)
+
+    weight = unit.fused_proj.weight[:unit.output_dim].detach()
+    proj = nn.Linear(unit.input_dim, unit.output_dim, device=weight.device, dtype=weight.dtype)
+    with torch.no_grad():
+        proj.weight.copy_(weight)
+        proj.bias.copy_(unit.fused_proj.bias[:unit.output_dim])
+    return proj
+
+
+def freeze_unit(unit: paGatingBase, zero_tol: float = 1e-6) -> nn.Module:
+    """Fold the constants of a single paGating unit.
+
+    Args:
+        unit (paGatingBase): Unit with a fixed or learnable alpha
+        zero_tol (float): α values at or below this threshold are treated as 0
+
+    Returns:
+        nn.Module: ``nn.Linear`` (``nn.Sequential(nn.Linear, nn.Tanh)`` for paGTU)
+        when α is effectively 0, otherwise a ``FrozenPaGating`` unit
+
+    Raises:
+        ValueError: If the unit computes alpha with a callable
+    """
+    if unit.alpha_fn is not None:
+        raise ValueError("Cannot freeze a paGating unit with a callable alpha")
+
+    with torch.no_grad():
+        alpha = unit.get_alpha().detach()
+    is_gtu = isinstance(unit, paGTU)
+
+    if alpha.item() <= zero_tol:
+        linear = _value_linear(unit)
+        return nn.Sequential(linear, nn.Tanh()) if is_gtu else linear
+
+    # paGTU never applies its GateNorm
+    gate_norm = unit.gate_norm if unit.use_gate_norm and not is_gtu else None
+
+    gate_scale = gate_shift = None
+    norm_eps = None
+    norm_type = "rms" if isinstance(gate_norm, GateRMSNorm) else "layer"
+    if gate_norm is not None:
+        norm_eps = gate_norm.eps
+        if gate_norm.elementwise_affine:
+            # α * (n * w + b) + (1 - α) = n * (α w) + (α b + 1 - α)
+            gate_scale = alpha * gate_norm.weight.detach()
+            gate_shift = 1.0 - alpha
+            if getattr(gate_norm, 'bias', None) is not None:
+                gate_shift = gate_shift + alpha * gate_norm.bias.detach()
+
+    if gate_scale is None and alpha.item() < 1.0:
+        gate_scale = alpha.clone()
+        gate_shift = 1.0 - alpha
+
+    return FrozenPaGating(
+        proj=_fused_linear(unit),
+        activation_fn=unit.activation_fn,
+        gate_scale=gate_scale,
+        gate_shift=gate_shift,
+        norm_eps=norm_eps,
+        norm_type=norm_type,
+        value_activation=torch.tanh if is_gtu else None,
+    )
+
+
+def _freeze_children(module: nn.Module, zero_tol: float) -> None:
+    for name, child in module.named_children():
+        if isinstance(child, paGatingBase) and child.alpha_fn is None:
+            setattr(module, name, freeze_unit(child, zero_tol=zero_tol))
+        else:
+            _freeze_children(child, zero_tol)
+
+
+def freeze(model: nn.Module, inplace: bool = False, zero_tol: float = 1e-6) -> nn.Module:
+    """Freeze a paGating model for inference.
+
+    Walks the module tree, folds ``PrePostNormWrapper`` pre-norm affines into
+    the wrapped projections, and replaces every fixed- or learnable-α unit
+    with its frozen equivalent. Units with a callable alpha are left as is.
+
+    Args:
+        model (nn.Module): Model (or single unit) to freeze
+        inplace (bool): Modify ``model`` instead of a deep copy. Default: False
+        zero_tol (float): α values at or below this threshold are treated as 0
+
+    Returns:
+        nn.Module: Frozen model in eval mode with gradients disabled
+    """
+    if not inplace:
+        model = copy.deepcopy(model)
+
+    for module in list(model.modules()):
+        if isinstance(module, PrePostNormWrapper):
+            _fold_pre_norm(module)
+
+    if isinstance(model, paGatingBase) and model.alpha_fn is None:
+        model = freeze_unit(model, zero_tol=zero_tol)
+    else:
+        _freeze_children(model, zero_tol)
+
+    model.eval()
+    model.requires_grad_(False)
+    return model
@@ -0,0 +1,196 @@
+"""
+Fused operations for paGating units.
+
+This module provides a memory-efficient implementation of the paGating
+epilogue, output = value * (α * activation(gate) + (1 - α)), as a custom
+autograd function. Only the value tensor and the pre-activation gate are
+saved for backward; the activation and its derivative are recomputed there
+instead of keeping the activated gate and the blend alive.
+"""
+
+import math
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import torch
+import torch.nn.functional as F
+from torch.autograd.function import once_differentiable
+
+from paGating.activation_fns import gelu, mish, swish
+
+
+_SQRT1_2 = 1.0 / math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
+def _sigmoid_grad(gate: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    act = torch.sigmoid(gate)
+    return act, act * (1.0 - act)
+
+
+def _tanh_grad(gate: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    act = torch.tanh(gate)
+    return act, 1.0 - act * act
+
+
+def _gelu_grad(gate: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    cdf = 0.5 * (1.0 + torch.erf(gate * _SQRT1_2))
+    pdf = torch.exp(-0.5 * gate * gate) * _INV_SQRT_2PI
+    return gate * cdf, cdf + gate * pdf
+
+
+def _silu_grad(gate: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    sig = torch.sigmoid(gate)
+    return gate * sig, sig * (1.0 + gate * (1.0 - sig))
+
+
+def _mish_grad(gate: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    tsp = torch.tanh(F.softplus(gate))
+    return gate * tsp, tsp + gate * torch.sigmoid(gate) * (1.0 - tsp * tsp)
+
+
+def _relu_grad(gate: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    return torch.relu(gate), (gate > 0).to(gate.dtype)
+
+
+def _identity_grad(gate: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    return gate, torch.ones_like(gate)
+
+
+# name -> (forward activation returning a new tensor, activation-and-derivative)
+_ACTIVATIONS: Dict[str, Tuple[Callable, Callable]] = {
+    'sigmoid': (torch.sigmoid, _sigmoid_grad),
+    'tanh': (torch.tanh, _tanh_grad),
+    'gelu': (F.gelu, _gelu_grad),
+    'silu': (F.silu, _silu_grad),
+    'mish': (F.mish, _mish_grad),
+    'relu': (torch.relu, _relu_grad),
+    'identity': (torch.clone, _identity_grad),
+}
+
+# Known activation callables and the fused epilogue they correspond to
+_ACTIVATION_NAMES: Dict[Callable, str] = {
+    torch.sigmoid: 'sigmoid',
+    F.sigmoid: 'sigmoid',
+    torch.tanh: 'tanh',
+    F.tanh: 'tanh',
+    F.gelu: 'gelu',
+    gelu: 'gelu',
+    F.silu: 'silu',
+    swish: 'silu',
+    F.mish: 'mish',
+    mish: 'mish',
+    torch.relu: 'relu',
+    F.relu: 'relu',
+}
+
+SUPPORTED_ACTIVATIONS = tuple(_ACTIVATIONS.keys())
+
+
+def resolve_activation(activation_fn: Callable) -> Optional[str]:
+    """Return the fused epilogue name for a known activation callable.
+
+    Args:
+        activation_fn (Callable): Activation function used in the gating path
+
+    Returns:
+        Optional[str]: Epilogue activation name, or None if the callable is not recognized
+    """
+    try:
+        return _ACTIVATION_NAMES.get(activation_fn)
+    except TypeError:
+        # Unhashable callables cannot be matched
+        return None
+
+
+class GatedBlendFunction(torch.autograd.Function):
+    """Autograd function for output = value * (α * activation(gate) + (1 - α)).
+
+    Saves only ``value``, the pre-activation ``gate`` and α (when it is a
+    tensor). The activation is recomputed in backward.
+    """
+
+    @staticmethod
+    def forward(ctx, value, gate, alpha, activation):
+        act_fn, _ = _ACTIVATIONS[activation]
+        alpha_is_tensor = isinstance(alpha, torch.Tensor)
+
+        # Build the blend in place on a single fresh tensor when broadcasting allows it
+        blend = act_fn(gate)
+        if alpha_is_tensor and torch.broadcast_shapes(blend.shape, alpha.shape) != blend.shape:
+            blend = (blend - 1.0) * alpha + 1.0
+        else:
+            blend.sub_(1.0).mul_(alpha).add_(1.0)
+
+        if blend.shape == value.shape:
+            output = blend.mul_(value)
+        else:
+            output = blend * value
+
+        ctx.activation = activation
+        ctx.alpha_is_tensor = alpha_is_tensor
+        if alpha_is_tensor:
+            ctx.save_for_backward(value, gate, alpha)
+        else:
+            ctx.alpha = alpha
+            ctx.save_for_backward(value, gate)
+        return output
+
+    @staticmethod
+    @once_differentiable
+    def backward(ctx, grad_output):
+        if ctx.alpha_is_tensor:
+            value, gate, alpha = ctx.saved_tensors
+        else:
+            value, gate = ctx.saved_tensors
+            alpha = ctx.alpha
+
+        _, act_and_grad = _ACTIVATIONS[ctx.activation]
+        act, act_grad = act_and_grad(gate)
+
+        grad_value = grad_gate = grad_alpha = None
+
+        if ctx.needs_input_grad[0]:
+            grad_value = grad_output * ((act - 1.0) * alpha + 1.0)
+            grad_value = grad_value.sum_to_size(value.shape)
+
+        if ctx.needs_input_grad[1] or (ctx.alpha_is_tensor and ctx.needs_input_grad[2]):
+            grad_value_path = grad_output * value
+
+            if ctx.needs_input_grad[1]:
+                grad_gate = (grad_value_path * alpha * act_grad).sum_to_size(gate.shape)
+
+            if ctx.alpha_is_tensor and ctx.needs_input_grad[2]:
+                grad_alpha = grad_value_path * (act - 1.0)
+                if alpha.dim() == 0:
+                    grad_alpha = grad_alpha.sum()
+                else:
+                    grad_alpha = grad_alpha.sum_to_size(alpha.shape)
+
+        return grad_value, grad_gate, grad_alpha, None
+
+
+def gated_blend(
+    value: torch.Tensor,
+    gate: torch.Tensor,
+    alpha: Union[float, torch.Tensor],
+    activation: str = 'sigmoid',
+) -> torch.Tensor:
+    """Memory-efficient paGating epilogue.
+
+    Computes: output = value * (α * activation(gate) + (1 - α))
+
+    Args:
+        value (torch.Tensor): Value path A(x)
+        gate (torch.Tensor): Pre-activation gate path B(x), same shape as value
+        alpha (Union[float, torch.Tensor]): Gating strength, scalar or broadcastable to value
+        activation (str): One of ``SUPPORTED_ACTIVATIONS``
+
+    Returns:
+        torch.Tensor: Partially gated output
+    """
+    if activation not in _ACTIVATIONS:
+        raise ValueError(
+            f"Unsupported epilogue activation '{activation}'. "
+            f"Available options: {list(SUPPORTED_ACTIVATIONS)}"
+        )
+    return GatedBlendFunction.apply(value, gate, alpha, activation)
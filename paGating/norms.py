@@ -7,9 +7,41 @@ techniques for paGating activation units.
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 from typing import Optional, Tuple, Union, Callable
 
 
+def rms_norm(
+    x: torch.Tensor,
+    normalized_shape: Tuple[int, ...],
+    weight: Optional[torch.Tensor] = None,
+    eps: float = 1e-5
+) -> torch.Tensor:
+    """Root-mean-square normalization over the trailing dimensions.
+    
+    Computes: x / sqrt(mean(x^2) + eps) * weight
+    
+    Uses the native ``F.rms_norm`` kernel when available.
+    
+    Args:
+        x (torch.Tensor): Input tensor
+        normalized_shape (Tuple[int, ...]): Trailing dimensions to normalize over
+        weight (Optional[torch.Tensor]): Optional elementwise scale
+        eps (float): Small constant added for numerical stability
+        
+    Returns:
+        torch.Tensor: Normalized tensor
+    """
+    if hasattr(F, 'rms_norm'):
+        return F.rms_norm(x, normalized_shape, weight, eps)
+    
+    dims = tuple(range(-len(normalized_shape), 0))
+    normalized = x * torch.rsqrt(x.pow(2).mean(dim=dims, keepdim=True) + eps)
+    if weight is not None:
+        normalized = normalized * weight
+    return normalized
+
+
 class GateNorm(nn.Module):
     """Layer normalization applied specifically to the gating pathway of paGating units.
     
@@ -17,6 +49,10 @@ class GateNorm(nn.Module):
     before combining with the value path, normalizing the gate activations
     to ensure consistent signal strength regardless of input distribution.
     
+    The statistics, normalization and affine step run as a single fused
+    ``F.layer_norm`` call, whose backward saves only the input and the
+    per-row mean and inverse standard deviation.
+    
     Args:
         normalized_shape (int): The expected shape of the gate activations
         eps (float): Small constant added for numerical stability
@@ -50,18 +86,79 @@ class GateNorm(nn.Module):
         Returns:
             torch.Tensor: Normalized gate signal
         """
-        # Compute mean and variance along feature dimension
-        mean = gate_signal.mean(dim=-1, keepdim=True)
-        var = gate_signal.var(dim=-1, keepdim=True, unbiased=False)
+        return F.layer_norm(
+            gate_signal, (self.normalized_shape,), self.weight, self.bias, self.eps
+        )
+
+
+class GateRMSNorm(nn.Module):
+    """RMS normalization applied to the gating pathway of paGating units.
+    
+    A cheaper alternative to GateNorm that skips mean-centering and only
+    rescales the gate activations by their root mean square.
+    
+    Args:
+        normalized_shape (int): The expected shape of the gate activations
+        eps (float): Small constant added for numerical stability
+        elementwise_affine (bool): If True, use a learnable elementwise scale
+    """
+    
+    def __init__(
+        self,
+        normalized_shape: int,
+        eps: float = 1e-5,
+        elementwise_affine: bool = True
+    ) -> None:
+        super().__init__()
+        self.normalized_shape = normalized_shape
+        self.eps = eps
+        self.elementwise_affine = elementwise_affine
         
-        # Normalize
-        normalized = (gate_signal - mean) / torch.sqrt(var + self.eps)
+        if elementwise_affine:
+            self.weight = nn.Parameter(torch.ones(normalized_shape))
+        else:
+            self.register_parameter('weight', None)
+    
+    def forward(self, gate_signal: torch.Tensor) -> torch.Tensor:
+        """Normalize the gate signal.
         
-        # Apply affine transformation if enabled
-        if self.elementwise_affine:
-            normalized = normalized * self.weight + self.bias
+        Args:
+            gate_signal (torch.Tensor): The gate activation tensor [batch_size, features]
             
-        return normalized
+        Returns:
+            torch.Tensor: Normalized gate signal
+        """
+        return rms_norm(gate_signal, (self.normalized_shape,), self.weight, self.eps)
+
+
+def build_gate_norm(
+    norm_type: Union[bool, str],
+    normalized_shape: int,
+    eps: float = 1e-5
+) -> Optional[nn.Module]:
+    """Create the gate normalization selected by a unit's ``use_gate_norm``.
+    
+    Args:
+        norm_type (Union[bool, str]): False/None for no normalization,
+            True or "layer" for GateNorm, "rms" for GateRMSNorm
+        normalized_shape (int): The expected shape of the gate activations
+        eps (float): Small constant added for numerical stability
+        
+    Returns:
+        Optional[nn.Module]: The normalization module, or None if disabled
+        
+    Raises:
+        ValueError: If the normalization type is not recognized
+    """
+    if norm_type is None or norm_type is False:
+        return None
+    if norm_type is True or norm_type == "layer":
+        return GateNorm(normalized_shape, eps=eps)
+    if norm_type == "rms":
+        return GateRMSNorm(normalized_shape, eps=eps)
+    raise ValueError(
+        f"use_gate_norm must be a bool, 'layer' or 'rms'. Got {norm_type!r}"
+    )
 
 
 class PrePostNormWrapper(nn.Module):
@@ -122,6 +219,26 @@ class PrePostNormWrapper(nn.Module):
         
         return output
     
+    def forward_alpha_grid(self, x: torch.Tensor, alphas) -> torch.Tensor:
+        """Evaluate the wrapped unit for several α values with a single forward.
+        
+        Args:
+            x (torch.Tensor): Input tensor
+            alphas: 1-D sequence or tensor of α values
+            
+        Returns:
+            torch.Tensor: Outputs of shape (len(alphas), ..., output_dim)
+        """
+        if self.pre_norm and self.pre_norm_layer is not None:
+            x = self.pre_norm_layer(x)
+        
+        output = self.module.forward_alpha_grid(x, alphas)
+        
+        if self.post_norm and self.post_norm_layer is not None:
+            output = self.post_norm_layer(output)
+        
+        return output
+    
     # Expose the wrapped module's attributes
     def __getattr__(self, name):
         """Forward attribute access to the wrapped module."""
@@ -33,12 +33,20 @@ class paGELU(paGatingBase):
             - "learnable": Creates a learnable parameter initialized to 0.5
             - Callable: Function that computes alpha dynamically
             Default: 0.5
-        use_gate_norm (bool, optional): Whether to apply GateNorm to the gating pathway
+        use_gate_norm (Union[bool, str], optional): Whether to apply GateNorm to the gating pathway
+            (True or "layer" for GateNorm, "rms" for GateRMSNorm)
             Default: False
         norm_eps (float, optional): Epsilon for numerical stability in normalization
             Default: 1e-5
         approximate (bool, optional): Whether to use the approximate GELU implementation
             Default: False
+        fused (bool, optional): Whether to compute value and gate paths with a
+            single fused projection
+            Default: False
+        memory_efficient (bool, optional): Whether to use the recomputing gating epilogue
+        recompute (bool, optional): Whether to recompute the unit in backward instead
+            of storing its intermediates during training
+            Default: False
     """
     
     def __init__(
@@ -46,9 +54,12 @@ class paGELU(paGatingBase):
         input_dim: int,
         output_dim: int,
         alpha: Union[float, str, Callable] = 0.5,
-        use_gate_norm: bool = False,
+        use_gate_norm: Union[bool, str] = False,
         norm_eps: float = 1e-5,
         approximate: bool = False,
+        fused: bool = False,
+        memory_efficient: bool = False,
+        recompute: bool = False,
     ) -> None:
         # Choose the appropriate GELU implementation
         if approximate:
@@ -62,5 +73,11 @@ class paGELU(paGatingBase):
             activation_fn=activation_fn,
             alpha=alpha,
             use_gate_norm=use_gate_norm,
-            norm_eps=norm_eps
-        ) 
\ No newline at end of file
+            norm_eps=norm_eps,
+            fused=fused,
+            memory_efficient=memory_efficient,
+            recompute=recompute
+        )
+        
+        # Both branches compute the exact GELU
+        self.epilogue_activation = 'gelu'
@@ -32,8 +32,14 @@ class paGLU(paGatingBase):
             - "learnable": Creates a learnable parameter initialized to 0.5
             - Callable: Function that computes alpha dynamically
             Default: 0.5
-        use_gate_norm (bool, optional): Whether to use gate normalization
+        use_gate_norm (Union[bool, str], optional): Whether to use gate normalization
+            (True or "layer" for GateNorm, "rms" for GateRMSNorm)
         norm_eps (float, optional): Epsilon for gate normalization
+        fused (bool, optional): Whether to compute value and gate paths with a
+            single fused projection
+        memory_efficient (bool, optional): Whether to use the recomputing gating epilogue
+        recompute (bool, optional): Whether to recompute the unit in backward instead
+            of storing its intermediates during training
     """
     
     def __init__(
@@ -41,8 +47,11 @@ class paGLU(paGatingBase):
         input_dim: int,
         output_dim: int,
         alpha: Union[float, str, Callable] = 0.5,
-        use_gate_norm: bool = False,
+        use_gate_norm: Union[bool, str] = False,
         norm_eps: float = 1e-5,
+        fused: bool = False,
+        memory_efficient: bool = False,
+        recompute: bool = False,
     ) -> None:
         # Initialize with sigmoid activation function for gating
         super().__init__(
@@ -51,5 +60,8 @@ class paGLU(paGatingBase):
             activation_fn=F.sigmoid,
             alpha=alpha,
             use_gate_norm=use_gate_norm,
-            norm_eps=norm_eps
+            norm_eps=norm_eps,
+            fused=fused,
+            memory_efficient=memory_efficient,
+            recompute=recompute
         )
\ No newline at end of file
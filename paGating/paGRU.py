@@ -2,27 +2,18 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import math
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple, Union
+from torch.nn.utils.rnn import PackedSequence, pack_padded_sequence, pad_packed_sequence
 
 # Helper functions for parameterized activations within GRU
-def PaSigmoid(x: torch.Tensor, alpha: torch.Tensor) -> torch.Tensor:
+def PaSigmoid(x: torch.Tensor, alpha: Union[torch.Tensor, float]) -> torch.Tensor:
     """ Parameterized Sigmoid: sigmoid(alpha * x) """
-    # Ensure alpha is broadcastable
-    if isinstance(alpha, torch.Tensor) and alpha.numel() == 1:
-        return torch.sigmoid(alpha.item() * x)
-    elif isinstance(alpha, float):
-         return torch.sigmoid(alpha * x)
-    else: # Should not happen with current setup, but handles tensor alpha if needed
-         return torch.sigmoid(alpha * x) 
-
-def PaTanh(x: torch.Tensor, alpha: torch.Tensor) -> torch.Tensor:
+    # Tensor alpha stays on device (no host sync) and keeps its gradient
+    return torch.sigmoid(alpha * x)
+
+def PaTanh(x: torch.Tensor, alpha: Union[torch.Tensor, float]) -> torch.Tensor:
     """ Parameterized Tanh: tanh(alpha * x) """
-    if isinstance(alpha, torch.Tensor) and alpha.numel() == 1:
-        return torch.tanh(alpha.item() * x)
-    elif isinstance(alpha, float):
-        return torch.tanh(alpha * x)
-    else:
-        return torch.tanh(alpha * x)
+    return torch.tanh(alpha * x)
 
 # Placeholder for the main class
 class PaGRUCell(nn.Module):
@@ -148,4 +139,250 @@ class PaGRUCell(nn.Module):
         # Calculate next hidden state
         hy = newgate + updategate * (hx - newgate)
 
-        return hy 
\ No newline at end of file
+        return hy 
+
+def _pagru_recurrence(
+    gi: torch.Tensor,
+    h: torch.Tensor,
+    weight_hh: torch.Tensor,
+    bias_hh: Optional[torch.Tensor],
+    alpha_r: torch.Tensor,
+    alpha_z: torch.Tensor,
+    alpha_h: torch.Tensor,
+    lengths: Optional[torch.Tensor],
+    reverse: bool,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Run the PaGRU recurrence over precomputed input projections.
+
+    Args:
+        gi: Input projections for the whole sequence, shape (T, B, 3 * H)
+        h: Initial hidden state, shape (B, H)
+        weight_hh, bias_hh: Hidden-to-hidden weights of the direction
+        alpha_r, alpha_z, alpha_h: Gate alphas as tensors (no host syncs)
+        lengths: Optional per-sequence lengths on the same device, shape (B,)
+        reverse: Process the sequence from the last step to the first
+
+    Returns:
+        Outputs of shape (T, B, H) (zero past each sequence's length) and the final hidden state
+    """
+    seq_len = gi.size(0)
+    hidden_size = h.size(1)
+    outputs: List[torch.Tensor] = []
+
+    for step in range(seq_len):
+        t = seq_len - 1 - step if reverse else step
+        gi_t = gi[t]
+        gh = F.linear(h, weight_hh, bias_hh)
+
+        resetgate = torch.sigmoid(alpha_r * (gi_t[:, :hidden_size] + gh[:, :hidden_size]))
+        updategate = torch.sigmoid(
+            alpha_z * (gi_t[:, hidden_size:2 * hidden_size] + gh[:, hidden_size:2 * hidden_size])
+        )
+        newgate = torch.tanh(
+            alpha_h * (gi_t[:, 2 * hidden_size:] + resetgate * gh[:, 2 * hidden_size:])
+        )
+        h_new = newgate + updategate * (h - newgate)
+
+        if lengths is not None:
+            # Steps past a sequence's end leave its state untouched, which also
+            # makes the reverse direction start at each sequence's last element
+            valid = (lengths > t).unsqueeze(1)
+            h = torch.where(valid, h_new, h)
+            outputs.append(torch.where(valid, h_new, torch.zeros_like(h_new)))
+        else:
+            h = h_new
+            outputs.append(h_new)
+
+    output = torch.stack(outputs, 0)
+    if reverse:
+        output = output.flip(0)
+    return output, h
+
+
+try:
+    _pagru_recurrence_scripted = torch.jit.script(_pagru_recurrence)
+except Exception:  # pragma: no cover - fall back to eager if scripting is unavailable
+    _pagru_recurrence_scripted = _pagru_recurrence
+
+
+class PaGRU(nn.Module):
+    """Multi-layer Parameterized Adaptive GRU over whole sequences.
+
+    Sequence-level counterpart of :class:`PaGRUCell` with an ``nn.GRU``-style
+    interface. For every layer and direction the input-side projections of
+    the whole sequence are computed with a single GEMM; only the
+    hidden-to-hidden projection runs inside the recurrence, which is a
+    TorchScript loop that keeps the alphas on device (no host syncs).
+
+    Args:
+        input_size (int): The number of expected features in the input x
+        hidden_size (int): The number of features in the hidden state h
+        num_layers (int): Number of stacked recurrent layers. Default: 1
+        bias (bool): If ``False``, then the layer does not use bias weights. Default: ``True``
+        batch_first (bool): If ``True``, input and output tensors are (batch, seq, feature).
+            Default: ``False``
+        dropout (float): Dropout applied to the outputs of each layer except the last. Default: 0
+        bidirectional (bool): If ``True``, becomes a bidirectional PaGRU. Default: ``False``
+        alpha_mode (str | float): "learnable" (default) for learnable `alpha_r`, `alpha_z`,
+            `alpha_h` per layer and direction initialized to 1.0, or a float for static alphas.
+        device: The device tensors will be moved to. Default: ``None``
+        dtype: The data type for tensors. Default: ``None``
+
+    Inputs: input, h_0
+        - input: Tensor of shape (T, B, input_size) (or (B, T, input_size) with
+          ``batch_first``), or a :class:`~torch.nn.utils.rnn.PackedSequence`
+        - h_0: Optional tensor of shape (num_layers * num_directions, B, hidden_size)
+
+    Outputs: output, h_n
+        - output: Tensor of shape (T, B, num_directions * hidden_size), or a
+          PackedSequence if the input was packed
+        - h_n: Tensor of shape (num_layers * num_directions, B, hidden_size)
+    """
+    def __init__(self, input_size: int, hidden_size: int, num_layers: int = 1,
+                 bias: bool = True, batch_first: bool = False, dropout: float = 0.0,
+                 bidirectional: bool = False, alpha_mode: Union[str, float] = "learnable",
+                 device=None, dtype=None) -> None:
+        factory_kwargs = {'device': device, 'dtype': dtype}
+        super().__init__()
+        self.input_size = input_size
+        self.hidden_size = hidden_size
+        self.num_layers = num_layers
+        self.bias = bias
+        self.batch_first = batch_first
+        self.dropout = float(dropout)
+        self.bidirectional = bidirectional
+        self.alpha_mode = alpha_mode
+        num_directions = 2 if bidirectional else 1
+
+        if alpha_mode != "learnable" and not isinstance(alpha_mode, (float, int)):
+            raise ValueError(f"Invalid alpha_mode: {alpha_mode}. Must be 'learnable' or a float/int.")
+
+        self._flat_names: List[List[str]] = []
+        for layer in range(num_layers):
+            layer_input_size = input_size if layer == 0 else hidden_size * num_directions
+            for direction in range(num_directions):
+                suffix = f'_l{layer}' + ('_reverse' if direction == 1 else '')
+                self.register_parameter(
+                    'weight_ih' + suffix,
+                    nn.Parameter(torch.empty((3 * hidden_size, layer_input_size), **factory_kwargs))
+                )
+                self.register_parameter(
+                    'weight_hh' + suffix,
+                    nn.Parameter(torch.empty((3 * hidden_size, hidden_size), **factory_kwargs))
+                )
+                if bias:
+                    self.register_parameter(
+                        'bias_ih' + suffix, nn.Parameter(torch.empty(3 * hidden_size, **factory_kwargs))
+                    )
+                    self.register_parameter(
+                        'bias_hh' + suffix, nn.Parameter(torch.empty(3 * hidden_size, **factory_kwargs))
+                    )
+                else:
+                    self.register_parameter('bias_ih' + suffix, None)
+                    self.register_parameter('bias_hh' + suffix, None)
+
+                for gate in ('alpha_r', 'alpha_z', 'alpha_h'):
+                    if alpha_mode == "learnable":
+                        self.register_parameter(
+                            gate + suffix, nn.Parameter(torch.tensor(1.0, **factory_kwargs))
+                        )
+                    else:
+                        # Static alphas live in buffers so they follow .to() without host copies
+                        self.register_buffer(
+                            gate + suffix, torch.tensor(float(alpha_mode), **factory_kwargs)
+                        )
+                self._flat_names.append([
+                    name + suffix for name in (
+                        'weight_ih', 'weight_hh', 'bias_ih', 'bias_hh', 'alpha_r', 'alpha_z', 'alpha_h'
+                    )
+                ])
+
+        self.reset_parameters()
+
+    def extra_repr(self) -> str:
+        s = '{input_size}, {hidden_size}'.format(**self.__dict__)
+        if self.num_layers != 1:
+            s += f', num_layers={self.num_layers}'
+        if not self.bias:
+            s += ', bias=False'
+        if self.batch_first:
+            s += ', batch_first=True'
+        if self.dropout:
+            s += f', dropout={self.dropout}'
+        if self.bidirectional:
+            s += ', bidirectional=True'
+        if self.alpha_mode == "learnable":
+            s += ', alpha_mode=learnable'
+        else:
+            s += f', alpha_mode=static({float(self.alpha_mode)})'
+        return s
+
+    def reset_parameters(self) -> None:
+        # Standard PyTorch GRU initialization for weights/biases
+        stdv = 1.0 / math.sqrt(self.hidden_size) if self.hidden_size > 0 else 0
+        for name, param in self.named_parameters():
+            if name.startswith('alpha'):
+                with torch.no_grad():
+                    param.fill_(1.0)
+            else:
+                nn.init.uniform_(param, -stdv, stdv)
+
+    def forward(
+        self, input: Union[torch.Tensor, PackedSequence], hx: Optional[torch.Tensor] = None
+    ) -> Tuple[Union[torch.Tensor, PackedSequence], torch.Tensor]:
+        """Performs a forward pass of the PaGRU layer over a whole sequence.
+
+        Args:
+            input (Union[torch.Tensor, PackedSequence]): Input sequence (see class docstring).
+            hx (Optional[torch.Tensor]): Initial hidden state of shape
+                (num_layers * num_directions, batch, hidden_size).
+
+        Returns:
+            Tuple of the output sequence and the final hidden state h_n.
+        """
+        is_packed = isinstance(input, PackedSequence)
+        lengths = None
+        if is_packed:
+            x, lengths_cpu = pad_packed_sequence(input, batch_first=False)
+            lengths = lengths_cpu.to(x.device)
+        else:
+            x = input.transpose(0, 1) if self.batch_first else input
+
+        num_directions = 2 if self.bidirectional else 1
+        batch_size = x.size(1)
+        if hx is None:
+            hx = torch.zeros(
+                self.num_layers * num_directions, batch_size, self.hidden_size,
+                dtype=x.dtype, device=x.device
+            )
+
+        h_n = []
+        layer_input = x
+        for layer in range(self.num_layers):
+            direction_outputs = []
+            for direction in range(num_directions):
+                idx = layer * num_directions + direction
+                w_ih, w_hh, b_ih, b_hh, a_r, a_z, a_h = (
+                    getattr(self, name) for name in self._flat_names[idx]
+                )
+                # One GEMM for the input projections of every timestep
+                gi = F.linear(layer_input, w_ih, b_ih)
+                output, h_last = _pagru_recurrence_scripted(
+                    gi, hx[idx], w_hh, b_hh, a_r, a_z, a_h, lengths, direction == 1
+                )
+                direction_outputs.append(output)
+                h_n.append(h_last)
+
+            layer_input = direction_outputs[0] if num_directions == 1 else torch.cat(direction_outputs, dim=2)
+            if self.dropout > 0 and self.training and layer < self.num_layers - 1:
+                layer_input = F.dropout(layer_input, p=self.dropout, training=True)
+
+        h_n = torch.stack(h_n, 0)
+
+        if is_packed:
+            output = pack_padded_sequence(layer_input, lengths_cpu, enforce_sorted=False)
+        elif self.batch_first:
+            output = layer_input.transpose(0, 1)
+        else:
+            output = layer_input
+        return output, h_n
@@ -7,7 +7,7 @@ and tanh for the value path.
 
 import torch
 import torch.nn as nn
-from typing import Union, Callable, Optional
+from typing import Union, Callable, Optional, Tuple
 
 from paGating.base import paGatingBase
 
@@ -32,8 +32,14 @@ class paGTU(paGatingBase):
             - "learnable": Creates a learnable parameter initialized to 0.5
             - Callable: Function that computes alpha dynamically
             Default: 0.5
-        use_gate_norm (bool, optional): Whether to use gate normalization
+        use_gate_norm (Union[bool, str], optional): Whether to use gate normalization
+            (True or "layer" for GateNorm, "rms" for GateRMSNorm)
         norm_eps (float, optional): Epsilon for gate normalization
+        fused (bool, optional): Whether to compute value and gate paths with a
+            single fused projection
+        memory_efficient (bool, optional): Whether to use the recomputing gating epilogue
+        recompute (bool, optional): Whether to recompute the unit in backward instead
+            of storing its intermediates during training
     """
     
     def __init__(
@@ -41,8 +47,11 @@ class paGTU(paGatingBase):
         input_dim: int,
         output_dim: int,
         alpha: Union[float, str, Callable] = 0.5,
-        use_gate_norm: bool = False,
+        use_gate_norm: Union[bool, str] = False,
         norm_eps: float = 1e-5,
+        fused: bool = False,
+        memory_efficient: bool = False,
+        recompute: bool = False,
     ) -> None:
         # Initialize with tanh activation function for gating
         super().__init__(
@@ -51,13 +60,16 @@ class paGTU(paGatingBase):
             activation_fn=torch.tanh,
             alpha=alpha,
             use_gate_norm=use_gate_norm,
-            norm_eps=norm_eps
+            norm_eps=norm_eps,
+            fused=fused,
+            memory_efficient=memory_efficient,
+            recompute=recompute
         )
     
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def _forward(self, x: torch.Tensor) -> torch.Tensor:
         """Forward pass for paGTU.
         
-        Overrides the base class forward to apply tanh to the value path.
+        Overrides the base class computation to apply tanh to the value path.
         
         Args:
             x (torch.Tensor): Input tensor of shape (batch_size, input_dim)
@@ -65,21 +77,22 @@ class paGTU(paGatingBase):
         Returns:
             torch.Tensor: Output tensor of shape (batch_size, output_dim)
         """
-        # Compute value path A(x) with tanh activation
-        value = torch.tanh(self.value_proj(x))
+        # α=0: tanh(A(x)), the gate path is skipped entirely
+        regime = self._fixed_alpha_regime()
+        if regime is not None and regime[0] == 'zero':
+            return torch.tanh(self.project_value(x))
         
-        # Compute gate path B(x)
-        gate = self.gate_proj(x)
-        gate_activated = self.activation_fn(gate)
+        # Compute value path A(x) and gate path B(x)
+        value, gate = self.project(x)
         
-        # Get alpha value (could be static, learnable, or computed)
-        alpha = self.get_alpha(x)
+        # Apply tanh activation to the value path
+        value = torch.tanh(value)
         
-        # Ensure alpha has the right shape for broadcasting
-        if alpha.dim() == 0:
-            alpha = alpha.view(1, 1)
-        
-        # Compute partially gated output
-        output = value * (alpha * gate_activated + (1.0 - alpha))
-        
-        return output
\ No newline at end of file
+        # Gate, alpha and blend are shared with the base class; paGTU has
+        # never normalized its gate path, so GateNorm is skipped here
+        return self._gate_and_blend(value, gate, x, normalize=False)
+    
+    def _activated_paths(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Value path tanh(A(x)) and activated gate path, without GateNorm."""
+        value, gate = self.project(x)
+        return torch.tanh(value), self.activation_fn(gate)
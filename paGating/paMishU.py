@@ -34,8 +34,14 @@ class paMishU(paGatingBase):
             - "learnable": Creates a learnable parameter initialized to 0.5
             - Callable: Function that computes alpha dynamically
             Default: 0.5
-        use_gate_norm (bool, optional): Whether to use gate normalization
+        use_gate_norm (Union[bool, str], optional): Whether to use gate normalization
+            (True or "layer" for GateNorm, "rms" for GateRMSNorm)
         norm_eps (float, optional): Epsilon for gate normalization
+        fused (bool, optional): Whether to compute value and gate paths with a
+            single fused projection
+        memory_efficient (bool, optional): Whether to use the recomputing gating epilogue
+        recompute (bool, optional): Whether to recompute the unit in backward instead
+            of storing its intermediates during training
     """
     
     def __init__(
@@ -43,8 +49,11 @@ class paMishU(paGatingBase):
         input_dim: int,
         output_dim: int,
         alpha: Union[float, str, Callable] = 0.5,
-        use_gate_norm: bool = False,
+        use_gate_norm: Union[bool, str] = False,
         norm_eps: float = 1e-5,
+        fused: bool = False,
+        memory_efficient: bool = False,
+        recompute: bool = False,
     ) -> None:
         # Initialize with Mish activation function for gating
         super().__init__(
@@ -53,5 +62,8 @@ class paMishU(paGatingBase):
             activation_fn=mish,
             alpha=alpha,
             use_gate_norm=use_gate_norm,
-            norm_eps=norm_eps
+            norm_eps=norm_eps,
+            fused=fused,
+            memory_efficient=memory_efficient,
+            recompute=recompute
         ) 
\ No newline at end of file
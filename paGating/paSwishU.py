@@ -45,8 +45,14 @@ class paSwishU(paGatingBase):
             - Callable: Function that computes alpha dynamically
             Default: 0.5
         beta (float, optional): Scaling factor for the gating function
-        use_gate_norm (bool, optional): Whether to use gate normalization
+        use_gate_norm (Union[bool, str], optional): Whether to use gate normalization
+            (True or "layer" for GateNorm, "rms" for GateRMSNorm)
         norm_eps (float, optional): Epsilon for gate normalization
+        fused (bool, optional): Whether to compute value and gate paths with a
+            single fused projection
+        memory_efficient (bool, optional): Whether to use the recomputing gating epilogue
+        recompute (bool, optional): Whether to recompute the unit in backward instead
+            of storing its intermediates during training
     """
     
     def __init__(
@@ -55,8 +61,11 @@ class paSwishU(paGatingBase):
         output_dim: int,
         alpha: Union[float, str, Callable] = 0.5,
         beta: float = 1.0,
-        use_gate_norm: bool = False,
+        use_gate_norm: Union[bool, str] = False,
         norm_eps: float = 1e-5,
+        fused: bool = False,
+        memory_efficient: bool = False,
+        recompute: bool = False,
     ) -> None:
         self.beta = beta
         super().__init__(
@@ -65,5 +74,11 @@ class paSwishU(paGatingBase):
             activation_fn=lambda x: x * torch.sigmoid(self.beta * x),
             alpha=alpha,
             use_gate_norm=use_gate_norm,
-            norm_eps=norm_eps
-        )
\ No newline at end of file
+            norm_eps=norm_eps,
+            fused=fused,
+            memory_efficient=memory_efficient,
+            recompute=recompute
+        )
+        
+        # swish with beta=1 is SiLU, which the fused epilogue supports
+        self.epilogue_activation = 'silu' if beta == 1.0 else None
@@ -0,0 +1,156 @@
+"""
+Int8 dynamic quantization for paGating inference on CPU.
+
+Quantized units build on :func:`paGating.freeze`: all α-dependent constants
+are folded first, then the fused value/gate projection is replaced by a
+single dynamically quantized int8 matmul with per-output-channel weight
+scales. Activations are quantized on the fly, and the gate activation,
+normalization and α blend stay in fp32.
+
+Example:
+    >>> qmodel = quantize(model)
+    >>> report = quantization_error(model, qmodel, sample_inputs)
+"""
+
+import copy
+import math
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+import torch
+import torch.nn as nn
+import torch.ao.nn.quantized.dynamic as nnqd
+from torch.ao.quantization import per_channel_dynamic_qconfig
+
+from .freeze import FrozenPaGating, freeze
+
+
+def quantize_linear(linear: nn.Linear) -> nnqd.Linear:
+    """Quantize a linear layer to int8 with per-output-channel weight scales.
+
+    Args:
+        linear (nn.Linear): fp32 linear layer
+
+    Returns:
+        nnqd.Linear: Dynamically quantized linear layer with fp32 inputs and outputs
+    """
+    float_linear = copy.deepcopy(linear).float().cpu()
+    float_linear.qconfig = per_channel_dynamic_qconfig
+    return nnqd.Linear.from_float(float_linear)
+
+
+def _quantize_children(module: nn.Module, include_linear: bool) -> None:
+    for name, child in module.named_children():
+        if isinstance(child, FrozenPaGating):
+            # Value and gate rows share one quantized matmul
+            child.proj = quantize_linear(child.proj)
+        elif include_linear and type(child) is nn.Linear:
+            setattr(module, name, quantize_linear(child))
+        else:
+            _quantize_children(child, include_linear)
+
+
+def quantize(
+    model: nn.Module,
+    inplace: bool = False,
+    include_linear: bool = True,
+    zero_tol: float = 1e-6,
+) -> nn.Module:
+    """Quantize a paGating model (or single unit) for int8 CPU inference.
+
+    Every fixed- or learnable-α unit is frozen and its fused projection
+    quantized. With ``include_linear`` the remaining ``nn.Linear`` layers of
+    the model, e.g. ``fc_in``/``fc_out`` of the patched GPT-2 ``PaGatingMLP``
+    and units frozen to a plain linear layer (α = 0), are quantized too.
+    Units with a callable alpha stay in fp32.
+
+    Args:
+        model (nn.Module): Model (or single unit) to quantize
+        inplace (bool): Modify ``model`` instead of a deep copy. Default: False
+        include_linear (bool): Also quantize plain ``nn.Linear`` layers. Default: True
+        zero_tol (float): α values at or below this threshold are treated as 0
+
+    Returns:
+        nn.Module: Quantized model on CPU in eval mode
+    """
+    model = freeze(model, inplace=inplace, zero_tol=zero_tol).cpu()
+
+    if isinstance(model, FrozenPaGating):
+        model.proj = quantize_linear(model.proj)
+    elif type(model) is nn.Linear:
+        model = quantize_linear(model)
+    else:
+        _quantize_children(model, include_linear)
+
+    return model.eval()
+
+
+def _output_tensor(output: Any) -> torch.Tensor:
+    """Tensor compared by :func:`quantization_error` for a model output.
+
+    Handles plain tensors, outputs with ``logits`` (HuggingFace ``ModelOutput``)
+    and tuples or lists, whose first element is used.
+    """
+    if isinstance(output, torch.Tensor):
+        return output
+    if getattr(output, 'logits', None) is not None:
+        return output.logits
+    if isinstance(output, (tuple, list)) and output:
+        return _output_tensor(output[0])
+    raise TypeError(
+        f"Cannot compare model outputs of type {type(output).__name__}; pass output_fn to select a tensor"
+    )
+
+
+@torch.no_grad()
+def quantization_error(
+    reference: nn.Module,
+    quantized: nn.Module,
+    inputs: Union[torch.Tensor, Iterable[torch.Tensor]],
+    output_fn: Optional[Callable[[Any], torch.Tensor]] = None,
+) -> Dict[str, float]:
+    """Measure the output error of a quantized model against its fp32 reference.
+
+    Args:
+        reference (nn.Module): Original fp32 model or unit
+        quantized (nn.Module): Result of :func:`quantize`
+        inputs (Union[torch.Tensor, Iterable[torch.Tensor]]): Calibration batch or batches
+        output_fn (Optional[Callable[[Any], torch.Tensor]]): Selects the compared
+            tensor from a model output. Default: the output itself, its ``logits``
+            (HuggingFace models) or the first element of a tuple
+
+    Returns:
+        Dict[str, float]: ``max_abs_error``, ``mean_abs_error``, ``relative_error``
+        (‖q − r‖ / ‖r‖) and ``sqnr_db`` (signal-to-quantization-noise ratio)
+    """
+    if isinstance(inputs, torch.Tensor):
+        inputs = [inputs]
+    if output_fn is None:
+        output_fn = _output_tensor
+
+    was_training = reference.training
+    reference.eval()
+
+    max_abs = 0.0
+    abs_sum = 0.0
+    count = 0
+    signal = 0.0
+    noise = 0.0
+    for x in inputs:
+        ref = output_fn(reference(x)).float().cpu()
+        diff = output_fn(quantized(x.cpu())).float() - ref
+        max_abs = max(max_abs, diff.abs().max().item())
+        abs_sum += diff.abs().sum().item()
+        count += diff.numel()
+        signal += ref.pow(2).sum().item()
+        noise += diff.pow(2).sum().item()
+
+    reference.train(was_training)
+
+    relative = (noise / signal) ** 0.5 if signal > 0 else float('inf')
+    sqnr = 10.0 * math.log10(signal / noise) if noise > 0 else float('inf')
+    return {
+        'max_abs_error': max_abs,
+        'mean_abs_error': abs_sum / max(count, 1),
+        'relative_error': relative,
+        'sqnr_db': sqnr,
+    }
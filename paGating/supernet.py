@@ -0,0 +1,283 @@
+"""
+Shared-projection supernet over the paGating units.
+
+Every paGating unit computes value * (α * act(gate) + 1 - α) from the same
+pair of projections; only the gate activation (and, for paGTU, a tanh on the
+value path) differs. ``paGatingSupernet`` therefore holds one set of
+projections and evaluates the units as branches on top of them:
+
+- ``forward`` runs the selected branch.
+- ``forward_all`` projects once and evaluates every branch, stacking the
+  results along a new leading dimension.
+- ``prune`` returns the concrete unit for one branch with identical outputs.
+
+This lets one training run rank all units: draw one branch per training
+step for the whole model with :func:`sample_supernet_branch` (so every step
+trains a homogeneous model of one unit on the shared weights), then evaluate
+each branch with :func:`set_supernet_branch`.
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from .activation_fns import mish
+from .base import paGatingBase
+from .norms import build_gate_norm
+from .paGELU import paGELU
+from .paGLU import paGLU
+from .paGTU import paGTU
+from .paMishU import paMishU
+from .paReGLU import paReGLU
+from .paSiLU import paSiLU
+from .paSwishU import paSwishU
+
+
+def _swish(x: torch.Tensor) -> torch.Tensor:
+    # Same expression as paSwishU with beta=1
+    return x * torch.sigmoid(1.0 * x)
+
+
+def _gelu(x: torch.Tensor) -> torch.Tensor:
+    return F.gelu(x, approximate="none")
+
+
+# Branch name -> (unit class, gate activation, tanh value path)
+SUPERNET_BRANCHES: Dict[str, Tuple[Type[paGatingBase], Callable, bool]] = {
+    'paGLU': (paGLU, F.sigmoid, False),
+    'paGTU': (paGTU, torch.tanh, True),
+    'paSwishU': (paSwishU, _swish, False),
+    'paReGLU': (paReGLU, F.relu, False),
+    'paGELU': (paGELU, _gelu, False),
+    'paMishU': (paMishU, mish, False),
+    'paSiLU': (paSiLU, F.silu, False),
+}
+
+
+class paGatingSupernet(nn.Module):
+    """paGating supernet with shared value/gate projections.
+
+    Args:
+        input_dim (int): Dimensionality of input features
+        output_dim (int): Dimensionality of output features
+        branches (Optional[Sequence[str]]): Unit names to include, a subset of
+            ``SUPERNET_BRANCHES``. Default: all units
+        alpha (Union[float, str]): Fixed α shared by all branches, or
+            "learnable" for one learnable α per branch (initialized like
+            paGatingBase)
+        use_gate_norm (Union[bool, str]): Gate normalization per branch (False, True/"layer"
+            or "rms"); the paGTU branch never normalizes, like paGTU
+        norm_eps (float): Epsilon for gate normalization
+    """
+
+    def __init__(
+        self,
+        input_dim: int,
+        output_dim: int,
+        branches: Optional[Sequence[str]] = None,
+        alpha: Union[float, str] = 0.5,
+        use_gate_norm: Union[bool, str] = False,
+        norm_eps: float = 1e-5,
+    ) -> None:
+        super().__init__()
+
+        branches = list(SUPERNET_BRANCHES) if branches is None else list(branches)
+        unknown = [name for name in branches if name not in SUPERNET_BRANCHES]
+        if unknown or not branches:
+            raise ValueError(
+                f"Unknown supernet branches {unknown}. Available options: {list(SUPERNET_BRANCHES)}"
+            )
+
+        self.input_dim = input_dim
+        self.output_dim = output_dim
+        self.branch_names: List[str] = branches
+        self.use_gate_norm = use_gate_norm
+        self.norm_eps = norm_eps
+        self.active_branch = 0
+
+        # Shared projections, laid out like a non-fused paGating unit
+        self.value_proj = nn.Linear(input_dim, output_dim)
+        self.gate_proj = nn.Linear(input_dim, output_dim)
+
+        self.gate_norms = nn.ModuleList([
+            nn.Identity() if SUPERNET_BRANCHES[name][2] or not use_gate_norm
+            else build_gate_norm(use_gate_norm, output_dim, eps=norm_eps)
+            for name in branches
+        ])
+
+        self.alpha_param = None
+        if isinstance(alpha, float):
+            if not 0 <= alpha <= 1:
+                raise ValueError(f"Alpha must be between 0 and 1, got {alpha}")
+            self.register_buffer('alpha_fixed', torch.tensor(alpha, dtype=torch.float))
+        elif alpha == "learnable":
+            self.alpha_param = nn.Parameter(torch.full((len(branches),), 0.5, dtype=torch.float))
+        else:
+            raise ValueError(f"Alpha must be a float or 'learnable'. Got {alpha!r}")
+
+    @property
+    def num_branches(self) -> int:
+        return len(self.branch_names)
+
+    def branch_index(self, branch: Union[int, str]) -> int:
+        """Resolve a branch name or index to an index."""
+        if isinstance(branch, str):
+            if branch not in self.branch_names:
+                raise ValueError(f"Unknown branch '{branch}'. Available options: {self.branch_names}")
+            return self.branch_names.index(branch)
+        if not 0 <= branch < self.num_branches:
+            raise ValueError(f"Branch index {branch} out of range for {self.num_branches} branches")
+        return branch
+
+    def set_branch(self, branch: Union[int, str]) -> None:
+        """Select the branch used by ``forward``."""
+        self.active_branch = self.branch_index(branch)
+
+    def get_alpha(self, branch: Optional[int] = None) -> torch.Tensor:
+        """Alpha of one branch, or of all branches as a vector if ``branch`` is None."""
+        if self.alpha_param is None:
+            if branch is None:
+                return self.alpha_fixed.expand(self.num_branches)
+            return self.alpha_fixed
+        alpha = torch.sigmoid(self.alpha_param)
+        return alpha if branch is None else alpha[branch]
+
+    def _branch(self, index: int, value: torch.Tensor, gate: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Value path and activated, normalized gate path of one branch."""
+        _, activation_fn, tanh_value = SUPERNET_BRANCHES[self.branch_names[index]]
+        if tanh_value:
+            value = torch.tanh(value)
+        return value, self.gate_norms[index](activation_fn(gate))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """Evaluate the active branch.
+
+        Args:
+            x (torch.Tensor): Input tensor of shape (..., input_dim)
+
+        Returns:
+            torch.Tensor: Output tensor of shape (..., output_dim)
+        """
+        index = self.active_branch
+        value, gate_activated = self._branch(index, self.value_proj(x), self.gate_proj(x))
+        alpha = self.get_alpha(index)
+        return value * (alpha * gate_activated + (1.0 - alpha))
+
+    def forward_all(self, x: torch.Tensor) -> torch.Tensor:
+        """Evaluate every branch with a single pair of projections.
+
+        Args:
+            x (torch.Tensor): Input tensor of shape (..., input_dim)
+
+        Returns:
+            torch.Tensor: Outputs of shape (num_branches, ..., output_dim), in
+            ``branch_names`` order
+        """
+        value, gate = self.value_proj(x), self.gate_proj(x)
+        paths = [self._branch(index, value, gate) for index in range(self.num_branches)]
+        values = torch.stack([path[0] for path in paths])
+        gates = torch.stack([path[1] for path in paths])
+
+        # One broadcast blend over the stacked branches
+        alpha = self.get_alpha().view(-1, *([1] * value.dim()))
+        return values * (alpha * gates + (1.0 - alpha))
+
+    def prune(self, branch: Optional[Union[int, str]] = None) -> paGatingBase:
+        """Extract one branch as a standalone paGating unit with identical outputs.
+
+        Args:
+            branch (Optional[Union[int, str]]): Branch to keep. Default: the active branch
+
+        Returns:
+            paGatingBase: Concrete unit (e.g. paGLU) holding copies of the weights
+        """
+        index = self.active_branch if branch is None else self.branch_index(branch)
+        unit_class = SUPERNET_BRANCHES[self.branch_names[index]][0]
+        alpha = "learnable" if self.alpha_param is not None else self.alpha_fixed.item()
+
+        unit = unit_class(
+            input_dim=self.input_dim,
+            output_dim=self.output_dim,
+            alpha=alpha,
+            use_gate_norm=self.use_gate_norm,
+            norm_eps=self.norm_eps,
+        ).to(device=self.value_proj.weight.device, dtype=self.value_proj.weight.dtype)
+
+        with torch.no_grad():
+            unit.value_proj.load_state_dict(self.value_proj.state_dict())
+            unit.gate_proj.load_state_dict(self.gate_proj.state_dict())
+            if unit.gate_norm is not None and not isinstance(self.gate_norms[index], nn.Identity):
+                unit.gate_norm.load_state_dict(self.gate_norms[index].state_dict())
+            if self.alpha_param is not None:
+                unit.alpha_param.copy_(self.alpha_param[index])
+            else:
+                unit.alpha_fixed.copy_(self.alpha_fixed)
+        return unit
+
+    def extra_repr(self) -> str:
+        return (
+            f'input_dim={self.input_dim}, output_dim={self.output_dim}, '
+            f'branches={self.branch_names}, active={self.branch_names[self.active_branch]}'
+        )
+
+
+def set_supernet_branch(model: nn.Module, branch: Union[int, str]) -> int:
+    """Select the same branch in every supernet of a model.
+
+    Args:
+        model (nn.Module): Model containing ``paGatingSupernet`` modules
+        branch (Union[int, str]): Branch name or index
+
+    Returns:
+        int: Number of supernets updated
+    """
+    count = 0
+    for module in model.modules():
+        if isinstance(module, paGatingSupernet):
+            module.set_branch(branch)
+            count += 1
+    return count
+
+
+def sample_supernet_branch(model: nn.Module, generator: Optional[torch.Generator] = None) -> Optional[str]:
+    """Draw one branch uniformly at random and select it in every supernet of a model.
+
+    Call once per training step, so all layers of a step use the same unit.
+
+    Args:
+        model (nn.Module): Model containing ``paGatingSupernet`` modules
+        generator (Optional[torch.Generator]): Random generator for the draw
+
+    Returns:
+        Optional[str]: Name of the drawn branch, or None if the model has no supernets
+    """
+    supernets = [module for module in model.modules() if isinstance(module, paGatingSupernet)]
+    if not supernets:
+        return None
+    branch_names = supernets[0].branch_names
+    if any(module.branch_names != branch_names for module in supernets):
+        raise ValueError("All supernets of a model must have the same branches to sample one for the model")
+
+    branch = branch_names[int(torch.randint(len(branch_names), (1,), generator=generator).item())]
+    for module in supernets:
+        module.set_branch(branch)
+    return branch
+
+
+def prune_supernets(model: nn.Module, branch: Optional[Union[int, str]] = None) -> nn.Module:
+    """Replace every supernet in a model, in place, with its pruned concrete unit.
+
+    Args:
+        model (nn.Module): Model (or single supernet) to prune
+        branch (Optional[Union[int, str]]): Branch to keep. Default: each supernet's active branch
+
+    Returns:
+        nn.Module: The pruned model
+    """
+    if isinstance(model, paGatingSupernet):
+        return model.prune(branch).train(model.training)
+    for name, child in model.named_children():
+        setattr(model, name, prune_supernets(child, branch))
+    return model
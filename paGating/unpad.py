@@ -0,0 +1,131 @@
+"""
+Padding-free token path for paGating feed-forward blocks.
+
+Feed-forward layers act on every token independently, so on a padded
+[batch, seq_len, D] batch they spend compute on pad positions whose outputs
+are never used. ``PaddingIndex`` records where the real tokens are (from an
+attention mask) and moves tensors between the padded layout and a packed
+[num_tokens, D] layout:
+
+    index = PaddingIndex(attention_mask)
+    packed = index.unpad(hidden)       # [num_tokens, D], real tokens only
+    packed = ffn(packed)               # any stack of per-token layers
+    hidden = index.repad(packed)       # [batch, seq_len, D], zeros at pads
+
+Both directions are differentiable (gather / index-copy), so the path is used
+unchanged for training and evaluation. Build the index once per batch and
+reuse it across layers; the residual stream can stay packed between
+attention layers, which are the only ones that need the padded layout.
+"""
+
+from typing import Optional
+
+import torch
+import torch.nn as nn
+
+
+class PaddingIndex:
+    """Positions of the real tokens of a padded batch.
+
+    Args:
+        attention_mask (torch.Tensor): Mask of shape (batch, seq_len), nonzero
+            (or True) for real tokens
+    """
+
+    def __init__(self, attention_mask: torch.Tensor) -> None:
+        if attention_mask.dim() != 2:
+            raise ValueError(
+                f"attention_mask must have shape (batch, seq_len), got {tuple(attention_mask.shape)}"
+            )
+        self.mask = attention_mask.bool()
+        self.batch_shape = self.mask.shape
+        self.indices = self.mask.reshape(-1).nonzero().squeeze(1)
+        self.num_tokens = self.indices.numel()
+        # Without padding the packed layout is a free reshape
+        self.dense = self.num_tokens == self.mask.numel()
+
+    @property
+    def lengths(self) -> torch.Tensor:
+        """Number of real tokens per sequence, shape (batch,)."""
+        return self.mask.sum(dim=1)
+
+    def _check(self, x: torch.Tensor) -> None:
+        if x.shape[:2] != self.batch_shape:
+            raise ValueError(
+                f"Expected input of shape {tuple(self.batch_shape)} + (...), got {tuple(x.shape)}"
+            )
+
+    def unpad(self, x: torch.Tensor) -> torch.Tensor:
+        """Gather the real tokens of a padded tensor.
+
+        Args:
+            x (torch.Tensor): Padded tensor of shape (batch, seq_len, ...)
+
+        Returns:
+            torch.Tensor: Packed tensor of shape (num_tokens, ...), in
+            row-major (batch, position) order
+        """
+        self._check(x)
+        flat = x.reshape(-1, *x.shape[2:])
+        if self.dense:
+            return flat
+        return flat.index_select(0, self.indices)
+
+    def repad(self, packed: torch.Tensor, fill_value: float = 0.0) -> torch.Tensor:
+        """Scatter packed tokens back into the padded layout.
+
+        Args:
+            packed (torch.Tensor): Packed tensor of shape (num_tokens, ...)
+            fill_value (float): Value written at pad positions
+
+        Returns:
+            torch.Tensor: Padded tensor of shape (batch, seq_len, ...)
+        """
+        if packed.shape[0] != self.num_tokens:
+            raise ValueError(f"Expected {self.num_tokens} packed tokens, got {packed.shape[0]}")
+        if self.dense:
+            return packed.reshape(*self.batch_shape, *packed.shape[1:])
+        out = packed.new_full((self.mask.numel(), *packed.shape[1:]), fill_value)
+        out = out.index_copy(0, self.indices, packed)
+        return out.reshape(*self.batch_shape, *packed.shape[1:])
+
+
+class UnpaddedFFN(nn.Module):
+    """Run a per-token module (or stack of them) on the real tokens only.
+
+    The wrapped module sees a packed [num_tokens, D] tensor; outputs at pad
+    positions are ``fill_value``. Without a mask the module runs on the padded
+    input as usual. Parameters keep their names under ``module.``.
+
+    Args:
+        module (nn.Module): Per-token module, e.g. a paGating unit or an
+            nn.Sequential of FFN layers that should stay packed together
+        fill_value (float): Output value at pad positions. Default: 0.0
+    """
+
+    def __init__(self, module: nn.Module, fill_value: float = 0.0) -> None:
+        super().__init__()
+        self.module = module
+        self.fill_value = fill_value
+
+    def forward(
+        self,
+        x: torch.Tensor,
+        attention_mask: Optional[torch.Tensor] = None,
+        padding_index: Optional[PaddingIndex] = None,
+    ) -> torch.Tensor:
+        """
+        Args:
+            x (torch.Tensor): Input of shape (batch, seq_len, D)
+            attention_mask (Optional[torch.Tensor]): (batch, seq_len) mask of real tokens
+            padding_index (Optional[PaddingIndex]): Prebuilt index, shared across
+                layers; takes precedence over ``attention_mask``
+
+        Returns:
+            torch.Tensor: Output of shape (batch, seq_len, D_out)
+        """
+        if padding_index is None:
+            if attention_mask is None:
+                return self.module(x)
+            padding_index = PaddingIndex(attention_mask)
+        return padding_index.repad(self.module(padding_index.unpad(x)), self.fill_value)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+"""
+Asynchronous successive halving (ASHA) for training sweeps.
+
+Every configuration of a sweep starts with the full training budget. Rungs
+are placed at ``grace_period * reduction_factor**k`` epochs (or steps); when a
+run reaches a rung, its validation metric is compared with those of all runs
+that reached the rung before it, and the run is terminated unless it is in the
+top ``1 / reduction_factor`` of them. No run ever waits for a rung to fill up,
+so workers stay busy, and only promising configurations train to the end.
+
+The metric is read from the CSV file each training run already writes after
+every evaluation (MetricsCsvLogger for the CIFAR-10 scripts), so training
+scripts need no changes beyond writing that file.
+
+Example:
+    scheduler = ASHAScheduler(max_t=50, grace_period=1, reduction_factor=3)
+    results = run_asha_jobs(jobs, scheduler, metric="val_loss", num_workers=4)
+"""
+
+import csv
+import glob
+import math
+import os
+import subprocess
+import time
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+# Seconds between checks of the running jobs' metrics files
+_POLL_INTERVAL = 5.0
+
+# Seconds a terminated job gets to exit before it is killed
+_TERMINATE_TIMEOUT = 30.0
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    # Linear interpolation between closest ranks, as numpy.percentile
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class ASHAScheduler:
+    """
+    Stopping decisions of asynchronous successive halving.
+
+    Args:
+        max_t: Training budget of a full run (epochs or steps)
+        grace_period: Budget of the first rung; no run is stopped before it (default: 1)
+        reduction_factor: Only the top 1/reduction_factor of the runs at a rung
+            continue (default: 3)
+        mode: "min" if lower metric values are better (losses), "max" otherwise
+    """
+
+    def __init__(self, max_t: int, grace_period: int = 1, reduction_factor: float = 3, mode: str = "min"):
+        if grace_period < 1 or grace_period > max_t:
+            raise ValueError(f"grace_period must be in [1, max_t={max_t}], got {grace_period}")
+        if reduction_factor <= 1:
+            raise ValueError(f"reduction_factor must be greater than 1, got {reduction_factor}")
+        if mode not in ("min", "max"):
+            raise ValueError(f"mode must be 'min' or 'max', got {mode!r}")
+
+        self.max_t = max_t
+        self.grace_period = grace_period
+        self.reduction_factor = reduction_factor
+        self.mode = mode
+
+        self.rungs: List[int] = []
+        milestone = grace_period
+        while milestone < max_t:
+            self.rungs.append(int(milestone))
+            milestone *= reduction_factor
+        # Scores (higher is better) recorded at each rung, by trial
+        self._recorded: Dict[int, Dict[Hashable, float]] = {rung: {} for rung in self.rungs}
+        self._stopped: Dict[Hashable, int] = {}
+
+    def cutoff(self, rung: int) -> Optional[float]:
+        """Score a run needs at ``rung`` to continue (None while the rung is empty)."""
+        scores = list(self._recorded[rung].values())
+        if not scores:
+            return None
+        return _percentile(scores, (1 - 1 / self.reduction_factor) * 100)
+
+    def on_result(self, trial_id: Hashable, t: int, value: Optional[float]) -> bool:
+        """
+        Record a run's validation metric after ``t`` epochs (or steps).
+
+        Args:
+            trial_id: Identifier of the run
+            t: Training progress of the result
+            value: Metric value (None or NaN for a diverged run)
+
+        Returns:
+            Whether the run should continue
+        """
+        if trial_id in self._stopped:
+            return False
+        if value is None or math.isnan(value):
+            score = -math.inf
+        else:
+            score = -value if self.mode == "min" else value
+
+        for rung in reversed(self.rungs):
+            if t < rung or trial_id in self._recorded[rung]:
+                continue
+            cutoff = self.cutoff(rung)
+            self._recorded[rung][trial_id] = score
+            if score == -math.inf or (cutoff is not None and score < cutoff):
+                self._stopped[trial_id] = rung
+                return False
+            break
+        return True
+
+    def stopped_at(self, trial_id: Hashable) -> Optional[int]:
+        """Rung at which a run was stopped, or None."""
+        return self._stopped.get(trial_id)
+
+    def summary(self) -> Dict[int, int]:
+        """Number of runs that reached each rung."""
+        return {rung: len(recorded) for rung, recorded in self._recorded.items()}
+
+
+def read_metric_history(pattern: str, metric: str, time_column: str = "epoch") -> Tuple[Optional[str], List[Tuple[int, float]]]:
+    """
+    Metric values logged so far by one run.
+
+    Args:
+        pattern: Path (or glob pattern) of the run's metrics CSV; the most
+            recently modified match is read
+        metric: Metric column, e.g. "val_loss"
+        time_column: Progress column, e.g. "epoch" or "step"
+
+    Returns:
+        Tuple of (CSV path or None, [(t, value), ...] in file order)
+    """
+    paths = glob.glob(pattern)
+    if not paths:
+        return None, []
+    path = max(paths, key=os.path.getmtime)
+    history = []
+    try:
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get(metric) not in (None, "") and row.get(time_column) not in (None, ""):
+                    history.append((int(float(row[time_column])), float(row[metric])))
+    except (OSError, ValueError):
+        # Unreadable right now; retried on the next poll
+        return path, []
+    return path, history
+
+
+def run_asha_jobs(
+    jobs: Sequence[Dict],
+    scheduler: ASHAScheduler,
+    metric: str,
+    time_column: str = "epoch",
+    num_workers: int = 1,
+    poll_interval: float = _POLL_INTERVAL,
+) -> List[Dict]:
+    """
+    Run training commands as subprocesses and terminate the runs ASHA stops.
+
+    Args:
+        jobs: Job specifications with ``cmd`` (argument list) and ``metrics_csv``
+            (path or glob pattern of the run's metrics file), and optionally
+            ``trial_id`` (default: index), ``env`` and ``log_path`` (stdout/stderr)
+        scheduler: ASHAScheduler making the stopping decisions
+        metric: Metric column compared at the rungs
+        time_column: Progress column of the metrics file
+        num_workers: Number of jobs running at the same time
+        poll_interval: Seconds between checks of the metrics files
+
+    Returns:
+        One dictionary per job, in order, with ``returncode``, ``stopped``
+        (terminated by the scheduler), ``metrics_csv``, ``last_t``,
+        ``last_value``, ``runtime_sec``, ``start_time`` and ``end_time``
+    """
+    if num_workers < 1:
+        raise ValueError(f"num_workers must be positive, got {num_workers}")
+
+    results: List[Optional[Dict]] = [None] * len(jobs)
+    queue = list(range(len(jobs)))
+    running: Dict[int, Dict] = {}
+
+    def report(index: int, state: Dict) -> bool:
+        """Feed new metric values to the scheduler; False once the run is stopped."""
+        job = jobs[index]
+        path, history = read_metric_history(job["metrics_csv"], metric, time_column)
+        keep_going = True
+        for t, value in history:
+            if t <= state["last_t"]:
+                continue
+            state.update(metrics_csv=path, last_t=t, last_value=value)
+            keep_going = scheduler.on_result(job.get("trial_id", index), t, value) and keep_going
+            if not keep_going:
+                break
+        return keep_going
+
+    while queue or running:
+        while queue and len(running) < num_workers:
+            index = queue.pop(0)
+            job = jobs[index]
+            log = open(job["log_path"], "w") if job.get("log_path") else None
+            process = subprocess.Popen(
+                job["cmd"], env=job.get("env"), stdout=log,
+                stderr=subprocess.STDOUT if log else None,
+            )
+            running[index] = {
+                "process": process, "log": log, "start": time.time(),
+                "metrics_csv": None, "last_t": 0, "last_value": None, "stopped": False,
+            }
+
+        time.sleep(poll_interval)
+        for index, state in list(running.items()):
+            process = state["process"]
+            finished = process.poll() is not None
+            if not report(index, state) and not finished:
+                process.terminate()
+                try:
+                    process.wait(timeout=_TERMINATE_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+                state["stopped"] = True
+                finished = True
+            if not finished:
+                continue
+
+            # Values written just before exit still count towards the rungs
+            report(index, state)
+            if state["log"] is not None:
+                state["log"].close()
+            end = time.time()
+            results[index] = {
+                "returncode": process.returncode,
+                "stopped": state["stopped"],
+                "metrics_csv": state["metrics_csv"],
+                "last_t": state["last_t"],
+                "last_value": state["last_value"],
+                "runtime_sec": end - state["start"],
+                "start_time": state["start"],
+                "end_time": end,
+            }
+            del running[index]
+
+    return results
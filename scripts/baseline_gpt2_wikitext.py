@@ -1,32 +1,22 @@
 #!/usr/bin/env python3.12
-from transformers import GPT2Tokenizer, GPT2LMHeadModel, DataCollatorForLanguageModeling, Trainer, TrainingArguments
-from datasets import load_dataset
+import os
+import sys
+
+from transformers import GPT2LMHeadModel, Trainer, TrainingArguments, default_data_collator
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from datamodules.wikitext_cache import load_packed_wikitext
 
 def main():
-    # 1. Load WikiText-103
-    dataset = load_dataset("wikitext", "wikitext-103-raw-v1")
+    # 1. Load WikiText-103, tokenized once and packed into 512-token blocks
+    train_dataset = load_packed_wikitext("train", block_size=512)
+    eval_dataset = load_packed_wikitext("validation", block_size=512)
     # 2. Initialize GPT-2 small
-    tokenizer = GPT2Tokenizer.from_pretrained("gpt2")
     model = GPT2LMHeadModel.from_pretrained("gpt2")
 
-    # Set pad_token if not already set (common for GPT-2)
-    if tokenizer.pad_token is None:
-        tokenizer.pad_token = tokenizer.eos_token
-    
-    # 3. Tokenize
-    def tokenize_fn(examples):
-        return tokenizer(examples["text"], return_special_tokens_mask=True, truncation=True, max_length=512)
-    tokenized_dataset = dataset.map(tokenize_fn, batched=True, remove_columns=["text"])
-
-    # Filter out empty sequences
-    def filter_empty_sequences(examples):
-        return [len(x) > 0 for x in examples["input_ids"]]
-
-    filtered_tokenized_dataset = tokenized_dataset.filter(filter_empty_sequences, batched=True)
-
-    # 4. Data collator
-    data_collator = DataCollatorForLanguageModeling(tokenizer, mlm=False)
-    # 5. Training arguments
+    # 3. Packed blocks carry their labels, so no padding or LM collator is needed
+    data_collator = default_data_collator
+    # 4. Training arguments
     training_args = TrainingArguments(
         output_dir="logs/phase1_baseline",              # store metrics & checkpoints here
         per_device_train_batch_size=1,
@@ -39,15 +29,15 @@ def main():
         save_steps=500,
         evaluation_strategy="steps",
     )
-    # 6. Trainer
+    # 5. Trainer
     trainer = Trainer(
         model=model,
         args=training_args,
-        train_dataset=filtered_tokenized_dataset["train"],
-        eval_dataset=filtered_tokenized_dataset["validation"],
+        train_dataset=train_dataset,
+        eval_dataset=eval_dataset,
         data_collator=data_collator,
     )
-    # 7. Run
+    # 6. Run
     trainer.train()
     trainer.save_model("outputs/baseline_gpt2_final")
 
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+Benchmark feature-map layouts for paActivationBlock.
+
+This script times the activation blocks of paCIFARClassifier at every stage
+(64@32x32, 128@16x16, 256@8x8, 512@4x4 for CIFAR-sized inputs) using three
+ways of feeding a convolutional feature map to a paGating unit:
+
+    flatten   legacy [B, C, H*W] -> [B, H*W, C] transpose round-trip
+    nhwc      unit applied to the NHWC view of a channels-last input
+    conv1x1   value/gate projections run as one fused 1x1 convolution
+
+Usage:
+    python benchmark_activation_layouts.py --unit paGLU --batch-size 128 --backward
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+import torch
+import torch.nn.functional as F
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from paGating import paGTU, PrePostNormWrapper
+from models.pa_cifar_classifier import create_model, paActivationBlock
+
+
+LAYOUTS = ["flatten", "nhwc", "conv1x1"]
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark paActivationBlock feature-map layouts")
+    parser.add_argument("--unit", type=str, default="paGLU", help="paGating unit to benchmark")
+    parser.add_argument("--alpha", type=float, default=0.5, help="Fixed alpha value")
+    parser.add_argument("--batch-size", type=int, default=128, help="Batch size")
+    parser.add_argument("--image-size", type=int, default=32, help="Input image height/width")
+    parser.add_argument("--warmup", type=int, default=5, help="Warmup iterations")
+    parser.add_argument("--iters", type=int, default=20, help="Timed iterations")
+    parser.add_argument("--backward", action="store_true", help="Time forward + backward")
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads value")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="benchmarks/activation_layouts.json",
+        help="Path of the JSON results file"
+    )
+    return parser.parse_args()
+
+
+def conv1x1_fn(block: paActivationBlock) -> Callable[[torch.Tensor], torch.Tensor]:
+    """Build a 1x1-convolution forward equivalent to a plain activation block.
+
+    Only blocks without GateNorm or pre/post normalization can be expressed
+    this way, because those normalize over the channel dimension.
+    """
+    unit = block.pa_unit
+    if isinstance(block.module, PrePostNormWrapper) or unit.gate_norm is not None:
+        raise ValueError("conv1x1 layout does not support normalization")
+
+    if unit.fused_proj is not None:
+        weight, bias = unit.fused_proj.weight, unit.fused_proj.bias
+    else:
+        weight = torch.cat([unit.value_proj.weight, unit.gate_proj.weight], dim=0)
+        bias = torch.cat([unit.value_proj.bias, unit.gate_proj.bias], dim=0)
+    # Standalone leaf tensors so repeated backward passes do not share a graph
+    weight = weight.detach()[:, :, None, None].contiguous().requires_grad_(True)
+    bias = bias.detach().clone().requires_grad_(True)
+    is_gtu = isinstance(unit, paGTU)
+
+    def forward(x: torch.Tensor) -> torch.Tensor:
+        value, gate = F.conv2d(x, weight, bias).chunk(2, dim=1)
+        if is_gtu:
+            value = torch.tanh(value)
+        alpha = unit.get_alpha(x)
+        return value * (alpha * unit.activation_fn(gate) + (1.0 - alpha))
+
+    return forward
+
+
+def time_fn(fn: Callable, x: torch.Tensor, warmup: int, iters: int, backward: bool) -> float:
+    """Return the mean wall-clock time per call in milliseconds."""
+    def step():
+        if backward:
+            inp = x.detach().requires_grad_(True)
+            fn(inp).sum().backward()
+        else:
+            with torch.no_grad():
+                fn(x)
+
+    for _ in range(warmup):
+        step()
+
+    start = time.perf_counter()
+    for _ in range(iters):
+        step()
+    return (time.perf_counter() - start) / iters * 1000.0
+
+
+def benchmark_stages(args) -> List[Dict]:
+    """Time every layout at every paCIFARClassifier stage."""
+    model = create_model(args.unit, alpha=args.alpha)
+    blocks = [model.pablock1, model.pablock2, model.pablock3, model.pablock4]
+
+    results = []
+    size = args.image_size
+    for stage, block in enumerate(blocks, start=1):
+        x = torch.randn(args.batch_size, block.in_channels, size, size)
+        x_channels_last = x.contiguous(memory_format=torch.channels_last)
+
+        def flatten_fn(inp, block=block):
+            block.layout = "flatten"
+            return block(inp)
+
+        def nhwc_fn(inp, block=block):
+            block.layout = "nhwc"
+            return block(inp)
+
+        candidates = {
+            "flatten": (flatten_fn, x),
+            "nhwc": (nhwc_fn, x_channels_last),
+            "conv1x1": (conv1x1_fn(block), x),
+        }
+
+        row = {
+            "stage": stage,
+            "channels": block.in_channels,
+            "spatial": size,
+        }
+        for layout in LAYOUTS:
+            fn, inp = candidates[layout]
+            row[f"{layout}_ms"] = time_fn(fn, inp, args.warmup, args.iters, args.backward)
+        results.append(row)
+
+        block.layout = "nhwc"
+        size //= 2
+
+    return results
+
+
+def main():
+    args = parse_args()
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+
+    results = benchmark_stages(args)
+
+    mode = "forward+backward" if args.backward else "forward"
+    print(f"\n{args.unit} (alpha={args.alpha}), batch={args.batch_size}, {mode}")
+    header = f"{'stage':>5} {'C':>5} {'HxW':>7} " + " ".join(f"{layout + ' ms':>12}" for layout in LAYOUTS)
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        cells = " ".join(f"{row[layout + '_ms']:>12.3f}" for layout in LAYOUTS)
+        print(f"{row['stage']:>5} {row['channels']:>5} {row['spatial']:>3}x{row['spatial']:<3} {cells}")
+
+    totals = {layout: sum(row[f"{layout}_ms"] for row in results) for layout in LAYOUTS}
+    print("total " + " ".join(f"{layout}={ms:.3f}ms" for layout, ms in totals.items()))
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({
+            "unit": args.unit,
+            "alpha": args.alpha,
+            "batch_size": args.batch_size,
+            "mode": mode,
+            "threads": torch.get_num_threads(),
+            "stages": results,
+            "totals_ms": totals,
+        }, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
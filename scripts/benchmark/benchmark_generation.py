@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+"""
+Autoregressive generation benchmark for paGating-patched GPT-2.
+
+For the unpatched baseline and every requested alpha mode this script:
+
+    1. checks that incremental decoding with the KV cache reproduces
+       cache-free greedy decoding with the patched MLP,
+    2. times the prefill (one forward over the prompt) and the decode loop
+       (one token per step reusing ``past_key_values``) separately,
+    3. reports tokens/sec over a grid of batch sizes and prompt lengths.
+
+With ``--freeze`` the patched models are passed through ``paGating.freeze``
+first, which folds α into the units and fuses their projections; this is the
+recommended inference path for fixed and learnable α.
+
+Results are written as JSON so they can be tracked over time.
+
+Usage:
+    python benchmark_generation.py --modes baseline static_0.5 learnable --batch-sizes 1 8 --freeze
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import torch
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from transformers import GPT2LMHeadModel
+
+from models.gpt2_pagating_patch import patch_gpt2_with_pagating
+from paGating import freeze
+
+
+DEFAULT_MODES = ["baseline", "static_0.5", "learnable", "scheduler_cosine"]
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark generation latency of paGating GPT-2")
+    parser.add_argument("--model-name", type=str, default="gpt2", help="Pretrained GPT-2 checkpoint")
+    parser.add_argument("--cache-dir", type=str, default=os.path.abspath('.cache'), help="HF cache directory")
+    parser.add_argument("--modes", nargs="+", default=DEFAULT_MODES,
+                        help="'baseline' and/or alpha modes accepted by patch_gpt2_with_pagating")
+    parser.add_argument("--mlp-mode", choices=["stacked", "replace"], default="stacked", help="Patched MLP layout")
+    parser.add_argument("--param-matched", action="store_true", help="Parameter-matched d_ff (replace mode)")
+    parser.add_argument("--freeze", action="store_true", help="Freeze patched models before benchmarking")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 4, 16], help="Batch sizes")
+    parser.add_argument("--prompt-lengths", nargs="+", type=int, default=[32, 128, 512], help="Prompt lengths")
+    parser.add_argument("--new-tokens", type=int, default=64, help="Tokens generated per sequence")
+    parser.add_argument("--warmup", type=int, default=2, help="Warmup repetitions")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repetitions")
+    parser.add_argument("--device", type=str, default=None, help="cuda, mps or cpu (default: best available)")
+    parser.add_argument("--dtype", choices=["float32", "float16", "bfloat16"], default="float32")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="benchmarks/generation.json",
+        help="Path of the JSON results file"
+    )
+    return parser.parse_args()
+
+
+def get_device(requested: str = None) -> torch.device:
+    """Pick the requested device or the best available one."""
+    if requested:
+        return torch.device(requested)
+    if torch.cuda.is_available():
+        return torch.device("cuda")
+    if torch.backends.mps.is_available():
+        return torch.device("mps")
+    return torch.device("cpu")
+
+
+def synchronize(device: torch.device) -> None:
+    """Wait for queued kernels so wall-clock timings are meaningful."""
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    elif device.type == "mps":
+        torch.mps.synchronize()
+
+
+def build_model(args, mode: str, device: torch.device, dtype: torch.dtype) -> GPT2LMHeadModel:
+    """Load GPT-2 and patch it for ``mode`` ('baseline' leaves it unpatched)."""
+    model = GPT2LMHeadModel.from_pretrained(args.model_name, cache_dir=args.cache_dir)
+    if mode != "baseline":
+        patch_gpt2_with_pagating(model, mode, mlp_mode=args.mlp_mode, param_matched=args.param_matched)
+        if args.freeze:
+            model = freeze(model, inplace=True)
+    return model.to(device=device, dtype=dtype).eval()
+
+
+@torch.inference_mode()
+def greedy_decode(model, input_ids: torch.Tensor, new_tokens: int, use_cache: bool) -> torch.Tensor:
+    """Greedy decoding with or without the KV cache; returns the generated ids."""
+    generated = []
+    if use_cache:
+        out = model(input_ids=input_ids, use_cache=True)
+        past = out.past_key_values
+        next_token = out.logits[:, -1].argmax(dim=-1, keepdim=True)
+        generated.append(next_token)
+        for _ in range(new_tokens - 1):
+            out = model(input_ids=next_token, past_key_values=past, use_cache=True)
+            past = out.past_key_values
+            next_token = out.logits[:, -1].argmax(dim=-1, keepdim=True)
+            generated.append(next_token)
+    else:
+        ids = input_ids
+        for _ in range(new_tokens):
+            logits = model(input_ids=ids, use_cache=False).logits
+            next_token = logits[:, -1].argmax(dim=-1, keepdim=True)
+            generated.append(next_token)
+            ids = torch.cat([ids, next_token], dim=1)
+    return torch.cat(generated, dim=1)
+
+
+def check_kv_cache(model, device: torch.device, vocab_size: int, seed: int) -> bool:
+    """Whether cached incremental decoding matches full recomputation."""
+    generator = torch.Generator().manual_seed(seed)
+    input_ids = torch.randint(0, vocab_size, (2, 16), generator=generator).to(device)
+    cached = greedy_decode(model, input_ids, new_tokens=8, use_cache=True)
+    uncached = greedy_decode(model, input_ids, new_tokens=8, use_cache=False)
+    return bool(torch.equal(cached, uncached))
+
+
+@torch.inference_mode()
+def time_generation(model, input_ids: torch.Tensor, new_tokens: int, device: torch.device) -> Dict[str, float]:
+    """Time the prefill and the cached decode loop of one generation."""
+    synchronize(device)
+    start = time.perf_counter()
+    out = model(input_ids=input_ids, use_cache=True)
+    past = out.past_key_values
+    next_token = out.logits[:, -1].argmax(dim=-1, keepdim=True)
+    synchronize(device)
+    prefill = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(new_tokens - 1):
+        out = model(input_ids=next_token, past_key_values=past, use_cache=True)
+        past = out.past_key_values
+        next_token = out.logits[:, -1].argmax(dim=-1, keepdim=True)
+    synchronize(device)
+    decode = time.perf_counter() - start
+
+    return {"prefill_s": prefill, "decode_s": decode}
+
+
+def benchmark_mode(args, mode: str, device: torch.device, dtype: torch.dtype) -> Dict:
+    """Benchmark one model configuration over the batch/prompt grid."""
+    model = build_model(args, mode, device, dtype)
+    vocab_size = model.config.vocab_size
+    max_positions = model.config.n_positions
+
+    result = {
+        "mode": mode,
+        "parameters": sum(p.numel() for p in model.parameters()),
+        "kv_cache_consistent": check_kv_cache(model, device, vocab_size, args.seed),
+        "runs": [],
+    }
+
+    generator = torch.Generator().manual_seed(args.seed)
+    for batch_size in args.batch_sizes:
+        for prompt_length in args.prompt_lengths:
+            if prompt_length + args.new_tokens > max_positions:
+                print(f"  skipping prompt_length={prompt_length}: exceeds {max_positions} positions")
+                continue
+            input_ids = torch.randint(0, vocab_size, (batch_size, prompt_length), generator=generator).to(device)
+
+            for _ in range(args.warmup):
+                time_generation(model, input_ids, args.new_tokens, device)
+            timings = [time_generation(model, input_ids, args.new_tokens, device) for _ in range(args.repeats)]
+
+            prefill = sum(t["prefill_s"] for t in timings) / len(timings)
+            decode = sum(t["decode_s"] for t in timings) / len(timings)
+            decode_steps = max(args.new_tokens - 1, 1)
+            run = {
+                "batch_size": batch_size,
+                "prompt_length": prompt_length,
+                "new_tokens": args.new_tokens,
+                "prefill_ms": prefill * 1000.0,
+                "decode_ms_per_token": decode / decode_steps * 1000.0,
+                "prefill_tokens_per_s": batch_size * prompt_length / prefill,
+                "decode_tokens_per_s": batch_size * decode_steps / decode if decode > 0 else float("inf"),
+                "end_to_end_tokens_per_s": batch_size * args.new_tokens / (prefill + decode),
+            }
+            result["runs"].append(run)
+            print(
+                f"  {mode:>18} bs={batch_size:<3} prompt={prompt_length:<4} "
+                f"prefill={run['prefill_ms']:8.2f}ms decode={run['decode_ms_per_token']:7.2f}ms/tok "
+                f"{run['decode_tokens_per_s']:9.1f} tok/s"
+            )
+
+    del model
+    return result
+
+
+def main():
+    args = parse_args()
+    torch.manual_seed(args.seed)
+    device = get_device(args.device)
+    dtype = getattr(torch, args.dtype)
+
+    print(f"Benchmarking generation on {device} ({args.dtype})")
+    results: List[Dict] = []
+    for mode in args.modes:
+        print(f"\n=== {mode} ===")
+        result = benchmark_mode(args, mode, device, dtype)
+        if not result["kv_cache_consistent"]:
+            print(f"  WARNING: cached decoding diverges from full recomputation for {mode}")
+        results.append(result)
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "model_name": args.model_name,
+            "device": str(device),
+            "dtype": args.dtype,
+            "torch_version": torch.__version__,
+            "platform": platform.platform(),
+            "mlp_mode": args.mlp_mode,
+            "param_matched": args.param_matched,
+            "frozen": args.freeze,
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+"""
+Throughput benchmark: paTransformer vs. an equivalent GELU-MLP transformer.
+
+Every configuration shares d_model, heads, layers and attention; only the FFN
+differs. By default the gated FFNs use ``gated_d_ff(d_model)`` and the GELU
+baseline 4 * d_model, so parameter counts match. For each model it reports:
+
+    train     tokens/s of a full forward + backward + optimizer step
+    forward   tokens/s of an inference forward over the whole sequence
+    decode    tokens/s of cached single-token decoding (causal models)
+
+With ``--freeze`` the paGating models are passed through ``paGating.freeze``
+before the inference measurements.
+
+Usage:
+    python benchmark_transformer.py --units paGLU paGELU --d-model 512 --n-layers 6 --seq-len 256
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import torch
+import torch.nn.functional as F
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from models.paTransformer import paTransformer, paTransformerConfig
+from paGating import freeze
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark paTransformer against a GELU-MLP transformer")
+    parser.add_argument("--units", nargs="+", default=["paGLU", "paGELU", "paSwishU"], help="paGating units")
+    parser.add_argument("--alpha", type=str, default="0.5", help="Fixed alpha or 'learnable'")
+    parser.add_argument("--d-model", type=int, default=512, help="Model dimension")
+    parser.add_argument("--n-heads", type=int, default=8, help="Attention heads")
+    parser.add_argument("--n-layers", type=int, default=6, help="Number of blocks")
+    parser.add_argument("--d-ff", type=int, default=None, help="FFN hidden size for all models (default: parameter-matched)")
+    parser.add_argument("--vocab-size", type=int, default=32000, help="Vocabulary size")
+    parser.add_argument("--batch-size", type=int, default=8, help="Batch size")
+    parser.add_argument("--seq-len", type=int, default=256, help="Sequence length")
+    parser.add_argument("--new-tokens", type=int, default=32, help="Tokens per cached decode measurement")
+    parser.add_argument("--encoder", action="store_true", help="Non-causal blocks (no decode measurement)")
+    parser.add_argument("--freeze", action="store_true", help="Freeze paGating models for inference")
+    parser.add_argument("--warmup", type=int, default=2, help="Warmup repetitions")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repetitions")
+    parser.add_argument("--device", type=str, default=None, help="cuda, mps or cpu (default: best available)")
+    parser.add_argument("--dtype", choices=["float32", "float16", "bfloat16"], default="float32")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="benchmarks/transformer_throughput.json",
+        help="Path of the JSON results file"
+    )
+    return parser.parse_args()
+
+
+def get_device(requested: str = None) -> torch.device:
+    """Pick the requested device or the best available one."""
+    if requested:
+        return torch.device(requested)
+    if torch.cuda.is_available():
+        return torch.device("cuda")
+    if torch.backends.mps.is_available():
+        return torch.device("mps")
+    return torch.device("cpu")
+
+
+def synchronize(device: torch.device) -> None:
+    """Wait for queued kernels so wall-clock timings are meaningful."""
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    elif device.type == "mps":
+        torch.mps.synchronize()
+
+
+def time_call(fn: Callable[[], None], device: torch.device, warmup: int, repeats: int) -> float:
+    """Mean wall-clock seconds per call."""
+    for _ in range(warmup):
+        fn()
+    synchronize(device)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    synchronize(device)
+    return (time.perf_counter() - start) / repeats
+
+
+def build_config(args, name: str) -> paTransformerConfig:
+    """Configuration for the 'gelu' baseline or a paGating unit."""
+    alpha = args.alpha if args.alpha == "learnable" else float(args.alpha)
+    return paTransformerConfig(
+        d_model=args.d_model,
+        n_heads=args.n_heads,
+        n_layers=args.n_layers,
+        d_ff=args.d_ff,
+        unit=name if name != "gelu" else "paGLU",
+        alpha=alpha,
+        ffn_type="gelu" if name == "gelu" else "pagating",
+        causal=not args.encoder,
+        vocab_size=args.vocab_size,
+        max_seq_len=args.seq_len + args.new_tokens,
+    )
+
+
+def benchmark_model(args, name: str, device: torch.device, dtype: torch.dtype) -> Dict:
+    """Measure train, forward and decode throughput of one model."""
+    config = build_config(args, name)
+    model = paTransformer(config).to(device=device, dtype=dtype)
+    optimizer = torch.optim.AdamW(model.parameters(), lr=1e-4)
+
+    generator = torch.Generator().manual_seed(args.seed)
+    input_ids = torch.randint(0, args.vocab_size, (args.batch_size, args.seq_len), generator=generator).to(device)
+    tokens = args.batch_size * args.seq_len
+
+    def train_step():
+        logits = model(input_ids)
+        loss = F.cross_entropy(logits[:, :-1].flatten(0, 1).float(), input_ids[:, 1:].flatten())
+        optimizer.zero_grad(set_to_none=True)
+        loss.backward()
+        optimizer.step()
+
+    model.train()
+    train_s = time_call(train_step, device, args.warmup, args.repeats)
+
+    model.eval()
+    if args.freeze and name != "gelu":
+        model = freeze(model, inplace=True)
+
+    @torch.inference_mode()
+    def forward():
+        model(input_ids)
+
+    forward_s = time_call(forward, device, args.warmup, args.repeats)
+
+    result = {
+        "model": name,
+        "d_ff": config.d_ff,
+        "parameters": sum(p.numel() for p in model.parameters()),
+        "train_tokens_per_s": tokens / train_s,
+        "forward_tokens_per_s": tokens / forward_s,
+    }
+
+    if config.causal:
+        @torch.inference_mode()
+        def decode():
+            cache = model.init_cache()
+            logits = model(input_ids, cache=cache)
+            next_token = logits[:, -1].argmax(dim=-1, keepdim=True)
+            for _ in range(args.new_tokens):
+                logits = model(next_token, cache=cache)
+                next_token = logits[:, -1].argmax(dim=-1, keepdim=True)
+
+        @torch.inference_mode()
+        def prefill():
+            model(input_ids, cache=model.init_cache())
+
+        # Decode time excludes the prefill that seeds the cache
+        decode_s = time_call(decode, device, args.warmup, args.repeats) - time_call(
+            prefill, device, args.warmup, args.repeats
+        )
+        result["decode_tokens_per_s"] = args.batch_size * args.new_tokens / max(decode_s, 1e-9)
+
+    del model, optimizer
+    return result
+
+
+def main():
+    args = parse_args()
+    torch.manual_seed(args.seed)
+    device = get_device(args.device)
+    dtype = getattr(torch, args.dtype)
+
+    print(f"Benchmarking on {device} ({args.dtype}): d_model={args.d_model}, layers={args.n_layers}, "
+          f"batch={args.batch_size}, seq_len={args.seq_len}")
+    results: List[Dict] = []
+    for name in ["gelu"] + args.units:
+        result = benchmark_model(args, name, device, dtype)
+        results.append(result)
+
+    baseline = results[0]
+    header = f"{'model':>10} {'d_ff':>6} {'params':>12} {'train tok/s':>12} {'fwd tok/s':>12} {'decode tok/s':>13} {'train x':>8}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        result["train_speedup_vs_gelu"] = result["train_tokens_per_s"] / baseline["train_tokens_per_s"]
+        decode = result.get("decode_tokens_per_s")
+        print(
+            f"{result['model']:>10} {result['d_ff']:>6} {result['parameters']:>12,} "
+            f"{result['train_tokens_per_s']:>12.1f} {result['forward_tokens_per_s']:>12.1f} "
+            f"{decode if decode is not None else float('nan'):>13.1f} {result['train_speedup_vs_gelu']:>8.2f}"
+        )
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "device": str(device),
+            "dtype": args.dtype,
+            "torch_version": torch.__version__,
+            "platform": platform.platform(),
+            "config": vars(args),
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
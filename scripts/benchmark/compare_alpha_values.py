@@ -4,13 +4,25 @@ Compare performance of a paGating unit with different alpha values.
 
 This script runs training for a specific paGating unit with different alpha 
 values and compares their performance.
+
+With --sensitivity it instead evaluates one untrained unit for every alpha in
+a single forward pass (``forward_alpha_grid``) and plots how the output
+statistics change with alpha. Training runs stay one per alpha, since each
+alpha trains different weights.
 """
 
+import argparse
 import os
 import sys
 import subprocess
 import matplotlib.pyplot as plt
 import numpy as np
+import torch
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from paGating import activation_map
 
 # Configuration
 UNIT = "paMishU"  # The unit to test with different alpha values
@@ -80,5 +92,44 @@ def compare_alpha_values():
     plt.savefig(output_path)
     print(f"Comparison chart saved as '{output_path}'")
 
+def compare_alpha_sensitivity(unit=UNIT, alphas=ALPHAS, batch_size=256, dim=128):
+    """Plot output statistics of one unit across alpha values from a single forward."""
+    torch.manual_seed(42)
+    model = activation_map[unit](input_dim=dim, output_dim=dim, alpha=0.5).eval()
+    x = torch.randn(batch_size, dim)
+    
+    with torch.no_grad():
+        outputs = model.forward_alpha_grid(x, alphas)  # [len(alphas), batch_size, dim]
+    flat = outputs.reshape(len(alphas), -1)
+    means = flat.mean(dim=1).tolist()
+    stds = flat.std(dim=1).tolist()
+    
+    for alpha, mean, std in zip(alphas, means, stds):
+        print(f"{unit} alpha={alpha}: output mean={mean:.4f}, std={std:.4f}")
+    
+    plt.figure(figsize=(10, 6))
+    plt.plot(alphas, means, 'o-', linewidth=2, markersize=8, label='mean')
+    plt.plot(alphas, stds, 's-', linewidth=2, markersize=8, label='std')
+    plt.xlabel('Alpha Value')
+    plt.ylabel('Output Statistic')
+    plt.title(f'Output Sensitivity of {unit} to Alpha')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.xticks(alphas)
+    plt.legend()
+    plt.tight_layout()
+    
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    output_path = os.path.join(script_dir, f'{unit}_alpha_sensitivity.png')
+    plt.savefig(output_path)
+    print(f"Sensitivity chart saved as '{output_path}'")
+
 if __name__ == "__main__":
-    compare_alpha_values() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Compare a paGating unit across alpha values")
+    parser.add_argument("--sensitivity", action="store_true",
+                        help="Evaluate all alphas with one forward of an untrained unit instead of training")
+    args = parser.parse_args()
+    
+    if args.sensitivity:
+        compare_alpha_sensitivity()
+    else:
+        compare_alpha_values() 
\ No newline at end of file
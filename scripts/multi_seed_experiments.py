@@ -4,6 +4,10 @@ Multi-Seed Experimental Framework for paGLU Research
 
 This script runs comprehensive experiments with multiple seeds, baselines, and datasets
 to ensure statistical significance, generalizability, and robustness claims.
+
+Finished (configuration, seed) cells are kept in a content-addressed result
+cache (result_cache.ResultCache), so re-running after a crash only trains the
+missing cells; interrupted vision runs resume from their last checkpoint.
 """
 
 import os
@@ -18,6 +22,9 @@ import numpy as np
 import pandas as pd
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Multi-seed paGLU experiments")
@@ -49,10 +56,38 @@ def parse_args():
                         help="Output directory for results")
     parser.add_argument("--dry_run", action="store_true",
                         help="Print commands without executing")
+    parser.add_argument("--warm", action="store_true",
+                        help="Run vision experiments in-process in a pool of warm worker processes")
+    parser.add_argument("--threads_per_worker", type=int, default=None,
+                        help="torch/OpenMP threads per warm worker (default: library default)")
+    parser.add_argument("--cache_dir", type=str, default=os.path.join(".cache", "results"),
+                        help="Result cache shared across runs (default: .cache/results)")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Ignore the result cache and rerun every experiment")
     
     return parser.parse_args()
 
 
+def init_vision_worker():
+    """Import the CIFAR training scripts and map the CIFAR-10 store once per warm worker."""
+    import train_cifar_pagating
+    import train_standard_baselines
+    from datamodules.cifar_cache import open_cifar10_cache
+    
+    for train in (True, False):
+        open_cifar10_cache('./data', train=train)
+    return {
+        "scripts/train_cifar_pagating.py": train_cifar_pagating,
+        "scripts/train_standard_baselines.py": train_standard_baselines,
+    }
+
+
+def run_script_job(cmd, context):
+    """Run a training command in-process in a warm worker and return its results dict."""
+    script, argv = cmd[1], cmd[2:]
+    return context[script].main(argv)
+
+
 class ExperimentRunner:
     """Manages multi-seed experimental runs."""
     
@@ -88,6 +123,25 @@ class ExperimentRunner:
         ]
         
         self.results = {"nlp": [], "vision": []}
+        
+        if args.no_cache or args.dry_run:
+            self.cache = None
+        else:
+            from result_cache import ResultCache
+            self.cache = ResultCache(args.cache_dir)
+    
+    def _cache_config(self, domain, config, seed):
+        """Result cache key configuration of one experiment cell."""
+        if domain == "nlp":
+            settings = {"steps": self.args.nlp_steps, "batch_size": self.args.nlp_batch_size}
+        else:
+            settings = {"epochs": self.args.vision_epochs, "batch_size": self.args.vision_batch_size}
+        return {"experiment": "multi_seed", "domain": domain, "config": config, "seed": seed, **settings}
+    
+    def _store_result(self, domain, config, seed, result):
+        """Record a successful experiment in the result cache."""
+        if self.cache is not None and result["status"] == "success":
+            self.cache.put(self._cache_config(domain, config, seed), result)
     
     def run_single_nlp_experiment(self, config, seed):
         """Run a single NLP experiment."""
@@ -126,8 +180,8 @@ class ExperimentRunner:
         
         return self._run_experiment(cmd, exp_name, "nlp", config, seed)
     
-    def run_single_vision_experiment(self, config, seed):
-        """Run a single vision experiment."""
+    def _vision_command(self, config, seed):
+        """Command line of a single vision experiment (resuming from the cache's checkpoints)."""
         exp_name = f"{config['unit']}_seed{seed}"
         output_path = self.output_dir / "vision" / exp_name
         
@@ -153,8 +207,63 @@ class ExperimentRunner:
                 "--output_dir", str(output_path)
             ]
         
+        if self.cache is not None:
+            checkpoint_dir = self.cache.checkpoint_dir(self._cache_config("vision", config, seed))
+            cmd += ["--checkpoint_dir", checkpoint_dir, "--resume"]
+        
+        return cmd, exp_name
+    
+    def run_single_vision_experiment(self, config, seed):
+        """Run a single vision experiment."""
+        cmd, exp_name = self._vision_command(config, seed)
         return self._run_experiment(cmd, exp_name, "vision", config, seed)
     
+    def run_vision_experiments_warm(self, experiments):
+        """
+        Run vision experiments in a pool of warm worker processes.
+        
+        Workers import torch and the training scripts once and return the
+        scripts' results dicts directly, so no stdout is parsed.
+        
+        Args:
+            experiments: List of (config, seed) pairs
+        """
+        from sweep_executor import SweepExecutor
+        
+        commands = [self._vision_command(config, seed) for config, seed in experiments]
+        with SweepExecutor(
+            run_script_job,
+            num_workers=self.args.max_workers,
+            threads_per_worker=self.args.threads_per_worker,
+            initializer=init_vision_worker,
+        ) as executor:
+            job_ids = {executor.submit(cmd): i for i, (cmd, _) in enumerate(commands)}
+            for payload in executor.as_completed():
+                index = job_ids[payload["job_id"]]
+                config, seed = experiments[index]
+                exp_name = commands[index][1]
+                result = {
+                    "experiment": exp_name,
+                    "domain": "vision",
+                    "config": config,
+                    "seed": seed,
+                    "duration": payload["runtime_sec"],
+                }
+                if payload["success"]:
+                    metrics = payload["result"]["metrics"]
+                    print(f"✅ Completed {exp_name} in {payload['runtime_sec']:.1f}s")
+                    result.update(
+                        status="success",
+                        results={"val_acc": metrics["best_val_acc"], "test_acc": metrics["final_test_acc"]},
+                    )
+                else:
+                    print(f"❌ Failed {exp_name}: {payload['error']}")
+                    result.update(status="failed", error=payload.get("traceback", payload["error"]), results={})
+                
+                self._store_result("vision", config, seed, result)
+                self.results["vision"].append(result)
+                self._save_results()
+    
     def _run_experiment(self, cmd, exp_name, domain, config, seed):
         """Execute a single experiment."""
         if self.args.dry_run:
@@ -279,10 +388,32 @@ class ExperimentRunner:
         
         return results
     
+    def prepare_nlp_data(self):
+        """Build the packed WikiText cache once, before the parallel NLP runs start."""
+        from datamodules.wikitext_cache import build_packed_cache
+        
+        for split in ("train", "validation"):
+            # Same dataset as scripts/train_pagating_optimized.py
+            prefix = build_packed_cache(split, dataset_config="wikitext-2-raw-v1")
+            print(f"📦 Packed {split} tokens: {prefix}.bin")
+    
+    def prepare_vision_data(self):
+        """Build the memory-mapped CIFAR-10 store once, before the parallel vision runs start."""
+        from datamodules.cifar_cache import build_cifar10_cache
+        
+        # Same root as scripts/train_cifar_pagating.py and train_standard_baselines.py
+        cache_dir = build_cifar10_cache('./data')
+        print(f"📦 CIFAR-10 store: {cache_dir}")
+    
     def run_all_experiments(self):
         """Run all experiments with multiple seeds."""
         all_experiments = []
         
+        if self.args.run_nlp and not self.args.dry_run:
+            self.prepare_nlp_data()
+        if self.args.run_vision and not self.args.dry_run:
+            self.prepare_vision_data()
+        
         # Generate all experiment combinations
         if self.args.run_nlp:
             for config in self.nlp_configs:
@@ -294,10 +425,28 @@ class ExperimentRunner:
                 for seed in self.args.seeds:
                     all_experiments.append(("vision", config, seed))
         
+        # Reuse finished cells from the result cache
+        if self.cache is not None:
+            pending = []
+            for domain, config, seed in all_experiments:
+                cached = self.cache.get(self._cache_config(domain, config, seed))
+                if cached is not None:
+                    self.results[domain].append(dict(cached, cached=True))
+                else:
+                    pending.append((domain, config, seed))
+            print(f"♻️  Reusing {len(all_experiments) - len(pending)} cached experiments")
+            all_experiments = pending
+        
         print(f"🎯 Running {len(all_experiments)} total experiments")
         print(f"📊 Seeds: {self.args.seeds}")
         print(f"⚡ Max workers: {self.args.max_workers}")
         
+        if self.args.warm and not self.args.dry_run:
+            vision_experiments = [(config, seed) for domain, config, seed in all_experiments if domain == "vision"]
+            if vision_experiments:
+                self.run_vision_experiments_warm(vision_experiments)
+            all_experiments = [exp for exp in all_experiments if exp[0] != "vision"]
+        
         # Run experiments in parallel
         with ProcessPoolExecutor(max_workers=self.args.max_workers) as executor:
             # Submit all experiments
@@ -314,6 +463,7 @@ class ExperimentRunner:
                 domain, config, seed = future_to_exp[future]
                 try:
                     result = future.result()
+                    self._store_result(domain, config, seed, result)
                     self.results[domain].append(result)
                     
                     # Save intermediate results
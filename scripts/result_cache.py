@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+"""
+Content-addressed cache of sweep results and checkpoints.
+
+Every run is keyed by the SHA-256 of its canonical JSON configuration (unit,
+alpha mode, hyperparameters, seed, ...) together with the code version, so
+re-running an orchestrator after a crash or a grid change only trains the
+cells that are new or unfinished:
+
+    <cache_dir>/<key[:2]>/<key>/config.json    the keyed configuration
+    <cache_dir>/<key[:2]>/<key>/checkpoints/   checkpoints of the run (for resuming)
+    <cache_dir>/<key[:2]>/<key>/artifacts/     files copied from a finished run
+    <cache_dir>/<key[:2]>/<key>/result.json    result, written last to mark completion
+
+The code version is the git commit plus a hash of uncommitted changes to
+tracked files, so editing the training code invalidates earlier results.
+
+Example:
+    cache = ResultCache(".cache/results")
+    result = cache.get(config)
+    if result is None:
+        result = train(config, checkpoint_dir=cache.checkpoint_dir(config))
+        cache.put(config, result)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from typing import Any, Dict, Iterable, Optional
+
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'results')
+FORMAT_VERSION = 1
+
+# Configuration entries that do not change what a run computes
+DEFAULT_IGNORED_KEYS = ("output_dir", "gpu_id", "checkpoint_dir", "data_dir")
+
+
+def code_version(repo_dir: Optional[str] = None) -> str:
+    """
+    Identifier of the code that produces results.
+
+    Args:
+        repo_dir: Directory inside the git repository (default: this repository)
+
+    Returns:
+        "<commit>" for a clean tree, "<commit>+<diff hash>" with uncommitted
+        changes to tracked files, or "unknown" outside git
+    """
+    repo_dir = repo_dir or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repo_dir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        diff = subprocess.run(
+            ["git", "diff", "HEAD"], cwd=repo_dir, capture_output=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    if diff:
+        return f"{commit}+{hashlib.sha256(diff).hexdigest()[:12]}"
+    return commit
+
+
+def config_key(config: Dict[str, Any], version: str, ignore: Iterable[str] = DEFAULT_IGNORED_KEYS) -> str:
+    """
+    Stable hash of a run configuration and code version.
+
+    Args:
+        config: JSON-serializable run configuration
+        version: Code version (see ``code_version``)
+        ignore: Keys left out of the hash
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    keyed = {name: value for name, value in config.items() if name not in set(ignore)}
+    payload = json.dumps(
+        {"format_version": FORMAT_VERSION, "code_version": version, "config": keyed},
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _write_json(path: str, data: Any):
+    # Written under a temporary name and renamed, so readers never see partial files
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+class ResultCache:
+    """
+    Local store of completed results and in-progress checkpoints, keyed by configuration.
+
+    Args:
+        cache_dir: Root directory of the cache (default: '.cache/results')
+        version: Code version mixed into every key (default: ``code_version()``)
+        ignore: Configuration keys that do not affect results
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        version: Optional[str] = None,
+        ignore: Iterable[str] = DEFAULT_IGNORED_KEYS,
+    ):
+        self.cache_dir = cache_dir
+        self.version = version if version is not None else code_version()
+        self.ignore = tuple(ignore)
+
+    def key(self, config: Dict[str, Any]) -> str:
+        """Cache key of a configuration."""
+        return config_key(config, self.version, self.ignore)
+
+    def run_dir(self, config: Dict[str, Any]) -> str:
+        """Directory of a configuration's entry (created on demand)."""
+        key = self.key(config)
+        path = os.path.join(self.cache_dir, key[:2], key)
+        if not os.path.exists(os.path.join(path, "config.json")):
+            os.makedirs(path, exist_ok=True)
+            _write_json(os.path.join(path, "config.json"), {
+                "code_version": self.version,
+                "config": {name: value for name, value in config.items() if name not in self.ignore},
+            })
+        return path
+
+    def checkpoint_dir(self, config: Dict[str, Any]) -> str:
+        """Directory for the run's checkpoints, kept across interrupted attempts."""
+        path = os.path.join(self.run_dir(config), "checkpoints")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def last_checkpoint(self, config: Dict[str, Any], filename: str = "last.ckpt") -> Optional[str]:
+        """Path of the run's latest checkpoint, or None if it has none yet."""
+        key = self.key(config)
+        path = os.path.join(self.cache_dir, key[:2], key, "checkpoints", filename)
+        return path if os.path.exists(path) else None
+
+    def get(self, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Result of a completed run, or None."""
+        key = self.key(config)
+        try:
+            with open(os.path.join(self.cache_dir, key[:2], key, "result.json")) as f:
+                return json.load(f)["result"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def status(self, config: Dict[str, Any]) -> str:
+        """'complete', 'partial' (has checkpoints) or 'new'."""
+        if self.get(config) is not None:
+            return "complete"
+        if self.last_checkpoint(config) is not None:
+            return "partial"
+        return "new"
+
+    def put(
+        self,
+        config: Dict[str, Any],
+        result: Dict[str, Any],
+        artifacts: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Record a completed run.
+
+        Args:
+            config: Run configuration
+            result: JSON-serializable result
+            artifacts: Files to keep with the result, as {name: source path};
+                missing sources are skipped
+
+        Returns:
+            The stored result, with ``artifacts`` mapping names to cached paths
+        """
+        run_dir = self.run_dir(config)
+        stored = dict(result)
+        if artifacts:
+            artifact_dir = os.path.join(run_dir, "artifacts")
+            os.makedirs(artifact_dir, exist_ok=True)
+            stored["artifacts"] = {}
+            for name, source in artifacts.items():
+                if source and os.path.exists(source):
+                    target = os.path.join(artifact_dir, name)
+                    shutil.copyfile(source, target)
+                    stored["artifacts"][name] = target
+        _write_json(os.path.join(run_dir, "result.json"), {
+            "key": self.key(config),
+            "code_version": self.version,
+            "result": stored,
+        })
+        return stored
+
+    def invalidate(self, config: Dict[str, Any]):
+        """Forget a run's result and checkpoints."""
+        key = self.key(config)
+        shutil.rmtree(os.path.join(self.cache_dir, key[:2], key), ignore_errors=True)
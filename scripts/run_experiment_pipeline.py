@@ -69,6 +69,10 @@ def parse_args():
                         help="Learning rate")
     parser.add_argument("--log_dir", type=str, default="logs",
                         help="Directory for sweep logs")
+    parser.add_argument("--cache_dir", type=str, default=os.path.join(".cache", "results"),
+                        help="Result cache for sweep and benchmark runs (default: .cache/results)")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Ignore the result cache and rerun every configuration")
     
     # Transformer-specific arguments
     parser.add_argument("--transformer_epochs", type=int, default=10,
@@ -165,6 +169,8 @@ def run_hyperparameter_sweep(args, experiment_dirs):
         # Add other relevant args if needed (e.g., --weight_decay, --seed?)
         # Check run_sweep.py defaults for these.
     ]
+    # Finished sweep runs are reused from (and new ones added to) the result cache
+    sweep_command += ["--no_cache"] if args.no_cache else ["--cache_dir", args.cache_dir]
     
     # Run the sweep
     start_time = time.time()
@@ -292,6 +298,99 @@ def create_visualizations(args, experiment_dirs):
     
     return process.returncode
 
+def run_single_transformer_benchmark(args, unit, alpha, logs_dir):
+    """
+    Run experiments/test_transformer.py for one unit and alpha value.
+    
+    Args:
+        args: Pipeline arguments (transformer settings)
+        unit: paGating unit name
+        alpha: Alpha value
+        logs_dir: Directory for the run's log file
+    
+    Returns:
+        Tuple of (result dictionary parsed from the output, process return code)
+    """
+    # Create log file for this run
+    log_file = os.path.join(
+        logs_dir, 
+        f"{unit}_alpha{alpha:.2f}.log"
+    )
+    
+    # Prepare benchmark command
+    benchmark_command = [
+        "python", "experiments/test_transformer.py",
+        "--unit", unit,
+        "--alpha", str(alpha),
+        "--epochs", str(args.transformer_epochs),
+        "--batch_size", str(args.transformer_batch_size),
+        "--seq_len", str(args.transformer_seq_len),
+        "--d_model", str(args.transformer_d_model),
+        "--n_head", str(args.transformer_n_head)
+    ]
+    
+    # Run the benchmark
+    start_time = time.time()
+    logger.info(f"Running command: {' '.join(benchmark_command)}")
+    
+    with open(log_file, 'w') as log:
+        process = subprocess.run(
+            benchmark_command, 
+            stdout=subprocess.PIPE, 
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        
+        # Write output to log file
+        log.write(f"Command: {' '.join(benchmark_command)}\n\n")
+        log.write(f"STDOUT:\n{process.stdout}\n\n")
+        
+        if process.stderr:
+            log.write(f"STDERR:\n{process.stderr}\n\n")
+    
+    elapsed_time = time.time() - start_time
+    logger.info(f"Benchmark for {unit} (alpha={alpha}) completed in {elapsed_time:.2f} seconds")
+    
+    # Parse results from stdout
+    train_loss = None
+    train_acc = None
+    test_loss = None
+    test_acc = None
+    
+    for line in process.stdout.splitlines():
+        if "Epoch 10/" in line or f"Epoch {args.transformer_epochs}/" in line:
+            # Extract last epoch's training metrics
+            parts = line.split(", ")
+            if len(parts) >= 3:
+                try:
+                    train_loss = float(parts[1].split(": ")[1])
+                    train_acc = float(parts[2].split(": ")[1].rstrip("%"))
+                except (IndexError, ValueError) as e:
+                    logger.warning(f"Could not parse training metrics from line: {line}. Error: {e}")
+        
+        if "Test Loss:" in line:
+            # Extract test metrics
+            parts = line.split(", ")
+            if len(parts) >= 2:
+                try:
+                    test_loss = float(parts[0].split(": ")[1])
+                    test_acc = float(parts[1].split(": ")[1].rstrip("%"))
+                except (IndexError, ValueError) as e:
+                    logger.warning(f"Could not parse test metrics from line: {line}. Error: {e}")
+    
+    # Store results
+    result = {
+        'unit': unit,
+        'alpha': alpha,
+        'train_loss': train_loss,
+        'train_acc': train_acc,
+        'test_loss': test_loss,
+        'test_acc': test_acc,
+        'epochs': args.transformer_epochs
+    }
+    
+    return result, process.returncode
+
 def run_transformer_benchmarks(args, experiment_dirs):
     """Run transformer benchmarks for each unit and alpha combination."""
     if not args.include_transformer:
@@ -304,6 +403,12 @@ def run_transformer_benchmarks(args, experiment_dirs):
     transformer_logs_dir = os.path.join(experiment_dirs["transformer"], "logs")
     os.makedirs(transformer_logs_dir, exist_ok=True)
     
+    # Result cache shared with run_sweep.py
+    cache = None
+    if not args.no_cache:
+        from result_cache import ResultCache
+        cache = ResultCache(args.cache_dir)
+    
     # CSV to store all results
     csv_path = os.path.join(experiment_dirs["transformer"], "transformer_results.csv")
     results = []
@@ -321,90 +426,31 @@ def run_transformer_benchmarks(args, experiment_dirs):
         # Run benchmark for each unit and alpha combination
         for unit in args.units:
             for alpha in args.alpha_values:
-                logger.info(f"Running transformer benchmark for {unit} with alpha={alpha}...")
-                
-                # Create log file for this run
-                log_file = os.path.join(
-                    transformer_logs_dir, 
-                    f"{unit}_alpha{alpha:.2f}.log"
-                )
-                
-                # Prepare benchmark command
-                benchmark_command = [
-                    "python", "experiments/test_transformer.py",
-                    "--unit", unit,
-                    "--alpha", str(alpha),
-                    "--epochs", str(args.transformer_epochs),
-                    "--batch_size", str(args.transformer_batch_size),
-                    "--seq_len", str(args.transformer_seq_len),
-                    "--d_model", str(args.transformer_d_model),
-                    "--n_head", str(args.transformer_n_head)
-                ]
-                
-                # Run the benchmark
-                start_time = time.time()
-                logger.info(f"Running command: {' '.join(benchmark_command)}")
-                
-                with open(log_file, 'w') as log:
-                    process = subprocess.run(
-                        benchmark_command, 
-                        stdout=subprocess.PIPE, 
-                        stderr=subprocess.PIPE,
-                        text=True
-                    )
-                    
-                    # Write output to log file
-                    log.write(f"Command: {' '.join(benchmark_command)}\n\n")
-                    log.write(f"STDOUT:\n{process.stdout}\n\n")
-                    
-                    if process.stderr:
-                        log.write(f"STDERR:\n{process.stderr}\n\n")
-                
-                elapsed_time = time.time() - start_time
-                logger.info(f"Benchmark for {unit} (alpha={alpha}) completed in {elapsed_time:.2f} seconds")
-                
-                # Parse results from stdout
-                train_loss = None
-                train_acc = None
-                test_loss = None
-                test_acc = None
-                
-                for line in process.stdout.splitlines():
-                    if "Epoch 10/" in line or f"Epoch {args.transformer_epochs}/" in line:
-                        # Extract last epoch's training metrics
-                        parts = line.split(", ")
-                        if len(parts) >= 3:
-                            try:
-                                train_loss = float(parts[1].split(": ")[1])
-                                train_acc = float(parts[2].split(": ")[1].rstrip("%"))
-                            except (IndexError, ValueError) as e:
-                                logger.warning(f"Could not parse training metrics from line: {line}. Error: {e}")
-                    
-                    if "Test Loss:" in line:
-                        # Extract test metrics
-                        parts = line.split(", ")
-                        if len(parts) >= 2:
-                            try:
-                                test_loss = float(parts[0].split(": ")[1])
-                                test_acc = float(parts[1].split(": ")[1].rstrip("%"))
-                            except (IndexError, ValueError) as e:
-                                logger.warning(f"Could not parse test metrics from line: {line}. Error: {e}")
-                
-                # Store results
-                result = {
-                    'unit': unit,
-                    'alpha': alpha,
-                    'train_loss': train_loss,
-                    'train_acc': train_acc,
-                    'test_loss': test_loss,
-                    'test_acc': test_acc,
-                    'epochs': args.transformer_epochs
+                # Reuse results of identical earlier benchmarks
+                cache_config = {
+                    "experiment": "transformer_benchmark",
+                    "unit": unit,
+                    "alpha": alpha,
+                    "epochs": args.transformer_epochs,
+                    "batch_size": args.transformer_batch_size,
+                    "seq_len": args.transformer_seq_len,
+                    "d_model": args.transformer_d_model,
+                    "n_head": args.transformer_n_head,
                 }
+                result = cache.get(cache_config) if cache is not None else None
+                if result is not None:
+                    logger.info(f"Using cached transformer benchmark for {unit} with alpha={alpha}")
+                else:
+                    logger.info(f"Running transformer benchmark for {unit} with alpha={alpha}...")
+                    result, returncode = run_single_transformer_benchmark(args, unit, alpha, transformer_logs_dir)
+                    if cache is not None and returncode == 0 and result['test_acc'] is not None:
+                        cache.put(cache_config, result)
                 results.append(result)
                 
                 # Write to CSV
                 writer.writerow([
-                    unit, alpha, train_loss, train_acc, test_loss, test_acc, args.transformer_epochs
+                    unit, alpha, result['train_loss'], result['train_acc'],
+                    result['test_loss'], result['test_acc'], args.transformer_epochs
                 ])
     
     # Copy generated plot files to the transformer/plots directory
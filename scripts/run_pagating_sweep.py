@@ -9,17 +9,54 @@ combos = list(itertools.product(*grid_vals))
 print(f"Launching {len(combos)} runs …")
 
 dry_run = "--dry-run" in sys.argv
+# --asha: stop dominated runs early by their eval_loss (successive halving)
+use_asha = "--asha" in sys.argv
 
+output_root = pathlib.Path(cfg.get("output_root","logs/phase2_sweeps"))
+jobs = []
 for combo in combos:
     params = dict(zip(grid_keys, combo))
+    run_name = f"{params['alpha_mode']}_lr{params['learning_rate']}_bs{params['batch_size']}"
+    metrics_csv = output_root / "eval_metrics" / f"{run_name}.csv"
     cmd = [
         "python3.12", "scripts/train_pagating.py",
         "--alpha_mode",   params["alpha_mode"],
         "--learning_rate", str(params["learning_rate"]),
         "--batch_size",    str(params["batch_size"]),
         "--max_steps",     str(cfg.get("max_steps",20000)),
-        "--output_dir",    cfg.get("output_root","logs/phase2_sweeps"),
+        "--output_dir",    str(output_root),
+        "--metrics_csv",   str(metrics_csv),
     ]
     print(">>>", " ".join(cmd))
-    if not dry_run:
-        subprocess.run(cmd, check=True) 
\ No newline at end of file
+    jobs.append({"cmd": cmd, "metrics_csv": str(metrics_csv)})
+
+if dry_run:
+    sys.exit(0)
+
+if not use_asha:
+    for job in jobs:
+        subprocess.run(job["cmd"], check=True)
+    sys.exit(0)
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+from asha import ASHAScheduler, run_asha_jobs
+
+asha_cfg = cfg.get("asha", {})
+max_steps = cfg.get("max_steps",20000)
+scheduler = ASHAScheduler(
+    max_t=max_steps,
+    grace_period=asha_cfg.get("grace_period", cfg.get("eval_interval",1000)),
+    reduction_factor=asha_cfg.get("reduction_factor",3),
+    mode="min",
+)
+print(f"ASHA rungs at steps {scheduler.rungs}")
+for job in jobs:
+    pathlib.Path(job["metrics_csv"]).unlink(missing_ok=True)   # no stale values from an earlier sweep
+outcomes = run_asha_jobs(jobs, scheduler, metric="eval_loss", time_column="step",
+                         num_workers=asha_cfg.get("num_workers",1), poll_interval=30.0)
+
+for combo, outcome in zip(combos, outcomes):
+    params = dict(zip(grid_keys, combo))
+    status = "stopped" if outcome["stopped"] else ("done" if outcome["returncode"] == 0 else f"failed ({outcome['returncode']})")
+    print(f"{params}: {status} at step {outcome['last_t']}, eval_loss={outcome['last_value']}")
+print(f"Runs reaching each rung: {scheduler.summary()}")
@@ -9,6 +9,39 @@ Usage:
     python scripts/run_sweep.py [--epochs EPOCHS] [--batch_size BATCH_SIZE] 
                                [--output_dir OUTPUT_DIR] [--parallel]
                                [--num_workers NUM_WORKERS] [--gpu_ids GPU_IDS]
+                               [--ensemble] [--tensor_data]
+                               [--warm] [--threads_per_worker N]
+                               [--cache_dir CACHE_DIR] [--no_cache]
+                               [--asha] [--asha_metric METRIC]
+                               [--asha_grace_period EPOCHS] [--asha_reduction_factor ETA]
+
+With --tensor_data, CIFAR-10 is held in memory as one uint8 tensor and
+augmented batch-wise (TensorCIFAR10DataModule) instead of per-sample PIL
+transforms in DataLoader worker processes.
+
+With --warm, configurations run in a pool of warm worker processes
+(sweep_executor.SweepExecutor) that import torch and load the dataset once,
+call train_cifar10.main in-process and return structured metrics, instead of
+one `python train_cifar10.py` process per configuration.
+
+With --ensemble, the alpha values of each (unit, learnable) group are trained
+together in-process as one vectorized paGating.AlphaEnsemble of
+paCIFARClassifier models instead of one train_cifar10.py process per value.
+
+Results are kept in a content-addressed cache (result_cache.ResultCache)
+keyed by each run's configuration and the code version: re-running the sweep
+after a crash or with an extended grid skips finished runs, and interrupted
+runs resume from the last checkpoint kept in the cache. Pass --no_cache to
+retrain everything.
+
+With --asha, configurations are scheduled by asynchronous successive halving
+(asha.ASHAScheduler): at rungs of grace_period * eta**k epochs, a run whose
+validation metric (read from its MetricsCsvLogger file) is not in the top 1/eta
+of the runs that reached the rung before it is terminated.
+
+Each run's MetricsCsvLogger file is also copied to
+<output_dir>/<unit>_alpha<alpha>[_learnable].csv, the layout read by
+generate_leaderboard.py; runs stopped by ASHA appear with fewer epochs.
 """
 
 import os
@@ -16,6 +49,7 @@ import sys
 import argparse
 import itertools
 import json
+import shutil
 import time
 from datetime import datetime
 from multiprocessing import Pool, cpu_count
@@ -49,6 +83,30 @@ def parse_args():
                         help="Number of parallel workers (default: number of CPUs)")
     parser.add_argument("--gpu_ids", type=str, default="",
                         help="Comma-separated list of GPU IDs to use (e.g., '0,1,2')")
+    parser.add_argument("--ensemble", action="store_true",
+                        help="Train all alpha values of a unit as one vectorized ensemble")
+    parser.add_argument("--tensor_data", action="store_true",
+                        help="Use the tensor-resident CIFAR-10 datamodule with batched augmentation")
+    parser.add_argument("--warm", action="store_true",
+                        help="Run configurations in-process in a pool of warm worker processes")
+    parser.add_argument("--threads_per_worker", type=int, default=None,
+                        help="torch/OpenMP threads per warm worker (default: library default)")
+    
+    # Result cache parameters
+    parser.add_argument("--cache_dir", type=str, default=os.path.join(".cache", "results"),
+                        help="Result cache shared across sweeps (default: .cache/results)")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Ignore the result cache and retrain every configuration")
+    
+    # Early stopping parameters
+    parser.add_argument("--asha", action="store_true",
+                        help="Terminate dominated configurations early with asynchronous successive halving")
+    parser.add_argument("--asha_metric", type=str, default="val_loss", choices=["val_loss", "val_acc"],
+                        help="Validation metric compared at the ASHA rungs (default: val_loss)")
+    parser.add_argument("--asha_grace_period", type=int, default=1,
+                        help="Epochs before the first ASHA rung (default: 1)")
+    parser.add_argument("--asha_reduction_factor", type=float, default=3,
+                        help="Fraction 1/eta of the runs at each rung that continue (default: 3)")
     
     # Data parameters
     parser.add_argument("--data_dir", type=str, default="data/cifar10",
@@ -69,6 +127,92 @@ def parse_args():
     
     return parser.parse_args()
 
+# Job configuration entries that determine a run's result
+CACHE_KEY_FIELDS = (
+    "unit_name", "alpha", "use_learnable_alpha", "epochs", "batch_size",
+    "learning_rate", "weight_decay", "val_split", "seed", "tensor_data",
+)
+
+def cache_config(config, trainer="train_cifar10"):
+    """
+    Result cache key configuration of one (unit, alpha, learnable) run.
+    
+    Args:
+        config: Dictionary containing job configuration
+        trainer: Training code that produces the result ("train_cifar10" or "ensemble")
+    
+    Returns:
+        Dictionary of the entries that determine the result
+    """
+    keyed = {name: config[name] for name in CACHE_KEY_FIELDS if name in config}
+    keyed["trainer"] = trainer
+    return keyed
+
+def store_result(config, result_dict, trainer="train_cifar10"):
+    """
+    Record a successful run in the sweep's result cache (if the job uses one).
+    
+    Args:
+        config: Job configuration of a single run
+        result_dict: Result dictionary of the run
+        trainer: Training code that produced the result
+    """
+    if not result_dict["success"] or config.get("cache") is None:
+        return
+    from result_cache import ResultCache
+    
+    cache = ResultCache(config["cache"]["dir"], version=config["cache"]["version"])
+    metrics_csv = result_dict.get("metrics", {}).get("metrics_csv")
+    cache.put(
+        cache_config(config, trainer),
+        result_dict,
+        artifacts={"metrics.csv": metrics_csv} if metrics_csv else None,
+    )
+
+def apply_result_cache(cache, job_configs, ensemble=False):
+    """
+    Split job configurations into cached results and jobs still to run.
+    
+    Runs left unfinished by an earlier sweep get their cache checkpoint
+    directory, so train_cifar10.py resumes them from last.ckpt.
+    
+    Args:
+        cache: result_cache.ResultCache
+        job_configs: List of job configurations
+        ensemble: Whether the jobs are (unit, learnable) ensemble groups
+    
+    Returns:
+        Tuple of (cached result dictionaries, job configurations to run)
+    """
+    trainer = "ensemble" if ensemble else "train_cifar10"
+    cached, pending = [], []
+    counts = {"complete": 0, "partial": 0, "new": 0}
+    for config in job_configs:
+        config = dict(config, cache={"dir": cache.cache_dir, "version": cache.version})
+        members = [dict(config, alpha=alpha) for alpha in config["alphas"]] if ensemble else [config]
+        remaining = []
+        for member in members:
+            keyed = cache_config(member, trainer)
+            status = cache.status(keyed)
+            counts[status] += 1
+            if status == "complete":
+                cached.append(dict(cache.get(keyed), cached=True))
+            else:
+                remaining.append(member)
+        
+        if not remaining:
+            continue
+        if ensemble:
+            # Ensembles retrain their unfinished members together from scratch
+            pending.append(dict(config, alphas=[member["alpha"] for member in remaining]))
+        else:
+            config["checkpoint_dir"] = cache.checkpoint_dir(cache_config(config, trainer))
+            pending.append(config)
+    
+    print(f"Result cache {cache.cache_dir}: {counts['complete']} cached, "
+          f"{counts['partial']} to resume, {counts['new']} new")
+    return cached, pending
+
 def run_training_job(config):
     """
     Run a single training job with the given configuration.
@@ -85,34 +229,13 @@ def run_training_job(config):
     unit_name = config["unit_name"]
     alpha = config["alpha"]
     use_learnable_alpha = config["use_learnable_alpha"]
-    epochs = config["epochs"]
-    batch_size = config["batch_size"]
-    learning_rate = config["learning_rate"]
-    weight_decay = config["weight_decay"]
     output_dir = config["output_dir"]
-    data_dir = config["data_dir"]
-    val_split = config["val_split"]
-    seed = config["seed"]
     gpu_id = config.get("gpu_id", None)
     
-    # Create command
-    cmd = [
-        "python", "train_cifar10.py",
-        f"--unit_name={unit_name}",
-        f"--alpha={alpha}",
-        f"--batch_size={batch_size}",
-        f"--learning_rate={learning_rate}",
-        f"--weight_decay={weight_decay}",
-        f"--max_epochs={epochs}",
-        f"--output_dir={output_dir}",
-        f"--data_dir={data_dir}",
-        f"--val_split={val_split}",
-        f"--seed={seed}"
-    ]
-    
-    # Add learnable alpha if requested
-    if use_learnable_alpha:
-        cmd.append("--use_learnable_alpha")
+    # Create command; the script writes its final metrics to a JSON file
+    mode = "learnable" if use_learnable_alpha else "static"
+    result_file = os.path.join(output_dir, f"result_{unit_name}_alpha{alpha}_{mode}.json")
+    cmd = ["python", "train_cifar10.py"] + train_cifar10_argv(config) + [f"--result_file={result_file}"]
     
     # Set CUDA_VISIBLE_DEVICES if GPU ID is specified
     env = os.environ.copy()
@@ -149,8 +272,12 @@ def run_training_job(config):
         "end_time": datetime.fromtimestamp(end_time).strftime('%Y-%m-%d %H:%M:%S')
     }
     
+    if success and os.path.exists(result_file):
+        with open(result_file) as f:
+            result_dict["metrics"] = json.load(f)
     if not success:
         result_dict["error"] = error
+    store_result(config, result_dict)
     
     # Save output log
     log_dir = os.path.join(
@@ -169,9 +296,348 @@ def run_training_job(config):
     
     return result_dict
 
+def train_cifar10_argv(config):
+    """
+    train_cifar10.py command line arguments for one job configuration.
+    
+    Args:
+        config: Dictionary containing job configuration
+    
+    Returns:
+        List of command line arguments
+    """
+    argv = [
+        f"--unit_name={config['unit_name']}",
+        f"--alpha={config['alpha']}",
+        f"--batch_size={config['batch_size']}",
+        f"--learning_rate={config['learning_rate']}",
+        f"--weight_decay={config['weight_decay']}",
+        f"--max_epochs={config['epochs']}",
+        f"--output_dir={config['output_dir']}",
+        f"--data_dir={config['data_dir']}",
+        f"--val_split={config['val_split']}",
+        f"--seed={config['seed']}"
+    ]
+    
+    # Add learnable alpha if requested
+    if config["use_learnable_alpha"]:
+        argv.append("--use_learnable_alpha")
+    if config.get("tensor_data", False):
+        argv.append("--tensor_data")
+    if config.get("checkpoint_dir"):
+        # Cached runs keep their checkpoints in the cache and resume from them
+        argv += [f"--checkpoint_dir={config['checkpoint_dir']}", "--resume"]
+    
+    return argv
+
+def _data_key(args):
+    """Arguments that determine the datamodule a job needs."""
+    return (args.data_dir, args.batch_size, args.val_split, args.seed, args.tensor_data)
+
+def init_warm_worker(config):
+    """
+    Import the training code and load the dataset once per warm worker.
+    
+    Args:
+        config: Any job configuration of the sweep; its data settings select
+            the resident datamodule
+    
+    Returns:
+        Context dictionary passed to every run_warm_training_job call
+    """
+    import train_cifar10
+    
+    args = train_cifar10.parse_args(train_cifar10_argv(config))
+    datamodule = train_cifar10.build_datamodule(args)
+    datamodule.prepare_data()
+    datamodule.setup("fit")
+    return {"train_cifar10": train_cifar10, "datamodule": datamodule, "data_key": _data_key(args)}
+
+def run_warm_training_job(config, context):
+    """
+    Run a single training job inside a warm worker.
+    
+    Args:
+        config: Dictionary containing job configuration
+        context: Return value of init_warm_worker in this worker
+    
+    Returns:
+        Dictionary returned by train_cifar10.main (output directory and metrics)
+    """
+    train_cifar10 = context["train_cifar10"]
+    args = train_cifar10.parse_args(train_cifar10_argv(config))
+    
+    # Reuse the resident dataset unless this job needs different data settings
+    datamodule = context["datamodule"] if _data_key(args) == context["data_key"] else None
+    return train_cifar10.main(args, datamodule=datamodule)
+
+def run_warm_jobs(job_configs, num_workers, threads_per_worker=None, gpu_ids=None):
+    """
+    Run training jobs in a pool of warm worker processes.
+    
+    Args:
+        job_configs: List of job configurations
+        num_workers: Number of worker processes
+        threads_per_worker: torch/OpenMP threads per worker
+        gpu_ids: GPU IDs assigned to the workers round-robin
+    
+    Returns:
+        List of result dictionaries in the order of job_configs
+    """
+    from sweep_executor import SweepExecutor
+    
+    results = [None] * len(job_configs)
+    with SweepExecutor(
+        run_warm_training_job,
+        num_workers=num_workers,
+        threads_per_worker=threads_per_worker,
+        initializer=init_warm_worker,
+        initargs=(job_configs[0],),
+        gpu_ids=gpu_ids,
+    ) as executor:
+        job_ids = {executor.submit(config): i for i, config in enumerate(job_configs)}
+        for payload in executor.as_completed():
+            config = job_configs[job_ids[payload["job_id"]]]
+            end_time = time.time()
+            runtime_sec = payload["runtime_sec"] or 0.0
+            
+            result_dict = {
+                "unit_name": config["unit_name"],
+                "alpha": config["alpha"],
+                "use_learnable_alpha": config["use_learnable_alpha"],
+                "success": payload["success"],
+                "runtime_sec": runtime_sec,
+                "start_time": datetime.fromtimestamp(end_time - runtime_sec).strftime('%Y-%m-%d %H:%M:%S'),
+                "end_time": datetime.fromtimestamp(end_time).strftime('%Y-%m-%d %H:%M:%S'),
+                "worker_id": payload["worker_id"],
+            }
+            if payload["success"]:
+                result_dict["metrics"] = payload["result"]
+            else:
+                result_dict["error"] = payload["error"]
+                if "traceback" in payload:
+                    result_dict["traceback"] = payload["traceback"]
+            store_result(config, result_dict)
+            results[job_ids[payload["job_id"]]] = result_dict
+            
+            status = "Completed" if payload["success"] else "Failed"
+            print(f"{status} {config['unit_name']}, α={config['alpha']}, "
+                  f"learnable={config['use_learnable_alpha']} in {runtime_sec:.2f}s")
+    
+    return results
+
+def run_asha_training_jobs(job_configs, scheduler, metric, num_workers, cached_results=()):
+    """
+    Run training jobs under asynchronous successive halving.
+    
+    Args:
+        job_configs: List of job configurations
+        scheduler: asha.ASHAScheduler deciding which runs continue
+        metric: MetricsCsvLogger column compared at the rungs
+        num_workers: Number of jobs running at the same time
+        cached_results: Completed results from the result cache; their metric
+            histories count towards the rungs
+    
+    Returns:
+        List of result dictionaries in the order of job_configs
+    """
+    from asha import read_metric_history, run_asha_jobs
+    
+    for i, result in enumerate(cached_results):
+        metrics_csv = result.get("artifacts", {}).get("metrics.csv")
+        if metrics_csv:
+            for t, value in read_metric_history(metrics_csv, metric)[1]:
+                scheduler.on_result(("cached", i), t, value)
+    
+    jobs = []
+    result_files = []
+    for config in job_configs:
+        unit_name = config["unit_name"]
+        mode = "learnable" if config["use_learnable_alpha"] else "static"
+        run_name = f"{unit_name}_alpha{config['alpha']}{'_learnable' if config['use_learnable_alpha'] else ''}"
+        log_dir = os.path.join(config["output_dir"], f"logs_{datetime.now().strftime('%Y%m%d')}")
+        os.makedirs(log_dir, exist_ok=True)
+        
+        env = os.environ.copy()
+        if config.get("gpu_id") is not None:
+            env["CUDA_VISIBLE_DEVICES"] = str(config["gpu_id"])
+        
+        result_file = os.path.join(config["output_dir"], f"result_{unit_name}_alpha{config['alpha']}_{mode}.json")
+        result_files.append(result_file)
+        jobs.append({
+            "cmd": ["python", "train_cifar10.py"] + train_cifar10_argv(config) + [f"--result_file={result_file}"],
+            # train_cifar10.py logs to <output_dir>/<run_name>_<timestamp>/<unit>/metrics.csv
+            "metrics_csv": os.path.join(config["output_dir"], f"{run_name}_[0-9]*", unit_name, "metrics.csv"),
+            "env": env,
+            "log_path": os.path.join(log_dir, f"{unit_name}_alpha{config['alpha']}_{mode}.log"),
+        })
+    
+    results = []
+    outcomes = run_asha_jobs(jobs, scheduler, metric, num_workers=num_workers)
+    for config, job, outcome, result_file in zip(job_configs, jobs, outcomes, result_files):
+        stopped = outcome["stopped"]
+        result_dict = {
+            "unit_name": config["unit_name"],
+            "alpha": config["alpha"],
+            "use_learnable_alpha": config["use_learnable_alpha"],
+            "success": stopped or outcome["returncode"] == 0,
+            "stopped_early": stopped,
+            "epochs_completed": outcome["last_t"],
+            metric: outcome["last_value"],
+            "runtime_sec": outcome["runtime_sec"],
+            "start_time": datetime.fromtimestamp(outcome["start_time"]).strftime('%Y-%m-%d %H:%M:%S'),
+            "end_time": datetime.fromtimestamp(outcome["end_time"]).strftime('%Y-%m-%d %H:%M:%S')
+        }
+        if stopped:
+            result_dict["metrics"] = {"metrics_csv": outcome["metrics_csv"]}
+        elif result_dict["success"] and os.path.exists(result_file):
+            with open(result_file) as f:
+                result_dict["metrics"] = json.load(f)
+            # Only full-length runs are complete results for the cache
+            store_result(config, result_dict)
+        elif not result_dict["success"]:
+            result_dict["error"] = f"train_cifar10.py exited with code {outcome['returncode']} (see {job['log_path']})"
+        
+        status = f"Stopped at epoch {outcome['last_t']}" if stopped else ("Completed" if result_dict["success"] else "Failed")
+        print(f"{status}: {config['unit_name']}, α={config['alpha']}, learnable={config['use_learnable_alpha']}, "
+              f"{metric}={outcome['last_value']}")
+        results.append(result_dict)
+    
+    return results
+
+def export_leaderboard_csvs(results, results_dir):
+    """
+    Copy each run's MetricsCsvLogger file to <unit>_alpha<alpha>[_learnable].csv.
+    
+    This flat layout is what generate_leaderboard.py reads.
+    
+    Args:
+        results: Result dictionaries of the sweep
+        results_dir: Directory for the leaderboard CSV files
+    
+    Returns:
+        Number of files written
+    """
+    count = 0
+    for result in results:
+        if not result["success"]:
+            continue
+        # Cached runs keep a copy of their metrics file in the cache
+        source = result.get("artifacts", {}).get("metrics.csv") or result.get("metrics", {}).get("metrics_csv")
+        if not source or not os.path.exists(source):
+            continue
+        filename = (f"{result['unit_name']}_alpha{result['alpha']:.2f}"
+                    f"{'_learnable' if result['use_learnable_alpha'] else ''}.csv")
+        shutil.copyfile(source, os.path.join(results_dir, filename))
+        count += 1
+    return count
+
+def run_ensemble_job(config):
+    """
+    Train all alpha values of one (unit, learnable) group as a vectorized ensemble.
+    
+    Every member sees the same batches; metrics and checkpoints are kept per member.
+    In learnable groups each member's α starts at its alpha value.
+    
+    Args:
+        config: Job configuration with an "alphas" list instead of a single "alpha"
+    
+    Returns:
+        List of result dictionaries, one per alpha value
+    """
+    import torch
+    import paGating
+    from lightning_modules.datamodule import CIFAR10DataModule
+    from lightning_modules.tensor_datamodule import TensorCIFAR10DataModule
+    from models.pa_cifar_classifier import create_model
+    
+    start_time = time.time()
+    
+    unit_name = config["unit_name"]
+    alphas = config["alphas"]
+    use_learnable_alpha = config["use_learnable_alpha"]
+    mode = "learnable" if use_learnable_alpha else "static"
+    gpu_id = config.get("gpu_id", None)
+    device = torch.device(f"cuda:{gpu_id}" if gpu_id is not None and torch.cuda.is_available() else "cpu")
+    
+    print(f"Running ensemble: {unit_name}, α={alphas}, learnable={use_learnable_alpha} on {device}")
+    
+    try:
+        torch.manual_seed(config["seed"])
+        if config.get("tensor_data", False):
+            # Batches are built directly on the ensemble's device
+            datamodule = TensorCIFAR10DataModule(
+                data_dir=config["data_dir"],
+                batch_size=config["batch_size"],
+                val_split=config["val_split"],
+                seed=config["seed"],
+                device=device,
+            )
+        else:
+            datamodule = CIFAR10DataModule(
+                data_dir=config["data_dir"],
+                batch_size=config["batch_size"],
+                val_split=config["val_split"],
+                seed=config["seed"],
+            )
+        datamodule.prepare_data()
+        datamodule.setup("fit")
+        
+        models = []
+        for alpha in alphas:
+            model = create_model(unit_name, alpha="learnable" if use_learnable_alpha else alpha)
+            if use_learnable_alpha:
+                # Learnable members start from their own α instead of being replicas
+                paGating.init_learnable_alpha(model, alpha)
+            models.append(model)
+        names = [f"{unit_name}_alpha{alpha}_{mode}" for alpha in alphas]
+        ensemble = paGating.AlphaEnsemble(models, names=names).to(device)
+        trainer = paGating.EnsembleTrainer(
+            ensemble,
+            lr=config["learning_rate"],
+            weight_decay=config["weight_decay"],
+        )
+        member_metrics = trainer.fit(
+            datamodule.train_dataloader(),
+            epochs=config["epochs"],
+            val_loader=datamodule.val_dataloader(),
+            checkpoint_dir=os.path.join(config["output_dir"], "checkpoints", f"{unit_name}_{mode}"),
+        )
+        success, error = True, None
+    except Exception as e:
+        member_metrics = [{} for _ in alphas]
+        success, error = False, str(e)
+    
+    end_time = time.time()
+    runtime_sec = end_time - start_time
+    
+    results = []
+    for alpha, metrics in zip(alphas, member_metrics):
+        result_dict = {
+            "unit_name": unit_name,
+            "alpha": alpha,
+            "use_learnable_alpha": use_learnable_alpha,
+            "success": success,
+            "runtime_sec": runtime_sec,
+            "ensemble_size": len(alphas),
+            "start_time": datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S'),
+            "end_time": datetime.fromtimestamp(end_time).strftime('%Y-%m-%d %H:%M:%S')
+        }
+        result_dict.update({k: v for k, v in metrics.items() if k != "name"})
+        if not success:
+            result_dict["error"] = error
+        store_result(dict(config, alpha=alpha), result_dict, trainer="ensemble")
+        results.append(result_dict)
+    
+    print(f"Completed ensemble {unit_name}, learnable={use_learnable_alpha} in {runtime_sec:.2f}s")
+    
+    return results
+
 def main():
     """Main function to run hyperparameter sweep."""
     args = parse_args()
+    if args.asha and (args.ensemble or args.warm):
+        raise ValueError("--asha terminates training subprocesses and cannot be combined with --ensemble or --warm")
     
     # Parse sweep parameters
     units = [unit.strip() for unit in args.units.split(",")]
@@ -195,6 +661,15 @@ def main():
         "data_dir": args.data_dir,
         "val_split": args.val_split,
         "seed": args.seed,
+        "ensemble": args.ensemble,
+        "tensor_data": args.tensor_data,
+        "warm": args.warm,
+        "cache_dir": None if args.no_cache else args.cache_dir,
+        "asha": {
+            "metric": args.asha_metric,
+            "grace_period": args.asha_grace_period,
+            "reduction_factor": args.asha_reduction_factor,
+        } if args.asha else None,
         "start_time": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
     }
     
@@ -220,6 +695,12 @@ def main():
     print(f"Output directory: {output_dir}")
     
     # Create jobs
+    if args.ensemble:
+        # One job per (unit, learnable) group; its alpha values train together
+        param_combinations = [
+            (unit_name, alphas, use_learnable_alpha)
+            for unit_name, use_learnable_alpha in itertools.product(units, learnable_options)
+        ]
     for i, (unit_name, alpha, use_learnable_alpha) in enumerate(param_combinations):
         # Assign GPU ID if available
         gpu_id = None
@@ -228,7 +709,7 @@ def main():
         
         config = {
             "unit_name": unit_name,
-            "alpha": alpha,
+            "alphas" if args.ensemble else "alpha": alpha,
             "use_learnable_alpha": use_learnable_alpha,
             "epochs": args.epochs,
             "batch_size": args.batch_size,
@@ -238,28 +719,68 @@ def main():
             "data_dir": args.data_dir,
             "val_split": args.val_split,
             "seed": args.seed,
+            "tensor_data": args.tensor_data,
             "gpu_id": gpu_id
         }
         
         job_configs.append(config)
     
+    # Decode CIFAR-10 once into the shared memory-mapped store; every job then
+    # maps the same read-only files instead of loading a private copy
+    from datamodules.cifar_cache import build_cifar10_cache
+    print(f"CIFAR-10 store: {build_cifar10_cache(args.data_dir)}")
+    
+    # Skip runs the result cache already holds
+    cached_results = []
+    if not args.no_cache:
+        from result_cache import ResultCache
+        cached_results, job_configs = apply_result_cache(
+            ResultCache(args.cache_dir), job_configs, ensemble=args.ensemble
+        )
+    
     # Run jobs
     results = []
-    
-    if args.parallel:
+    job_fn = run_ensemble_job if args.ensemble else run_training_job
+    num_jobs = len(job_configs)
+    
+    scheduler = None
+    if not job_configs:
+        print("All runs are cached")
+    elif args.asha:
+        from asha import ASHAScheduler
+        
+        scheduler = ASHAScheduler(
+            max_t=args.epochs,
+            grace_period=args.asha_grace_period,
+            reduction_factor=args.asha_reduction_factor,
+            mode="max" if args.asha_metric == "val_acc" else "min",
+        )
+        num_workers = (args.num_workers or min(cpu_count(), num_jobs)) if args.parallel else 1
+        print(f"Running {num_jobs} jobs with ASHA (rungs at epochs {scheduler.rungs}) in {num_workers} workers")
+        results = run_asha_training_jobs(job_configs, scheduler, args.asha_metric, num_workers, cached_results)
+    elif args.warm and not args.ensemble:
+        # Warm workers train in-process; each gets its GPU via CUDA_VISIBLE_DEVICES
+        num_workers = (args.num_workers or min(cpu_count(), num_jobs)) if args.parallel else 1
+        print(f"Running {num_jobs} jobs in {num_workers} warm workers")
+        results = run_warm_jobs(job_configs, num_workers, args.threads_per_worker, gpu_ids)
+    elif args.parallel:
         # Determine number of workers
         num_workers = args.num_workers or min(cpu_count(), num_jobs)
         print(f"Running {num_jobs} jobs in parallel with {num_workers} workers")
         
         # Run jobs in parallel
         with Pool(num_workers) as pool:
-            results = pool.map(run_training_job, job_configs)
+            results = pool.map(job_fn, job_configs)
     else:
         # Run jobs sequentially
         print(f"Running {num_jobs} jobs sequentially")
         for config in job_configs:
-            result = run_training_job(config)
-            results.append(result)
+            results.append(job_fn(config))
+    
+    if args.ensemble:
+        # Flatten to one result per alpha value, like the per-process sweep
+        results = [result for group in results for result in group]
+    results = cached_results + results
     
     # Save results
     sweep_results = {
@@ -275,10 +796,17 @@ def main():
     success_count = sum(1 for r in results if r["success"])
     
     print("\nSweep Summary:")
-    print(f"Total jobs: {num_jobs}")
-    print(f"Successful jobs: {success_count}")
-    print(f"Failed jobs: {num_jobs - success_count}")
+    print(f"Total runs: {len(results)}")
+    print(f"Successful runs: {success_count}")
+    print(f"Failed runs: {len(results) - success_count}")
+    if scheduler is not None:
+        print(f"Stopped early by ASHA: {sum(1 for r in results if r.get('stopped_early'))}")
+        print(f"Runs reaching each rung: {scheduler.summary()}")
     print(f"Results saved to: {output_dir}")
+    
+    # Flat per-run CSVs for generate_leaderboard.py
+    num_csvs = export_leaderboard_csvs(results, args.output_dir)
+    print(f"Leaderboard inputs: {num_csvs} CSV files in {args.output_dir}")
 
 
 if __name__ == "__main__":
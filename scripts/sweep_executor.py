@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+"""
+Warm worker-pool executor for training sweeps.
+
+Launching ``python train_*.py`` once per configuration pays interpreter
+startup, the torch/Lightning import and the dataset load for every run, and
+the results then have to be scraped from stdout. ``SweepExecutor`` instead
+starts a fixed pool of worker processes once:
+
+    - each worker imports torch, applies its thread budget and runs an
+      optional initializer (e.g. loading the dataset) a single time
+    - the parent hands each configuration to an idle worker over that
+      worker's task pipe, so it always knows which job a worker holds
+    - every job returns a structured result dict over the worker's pipe
+    - an exception fails only its own job; a worker that dies (segfault,
+      OOM kill) fails its current job and is replaced by a fresh worker
+
+Job functions are called as ``job_fn(config, context)``, where ``context`` is
+the initializer's return value in that worker. Both must be importable
+top-level functions, since workers are started with the "spawn" method.
+Workers are not daemonic, so jobs may start processes of their own (e.g.
+DataLoader workers); use the executor as a context manager (or call
+``close``/``terminate``) to stop them.
+
+Example:
+    with SweepExecutor(train_job, num_workers=4, threads_per_worker=2) as executor:
+        for result in executor.run(configs):
+            print(result["job_id"], result["success"])
+"""
+
+import atexit
+import multiprocessing as mp
+import os
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+
+# Seconds between liveness checks while waiting for results
+_POLL_INTERVAL = 1.0
+
+# Thread pools sized by environment variables at import time
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "VECLIB_MAXIMUM_THREADS")
+
+
+def _worker_loop(
+    tasks,
+    conn,
+    job_fn: Callable,
+    initializer: Optional[Callable],
+    initargs: tuple,
+    threads: Optional[int],
+    gpu_id: Optional[str],
+):
+    """Body of one warm worker process."""
+    # Must happen before torch is imported in this process
+    if threads is not None:
+        for name in _THREAD_ENV_VARS:
+            os.environ[name] = str(threads)
+    if gpu_id is not None:
+        os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu_id)
+
+    # Pipe sends are synchronous, so every message sent before a hard crash
+    # reaches the parent (a multiprocessing.Queue may still be buffering it)
+    try:
+        import torch
+
+        if threads is not None:
+            torch.set_num_threads(threads)
+        context = initializer(*initargs) if initializer is not None else None
+    except Exception:
+        conn.send(("init_error", traceback.format_exc()))
+        return
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            task = tasks.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        job_id, config = task
+
+        start_time = time.time()
+        try:
+            payload = {"success": True, "result": job_fn(config, context)}
+        except Exception as e:
+            payload = {"success": False, "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+        payload.update(job_id=job_id, runtime_sec=time.time() - start_time)
+        conn.send(("done", payload))
+
+
+class SweepExecutor:
+    """
+    Pool of warm worker processes that run sweep configurations.
+
+    Args:
+        job_fn: Top-level function ``job_fn(config, context) -> result``
+        num_workers: Number of worker processes (default: 1)
+        threads_per_worker: torch/OpenMP threads per worker (default: library default)
+        initializer: Top-level function run once per worker; its return value is
+            the ``context`` passed to every job in that worker
+        initargs: Arguments for ``initializer``
+        gpu_ids: GPU ids assigned to the workers round-robin (sets CUDA_VISIBLE_DEVICES)
+    """
+
+    def __init__(
+        self,
+        job_fn: Callable[[Dict, Any], Any],
+        num_workers: int = 1,
+        threads_per_worker: Optional[int] = None,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: tuple = (),
+        gpu_ids: Optional[Sequence[str]] = None,
+    ):
+        if num_workers < 1:
+            raise ValueError(f"num_workers must be positive, got {num_workers}")
+        if threads_per_worker is not None and threads_per_worker < 1:
+            raise ValueError(f"threads_per_worker must be positive, got {threads_per_worker}")
+
+        self.job_fn = job_fn
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+        self.initializer = initializer
+        self.initargs = initargs
+        self.gpu_ids = list(gpu_ids) if gpu_ids else []
+
+        self._ctx = mp.get_context("spawn")
+        self._workers: Dict[int, Any] = {}
+        self._conns: Dict[int, Any] = {}
+        self._task_conns: Dict[int, Any] = {}
+        self._ready: set = set()
+        self._queue: deque = deque()
+        self._in_flight: Dict[int, int] = {}
+        self._pending: set = set()
+        self._next_job_id = 0
+        self._closed = False
+
+        # Non-daemonic workers would otherwise keep the interpreter from exiting
+        atexit.register(self.terminate)
+        for slot in range(num_workers):
+            self._start_worker(slot)
+
+    def _start_worker(self, slot: int):
+        self._ready.discard(slot)
+        gpu_id = self.gpu_ids[slot % len(self.gpu_ids)] if self.gpu_ids else None
+        reader, writer = self._ctx.Pipe(duplex=False)
+        task_reader, task_writer = self._ctx.Pipe(duplex=False)
+        # Not daemonic: daemonic processes may not start DataLoader workers
+        process = self._ctx.Process(
+            target=_worker_loop,
+            args=(
+                task_reader, writer, self.job_fn, self.initializer,
+                self.initargs, self.threads_per_worker, gpu_id,
+            ),
+        )
+        process.start()
+        # Only the worker holds the write end, so a dead worker reads as EOF
+        writer.close()
+        task_reader.close()
+        self._workers[slot] = process
+        self._conns[slot] = reader
+        self._task_conns[slot] = task_writer
+
+    def submit(self, config: Dict) -> int:
+        """
+        Queue one configuration.
+
+        Args:
+            config: Job configuration (must be picklable)
+
+        Returns:
+            Job id, reported back in the job's result
+        """
+        if self._closed:
+            raise RuntimeError("SweepExecutor is closed")
+        job_id = self._next_job_id
+        self._next_job_id += 1
+        self._pending.add(job_id)
+        self._queue.append((job_id, config))
+        return job_id
+
+    def _dispatch(self):
+        """Hand queued jobs to idle ready workers."""
+        for slot in sorted(self._ready):
+            if not self._queue:
+                return
+            if slot in self._in_flight:
+                continue
+            job_id, config = self._queue.popleft()
+            try:
+                self._task_conns[slot].send((job_id, config))
+            except (BrokenPipeError, ConnectionResetError):
+                # The worker died while idle; the job goes to its replacement
+                self._queue.appendleft((job_id, config))
+                continue
+            # Recorded by the parent, so a worker death always fails its job
+            self._in_flight[slot] = job_id
+
+    def _receive(self, slot: int) -> Iterator[Dict]:
+        """Handle all messages waiting on one worker's pipe."""
+        conn = self._conns[slot]
+        while conn.poll():
+            try:
+                kind, payload = conn.recv()
+            except EOFError:
+                return
+            if kind == "init_error":
+                self.terminate()
+                raise RuntimeError(f"Sweep worker {slot} failed to initialize:\n{payload}")
+            if kind == "ready":
+                self._ready.add(slot)
+            elif kind == "done":
+                self._in_flight.pop(slot, None)
+                self._pending.discard(payload["job_id"])
+                payload["worker_id"] = slot
+                yield payload
+
+    def _replace_dead(self, slot: int) -> Iterator[Dict]:
+        """Fail the job of a dead worker and start a replacement."""
+        process = self._workers[slot]
+        if slot not in self._ready:
+            # Respawning would fail the same way, e.g. on a broken import
+            self.terminate()
+            raise RuntimeError(f"Sweep worker {slot} exited with code {process.exitcode} during startup")
+        job_id = self._in_flight.pop(slot, None)
+        self._conns.pop(slot).close()
+        self._task_conns.pop(slot).close()
+        self._start_worker(slot)
+        if job_id is not None:
+            self._pending.discard(job_id)
+            yield {
+                "success": False,
+                "error": f"Worker {slot} exited with code {process.exitcode}",
+                "job_id": job_id,
+                "worker_id": slot,
+                "runtime_sec": None,
+            }
+
+    def as_completed(self) -> Iterator[Dict]:
+        """
+        Yield the results of all submitted jobs in completion order.
+
+        Each result has ``job_id``, ``worker_id``, ``success`` and ``runtime_sec``,
+        plus ``result`` on success or ``error`` (and ``traceback``) on failure.
+        """
+        while self._pending:
+            self._dispatch()
+            handles = list(self._conns.values()) + [process.sentinel for process in self._workers.values()]
+            wait(handles, timeout=_POLL_INTERVAL)
+            for slot in list(self._workers):
+                # Drain the pipe first: a finished job's result may precede the exit
+                yield from self._receive(slot)
+                if not self._workers[slot].is_alive():
+                    yield from self._replace_dead(slot)
+
+    def run(self, configs: Iterable[Dict]) -> Iterator[Dict]:
+        """Submit configurations and yield their results as they complete."""
+        for config in configs:
+            self.submit(config)
+        return self.as_completed()
+
+    def map(self, configs: Iterable[Dict]) -> List[Dict]:
+        """Run configurations and return their results in submission order."""
+        job_ids = [self.submit(config) for config in configs]
+        results = {result["job_id"]: result for result in self.as_completed()}
+        return [results[job_id] for job_id in job_ids]
+
+    def close(self):
+        """Let the workers finish queued jobs (discarding their results), then stop them."""
+        if self._closed:
+            return
+        for _ in self.as_completed():
+            pass
+        self._closed = True
+        atexit.unregister(self.terminate)
+        for conn in self._task_conns.values():
+            try:
+                conn.send(None)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        for process in self._workers.values():
+            process.join()
+        self._close_conns()
+
+    def terminate(self):
+        """Stop all workers immediately."""
+        self._closed = True
+        atexit.unregister(self.terminate)
+        for process in self._workers.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self._workers.values():
+            process.join()
+        self._close_conns()
+
+    def _close_conns(self):
+        for conn in list(self._conns.values()) + list(self._task_conns.values()):
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+        return False
@@ -8,6 +8,7 @@ using PyTorch Lightning.
 
 import os
 import argparse
+import json
 from datetime import datetime
 
 import torch
@@ -20,6 +21,7 @@ from pytorch_lightning.callbacks import ModelCheckpoint, EarlyStopping, Learning
 from lightning_modules.paGatingModule import paGatingModule
 from lightning_modules.metrics_logger import MetricsCsvLogger
 from lightning_modules.datamodule import CIFAR10DataModule
+from lightning_modules.tensor_datamodule import TensorCIFAR10DataModule
 import paGating
 
 
@@ -186,8 +188,37 @@ class CIFAR10Model(pl.LightningModule):
         return parent_parser
 
 
-def main(args):
-    """Main training function."""
+def build_datamodule(args):
+    """Create the CIFAR-10 datamodule selected by the command line arguments."""
+    if args.tensor_data:
+        # Whole dataset in memory, augmented batch-wise without worker processes
+        return TensorCIFAR10DataModule(
+            data_dir=args.data_dir,
+            batch_size=args.batch_size,
+            val_split=args.val_split,
+            seed=args.seed
+        )
+    return CIFAR10DataModule(
+        data_dir=args.data_dir,
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
+        val_split=args.val_split,
+        seed=args.seed
+    )
+
+
+def main(args, datamodule=None):
+    """
+    Main training function.
+    
+    Args:
+        args: Parsed command line arguments (see ``parse_args``)
+        datamodule: Already set up datamodule to reuse, e.g. in a warm sweep
+            worker (default: build one from ``args``)
+    
+    Returns:
+        Dictionary with the output directory and final metrics
+    """
     pl.seed_everything(args.seed)
     
     # Set up output directory
@@ -198,14 +229,9 @@ def main(args):
     )
     os.makedirs(output_dir, exist_ok=True)
     
-    # Set up data module
-    datamodule = CIFAR10DataModule(
-        data_dir=args.data_dir,
-        batch_size=args.batch_size,
-        num_workers=args.num_workers,
-        val_split=args.val_split,
-        seed=args.seed
-    )
+    # Set up data module (unless the caller passes a resident one)
+    if datamodule is None:
+        datamodule = build_datamodule(args)
     
     # Set up model
     model = CIFAR10Model(
@@ -224,9 +250,10 @@ def main(args):
     )
     
     # Callbacks
+    checkpoint_dir = args.checkpoint_dir or os.path.join(output_dir, "checkpoints")
     callbacks = [
         ModelCheckpoint(
-            dirpath=os.path.join(output_dir, "checkpoints"),
+            dirpath=checkpoint_dir,
             filename="{epoch:02d}-{val_loss:.4f}-{val_acc:.4f}",
             monitor="val_loss",
             mode="min",
@@ -258,13 +285,34 @@ def main(args):
     )
     
     # Train and test
-    trainer.fit(model, datamodule)
-    trainer.test(model, datamodule, ckpt_path="best")
+    # Continue an interrupted run from its last checkpoint
+    resume_path = os.path.join(checkpoint_dir, "last.ckpt") if args.resume else None
+    if resume_path is not None and not os.path.exists(resume_path):
+        resume_path = None
+    if resume_path is not None:
+        print(f"Resuming from {resume_path}")
+    
+    trainer.fit(model, datamodule, ckpt_path=resume_path)
+    fit_metrics = {name: float(value) for name, value in trainer.callback_metrics.items()}
+    test_metrics = trainer.test(model, datamodule, ckpt_path="best")
     
     print(f"Training completed. Results saved to {output_dir}")
+    
+    checkpoint = callbacks[0]
+    return {
+        "output_dir": output_dir,
+        "metrics_csv": os.path.join(output_dir, args.unit_name, "metrics.csv"),
+        "resumed_from": resume_path,
+        "epochs_trained": trainer.current_epoch,
+        "best_model_path": checkpoint.best_model_path,
+        "best_val_loss": float(checkpoint.best_model_score) if checkpoint.best_model_score is not None else None,
+        "final_metrics": fit_metrics,
+        "test_metrics": {name: float(value) for name, value in test_metrics[0].items()} if test_metrics else {},
+    }
 
 
-if __name__ == "__main__":
+def parse_args(argv=None):
+    """Parse command line arguments (``argv`` defaults to ``sys.argv``)."""
     parser = argparse.ArgumentParser(description="CIFAR-10 Training Script for paGating Units")
     
     # Add datamodule arguments
@@ -278,6 +326,23 @@ if __name__ == "__main__":
     parser.add_argument("--max_epochs", type=int, default=100)
     parser.add_argument("--output_dir", type=str, default="cifar10_results")
     parser.add_argument("--cpu", action="store_true", help="Force CPU training")
+    parser.add_argument("--tensor_data", action="store_true",
+                        help="Keep CIFAR-10 in memory and augment whole batches (TensorCIFAR10DataModule)")
+    parser.add_argument("--checkpoint_dir", type=str, default=None,
+                        help="Checkpoint directory (default: <run output dir>/checkpoints)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume from last.ckpt in the checkpoint directory if it exists")
+    parser.add_argument("--result_file", type=str, default=None,
+                        help="Write the final metrics to this JSON file")
     
-    args = parser.parse_args()
-    main(args) 
\ No newline at end of file
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = main(args)
+    if args.result_file:
+        with open(args.result_file, "w") as f:
+            json.dump(results, f, indent=2)
+
+ 
\ No newline at end of file
@@ -23,9 +23,10 @@ from pathlib import Path
 # Add paGating to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from paGating import paGLU, paGTU, paSwishU, paReGLU, paGELU, paMishU, paSiLU
+from datamodules.cifar_cache import MemmapCIFAR10
 
-def parse_args():
-    """Parse command line arguments."""
+def parse_args(argv=None):
+    """Parse command line arguments (``argv`` defaults to ``sys.argv``)."""
     parser = argparse.ArgumentParser(description="Train CIFAR-10 with paGating activations")
     
     parser.add_argument("--unit", type=str, required=True,
@@ -45,8 +46,12 @@ def parse_args():
                         help="Output directory")
     parser.add_argument("--num_workers", type=int, default=4,
                         help="Number of data loader workers")
+    parser.add_argument("--checkpoint_dir", type=str, default=None,
+                        help="Checkpoint directory (default: <output_dir>/checkpoints)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume from last.ckpt in the checkpoint directory if it exists")
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 class paGatingCNN(nn.Module):
@@ -205,6 +210,13 @@ class paGatingCIFARModule(pl.LightningModule):
         if current_val_acc > self.best_val_acc:
             self.best_val_acc = float(current_val_acc)
     
+    def on_save_checkpoint(self, checkpoint):
+        # Keep the best accuracy across resumed runs
+        checkpoint["best_val_acc"] = self.best_val_acc
+    
+    def on_load_checkpoint(self, checkpoint):
+        self.best_val_acc = checkpoint.get("best_val_acc", 0.0)
+    
     def on_test_epoch_end(self):
         # Track final test accuracy
         self.final_test_acc = float(self.trainer.callback_metrics.get("test_acc", 0.0))
@@ -231,13 +243,13 @@ def get_cifar10_dataloaders(batch_size, num_workers=4):
         transforms.Normalize((0.4914, 0.4822, 0.4465), (0.2023, 0.1994, 0.2010))
     ])
     
-    # Datasets
-    train_dataset = torchvision.datasets.CIFAR10(
-        root='./data', train=True, download=True, transform=transform_train
+    # Datasets (read-only views of the shared memory-mapped store)
+    train_dataset = MemmapCIFAR10(
+        root='./data', train=True, transform=transform_train
     )
     
-    test_dataset = torchvision.datasets.CIFAR10(
-        root='./data', train=False, download=True, transform=transform_test
+    test_dataset = MemmapCIFAR10(
+        root='./data', train=False, transform=transform_test
     )
     
     # Split train into train/val
@@ -266,9 +278,17 @@ def get_cifar10_dataloaders(batch_size, num_workers=4):
     return train_loader, val_loader, test_loader
 
 
-def main():
-    """Main training function."""
-    args = parse_args()
+def main(argv=None):
+    """
+    Main training function.
+    
+    Args:
+        argv: Command line arguments (default: ``sys.argv``)
+    
+    Returns:
+        Dictionary with the hyperparameters and final metrics (also saved as results.json)
+    """
+    args = parse_args(argv)
     
     # Set seed
     pl.seed_everything(args.seed)
@@ -293,12 +313,14 @@ def main():
     model = paGatingCIFARModule(args.unit, args.alpha, args.learning_rate)
     
     # Callbacks
+    checkpoint_dir = Path(args.checkpoint_dir) if args.checkpoint_dir else output_dir / "checkpoints"
     checkpoint_callback = ModelCheckpoint(
-        dirpath=output_dir / "checkpoints",
+        dirpath=checkpoint_dir,
         filename=f"{args.unit}_alpha{args.alpha}_best",
         monitor="val_acc",
         mode="max",
-        save_top_k=1
+        save_top_k=1,
+        save_last=True
     )
     
     early_stopping = EarlyStopping(
@@ -326,8 +348,13 @@ def main():
     )
     
     # Train
-    print("🏋️ Starting training...")
-    trainer.fit(model, train_loader, val_loader)
+    # Continue an interrupted run from its last checkpoint
+    resume_path = checkpoint_dir / "last.ckpt" if args.resume else None
+    if resume_path is not None and not resume_path.exists():
+        resume_path = None
+    
+    print("🏋️ Starting training..." if resume_path is None else f"🏋️ Resuming training from {resume_path}...")
+    trainer.fit(model, train_loader, val_loader, ckpt_path=resume_path)
     
     # Test
     print("🧪 Running final test...")
@@ -363,6 +390,8 @@ def main():
     # Print final results for parsing
     print(f"Final validation accuracy: {model.best_val_acc:.4f}")
     print(f"Final test accuracy: {model.final_test_acc:.4f}")
+    
+    return results
 
 
 if __name__ == "__main__":
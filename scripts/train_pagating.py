@@ -1,5 +1,5 @@
 #!/usr/bin/env python3.12
-import argparse, pathlib, sys, os
+import argparse, csv, pathlib, sys, os
 
 # --- Cache Setup ---
 # Set HF_HOME and TRANSFORMERS_CACHE to a local directory
@@ -8,8 +8,7 @@ os.environ['HF_HOME'] = CACHE_DIR
 os.environ['TRANSFORMERS_CACHE'] = CACHE_DIR
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-from datasets import load_dataset
-from transformers import GPT2Tokenizer, TrainingArguments, Trainer, GPT2LMHeadModel
+from transformers import TrainingArguments, Trainer, TrainerCallback, GPT2LMHeadModel
 import torch
 import torch._dynamo
 
@@ -18,7 +17,28 @@ torch._dynamo.config.suppress_errors = True
 
 # Add project root to Python path for models import
 sys.path.insert(0, os.path.abspath('.'))
-from models.gpt2_pagating_patch import patch_gpt2_with_pagating
+from datamodules.wikitext_cache import load_packed_wikitext
+from models.gpt2_pagating_patch import AlphaSchedulerTrainerCallback, patch_gpt2_with_pagating
+
+class EvalMetricsCsvCallback(TrainerCallback):
+    """Rewrite a CSV of (step, eval_loss) after every evaluation, for sweep schedulers."""
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rows = []
+
+    def on_evaluate(self, args, state, control, metrics=None, **kwargs):
+        if not state.is_world_process_zero or not metrics or "eval_loss" not in metrics:
+            return
+        self.rows.append({"step": state.global_step, "eval_loss": metrics["eval_loss"]})
+        # Replaced atomically, since the sweep reads it while training runs
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["step", "eval_loss"])
+            writer.writeheader()
+            writer.writerows(self.rows)
+        os.replace(tmp_path, self.path)
 
 parser = argparse.ArgumentParser()
 parser.add_argument("--alpha_mode", required=True)
@@ -27,36 +47,42 @@ parser.add_argument("--batch_size",  type=int,   default=8)
 parser.add_argument("--max_steps",   type=int,   default=20000)
 parser.add_argument("--output_dir",  default="logs/phase2_runs")
 parser.add_argument("--resume_from_checkpoint", type=str, default=None, help="Path to checkpoint to resume from")
+parser.add_argument("--recompute", action="store_true", help="Recompute paGating units in backward to save activation memory")
+parser.add_argument("--mlp_mode", choices=["stacked", "replace"], default="stacked",
+                    help="'replace' makes the paGating unit the d_model->d_ff expansion (FLOP-neutral with --param_matched)")
+parser.add_argument("--param_matched", action="store_true", help="Shrink d_ff to match stock GPT-2 MLP parameters (replace mode)")
+parser.add_argument("--no_pretrained_mlp_init", action="store_true", help="Do not initialize the replace-mode MLP from c_fc/c_proj")
+parser.add_argument("--block_size", type=int, default=128, help="Tokens per packed training example")
+parser.add_argument("--max_train_lines", type=int, default=50_000, help="WikiText-103 train lines to pack (0: all)")
+parser.add_argument("--packed_cache_dir", default=None, help="Directory of the packed token cache (default: ./.cache/packed)")
+parser.add_argument("--metrics_csv", default=None, help="Evaluation loss log (default: <run dir>/eval_metrics.csv)")
 args = parser.parse_args()
 
 run_name = f"pagating_{args.alpha_mode}_lr{args.learning_rate}".replace(".","-")
+if args.mlp_mode != "stacked":
+    run_name += f"_{args.mlp_mode}" + ("_pm" if args.param_matched else "")
 run_dir  = pathlib.Path(args.output_dir) / run_name
 run_dir.mkdir(parents=True, exist_ok=True)
 
 print("Loading dataset …")
-tok = GPT2Tokenizer.from_pretrained("gpt2", cache_dir=CACHE_DIR)
-tok.pad_token = tok.eos_token  # Fix missing pad_token
-ds  = load_dataset("wikitext", "wikitext-103-raw-v1", cache_dir=CACHE_DIR)
-def tok_fn(ex): 
-    result = tok(ex["text"], truncation=True, padding="max_length", max_length=128)
-    # For language modeling, labels should be the same as input_ids
-    result["labels"] = result["input_ids"].copy()
-    # Filter out empty sequences
-    if not result['input_ids'] or len(result['input_ids']) == 0:
-        return None
-    return result
-train = ds["train"].select(range(50_000)).map(tok_fn, batched=True, remove_columns=["text"])
-val   = ds["validation"].map(tok_fn, batched=True, remove_columns=["text"])
-# Filter None results
-train = train.filter(lambda x: x is not None)
-val = val.filter(lambda x: x is not None)
-train.set_format(type="torch", columns=["input_ids","attention_mask","labels"])
-val.set_format(type="torch", columns=["input_ids","attention_mask","labels"])
+# Tokenized once into a packed uint16 cache; every example is block_size real tokens
+data_kwargs = dict(block_size=args.block_size, cache_dir=args.packed_cache_dir, hf_cache_dir=CACHE_DIR)
+train = load_packed_wikitext("train", max_lines=args.max_train_lines or None, **data_kwargs)
+val   = load_packed_wikitext("validation", **data_kwargs)
+print(f"{len(train):,} train / {len(val):,} validation blocks of {args.block_size} tokens")
 
 print("Patching GPT-2 with paGating …")
 model = GPT2LMHeadModel.from_pretrained("gpt2", cache_dir=CACHE_DIR)
-patch_gpt2_with_pagating(model, args.alpha_mode)
-# model.gradient_checkpointing_enable() # Disabled for performance
+patch_gpt2_with_pagating(
+    model,
+    args.alpha_mode,
+    recompute=args.recompute,
+    mlp_mode=args.mlp_mode,
+    init_from_pretrained=not args.no_pretrained_mlp_init,
+    param_matched=args.param_matched,
+    alpha_schedule_steps=args.max_steps,
+)
+# model.gradient_checkpointing_enable() # Disabled for performance; use --recompute for unit-level recompute
 
 # if hasattr(torch, 'compile'):
 #     print("Compiling model with torch.compile() ...")
@@ -78,7 +104,16 @@ training_args = TrainingArguments(
     use_cpu=not torch.backends.mps.is_available(),
 )
 
-trainer = Trainer(model=model, args=training_args, train_dataset=train, eval_dataset=val)
+trainer = Trainer(
+    model=model,
+    args=training_args,
+    train_dataset=train,
+    eval_dataset=val,
+    callbacks=[
+        AlphaSchedulerTrainerCallback(),
+        EvalMetricsCsvCallback(args.metrics_csv or run_dir/"eval_metrics.csv"),
+    ],
+)
 
 # Resume from checkpoint if specified
 if args.resume_from_checkpoint:
@@ -10,9 +10,8 @@ import torch.nn as nn
 from pathlib import Path
 from transformers import (
     GPT2LMHeadModel, GPT2Tokenizer, TrainingArguments, 
-    Trainer, DataCollatorForLanguageModeling
+    Trainer, default_data_collator
 )
-from datasets import load_dataset
 import sys
 import os
 from transformers import AdamW
@@ -21,6 +20,7 @@ from transformers import AdamW
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+from datamodules.wikitext_cache import load_packed_wikitext
 from models.gpt2_pagating_patch import patch_gpt2_with_pagating
 
 def setup_device():
@@ -135,6 +135,12 @@ def main():
                        help="Enable mixed precision training (experimental)")
     parser.add_argument("--compile_model", action="store_true",
                        help="Enable torch.compile for MPS (experimental)")
+    parser.add_argument("--dataset_config", type=str, default="wikitext-2-raw-v1",
+                       help="WikiText configuration")
+    parser.add_argument("--block_size", type=int, default=512,
+                       help="Tokens per packed training example")
+    parser.add_argument("--packed_cache_dir", type=str, default=None,
+                       help="Directory of the packed token cache (default: ./.cache/packed)")
     
     args = parser.parse_args()
     
@@ -154,29 +160,19 @@ def main():
     run_dir.mkdir(parents=True, exist_ok=True)
     
     print("📚 Loading dataset...")
-    dataset = load_dataset("wikitext", "wikitext-2-raw-v1")
+    # Tokenized once into a packed uint16 cache; blocks contain no padding
+    data_kwargs = dict(
+        block_size=args.block_size,
+        dataset_config=args.dataset_config,
+        cache_dir=args.packed_cache_dir,
+    )
+    train_dataset = load_packed_wikitext("train", **data_kwargs)
+    eval_dataset = load_packed_wikitext("validation", **data_kwargs)
+    print(f"   {len(train_dataset):,} train / {len(eval_dataset):,} validation blocks of {args.block_size} tokens")
     
     # Setup model, tokenizer, and optimizer
     model, tokenizer, optimizer = setup_model_and_optimizer(args, device)
     
-    def tokenize_function(examples):
-        return tokenizer(examples["text"], truncation=True, padding=True, max_length=512)
-    
-    print("🔄 Tokenizing dataset...")
-    tokenized_datasets = dataset.map(tokenize_function, batched=True, remove_columns=["text"])
-    
-    # Filter out empty sequences
-    def filter_empty(example):
-        return len(example["input_ids"]) > 1
-    
-    tokenized_datasets = tokenized_datasets.filter(filter_empty)
-    
-    # Data collator
-    data_collator = DataCollatorForLanguageModeling(
-        tokenizer=tokenizer,
-        mlm=False,
-    )
-    
     # Optimized training arguments
     training_args = TrainingArguments(
         output_dir=str(run_dir),
@@ -231,9 +227,9 @@ def main():
     trainer = OptimizedTrainer(
         model=model,
         args=training_args,
-        train_dataset=tokenized_datasets["train"],
-        eval_dataset=tokenized_datasets["validation"],
-        data_collator=data_collator,
+        train_dataset=train_dataset,
+        eval_dataset=eval_dataset,
+        data_collator=default_data_collator,
         tokenizer=tokenizer,
         optimizers=(optimizer, None),  # Use our custom optimizer
     )
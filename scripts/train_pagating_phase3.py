@@ -1,7 +1,6 @@
 #!/usr/bin/env python3.12
 import argparse, pathlib, sys, os, time, psutil
-from datasets import load_dataset
-from transformers import GPT2Tokenizer, TrainingArguments, Trainer, GPT2LMHeadModel
+from transformers import TrainingArguments, Trainer, GPT2LMHeadModel
 import torch
 import torch._dynamo
 import numpy as np
@@ -12,6 +11,7 @@ torch._dynamo.config.suppress_errors = True
 
 # Add project root to Python path for models import
 sys.path.insert(0, os.path.abspath('.'))
+from datamodules.wikitext_cache import load_packed_wikitext
 from models.gpt2_pagating_patch import patch_gpt2_with_pagating
 
 # --- Cache Setup ---
@@ -137,6 +137,9 @@ def main():
     parser.add_argument("--resume_from_checkpoint", type=str, default=None)
     parser.add_argument("--enable_profiling", action="store_true", default=True)
     parser.add_argument("--compile_mode", choices=["default", "reduce-overhead", "max-autotune"], default="default")
+    parser.add_argument("--block_size", type=int, default=128, help="Tokens per packed training example")
+    parser.add_argument("--max_train_lines", type=int, default=50_000, help="WikiText-103 train lines to pack (0: all)")
+    parser.add_argument("--packed_cache_dir", default=None, help="Directory of the packed token cache (default: ./.cache/packed)")
     args = parser.parse_args()
     
     run_name = f"pagating_{args.alpha_mode}_lr{args.learning_rate}_phase3".replace(".", "-")
@@ -150,23 +153,10 @@ def main():
     print(f"  Memory: {psutil.virtual_memory().total / (1024**3):.1f}GB")
     
     print("\nLoading dataset...")
-    tok = GPT2Tokenizer.from_pretrained("gpt2", cache_dir=CACHE_DIR)
-    tok.pad_token = tok.eos_token
-    ds = load_dataset("wikitext", "wikitext-103-raw-v1", cache_dir=CACHE_DIR)
-    
-    def tok_fn(ex):
-        result = tok(ex["text"], truncation=True, padding="max_length", max_length=128)
-        result["labels"] = result["input_ids"].copy()
-        if not result['input_ids'] or len(result['input_ids']) == 0:
-            return None
-        return result
-    
-    train = ds["train"].select(range(50_000)).map(tok_fn, batched=True, remove_columns=["text"])
-    val = ds["validation"].map(tok_fn, batched=True, remove_columns=["text"])
-    train = train.filter(lambda x: x is not None)
-    val = val.filter(lambda x: x is not None)
-    train.set_format(type="torch", columns=["input_ids", "attention_mask", "labels"])
-    val.set_format(type="torch", columns=["input_ids", "attention_mask", "labels"])
+    data_kwargs = dict(block_size=args.block_size, cache_dir=args.packed_cache_dir, hf_cache_dir=CACHE_DIR)
+    train = load_packed_wikitext("train", max_lines=args.max_train_lines or None, **data_kwargs)
+    val = load_packed_wikitext("validation", **data_kwargs)
+    print(f"{len(train):,} train / {len(val):,} validation blocks of {args.block_size} tokens")
     
     print("Initializing model with advanced optimizations...")
     model = GPT2LMHeadModel.from_pretrained("gpt2", cache_dir=CACHE_DIR)
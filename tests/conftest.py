@@ -0,0 +1,17 @@
+import pytest
+
+
+@pytest.fixture
+def randomize_norms():
+    """Give every affine norm of a module non-trivial parameters, so that
+    folding (freeze) and copying (supernet pruning) are exercised."""
+    # Imported here so that torch-free tests (sweep scheduling, caches) still collect
+    import torch
+
+    def randomize(module):
+        with torch.no_grad():
+            for name, param in module.named_parameters():
+                if 'norm' in name:
+                    param.copy_(torch.randn_like(param))
+        return module
+    return randomize
@@ -0,0 +1,118 @@
+import pytest
+import torch
+
+from paGating import activation_map, paGLU, paGTU, PrePostNormWrapper
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 8
+INPUT_DIM = 16
+OUTPUT_DIM = 24
+
+PA_UNITS = list(activation_map.values())
+
+
+def _generic_copy(unit):
+    """Build an identical unit that always runs the generic blend."""
+    generic = unit.clone()
+    generic.load_state_dict(unit.state_dict())
+    generic.specialize_alpha = False
+    return generic
+
+
+@pytest.mark.parametrize("unit_class", PA_UNITS)
+@pytest.mark.parametrize("alpha", [0.0, 0.3, 1.0])
+@pytest.mark.parametrize("fused", [False, True])
+def test_specialized_matches_generic(unit_class, alpha, fused):
+    """Specialized α paths reproduce the generic blend."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    unit = unit_class(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=alpha, fused=fused)
+    generic = _generic_copy(unit)
+
+    assert torch.allclose(unit(x), generic(x), atol=1e-6)
+
+
+@pytest.mark.parametrize("unit_class", [paGLU, paGTU])
+def test_alpha_zero_skips_gate_path(unit_class):
+    """With α=0 the gate projection takes no part in the computation."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    unit = unit_class(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=0.0, use_gate_norm=True)
+
+    unit(x).sum().backward()
+
+    assert unit.value_proj.weight.grad is not None
+    assert unit.gate_proj.weight.grad is None
+
+
+def test_regime_invalidated_on_in_place_update():
+    """Mutating the alpha buffer in place switches the dispatched path."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    unit = paGLU(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=0.0)
+    assert torch.allclose(unit(x), unit.value_proj(x))
+
+    unit.alpha_fixed.fill_(0.5)
+    generic = _generic_copy(unit)
+    assert torch.allclose(unit(x), generic(x), atol=1e-6)
+    assert not torch.allclose(unit(x), unit.value_proj(x))
+
+
+def test_regime_invalidated_on_load_state_dict():
+    """Loading a checkpoint with a different α refreshes the cached regime."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    unit = paGLU(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=1.0)
+    unit(x)
+
+    source = paGLU(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=0.0)
+    unit.load_state_dict(source.state_dict())
+
+    assert torch.allclose(unit(x), source(x))
+
+
+def test_regime_invalidated_on_buffer_replacement():
+    """Replacing the alpha buffer refreshes the cached regime."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    unit = paGLU(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=0.0)
+    unit(x)
+
+    unit.alpha_fixed = torch.tensor(1.0)
+    expected = unit.value_proj(x) * torch.sigmoid(unit.gate_proj(x))
+
+    assert torch.allclose(unit(x), expected, atol=1e-6)
+
+
+ALPHA_GRID = [0.0, 0.1, 0.5, 0.9, 1.0]
+
+
+@pytest.mark.parametrize("unit_class", PA_UNITS)
+@pytest.mark.parametrize("use_gate_norm", [False, True])
+def test_forward_alpha_grid_matches_per_alpha(unit_class, use_gate_norm):
+    """Each grid slice equals the unit evaluated at that alpha."""
+    x = torch.randn(2, 3, INPUT_DIM)
+    unit = unit_class(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=0.5, use_gate_norm=use_gate_norm)
+
+    grid = unit.forward_alpha_grid(x, ALPHA_GRID)
+
+    assert grid.shape == (len(ALPHA_GRID), 2, 3, OUTPUT_DIM)
+    for i, alpha in enumerate(ALPHA_GRID):
+        unit.alpha_fixed.fill_(alpha)
+        assert torch.allclose(grid[i], unit(x), atol=1e-6)
+
+
+def test_forward_alpha_grid_wrapper():
+    """PrePostNormWrapper applies its norms around the grid evaluation."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    unit = paGLU(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=0.5)
+    model = PrePostNormWrapper(unit, INPUT_DIM, OUTPUT_DIM, pre_norm=True, post_norm=True)
+
+    grid = model.forward_alpha_grid(x, torch.tensor(ALPHA_GRID))
+
+    for i, alpha in enumerate(ALPHA_GRID):
+        unit.alpha_fixed.fill_(alpha)
+        assert torch.allclose(grid[i], model(x), atol=1e-5)
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
@@ -9,8 +9,11 @@ from paGating.alpha_schedulers import (
     EntropyBasedAlpha,
     ConfidenceBasedAlpha,
     LinearRampScheduler,
-    get_scheduler
+    StepAlphaScheduler,
+    get_scheduler,
+    step_alpha_schedulers
 )
+from paGating import paGLU
 
 
 # Set reproducible seed
@@ -293,5 +296,127 @@ def test_scheduler_output_tensor_type():
             assert torch.all((0.0 <= result) & (result <= 1.0)), "All alpha values should be in range [0,1]"
 
 
+@pytest.mark.parametrize("scheduler_class,kwargs", [
+    (CosineAlphaScheduler, {"max_steps": 100}),
+    (LinearRampScheduler, {"warmup_steps": 100}),
+])
+def test_step_schedulers_are_buffer_resident(scheduler_class, kwargs):
+    """Step-driven schedulers return one buffer instead of allocating per call."""
+    scheduler = scheduler_class(**kwargs)
+    first = scheduler()
+    scheduler.step()
+    second = scheduler()
+
+    assert first is second
+    assert scheduler.schedule.numel() == 101
+    assert torch.isclose(second, scheduler.schedule[1])
+
+
+def test_step_scheduler_requires_schedule():
+    """Subclasses without _schedule fail on construction."""
+    class Incomplete(StepAlphaScheduler):
+        def __init__(self):
+            super().__init__()
+            self._register_schedule()
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    with pytest.raises(TypeError):
+        StepAlphaScheduler()
+
+
+def test_scheduler_follows_unit_and_keeps_state_dict():
+    """A scheduler passed as alpha moves with its unit and adds no checkpoint keys."""
+    scheduler = CosineAlphaScheduler(max_steps=10)
+    unit = paGLU(INPUT_DIM, INPUT_DIM, alpha=scheduler)
+
+    unit.double()
+
+    assert scheduler.alpha.dtype == torch.float64
+    assert not any(key.startswith("alpha_fn") for key in unit.state_dict())
+    assert unit(torch.randn(BATCH_SIZE, INPUT_DIM, dtype=torch.float64)).dtype == torch.float64
+
+
+def test_step_alpha_schedulers():
+    """step_alpha_schedulers advances every scheduler in a model."""
+    model = torch.nn.Sequential(
+        paGLU(INPUT_DIM, INPUT_DIM, alpha=CosineAlphaScheduler(max_steps=10)),
+        paGLU(INPUT_DIM, INPUT_DIM, alpha=LinearRampScheduler(warmup_steps=10)),
+        paGLU(INPUT_DIM, INPUT_DIM, alpha=0.5),
+    )
+
+    assert step_alpha_schedulers(model) == 2
+    assert model[0].alpha_fn.current_step == 1
+    assert model[1].alpha_fn.current_step == 1
+
+    step_alpha_schedulers(model, step=5)
+    assert torch.isclose(model[0].alpha_fn(), torch.tensor(0.5))
+    assert torch.isclose(model[1].alpha_fn(), torch.tensor(0.5))
+
+    step_alpha_schedulers(model, step=50)
+    assert model[0].alpha_fn.current_step == 10
+    assert torch.isclose(model[0].alpha_fn(), torch.tensor(0.0), atol=1e-6)
+    assert torch.isclose(model[1].alpha_fn(), torch.tensor(1.0))
+
+
+def _reference_entropy_alpha(x):
+    probs = torch.softmax(x, dim=-1)
+    entropy = -torch.sum(probs * torch.log(probs + 1e-10), dim=-1)
+    return torch.clamp(entropy / np.log(x.size(-1)), 0.0, 1.0)
+
+
+def _reference_confidence_alpha(x):
+    return torch.clamp(1 - torch.softmax(x, dim=-1).max(dim=-1)[0], 0.0, 1.0)
+
+
+@pytest.mark.parametrize("shape", [(BATCH_SIZE, INPUT_DIM), (4, 5, INPUT_DIM), (2, 3, 4, INPUT_DIM)])
+def test_input_adaptive_alpha_matches_softmax_reference(shape):
+    """Log-sum-exp formulations match the softmax definitions per token."""
+    x = torch.randn(*shape) * 3
+
+    entropy_alpha = EntropyBasedAlpha()(x)
+    confidence_alpha = ConfidenceBasedAlpha()(x)
+
+    assert entropy_alpha.shape == shape[:-1]
+    assert torch.allclose(entropy_alpha, _reference_entropy_alpha(x), atol=1e-5)
+    assert torch.allclose(confidence_alpha, _reference_confidence_alpha(x), atol=1e-6)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, INPUT_DIM])
+def test_entropy_alpha_chunked(chunk_size):
+    """Chunked online entropy matches the softmax reference, including a ragged last chunk."""
+    x = torch.randn(4, 5, INPUT_DIM) * 10
+    expected = _reference_entropy_alpha(x)
+
+    assert torch.allclose(EntropyBasedAlpha(chunk_size=chunk_size)(x), expected, atol=1e-5)
+    with pytest.raises(ValueError):
+        EntropyBasedAlpha(chunk_size=0)
+
+
+def test_input_adaptive_alpha_pooled():
+    """Pooled alpha is computed from averaged feature groups."""
+    x = torch.randn(4, 5, INPUT_DIM)
+    pooled = x.reshape(4, 5, 8, INPUT_DIM // 8).mean(dim=-1)
+
+    assert torch.allclose(EntropyBasedAlpha(pooled_dim=8)(x), _reference_entropy_alpha(pooled), atol=1e-5)
+    assert torch.allclose(ConfidenceBasedAlpha(pooled_dim=8)(x), _reference_confidence_alpha(pooled), atol=1e-6)
+
+
+@pytest.mark.parametrize("shape", [(BATCH_SIZE, INPUT_DIM), (4, 5, INPUT_DIM), (2, 3, 4, INPUT_DIM)])
+@pytest.mark.parametrize("memory_efficient", [False, True])
+def test_unit_broadcasts_per_token_alpha(shape, memory_efficient):
+    """Units apply per-token alpha along the feature dimension for 2-D to 4-D inputs."""
+    x = torch.randn(*shape)
+    unit = paGLU(INPUT_DIM, 24, alpha=EntropyBasedAlpha(), memory_efficient=memory_efficient)
+
+    out = unit(x)
+
+    alpha = _reference_entropy_alpha(x).unsqueeze(-1)
+    gate = torch.sigmoid(unit.gate_proj(x))
+    expected = unit.value_proj(x) * (alpha * gate + 1 - alpha)
+    assert out.shape == (*shape[:-1], 24)
+    assert torch.allclose(out, expected, atol=1e-5)
+
+
 if __name__ == "__main__":
     pytest.main(["-v"])
\ No newline at end of file
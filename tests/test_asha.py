@@ -0,0 +1,90 @@
+import os
+import sys
+
+import pytest
+
+# Add the scripts directory to path to import the ASHA scheduler
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from asha import ASHAScheduler, read_metric_history, run_asha_jobs
+
+
+# Test parameters
+MAX_EPOCHS = 10
+REDUCTION_FACTOR = 3
+
+# Writes a MetricsCsvLogger-style file one epoch at a time
+TRAIN_SCRIPT = """
+import os, sys, time
+path, loss = sys.argv[1], float(sys.argv[2])
+rows = ["epoch,train_loss,val_loss,train_acc,val_acc"]
+for epoch in range(1, int(sys.argv[3]) + 1):
+    rows.append(f"{epoch},{loss},{loss / epoch},0.5,0.5")
+    with open(path + ".tmp", "w") as f:
+        f.write("\\n".join(rows) + "\\n")
+    os.replace(path + ".tmp", path)
+    time.sleep(0.05)
+"""
+
+
+def test_rungs_and_stopping():
+    """Runs below the rung cutoff stop; the first and better runs continue."""
+    scheduler = ASHAScheduler(max_t=MAX_EPOCHS, grace_period=1, reduction_factor=REDUCTION_FACTOR)
+    assert scheduler.rungs == [1, 3, 9]
+
+    assert scheduler.on_result("a", 1, 0.5)      # first run at the rung always continues
+    assert not scheduler.on_result("b", 1, 0.9)  # worse than the top third
+    assert scheduler.on_result("c", 1, 0.1)
+    assert scheduler.on_result("a", 2, 0.4)      # between rungs: no decision
+    assert not scheduler.on_result("b", 2, 0.1)  # stopped runs stay stopped
+    assert scheduler.stopped_at("b") == 1
+    assert not scheduler.on_result("d", 1, float("nan"))
+    assert scheduler.summary() == {1: 4, 3: 0, 9: 0}
+
+
+def test_max_mode_and_validation():
+    """Accuracy-like metrics keep the highest values; bad settings raise ValueError."""
+    scheduler = ASHAScheduler(max_t=MAX_EPOCHS, mode="max")
+    assert scheduler.on_result("a", 1, 0.5)
+    assert not scheduler.on_result("b", 1, 0.2)
+    assert scheduler.on_result("c", 1, 0.7)
+
+    with pytest.raises(ValueError):
+        ASHAScheduler(max_t=MAX_EPOCHS, grace_period=0)
+    with pytest.raises(ValueError):
+        ASHAScheduler(max_t=MAX_EPOCHS, reduction_factor=1)
+    with pytest.raises(ValueError):
+        ASHAScheduler(max_t=MAX_EPOCHS, mode="best")
+
+
+def test_read_metric_history(tmp_path):
+    """Rows without the metric (e.g. before validation) are skipped."""
+    path = tmp_path / "metrics.csv"
+    path.write_text("epoch,train_loss,val_loss\n1,1.0,0.9\n2,0.8,\n")
+    found, history = read_metric_history(str(tmp_path / "*.csv"), "val_loss")
+    assert found == str(path)
+    assert history == [(1, 0.9)]
+    assert read_metric_history(str(tmp_path / "missing.csv"), "val_loss") == (None, [])
+
+
+def test_run_asha_jobs_terminates_dominated_runs(tmp_path):
+    """The best run trains to the end; a clearly worse later run is terminated."""
+    losses = [1.0, 50.0]
+    jobs = [
+        {
+            "cmd": [sys.executable, "-c", TRAIN_SCRIPT, str(tmp_path / f"run{i}.csv"), str(loss), str(MAX_EPOCHS)],
+            "metrics_csv": str(tmp_path / f"run{i}.csv"),
+        }
+        for i, loss in enumerate(losses)
+    ]
+    scheduler = ASHAScheduler(max_t=MAX_EPOCHS, grace_period=1, reduction_factor=REDUCTION_FACTOR)
+    results = run_asha_jobs(jobs, scheduler, metric="val_loss", num_workers=1, poll_interval=0.01)
+
+    assert results[0]["returncode"] == 0 and not results[0]["stopped"]
+    assert results[0]["last_t"] == MAX_EPOCHS
+    assert results[1]["stopped"]
+    assert results[1]["last_t"] < MAX_EPOCHS
+    assert scheduler.stopped_at(1) is not None
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
@@ -0,0 +1,133 @@
+import os
+import pickle
+import sys
+
+import numpy as np
+import pytest
+import torch
+import torchvision.transforms as transforms
+
+# Add parent directory to path to import the datamodules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from datamodules.cifar_cache import (
+    MemmapCIFAR10,
+    open_cifar10_cache,
+    verify_cifar10_cache,
+    write_cifar10_cache,
+)
+from lightning_modules.tensor_datamodule import TensorCIFAR10DataModule
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+NUM_TRAIN = 40
+NUM_TEST = 10
+BATCH_SIZE = 8
+
+
+def _splits():
+    rng = np.random.default_rng(42)
+    return {
+        split: (
+            rng.integers(0, 256, (size, 32, 32, 3), dtype=np.uint8),
+            rng.integers(0, 10, size),
+        )
+        for split, size in (('train', NUM_TRAIN), ('test', NUM_TEST))
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    splits = _splits()
+    cache_dir = write_cifar10_cache(str(tmp_path / 'cifar10_npy'), splits)
+    return str(tmp_path), cache_dir, splits
+
+
+def test_store_is_read_only_memmap(store):
+    """Splits open as read-only memory maps with the written contents."""
+    data_dir, cache_dir, splits = store
+    images, labels = open_cifar10_cache(data_dir, train=True, cache_dir=cache_dir, verify=True)
+
+    assert isinstance(images, np.memmap)
+    assert not images.flags.writeable
+    assert np.array_equal(images, splits['train'][0])
+    assert np.array_equal(labels, splits['train'][1])
+    with pytest.raises(ValueError):
+        images[0, 0, 0, 0] = 0
+
+
+def test_checksum_detects_corruption(store):
+    """A modified file fails verification even when its size is unchanged."""
+    data_dir, cache_dir, _ = store
+    assert verify_cifar10_cache(cache_dir)
+
+    path = os.path.join(cache_dir, 'test_images.npy')
+    with open(path, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    assert not verify_cifar10_cache(cache_dir)
+    with pytest.raises(ValueError):
+        open_cifar10_cache(data_dir, train=False, cache_dir=cache_dir, verify=True)
+
+
+def test_memmap_dataset_matches_torchvision_samples(store):
+    """Samples go through PIL transforms like torchvision's CIFAR10 and pickle without data."""
+    data_dir, cache_dir, splits = store
+    dataset = MemmapCIFAR10(data_dir, train=False, transform=transforms.ToTensor(), cache_dir=cache_dir)
+
+    image, target = dataset[3]
+    expected = torch.from_numpy(splits['test'][0][3]).permute(2, 0, 1).float() / 255.0
+    assert len(dataset) == NUM_TEST
+    assert torch.allclose(image, expected)
+    assert target == splits['test'][1][3]
+
+    # The memory map is reopened, not serialized, when sent to DataLoader workers
+    assert len(pickle.dumps(dataset)) < splits['test'][0].nbytes
+    restored = pickle.loads(pickle.dumps(dataset))
+    assert torch.equal(restored[3][0], image)
+
+
+def test_tensor_datamodule_shares_store(store):
+    """The tensor datamodule views the store and reproduces random_split."""
+    data_dir, cache_dir, splits = store
+    datamodule = TensorCIFAR10DataModule(data_dir, batch_size=BATCH_SIZE, val_split=0.25, cache_dir=cache_dir)
+    datamodule.setup()
+
+    images, labels, train_index = datamodule.train_data
+    train_subset, val_subset = torch.utils.data.random_split(
+        range(NUM_TRAIN), [30, 10], generator=torch.Generator().manual_seed(42)
+    )
+    assert train_index.tolist() == list(train_subset.indices)
+    assert datamodule.val_data[2].tolist() == list(val_subset.indices)
+    assert not images.is_contiguous()  # NCHW view of the HWC store, not a copy
+
+    seen = torch.cat([batch_labels for _, batch_labels in datamodule.train_dataloader()])
+    assert torch.equal(seen.sort().values, torch.as_tensor(splits['train'][1])[train_index].sort().values)
+    batch, _ = next(iter(datamodule.test_dataloader()))
+    assert batch.shape == (BATCH_SIZE, 3, 32, 32)
+
+
+def test_reused_datamodule_repeats_training_stream(store):
+    """A datamodule reused for a second fit yields the same batches as a fresh one."""
+    data_dir, cache_dir, _ = store
+    datamodule = TensorCIFAR10DataModule(data_dir, batch_size=BATCH_SIZE, cache_dir=cache_dir)
+
+    runs = []
+    for _ in range(2):
+        datamodule.setup("fit")
+        runs.append([next(iter(datamodule.train_dataloader())) for _ in range(2)])
+
+    for (first_images, first_labels), (second_images, second_labels) in zip(*runs):
+        assert torch.equal(first_images, second_images)
+        assert torch.equal(first_labels, second_labels)
+    # Epochs within one fit still differ
+    assert not torch.equal(runs[0][0][1], runs[0][1][1])
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
@@ -0,0 +1,63 @@
+import pytest
+import torch
+
+from paGating import activation_map, paGating2D, create_paGating2D
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 4
+IN_CHANNELS = 8
+OUT_CHANNELS = 12
+HEIGHT = WIDTH = 6
+
+
+def _reference_forward(adapter, x):
+    """The original flatten/permute implementation of paGating2D."""
+    batch_size, channels, height, width = x.shape
+    x_flat = x.permute(0, 2, 3, 1).reshape(-1, channels)
+    out_flat = adapter.pa_unit(x_flat)
+    return out_flat.reshape(batch_size, height, width, adapter.out_channels).permute(0, 3, 1, 2)
+
+
+@pytest.mark.parametrize("unit_name", list(activation_map.keys()))
+@pytest.mark.parametrize("channels_last", [False, True])
+@pytest.mark.parametrize("use_gate_norm", [False, True])
+def test_adapter_matches_reference(unit_name, channels_last, use_gate_norm):
+    """The copy-free path reproduces the flatten/permute reference."""
+    adapter = create_paGating2D(
+        unit_name, IN_CHANNELS, OUT_CHANNELS,
+        use_gate_norm=use_gate_norm, channels_last=channels_last
+    )
+    x = torch.randn(BATCH_SIZE, IN_CHANNELS, HEIGHT, WIDTH)
+
+    out = adapter(x)
+
+    assert out.shape == (BATCH_SIZE, OUT_CHANNELS, HEIGHT, WIDTH)
+    assert torch.allclose(out, _reference_forward(adapter, x), atol=1e-6)
+
+
+def test_channels_last_is_copy_free():
+    """Channels-last input yields a channels-last output view of the unit result."""
+    adapter = paGating2D(activation_map['paGLU'], IN_CHANNELS, OUT_CHANNELS, channels_last=True)
+    x = torch.randn(BATCH_SIZE, IN_CHANNELS, HEIGHT, WIDTH).contiguous(memory_format=torch.channels_last)
+
+    out = adapter(x)
+
+    assert out.is_contiguous(memory_format=torch.channels_last)
+    assert x.permute(0, 2, 3, 1).is_contiguous()
+
+
+def test_clone_preserves_channels_last():
+    """Cloning keeps the memory-format setting."""
+    adapter = create_paGating2D('paGELU', IN_CHANNELS, OUT_CHANNELS, channels_last=True, fused=True)
+    clone = adapter.clone()
+
+    assert clone.channels_last
+    assert clone.pa_unit.fused
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
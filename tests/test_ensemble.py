@@ -0,0 +1,127 @@
+import copy
+
+import pytest
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from paGating import AlphaEnsemble, EnsembleTrainer, activation_map, init_learnable_alpha
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 8
+INPUT_DIM = 16
+OUTPUT_DIM = 24
+NUM_CLASSES = 5
+
+ALPHAS = [0.0, 0.3, 1.0]
+
+
+def _make_model(unit_name, alpha, batch_norm=False):
+    layers = [activation_map[unit_name](INPUT_DIM, OUTPUT_DIM, alpha=alpha, memory_efficient=True)]
+    if batch_norm:
+        layers.append(nn.BatchNorm1d(OUTPUT_DIM))
+    layers.append(nn.Linear(OUTPUT_DIM, NUM_CLASSES))
+    return nn.Sequential(*layers)
+
+
+@pytest.mark.parametrize("unit_name", list(activation_map.keys()))
+def test_forward_matches_members(unit_name):
+    """Stacked outputs equal the outputs of the independent models."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    models = [_make_model(unit_name, alpha).eval() for alpha in ALPHAS]
+    ensemble = AlphaEnsemble(models).eval()
+
+    out = ensemble(x)
+    assert out.shape == (len(ALPHAS), BATCH_SIZE, NUM_CLASSES)
+    for index, model in enumerate(models):
+        assert torch.allclose(out[index], model(x), atol=1e-6)
+
+
+@pytest.mark.parametrize("batch_norm", [False, True])
+def test_train_step_matches_independent_training(batch_norm):
+    """One ensemble step updates every member like its own optimizer would."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    y = torch.randint(0, NUM_CLASSES, (BATCH_SIZE,))
+    models = [_make_model("paGLU", alpha, batch_norm) for alpha in ALPHAS]
+    references = [copy.deepcopy(model) for model in models]
+
+    trainer = EnsembleTrainer(AlphaEnsemble(models, randomness="same"), optimizer_cls=torch.optim.Adam, lr=1e-2)
+    metrics = trainer.train_step(x, y)
+    assert metrics["loss"].shape == (len(models),)
+    assert metrics["accuracy"].shape == (len(models),)
+
+    for index, reference in enumerate(references):
+        optimizer = torch.optim.Adam(reference.parameters(), lr=1e-2)
+        loss = F.cross_entropy(reference(x), y)
+        loss.backward()
+        optimizer.step()
+
+        assert torch.allclose(metrics["loss"][index], loss.detach(), atol=1e-6)
+        member = trainer.ensemble.member(index)
+        for (name, expected), actual in zip(reference.state_dict().items(), member.state_dict().values()):
+            assert torch.allclose(actual.float(), expected.float(), atol=1e-6), name
+
+
+def test_member_export_and_checkpoints(tmp_path):
+    """Members materialize as regular models and are checkpointed one file each."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    y = torch.randint(0, NUM_CLASSES, (BATCH_SIZE,))
+    names = [f"paGLU_alpha{alpha}" for alpha in ALPHAS]
+    ensemble = AlphaEnsemble([_make_model("paGLU", alpha) for alpha in ALPHAS], names=names)
+    trainer = EnsembleTrainer(ensemble, lr=1e-2)
+
+    results = trainer.fit([(x, y)] * 2, epochs=2, val_loader=[(x, y)], checkpoint_dir=str(tmp_path))
+    assert [result["name"] for result in results] == names
+    assert all(len(result["history"]) == 2 and "val_accuracy" in result for result in results)
+
+    ensemble.eval()
+    out = ensemble(x)
+    for index, name in enumerate(names):
+        member = ensemble.member(index).eval()
+        # Unit flags are restored on export
+        assert member[0].specialize_alpha and member[0].memory_efficient
+        assert torch.allclose(member[0].get_alpha(), torch.tensor(ALPHAS[index]))
+        assert torch.allclose(member(x), out[index], atol=1e-6)
+
+        checkpoint = torch.load(tmp_path / f"{name}.pt")
+        assert checkpoint["metrics"]["train_loss"] == results[index]["train_loss"]
+        restored = _make_model("paGLU", ALPHAS[index]).eval()
+        restored.load_state_dict(checkpoint["state_dict"])
+        assert torch.allclose(restored(x), out[index], atol=1e-6)
+
+
+def test_learnable_members_start_at_their_alpha():
+    """Learnable-α members differ in their starting α, not only in random init."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    models = [_make_model("paGLU", "learnable") for _ in ALPHAS]
+    for model in models[1:]:
+        model.load_state_dict(models[0].state_dict())
+    for model, alpha in zip(models, ALPHAS):
+        assert init_learnable_alpha(model, alpha) == 1
+
+    starts = [model[0].get_alpha().item() for model in models]
+    assert starts[1] == pytest.approx(0.3, abs=1e-6)
+    assert starts[0] == pytest.approx(0.0, abs=1e-2) and starts[2] == pytest.approx(1.0, abs=1e-2)
+
+    out = AlphaEnsemble(models).eval()(x)
+    assert not torch.allclose(out[0], out[1]) and not torch.allclose(out[1], out[2])
+
+    assert init_learnable_alpha(_make_model("paGLU", 0.5), 0.3) == 0
+    with pytest.raises(ValueError):
+        init_learnable_alpha(models[0], 1.5)
+
+
+def test_mismatched_members():
+    """Members must share an architecture."""
+    with pytest.raises(ValueError):
+        AlphaEnsemble([_make_model("paGLU", 0.5), _make_model("paGLU", 0.5, batch_norm=True)])
+    with pytest.raises(ValueError):
+        AlphaEnsemble([])
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
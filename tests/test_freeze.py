@@ -0,0 +1,95 @@
+import pytest
+import torch
+import torch.nn as nn
+
+from paGating import activation_map, freeze, FrozenPaGating, PrePostNormWrapper, paGLU, paGTU
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 8
+INPUT_DIM = 16
+OUTPUT_DIM = 24
+
+PA_UNITS = list(activation_map.values())
+
+
+@pytest.mark.parametrize("unit_class", PA_UNITS)
+@pytest.mark.parametrize("alpha", [0.0, 0.3, 1.0, "learnable"])
+@pytest.mark.parametrize("use_gate_norm", [False, True, "rms"])
+def test_freeze_unit_matches(unit_class, alpha, use_gate_norm, randomize_norms):
+    """Frozen units reproduce the original outputs."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    unit = randomize_norms(unit_class(INPUT_DIM, OUTPUT_DIM, alpha=alpha, use_gate_norm=use_gate_norm)).eval()
+
+    frozen = freeze(unit)
+
+    assert torch.allclose(frozen(x), unit(x), atol=1e-5)
+    assert not any(p.requires_grad for p in frozen.parameters())
+
+
+def test_freeze_alpha_zero_is_linear():
+    """Units with α=0 collapse to a plain linear layer."""
+    assert isinstance(freeze(paGLU(INPUT_DIM, OUTPUT_DIM, alpha=0.0)), nn.Linear)
+
+    gtu = freeze(paGTU(INPUT_DIM, OUTPUT_DIM, alpha=0.0))
+    assert isinstance(gtu, nn.Sequential)
+    assert isinstance(gtu[0], nn.Linear) and isinstance(gtu[1], nn.Tanh)
+
+
+def test_freeze_learnable_alpha_is_baked():
+    """Learnable α is evaluated once and stored as a constant."""
+    unit = paGLU(INPUT_DIM, OUTPUT_DIM, alpha="learnable")
+    frozen = freeze(unit)
+
+    assert isinstance(frozen, FrozenPaGating)
+    assert torch.isclose(frozen.gate_scale, torch.sigmoid(unit.alpha_param))
+    assert 'alpha_param' not in dict(frozen.named_parameters())
+
+
+@pytest.mark.parametrize("fused", [False, True])
+def test_freeze_folds_pre_norm(fused, randomize_norms):
+    """PrePostNormWrapper pre-norm affine is folded into the projections."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    model = PrePostNormWrapper(
+        paGLU(INPUT_DIM, OUTPUT_DIM, alpha=0.5, use_gate_norm=True, fused=fused),
+        input_dim=INPUT_DIM,
+        output_dim=OUTPUT_DIM,
+        pre_norm=True,
+        post_norm=True,
+    )
+    randomize_norms(model).eval()
+
+    frozen = freeze(model)
+
+    assert frozen.pre_norm_layer.weight is None
+    assert isinstance(frozen.module, FrozenPaGating)
+    assert torch.allclose(frozen(x), model(x), atol=1e-5)
+
+
+def test_freeze_leaves_callable_alpha():
+    """Units with a callable α are left untouched inside a model."""
+    model = nn.Sequential(
+        paGLU(INPUT_DIM, OUTPUT_DIM, alpha=lambda x: torch.tensor(0.3)),
+        paGLU(OUTPUT_DIM, OUTPUT_DIM, alpha=0.5),
+    )
+    frozen = freeze(model)
+
+    assert isinstance(frozen[0], paGLU)
+    assert isinstance(frozen[1], FrozenPaGating)
+
+
+def test_freeze_not_inplace_by_default():
+    """The original model is not modified unless inplace=True."""
+    model = nn.Sequential(paGLU(INPUT_DIM, OUTPUT_DIM, alpha=0.5))
+    freeze(model)
+    assert isinstance(model[0], paGLU)
+
+    freeze(model, inplace=True)
+    assert isinstance(model[0], FrozenPaGating)
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
@@ -0,0 +1,100 @@
+import pytest
+import torch
+from torch.autograd import gradcheck
+
+from paGating import activation_map
+from paGating.fused_ops import gated_blend, SUPPORTED_ACTIVATIONS
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 8
+INPUT_DIM = 16
+OUTPUT_DIM = 24
+
+PA_UNITS = list(activation_map.values())
+
+
+@pytest.mark.parametrize("activation", SUPPORTED_ACTIVATIONS)
+@pytest.mark.parametrize("alpha_shape", [(), (1, 1), (4, 1)])
+def test_gated_blend_gradcheck(activation, alpha_shape):
+    """The recomputing backward matches numerical gradients."""
+    value = torch.randn(4, 6, dtype=torch.float64, requires_grad=True)
+    # Keep ReLU inputs away from the kink at zero
+    gate = (torch.rand(4, 6, dtype=torch.float64) + 0.1) * torch.randn(4, 6, dtype=torch.float64).sign()
+    gate.requires_grad_(True)
+    alpha = torch.rand(alpha_shape, dtype=torch.float64, requires_grad=True)
+
+    def func(value, gate, alpha):
+        return gated_blend(value, gate, alpha, activation)
+
+    assert gradcheck(func, (value, gate, alpha), eps=1e-6, atol=1e-4)
+
+
+def test_gated_blend_float_alpha():
+    """A Python float alpha is accepted and receives no gradient."""
+    value = torch.randn(4, 6, dtype=torch.float64, requires_grad=True)
+    gate = torch.randn(4, 6, dtype=torch.float64, requires_grad=True)
+
+    assert gradcheck(lambda v, g: gated_blend(v, g, 0.3, 'sigmoid'), (value, gate), eps=1e-6, atol=1e-4)
+
+
+def test_gated_blend_rejects_unknown_activation():
+    """Unknown activation names raise a ValueError."""
+    with pytest.raises(ValueError):
+        gated_blend(torch.randn(2, 3), torch.randn(2, 3), 0.5, 'softsign')
+
+
+@pytest.mark.parametrize("unit_class", PA_UNITS)
+@pytest.mark.parametrize("alpha", [0.5, "learnable"])
+@pytest.mark.parametrize("use_gate_norm", [False, True])
+def test_memory_efficient_matches_default(unit_class, alpha, use_gate_norm):
+    """Memory-efficient units produce the same outputs and gradients."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+
+    reference = unit_class(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=alpha, use_gate_norm=use_gate_norm)
+    efficient = unit_class(
+        input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=alpha,
+        use_gate_norm=use_gate_norm, memory_efficient=True
+    )
+    efficient.load_state_dict(reference.state_dict())
+
+    ref_out = reference(x)
+    eff_out = efficient(x)
+    assert torch.allclose(eff_out, ref_out, atol=1e-5)
+
+    ref_out.sum().backward()
+    eff_out.sum().backward()
+    for (name, ref_param), (_, eff_param) in zip(reference.named_parameters(), efficient.named_parameters()):
+        if ref_param.grad is None:
+            # e.g. paGTU does not use its GateNorm
+            assert eff_param.grad is None
+            continue
+        assert torch.allclose(eff_param.grad, ref_param.grad, atol=1e-4), f"Gradient mismatch for {name}"
+
+
+def test_memory_efficient_saves_fewer_tensors():
+    """The fused epilogue keeps fewer activation tensors alive for backward."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+
+    def saved_numel(unit):
+        sizes = []
+
+        def pack(tensor):
+            sizes.append(tensor.numel())
+            return tensor
+
+        with torch.autograd.graph.saved_tensors_hooks(pack, lambda tensor: tensor):
+            unit(x)
+        return sum(size for size in sizes if size == BATCH_SIZE * OUTPUT_DIM)
+
+    reference = activation_map['paMishU'](INPUT_DIM, OUTPUT_DIM, alpha="learnable")
+    efficient = activation_map['paMishU'](INPUT_DIM, OUTPUT_DIM, alpha="learnable", memory_efficient=True)
+
+    assert saved_numel(efficient) < saved_numel(reference)
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
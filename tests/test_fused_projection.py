@@ -0,0 +1,78 @@
+import pytest
+import torch
+
+from paGating import activation_map
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 8
+INPUT_DIM = 16
+OUTPUT_DIM = 24
+
+PA_UNITS = list(activation_map.values())
+
+
+@pytest.mark.parametrize("unit_class", PA_UNITS)
+@pytest.mark.parametrize("alpha", [0.0, 0.5, 1.0, "learnable"])
+def test_fused_matches_split(unit_class, alpha):
+    """A fused unit loaded from a split checkpoint reproduces the split unit."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+
+    split_unit = unit_class(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=alpha)
+    fused_unit = unit_class(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha=alpha, fused=True)
+
+    fused_unit.load_state_dict(split_unit.state_dict())
+
+    assert fused_unit.fused_proj.weight.shape == (2 * OUTPUT_DIM, INPUT_DIM)
+    assert torch.allclose(fused_unit(x), split_unit(x), atol=1e-6)
+
+
+@pytest.mark.parametrize("unit_class", PA_UNITS)
+def test_split_loads_fused_checkpoint(unit_class):
+    """A split unit can load a checkpoint saved from a fused unit."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+
+    fused_unit = unit_class(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, fused=True)
+    split_unit = unit_class(input_dim=INPUT_DIM, output_dim=OUTPUT_DIM)
+
+    split_unit.load_state_dict(fused_unit.state_dict())
+
+    assert torch.allclose(split_unit(x), fused_unit(x), atol=1e-6)
+
+
+def test_fused_split_is_view():
+    """The value and gate paths are views into a single GEMM output."""
+    unit = activation_map['paGLU'](input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, fused=True)
+    value, gate = unit.project(torch.randn(BATCH_SIZE, INPUT_DIM))
+
+    assert value.shape == gate.shape == (BATCH_SIZE, OUTPUT_DIM)
+    assert value.data_ptr() != gate.data_ptr()
+    assert value.untyped_storage().data_ptr() == gate.untyped_storage().data_ptr()
+
+
+def test_fused_backward():
+    """Gradients reach the fused projection and the input."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM, requires_grad=True)
+    unit = activation_map['paGTU'](input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, alpha="learnable", fused=True)
+
+    unit(x).sum().backward()
+
+    assert x.grad is not None
+    assert unit.fused_proj.weight.grad is not None
+    assert unit.alpha_param.grad is not None
+
+
+def test_fused_clone_preserves_layout():
+    """Cloning keeps the fused layout."""
+    unit = activation_map['paGELU'](input_dim=INPUT_DIM, output_dim=OUTPUT_DIM, fused=True)
+    clone = unit.clone()
+
+    assert clone.fused
+    assert clone.get_config() == unit.get_config()
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
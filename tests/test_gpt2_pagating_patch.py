@@ -0,0 +1,90 @@
+import copy
+import os
+import sys
+
+import pytest
+import torch
+from transformers import GPT2Config, GPT2LMHeadModel
+
+# Add parent directory to path to import the models
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from models.gpt2_pagating_patch import param_matched_d_ff, patch_gpt2_with_pagating
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 2
+SEQ_LEN = 8
+D_MODEL = 96
+D_FF = 4 * D_MODEL
+VOCAB_SIZE = 50
+
+
+def _model():
+    config = GPT2Config(
+        vocab_size=VOCAB_SIZE, n_positions=32, n_embd=D_MODEL, n_layer=2, n_head=4,
+        resid_pdrop=0.0, embd_pdrop=0.0, attn_pdrop=0.0,
+    )
+    return GPT2LMHeadModel(config).eval()
+
+
+def _mlp_weight_count(model):
+    """Number of MLP matrix weights (biases and alpha excluded)."""
+    return sum(
+        param.numel()
+        for blk in model.transformer.h
+        for param in blk.mlp.parameters()
+        if param.dim() == 2
+    )
+
+
+def test_param_matched_d_ff():
+    """The gated hidden size keeps the 2-matrix parameter count."""
+    assert param_matched_d_ff(3072) == 2048
+    assert param_matched_d_ff(D_FF) == 256
+    assert 3 * D_MODEL * param_matched_d_ff(D_FF) == 2 * D_MODEL * D_FF
+
+
+def test_replace_mode_shape_and_param_count():
+    """Param-matched replace mode keeps the logits shape and the MLP weight count."""
+    stock = _model()
+    patched = patch_gpt2_with_pagating(copy.deepcopy(stock), "static_0.5", mlp_mode="replace", param_matched=True)
+    input_ids = torch.randint(0, VOCAB_SIZE, (BATCH_SIZE, SEQ_LEN))
+
+    with torch.no_grad():
+        logits = patched(input_ids).logits
+
+    assert logits.shape == (BATCH_SIZE, SEQ_LEN, VOCAB_SIZE)
+    assert torch.isfinite(logits).all()
+    for blk in patched.transformer.h:
+        assert blk.mlp.fc_out.in_features == param_matched_d_ff(D_FF)
+    assert _mlp_weight_count(patched) == _mlp_weight_count(stock)
+
+
+@pytest.mark.parametrize("param_matched", [False, True])
+def test_load_pretrained_transposes_conv1d(param_matched):
+    """The value path and fc_out start from the transposed Conv1D weights."""
+    stock = _model()
+    patched = patch_gpt2_with_pagating(
+        copy.deepcopy(stock), "learnable", mlp_mode="replace", param_matched=param_matched
+    )
+    d_ff = param_matched_d_ff(D_FF) if param_matched else D_FF
+
+    for stock_blk, blk in zip(stock.transformer.h, patched.transformer.h):
+        c_fc, c_proj = stock_blk.mlp.c_fc, stock_blk.mlp.c_proj
+        assert torch.equal(blk.mlp.act.fused_proj.weight[:d_ff], c_fc.weight[:, :d_ff].T)
+        assert torch.equal(blk.mlp.act.fused_proj.bias[:d_ff], c_fc.bias[:d_ff])
+        assert torch.equal(blk.mlp.fc_out.weight, c_proj.weight[:d_ff].T)
+        assert torch.equal(blk.mlp.fc_out.bias, c_proj.bias)
+
+
+def test_invalid_mlp_mode():
+    """Unknown MLP layouts are rejected."""
+    with pytest.raises(ValueError):
+        patch_gpt2_with_pagating(_model(), "static_0.5", mlp_mode="parallel")
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
@@ -15,6 +15,27 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from lightning_modules.metrics_logger import MetricsCsvLogger
 
 
+class _EpochModule(pl.LightningModule):
+    """Logs the (1-indexed) epoch as val_loss, to check which row it lands on."""
+    
+    def __init__(self):
+        super().__init__()
+        self.layer = torch.nn.Linear(4, 1)
+    
+    def training_step(self, batch, batch_idx):
+        loss = self.layer(batch[0]).pow(2).mean()
+        self.log("train_loss", loss, on_step=False, on_epoch=True)
+        return loss
+    
+    def validation_step(self, batch, batch_idx):
+        # Sanity-check values must not reach the CSV
+        offset = 100.0 if self.trainer.sanity_checking else 0.0
+        self.log("val_loss", float(self.current_epoch + 1) + offset)
+    
+    def configure_optimizers(self):
+        return torch.optim.SGD(self.parameters(), lr=0.01)
+
+
 class TestMetricsCsvLogger(unittest.TestCase):
     """Tests for the MetricsCsvLogger class."""
     
@@ -29,6 +50,7 @@ class TestMetricsCsvLogger(unittest.TestCase):
         
         # Set up sample metrics
         self.trainer.current_epoch = 0
+        self.trainer.sanity_checking = False
         self.sample_metrics = {
             'train_loss': torch.tensor(0.5),
             'train_acc': torch.tensor(0.8),
@@ -184,6 +206,32 @@ class TestMetricsCsvLogger(unittest.TestCase):
             self.assertAlmostEqual(float(row["test_loss"]), 0.3, places=6)
             self.assertAlmostEqual(float(row["test_acc"]), 0.9, places=6)
     
+    def test_rows_line_up_with_trainer_epochs(self):
+        """With a real Trainer, every epoch's row holds that epoch's validation loss."""
+        num_epochs = 3
+        logger = MetricsCsvLogger(output_dir=self.test_dir, unit_name="paGLU", alpha_value=0.5)
+        dataset = torch.utils.data.TensorDataset(torch.randn(8, 4))
+        loader = torch.utils.data.DataLoader(dataset, batch_size=4)
+        trainer = pl.Trainer(
+            max_epochs=num_epochs,
+            accelerator="cpu",
+            logger=False,
+            enable_checkpointing=False,
+            enable_progress_bar=False,
+            enable_model_summary=False,
+            callbacks=[logger],
+        )
+        
+        trainer.fit(_EpochModule(), loader, loader)
+        
+        csv_path = os.path.join(self.test_dir, "paGLU", "metrics.csv")
+        with open(csv_path, 'r') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([int(row["epoch"]) for row in rows], list(range(1, num_epochs + 1)))
+        for row in rows:
+            self.assertEqual(float(row["val_loss"]), float(row["epoch"]))
+            self.assertNotEqual(row["train_loss"], "")
+    
     def test_get_metrics_as_dict(self):
         """Test the get_metrics_as_dict method."""
         # Create logger with static alpha
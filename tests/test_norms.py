@@ -4,7 +4,7 @@ import numpy as np
 from torch.autograd import gradcheck
 
 # Import the normalization components and paGating units
-from paGating.norms import GateNorm, PrePostNormWrapper
+from paGating.norms import GateNorm, GateRMSNorm, PrePostNormWrapper
 from paGating import paGLU, paGELU
 
 # Set reproducible seed
@@ -79,6 +79,57 @@ def test_gate_norm_backward():
     assert result, "Gradient check failed"
 
 
+def test_gate_norm_matches_reference():
+    """Test that the fused GateNorm matches the two-pass formulation."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    norm = GateNorm(INPUT_DIM)
+    with torch.no_grad():
+        norm.weight.normal_()
+        norm.bias.normal_()
+    
+    mean = x.mean(dim=-1, keepdim=True)
+    var = x.var(dim=-1, keepdim=True, unbiased=False)
+    expected = (x - mean) / torch.sqrt(var + norm.eps) * norm.weight + norm.bias
+    
+    assert torch.allclose(norm(x), expected, atol=1e-5), "Fused GateNorm differs from reference"
+
+
+def test_gate_rms_norm_forward():
+    """Test forward pass and gradients of GateRMSNorm."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    norm = GateRMSNorm(INPUT_DIM)
+    
+    y = norm(x)
+    
+    # Root mean square should be close to 1 and the mean is not centered
+    rms = y.pow(2).mean(dim=-1).sqrt()
+    assert torch.allclose(rms, torch.ones_like(rms), atol=1e-3), \
+        f"Expected RMS close to 1, got {rms.mean().item()}"
+    assert not hasattr(norm, 'bias'), "GateRMSNorm should not have a bias"
+    
+    x64 = torch.randn(4, 8, requires_grad=True, dtype=torch.float64)
+    norm64 = GateRMSNorm(8).double()
+    assert gradcheck(lambda t: norm64(t).sum(), (x64,), eps=1e-6, atol=1e-4), "Gradient check failed"
+
+
+@pytest.mark.parametrize("use_gate_norm,norm_class", [
+    (True, GateNorm),
+    ("layer", GateNorm),
+    ("rms", GateRMSNorm),
+])
+def test_gate_norm_selection(use_gate_norm, norm_class):
+    """Test that use_gate_norm selects the gate normalization type."""
+    unit = paGLU(INPUT_DIM, OUTPUT_DIM, use_gate_norm=use_gate_norm)
+    assert isinstance(unit.gate_norm, norm_class)
+    assert unit(torch.randn(BATCH_SIZE, INPUT_DIM)).shape == (BATCH_SIZE, OUTPUT_DIM)
+
+
+def test_gate_norm_selection_invalid():
+    """Test that an unknown normalization type raises an error."""
+    with pytest.raises(ValueError):
+        paGLU(INPUT_DIM, OUTPUT_DIM, use_gate_norm="batch")
+
+
 def test_pre_post_norm_wrapper():
     """Test PrePostNormWrapper with different configurations."""
     # Create a random input tensor
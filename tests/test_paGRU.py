@@ -1,6 +1,7 @@
 import torch
 import pytest
-from paGating.paGRU import PaGRUCell
+from paGating.paGRU import PaGRU, PaGRUCell
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
 
 # Test parameters
 INPUT_SIZE = 10
@@ -71,4 +72,81 @@ def test_no_bias(sample_input, sample_hidden):
     assert cell_no_bias.weight_hh.grad is not None
     assert cell_no_bias.alpha_r.grad is not None
     assert cell_no_bias.alpha_z.grad is not None
-    assert cell_no_bias.alpha_h.grad is not None 
\ No newline at end of file
+    assert cell_no_bias.alpha_h.grad is not None 
+SEQ_LEN = 7
+
+def _cell_from_layer(layer, suffix='_l0'):
+    """Build a PaGRUCell sharing the weights of one PaGRU layer/direction."""
+    cell = PaGRUCell(getattr(layer, 'weight_ih' + suffix).size(1), HIDDEN_SIZE)
+    with torch.no_grad():
+        for name in ('weight_ih', 'weight_hh', 'bias_ih', 'bias_hh', 'alpha_r', 'alpha_z', 'alpha_h'):
+            getattr(cell, name).copy_(getattr(layer, name + suffix))
+    return cell
+
+def test_pagru_output_shapes():
+    """Test PaGRU output and final hidden state shapes."""
+    layer = PaGRU(INPUT_SIZE, HIDDEN_SIZE, num_layers=2, bidirectional=True)
+    x = torch.randn(SEQ_LEN, BATCH_SIZE, INPUT_SIZE)
+    output, h_n = layer(x)
+    assert output.shape == (SEQ_LEN, BATCH_SIZE, 2 * HIDDEN_SIZE)
+    assert h_n.shape == (4, BATCH_SIZE, HIDDEN_SIZE)
+
+    layer_bf = PaGRU(INPUT_SIZE, HIDDEN_SIZE, batch_first=True)
+    output, h_n = layer_bf(x.transpose(0, 1))
+    assert output.shape == (BATCH_SIZE, SEQ_LEN, HIDDEN_SIZE)
+    assert h_n.shape == (1, BATCH_SIZE, HIDDEN_SIZE)
+
+def test_pagru_matches_cell_loop():
+    """PaGRU reproduces a step-by-step PaGRUCell loop."""
+    torch.manual_seed(42)
+    layer = PaGRU(INPUT_SIZE, HIDDEN_SIZE)
+    with torch.no_grad():
+        layer.alpha_r_l0.fill_(0.7)
+        layer.alpha_z_l0.fill_(1.3)
+        layer.alpha_h_l0.fill_(0.9)
+    cell = _cell_from_layer(layer)
+    x = torch.randn(SEQ_LEN, BATCH_SIZE, INPUT_SIZE)
+    h0 = torch.randn(1, BATCH_SIZE, HIDDEN_SIZE)
+
+    output, h_n = layer(x, h0)
+
+    h = h0[0]
+    expected = []
+    for t in range(SEQ_LEN):
+        h = cell(x[t], h)
+        expected.append(h)
+    assert torch.allclose(output, torch.stack(expected), atol=1e-5)
+    assert torch.allclose(h_n[0], h, atol=1e-5)
+
+def test_pagru_packed_matches_unpadded():
+    """Packed variable-length batches match running each sequence on its own."""
+    torch.manual_seed(42)
+    layer = PaGRU(INPUT_SIZE, HIDDEN_SIZE, bidirectional=True)
+    lengths = torch.tensor([SEQ_LEN, 3, 5, 1, 4])
+    x = torch.randn(SEQ_LEN, BATCH_SIZE, INPUT_SIZE)
+
+    packed = pack_padded_sequence(x, lengths, enforce_sorted=False)
+    packed_out, h_n = layer(packed)
+    output, _ = pad_packed_sequence(packed_out)
+
+    for b, length in enumerate(lengths.tolist()):
+        single_out, single_h = layer(x[:length, b:b + 1])
+        assert torch.allclose(output[:length, b], single_out[:, 0], atol=1e-5)
+        assert torch.allclose(h_n[:, b], single_h[:, 0], atol=1e-5)
+        assert torch.all(output[length:, b] == 0)
+
+def test_pagru_gradients():
+    """Gradients reach every weight and alpha of every layer."""
+    layer = PaGRU(INPUT_SIZE, HIDDEN_SIZE, num_layers=2, dropout=0.1)
+    output, h_n = layer(torch.randn(SEQ_LEN, BATCH_SIZE, INPUT_SIZE))
+    (output.sum() + h_n.sum()).backward()
+    for name, param in layer.named_parameters():
+        assert param.grad is not None, f"Gradient missing for {name}"
+
+def test_pagru_static_alpha():
+    """Static alpha mode registers non-trainable alphas."""
+    layer = PaGRU(INPUT_SIZE, HIDDEN_SIZE, alpha_mode=0.5)
+    assert not any(name.startswith('alpha') for name, _ in layer.named_parameters())
+    assert torch.equal(layer.alpha_r_l0, torch.tensor(0.5))
+    with pytest.raises(ValueError):
+        PaGRU(INPUT_SIZE, HIDDEN_SIZE, alpha_mode="invalid")
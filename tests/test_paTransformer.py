@@ -0,0 +1,128 @@
+import os
+import sys
+
+import pytest
+import torch
+
+# Add parent directory to path to import the models
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from models.paTransformer import (
+    MultiHeadAttention,
+    paTransformer,
+    paTransformerConfig,
+)
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 2
+SEQ_LEN = 12
+D_MODEL = 32
+N_HEADS = 4
+VOCAB_SIZE = 50
+
+
+def _config(**kwargs):
+    defaults = dict(d_model=D_MODEL, n_heads=N_HEADS, n_layers=2, vocab_size=VOCAB_SIZE, max_seq_len=64)
+    defaults.update(kwargs)
+    return paTransformerConfig(**defaults)
+
+
+@pytest.mark.parametrize("unit", ["paGLU", "paGTU", "paGELU"])
+def test_kv_cache_matches_full_forward(unit):
+    """Prefill plus cached single-token steps reproduce the full causal forward."""
+    model = paTransformer(_config(unit=unit)).eval()
+    input_ids = torch.randint(0, VOCAB_SIZE, (BATCH_SIZE, SEQ_LEN))
+
+    with torch.no_grad():
+        full = model(input_ids)
+        cache = model.init_cache()
+        steps = [model(input_ids[:, :5], cache=cache)]
+        steps.append(model(input_ids[:, 5:8], cache=cache))
+        for position in range(8, SEQ_LEN):
+            steps.append(model(input_ids[:, position:position + 1], cache=cache))
+
+    assert cache[0].length == SEQ_LEN
+    assert torch.allclose(torch.cat(steps, dim=1), full, atol=1e-5)
+
+
+def test_causal_and_padding_masks():
+    """Causal outputs ignore the future; encoder outputs ignore padded keys."""
+    x = torch.randn(BATCH_SIZE, SEQ_LEN, D_MODEL)
+    decoder = paTransformer(_config(vocab_size=None)).eval()
+    changed = x.clone()
+    changed[:, -1] += 1.0
+    with torch.no_grad():
+        assert torch.allclose(decoder(x)[:, :-1], decoder(changed)[:, :-1], atol=1e-6)
+
+    encoder = paTransformer(_config(vocab_size=None, causal=False)).eval()
+    mask = torch.ones(BATCH_SIZE, SEQ_LEN, dtype=torch.bool)
+    mask[1, 8:] = False
+    padded = x.clone()
+    padded[1, 8:] = torch.randn(SEQ_LEN - 8, D_MODEL)
+    with torch.no_grad():
+        out = encoder(x, attention_mask=mask)
+        out_padded = encoder(padded, attention_mask=mask)
+        assert torch.isfinite(out).all()
+        assert torch.allclose(out[1, :8], out_padded[1, :8], atol=1e-5)
+        # Without padding the encoder attends to all positions
+        assert not torch.allclose(encoder(x)[1, :8], out[1, :8], atol=1e-5)
+
+
+def test_cross_attention_caches_memory():
+    """Decoder blocks attend to an encoder memory, projected once per cache."""
+    memory = torch.randn(BATCH_SIZE, 7, D_MODEL)
+    model = paTransformer(_config(cross_attention=True)).eval()
+    input_ids = torch.randint(0, VOCAB_SIZE, (BATCH_SIZE, 4))
+
+    with torch.no_grad():
+        full = model(input_ids, memory=memory)
+        cache = model.init_cache()
+        first = model(input_ids[:, :3], memory=memory, cache=cache)
+        # The memory projection is reused, so it need not be passed again
+        last = model(input_ids[:, 3:], cache=cache)
+
+    assert cache[0].memory_key.shape == (BATCH_SIZE, N_HEADS, 7, D_MODEL // N_HEADS)
+    assert torch.allclose(torch.cat([first, last], dim=1), full, atol=1e-5)
+    with pytest.raises(ValueError):
+        MultiHeadAttention(D_MODEL, N_HEADS, cross=True)(torch.randn(1, 3, D_MODEL))
+
+
+def test_training_step_and_baseline_parity():
+    """Both FFN types train, and the default hidden sizes match parameter counts."""
+    config = _config(alpha="learnable", dropout=0.1)
+    model = paTransformer(config)
+    input_ids = torch.randint(0, VOCAB_SIZE, (BATCH_SIZE, SEQ_LEN))
+    logits = model(input_ids)
+    assert logits.shape == (BATCH_SIZE, SEQ_LEN, VOCAB_SIZE)
+    logits.sum().backward()
+    assert all(param.grad is not None for param in model.parameters())
+
+    # 8/3 * 96 = 256 needs no rounding
+    gated = paTransformer(_config(d_model=96))
+    baseline = paTransformer(_config(d_model=96, ffn_type="gelu"))
+    gated_ffn = sum(p.numel() for p in gated.layers[0].ffn.parameters())
+    gelu_ffn = sum(p.numel() for p in baseline.layers[0].ffn.parameters())
+    assert abs(gated_ffn - gelu_ffn) / gelu_ffn < 0.05
+
+
+def test_config_roundtrip_and_validation():
+    """Configs serialize to dicts and reject invalid settings."""
+    config = _config(unit="paSwishU", causal=False)
+    restored = paTransformerConfig.from_dict(config.to_dict())
+    assert restored.to_dict() == config.to_dict()
+
+    with pytest.raises(ValueError):
+        paTransformerConfig(d_model=30, n_heads=4)
+    with pytest.raises(ValueError):
+        paTransformerConfig(ffn_type="relu")
+    with pytest.raises(ValueError):
+        paTransformerConfig(unit="paUnknown")
+    with pytest.raises(ValueError):
+        paTransformer(_config(max_seq_len=8))(torch.randint(0, VOCAB_SIZE, (1, 9)))
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
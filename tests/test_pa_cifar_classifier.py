@@ -0,0 +1,88 @@
+import os
+import sys
+
+import pytest
+import torch
+
+# Add parent directory to path to import the models
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from models.pa_cifar_classifier import create_model, paActivationBlock
+from paGating import paGLU, paGTU
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 2
+CHANNELS = 8
+HEIGHT = 5
+WIDTH = 6
+IMAGE_SIZE = 16
+
+
+def _blocks(unit_class, **kwargs):
+    """nhwc and flatten blocks with the same weights."""
+    nhwc = paActivationBlock(CHANNELS, CHANNELS, unit_class, layout="nhwc", **kwargs)
+    flatten = paActivationBlock(CHANNELS, CHANNELS, unit_class, layout="flatten", **kwargs)
+    with torch.no_grad():
+        for param in nhwc.parameters():
+            param.copy_(torch.randn_like(param))
+    flatten.load_state_dict(nhwc.state_dict())
+    return nhwc, flatten
+
+
+@pytest.mark.parametrize("unit_class", [paGLU, paGTU])
+@pytest.mark.parametrize("norms", [{}, {"use_gate_norm": True, "pre_norm": True, "post_norm": True}])
+@pytest.mark.parametrize("channels_last", [False, True])
+def test_block_layouts_match(unit_class, norms, channels_last):
+    """nhwc and flatten layouts give the same outputs and gradients."""
+    nhwc, flatten = _blocks(unit_class, alpha="learnable", **norms)
+    x = torch.randn(BATCH_SIZE, CHANNELS, HEIGHT, WIDTH)
+    if channels_last:
+        x = x.contiguous(memory_format=torch.channels_last)
+    x_nhwc = x.clone().requires_grad_(True)
+    x_flatten = x.clone().requires_grad_(True)
+    weight = torch.randn(BATCH_SIZE, CHANNELS, HEIGHT, WIDTH)
+
+    out_nhwc = nhwc(x_nhwc)
+    out_flatten = flatten(x_flatten)
+    (out_nhwc * weight).sum().backward()
+    (out_flatten * weight).sum().backward()
+
+    assert out_nhwc.shape == (BATCH_SIZE, CHANNELS, HEIGHT, WIDTH)
+    assert torch.allclose(out_nhwc, out_flatten, atol=1e-5)
+    assert torch.allclose(x_nhwc.grad, x_flatten.grad, atol=1e-5)
+    for (name, param_nhwc), param_flatten in zip(nhwc.named_parameters(), flatten.parameters()):
+        assert torch.allclose(param_nhwc.grad, param_flatten.grad, atol=1e-4), name
+    if channels_last:
+        # No copies: the output is a channels-last view of the unit's output
+        assert out_nhwc.is_contiguous(memory_format=torch.channels_last)
+
+
+def test_classifier_layouts_match():
+    """A channels-last nhwc classifier matches the flatten one with the same weights."""
+    nhwc = create_model("paGLU", alpha="learnable", use_gate_norm=True, layout="nhwc", channels_last=True).eval()
+    flatten = create_model("paGLU", alpha="learnable", use_gate_norm=True, layout="flatten").eval()
+    flatten.load_state_dict(nhwc.state_dict())
+    x = torch.randn(BATCH_SIZE, 3, IMAGE_SIZE, IMAGE_SIZE)
+
+    out_nhwc = nhwc(x)
+    out_flatten = flatten(x)
+    out_nhwc.sum().backward()
+    out_flatten.sum().backward()
+
+    assert out_nhwc.shape == (BATCH_SIZE, 10)
+    assert torch.allclose(out_nhwc, out_flatten, atol=1e-4)
+    for (name, param_nhwc), param_flatten in zip(nhwc.named_parameters(), flatten.parameters()):
+        assert torch.allclose(param_nhwc.grad, param_flatten.grad, atol=1e-3, rtol=1e-3), name
+
+
+def test_invalid_layout():
+    """Unknown layouts are rejected."""
+    with pytest.raises(ValueError):
+        paActivationBlock(CHANNELS, CHANNELS, paGLU, layout="nchw")
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
@@ -0,0 +1,152 @@
+import pytest
+import torch
+import torch.nn as nn
+import torch.ao.nn.quantized.dynamic as nnqd
+
+from paGating import activation_map, FrozenPaGating, paGLU, quantize, quantization_error
+
+
+pytestmark = pytest.mark.skipif(
+    not any(engine in torch.backends.quantized.supported_engines for engine in ("fbgemm", "x86", "qnnpack")),
+    reason="No quantized CPU engine available",
+)
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 32
+INPUT_DIM = 64
+OUTPUT_DIM = 48
+
+PA_UNITS = list(activation_map.values())
+
+
+class _MLP(nn.Module):
+    """Same layout as the patched GPT-2 PaGatingMLP."""
+
+    def __init__(self, d_model, d_ff, alpha=0.5):
+        super().__init__()
+        self.fc_in = nn.Linear(d_model, d_ff)
+        self.act = paGLU(input_dim=d_ff, output_dim=d_ff, alpha=alpha)
+        self.fc_out = nn.Linear(d_ff, d_model)
+
+    def forward(self, x):
+        return self.fc_out(self.act(self.fc_in(x)))
+
+
+@pytest.mark.parametrize("unit_class", PA_UNITS)
+@pytest.mark.parametrize("alpha", [0.3, 1.0, "learnable"])
+@pytest.mark.parametrize("use_gate_norm", [False, True])
+def test_quantized_unit_close_to_fp32(unit_class, alpha, use_gate_norm):
+    """Int8 units stay close to the fp32 reference."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    unit = unit_class(INPUT_DIM, OUTPUT_DIM, alpha=alpha, use_gate_norm=use_gate_norm).eval()
+
+    qunit = quantize(unit)
+    report = quantization_error(unit, qunit, x)
+
+    assert isinstance(qunit, FrozenPaGating)
+    assert isinstance(qunit.proj, nnqd.Linear)
+    assert qunit.proj.weight().qscheme() == torch.per_channel_affine
+    assert report['relative_error'] < 0.05
+    assert report['sqnr_db'] > 25.0
+
+
+def test_quantize_alpha_zero_unit():
+    """α=0 units become a single quantized linear layer."""
+    unit = paGLU(INPUT_DIM, OUTPUT_DIM, alpha=0.0)
+    assert isinstance(quantize(unit), nnqd.Linear)
+
+
+def test_quantize_model_wide():
+    """Every unit and linear layer of a PaGatingMLP-style model is quantized."""
+    x = torch.randn(BATCH_SIZE, 8, INPUT_DIM)
+    model = nn.Sequential(_MLP(INPUT_DIM, OUTPUT_DIM), _MLP(INPUT_DIM, OUTPUT_DIM, alpha="learnable")).eval()
+
+    qmodel = quantize(model)
+
+    for mlp in qmodel:
+        assert isinstance(mlp.fc_in, nnqd.Linear)
+        assert isinstance(mlp.fc_out, nnqd.Linear)
+        assert isinstance(mlp.act.proj, nnqd.Linear)
+    assert isinstance(model[0].fc_in, nn.Linear)
+    assert quantization_error(model, qmodel, [x, x[:4]])['relative_error'] < 0.05
+
+
+class _TupleMLP(_MLP):
+    """Returns (output, hidden), like models with auxiliary outputs."""
+
+    def forward(self, x):
+        hidden = self.act(self.fc_in(x))
+        return self.fc_out(hidden), hidden
+
+
+class _LogitsOutput(dict):
+    """Minimal stand-in for a HuggingFace ModelOutput."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class _LogitsMLP(_MLP):
+    def forward(self, x):
+        return _LogitsOutput(logits=super().forward(x))
+
+
+class _DictOutput(nn.Module):
+    """Returns a plain dict, which has no default tensor to compare."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x):
+        return {"output": self.model(x)[0]}
+
+
+@pytest.mark.parametrize("model_class", [_TupleMLP, _LogitsMLP])
+def test_quantization_error_structured_outputs(model_class):
+    """Tuple and ModelOutput-style outputs are compared on their main tensor."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    model = model_class(INPUT_DIM, OUTPUT_DIM).eval()
+    qmodel = quantize(model)
+
+    assert quantization_error(model, qmodel, x)['relative_error'] < 0.05
+
+
+def test_quantization_error_output_fn():
+    """output_fn selects the compared tensor; unknown outputs need one."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    model = _TupleMLP(INPUT_DIM, OUTPUT_DIM).eval()
+    qmodel = quantize(model)
+
+    report = quantization_error(model, qmodel, x, output_fn=lambda output: output[1])
+    assert 0.0 < report['relative_error'] < 0.05
+
+    with pytest.raises(TypeError):
+        quantization_error(_DictOutput(model), _DictOutput(qmodel), x)
+
+
+def test_quantize_units_only():
+    """include_linear=False leaves plain linear layers in fp32."""
+    qmodel = quantize(_MLP(INPUT_DIM, OUTPUT_DIM), include_linear=False)
+
+    assert type(qmodel.fc_in) is nn.Linear
+    assert isinstance(qmodel.act.proj, nnqd.Linear)
+
+
+def test_quantize_keeps_callable_alpha_in_fp32():
+    """Units with a callable α are left unquantized."""
+    model = _MLP(INPUT_DIM, OUTPUT_DIM, alpha=lambda x: torch.tensor(0.3))
+    qmodel = quantize(model)
+
+    assert isinstance(qmodel.act, paGLU)
+    assert isinstance(qmodel.fc_in, nnqd.Linear)
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
@@ -0,0 +1,96 @@
+import pytest
+import torch
+import torch.nn as nn
+
+from paGating import activation_map, create_paGating2D, paGLU, set_recompute
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 8
+INPUT_DIM = 16
+OUTPUT_DIM = 24
+
+PA_UNITS = list(activation_map.values())
+
+
+def _grads(module, x):
+    x = x.clone().requires_grad_(True)
+    out = module(x)
+    out.pow(2).sum().backward()
+    grads = {name: p.grad.clone() for name, p in module.named_parameters() if p.grad is not None}
+    return out.detach(), x.grad, grads
+
+
+@pytest.mark.parametrize("unit_class", PA_UNITS)
+@pytest.mark.parametrize("alpha", [0.0, 0.5, "learnable"])
+@pytest.mark.parametrize("use_gate_norm", [False, True])
+def test_recompute_matches_default(unit_class, alpha, use_gate_norm):
+    """Recomputing units produce the same outputs and gradients."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    unit = unit_class(INPUT_DIM, OUTPUT_DIM, alpha=alpha, use_gate_norm=use_gate_norm)
+    recomputing = unit_class(INPUT_DIM, OUTPUT_DIM, alpha=alpha, use_gate_norm=use_gate_norm, recompute=True)
+    recomputing.load_state_dict(unit.state_dict())
+
+    out, x_grad, grads = _grads(unit, x)
+    out_rc, x_grad_rc, grads_rc = _grads(recomputing, x)
+
+    assert torch.allclose(out, out_rc, atol=1e-6)
+    assert torch.allclose(x_grad, x_grad_rc, atol=1e-6)
+    assert grads.keys() == grads_rc.keys()
+    for name in grads:
+        assert torch.allclose(grads[name], grads_rc[name], atol=1e-6), name
+
+
+def test_recompute_with_memory_efficient_epilogue():
+    """Recompute composes with the memory-efficient gating epilogue."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    unit = paGLU(INPUT_DIM, OUTPUT_DIM, alpha=0.3, fused=True)
+    recomputing = paGLU(INPUT_DIM, OUTPUT_DIM, alpha=0.3, fused=True, memory_efficient=True, recompute=True)
+    recomputing.load_state_dict(unit.state_dict())
+
+    _, x_grad, grads = _grads(unit, x)
+    _, x_grad_rc, grads_rc = _grads(recomputing, x)
+
+    assert torch.allclose(x_grad, x_grad_rc, atol=1e-6)
+    for name in grads:
+        assert torch.allclose(grads[name], grads_rc[name], atol=1e-6), name
+
+
+def test_set_recompute_model_wide():
+    """set_recompute toggles every unit, including those inside adapters."""
+    model = nn.Sequential(
+        nn.Linear(INPUT_DIM, INPUT_DIM),
+        paGLU(INPUT_DIM, OUTPUT_DIM),
+        paGLU(OUTPUT_DIM, OUTPUT_DIM),
+    )
+    adapter = create_paGating2D('paGELU', INPUT_DIM, OUTPUT_DIM)
+
+    assert set_recompute(model) == 2
+    assert model[1].recompute and model[2].recompute
+    assert set_recompute(adapter) == 1
+    assert adapter.pa_unit.recompute
+
+    set_recompute(model, False)
+    assert not model[1].recompute
+
+
+def test_adapter_recompute():
+    """paGating2D forwards the recompute option to its unit and clones."""
+    x = torch.randn(2, INPUT_DIM, 5, 5)
+    adapter = create_paGating2D('paMishU', INPUT_DIM, OUTPUT_DIM, recompute=True)
+    reference = create_paGating2D('paMishU', INPUT_DIM, OUTPUT_DIM)
+    reference.load_state_dict(adapter.state_dict())
+
+    _, x_grad, _ = _grads(reference, x)
+    _, x_grad_rc, _ = _grads(adapter, x)
+
+    assert adapter.pa_unit.recompute
+    assert adapter.clone().pa_unit.recompute
+    assert torch.allclose(x_grad, x_grad_rc, atol=1e-6)
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
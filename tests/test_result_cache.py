@@ -0,0 +1,74 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add the scripts directory to path to import the result cache
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from result_cache import ResultCache, config_key
+
+
+# Test parameters
+VERSION = "abc123"
+CONFIG = {
+    "unit_name": "paGLU",
+    "alpha": 0.5,
+    "use_learnable_alpha": False,
+    "epochs": 10,
+    "learning_rate": 0.001,
+    "seed": 42,
+}
+
+
+def test_keys_are_stable_and_content_addressed():
+    """Keys ignore key order and run-local entries but change with content and code version."""
+    reordered = dict(reversed(list(CONFIG.items())))
+    assert config_key(CONFIG, VERSION) == config_key(reordered, VERSION)
+    assert config_key(CONFIG, VERSION) == config_key(dict(CONFIG, output_dir="elsewhere", gpu_id="1"), VERSION)
+
+    assert config_key(CONFIG, VERSION) != config_key(dict(CONFIG, seed=123), VERSION)
+    assert config_key(CONFIG, VERSION) != config_key(dict(CONFIG, use_learnable_alpha=True), VERSION)
+    assert config_key(CONFIG, VERSION) != config_key(CONFIG, "def456")
+
+
+def test_put_get_and_status(tmp_path):
+    """Runs go from new to partial (checkpoints) to complete (result with artifacts)."""
+    cache = ResultCache(str(tmp_path), version=VERSION)
+    assert cache.get(CONFIG) is None
+    assert cache.status(CONFIG) == "new"
+
+    checkpoint_dir = cache.checkpoint_dir(CONFIG)
+    assert checkpoint_dir.startswith(str(tmp_path))
+    with open(os.path.join(checkpoint_dir, "last.ckpt"), "w") as f:
+        f.write("checkpoint")
+    assert cache.status(CONFIG) == "partial"
+    assert cache.last_checkpoint(CONFIG) == os.path.join(checkpoint_dir, "last.ckpt")
+
+    metrics_csv = tmp_path / "metrics.csv"
+    metrics_csv.write_text("epoch,val_loss\n1,0.9\n")
+    cache.put(CONFIG, {"val_loss": 0.9}, artifacts={"metrics.csv": str(metrics_csv), "missing.txt": None})
+
+    result = cache.get(dict(CONFIG, output_dir="elsewhere"))
+    assert cache.status(CONFIG) == "complete"
+    assert result["val_loss"] == 0.9
+    assert list(result["artifacts"]) == ["metrics.csv"]
+    with open(result["artifacts"]["metrics.csv"]) as f:
+        assert f.read() == metrics_csv.read_text()
+
+    with open(os.path.join(cache.run_dir(CONFIG), "config.json")) as f:
+        assert json.load(f)["config"] == CONFIG
+
+
+def test_code_version_and_invalidate(tmp_path):
+    """A new code version misses old results; invalidate drops an entry."""
+    cache = ResultCache(str(tmp_path), version=VERSION)
+    cache.put(CONFIG, {"val_loss": 0.9})
+
+    assert ResultCache(str(tmp_path), version="def456").get(CONFIG) is None
+    cache.invalidate(CONFIG)
+    assert cache.status(CONFIG) == "new"
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
@@ -0,0 +1,127 @@
+import pytest
+import torch
+import torch.nn as nn
+
+from paGating import activation_map, paGatingSupernet, prune_supernets, sample_supernet_branch, set_supernet_branch
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 8
+INPUT_DIM = 16
+OUTPUT_DIM = 24
+
+BRANCHES = list(activation_map.keys())
+
+
+@pytest.mark.parametrize("branch", BRANCHES)
+@pytest.mark.parametrize("alpha", [0.3, "learnable"])
+@pytest.mark.parametrize("use_gate_norm", [False, True, "rms"])
+def test_prune_matches_branch(branch, alpha, use_gate_norm, randomize_norms):
+    """Pruned units reproduce the supernet branch."""
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    supernet = randomize_norms(paGatingSupernet(INPUT_DIM, OUTPUT_DIM, alpha=alpha, use_gate_norm=use_gate_norm))
+    if alpha == "learnable":
+        with torch.no_grad():
+            supernet.alpha_param.copy_(torch.randn(supernet.num_branches))
+    supernet.set_branch(branch)
+
+    unit = supernet.prune()
+
+    assert isinstance(unit, activation_map[branch])
+    assert torch.allclose(unit(x), supernet(x), atol=1e-6)
+
+
+@pytest.mark.parametrize("alpha", [0.7, "learnable"])
+def test_forward_all_matches_each_branch(alpha):
+    """The vectorized evaluation stacks every branch in order."""
+    x = torch.randn(2, 5, INPUT_DIM)
+    supernet = paGatingSupernet(INPUT_DIM, OUTPUT_DIM, alpha=alpha, use_gate_norm=True)
+
+    outputs = supernet.forward_all(x)
+
+    assert outputs.shape == (len(BRANCHES), 2, 5, OUTPUT_DIM)
+    for index, branch in enumerate(supernet.branch_names):
+        supernet.set_branch(branch)
+        assert torch.allclose(outputs[index], supernet(x), atol=1e-6)
+
+
+def test_sampling_trains_shared_projections():
+    """Sampled training updates the shared projections and only the drawn branch."""
+    supernet = paGatingSupernet(INPUT_DIM, OUTPUT_DIM, alpha="learnable")
+    supernet.train()
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+
+    drawn = sample_supernet_branch(supernet, torch.Generator().manual_seed(0))
+    supernet(x).sum().backward()
+
+    assert supernet.value_proj.weight.grad is not None
+    assert supernet.gate_proj.weight.grad is not None
+    nonzero = (supernet.alpha_param.grad != 0).nonzero().flatten().tolist()
+    assert nonzero == [supernet.branch_names.index(drawn)]
+
+
+def test_sampling_uses_one_branch_per_step():
+    """Every layer of a step runs the same drawn branch, also over repeated forwards."""
+    model = nn.Sequential(
+        paGatingSupernet(INPUT_DIM, OUTPUT_DIM, alpha="learnable"),
+        nn.ReLU(),
+        paGatingSupernet(OUTPUT_DIM, OUTPUT_DIM, alpha="learnable"),
+    )
+    model.train()
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+    generator = torch.Generator().manual_seed(0)
+
+    drawn_branches = set()
+    for _ in range(20):
+        model.zero_grad()
+        drawn = sample_supernet_branch(model, generator)
+        drawn_branches.add(drawn)
+        for _ in range(3):
+            model(x).sum().backward()
+
+        for supernet in (model[0], model[2]):
+            nonzero = (supernet.alpha_param.grad != 0).nonzero().flatten().tolist()
+            assert nonzero == [supernet.branch_names.index(drawn)]
+    assert len(drawn_branches) > 1
+
+    assert sample_supernet_branch(nn.Linear(INPUT_DIM, OUTPUT_DIM)) is None
+    mixed = nn.Sequential(
+        paGatingSupernet(INPUT_DIM, OUTPUT_DIM),
+        paGatingSupernet(OUTPUT_DIM, OUTPUT_DIM, branches=["paGLU", "paMishU"]),
+    )
+    with pytest.raises(ValueError):
+        sample_supernet_branch(mixed)
+
+
+def test_model_wide_branch_selection_and_prune():
+    """Helpers select and prune every supernet in a model."""
+    model = nn.Sequential(
+        paGatingSupernet(INPUT_DIM, OUTPUT_DIM),
+        nn.ReLU(),
+        paGatingSupernet(OUTPUT_DIM, OUTPUT_DIM, branches=["paGLU", "paMishU"]),
+    )
+    x = torch.randn(BATCH_SIZE, INPUT_DIM)
+
+    assert set_supernet_branch(model, "paMishU") == 2
+    expected = model(x)
+    pruned = prune_supernets(model)
+
+    assert isinstance(pruned[0], activation_map["paMishU"])
+    assert isinstance(pruned[2], activation_map["paMishU"])
+    assert torch.allclose(pruned(x), expected, atol=1e-6)
+
+
+def test_invalid_branches():
+    """Unknown branch names are rejected."""
+    with pytest.raises(ValueError):
+        paGatingSupernet(INPUT_DIM, OUTPUT_DIM, branches=["paFoo"])
+    supernet = paGatingSupernet(INPUT_DIM, OUTPUT_DIM, branches=["paGLU"])
+    with pytest.raises(ValueError):
+        supernet.set_branch("paGTU")
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
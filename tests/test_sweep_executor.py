@@ -0,0 +1,97 @@
+import os
+import sys
+
+import pytest
+
+# Add the scripts directory to path to import the sweep executor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from sweep_executor import SweepExecutor
+
+
+# Test parameters
+NUM_WORKERS = 2
+THREADS_PER_WORKER = 2
+
+
+def _init(offset):
+    return {"offset": offset, "pid": os.getpid()}
+
+
+def _job(config, context):
+    import torch
+
+    if config.get("raise"):
+        raise ValueError("bad config")
+    if config.get("crash"):
+        os._exit(3)
+    return {
+        "value": config["x"] * config["x"] + context["offset"],
+        "pid": context["pid"],
+        "threads": torch.get_num_threads(),
+    }
+
+
+def _failing_init():
+    raise RuntimeError("dataset missing")
+
+
+def _loader_job(config, context):
+    import torch
+    from torch.utils.data import DataLoader, TensorDataset
+
+    dataset = TensorDataset(torch.arange(config["size"], dtype=torch.float32))
+    loader = DataLoader(dataset, batch_size=4, num_workers=config["num_workers"])
+    return float(sum(batch.sum() for (batch,) in loader))
+
+
+def test_results_are_structured_and_ordered():
+    """Jobs run in warm workers with their initializer context and thread budget."""
+    configs = [{"x": x} for x in range(6)]
+    with SweepExecutor(
+        _job, num_workers=NUM_WORKERS, threads_per_worker=THREADS_PER_WORKER,
+        initializer=_init, initargs=(10,),
+    ) as executor:
+        results = executor.map(configs)
+
+    assert [r["result"]["value"] for r in results] == [x * x + 10 for x in range(6)]
+    assert all(r["success"] and r["runtime_sec"] >= 0 for r in results)
+    assert all(r["result"]["threads"] == THREADS_PER_WORKER for r in results)
+    # Six jobs share at most two worker processes
+    assert len({r["result"]["pid"] for r in results}) <= NUM_WORKERS
+
+
+def test_failures_are_isolated():
+    """An exception fails its job; a dead worker fails its job and is replaced."""
+    configs = [{"x": 1}, {"raise": True}, {"crash": True}, {"x": 2}, {"x": 3}]
+    with SweepExecutor(_job, num_workers=1, initializer=_init, initargs=(0,)) as executor:
+        results = executor.map(configs)
+
+    assert [r["success"] for r in results] == [True, False, False, True, True]
+    assert "ValueError: bad config" in results[1]["error"]
+    assert "traceback" in results[1]
+    assert "exited with code 3" in results[2]["error"]
+    # Jobs after the crash ran in a fresh worker
+    assert results[3]["result"]["pid"] != results[0]["result"]["pid"]
+
+
+def test_initializer_errors_and_validation():
+    """A broken initializer stops the sweep instead of failing every job."""
+    with pytest.raises(RuntimeError, match="dataset missing"):
+        with SweepExecutor(_job, initializer=_failing_init) as executor:
+            executor.map([{"x": 1}])
+    with pytest.raises(ValueError):
+        SweepExecutor(_job, num_workers=0)
+
+
+def test_jobs_can_start_dataloader_workers():
+    """Warm workers are not daemonic, so in-process jobs may use DataLoader worker processes."""
+    configs = [{"size": 10, "num_workers": NUM_WORKERS}, {"size": 20, "num_workers": NUM_WORKERS}]
+    with SweepExecutor(_loader_job, num_workers=1) as executor:
+        results = executor.map(configs)
+
+    assert all(r["success"] for r in results), [r.get("error") for r in results]
+    assert [r["result"] for r in results] == [float(sum(range(10))), float(sum(range(20)))]
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
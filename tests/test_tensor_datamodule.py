@@ -0,0 +1,91 @@
+import os
+import sys
+
+import pytest
+import torch
+import torchvision.transforms as transforms
+
+# Add parent directory to path to import the lightning modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from lightning_modules.tensor_datamodule import (
+    CIFAR10_MEAN,
+    CIFAR10_STD,
+    TensorBatchLoader,
+    random_crop,
+    random_flip,
+)
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+NUM_SAMPLES = 50
+BATCH_SIZE = 16
+IMAGE_SIZE = 32
+
+
+def _data():
+    images = torch.randint(0, 256, (NUM_SAMPLES, 3, IMAGE_SIZE, IMAGE_SIZE), dtype=torch.uint8)
+    labels = torch.arange(NUM_SAMPLES)
+    return images, labels
+
+
+def test_normalization_matches_torchvision():
+    """The fused normalize equals ToTensor + Normalize."""
+    images, labels = _data()
+    loader = TensorBatchLoader(images, labels, BATCH_SIZE)
+    normalize = transforms.Normalize(CIFAR10_MEAN, CIFAR10_STD)
+
+    batch, batch_labels = next(iter(loader))
+    expected = torch.stack([normalize(image.float() / 255.0) for image in images[:BATCH_SIZE]])
+    assert batch.dtype == torch.float32
+    assert torch.allclose(batch, expected, atol=1e-5)
+    assert torch.equal(batch_labels, labels[:BATCH_SIZE])
+
+
+def test_crop_and_flip_keep_pixels():
+    """Crops are windows of the zero-padded image; flips mirror whole images."""
+    images, _ = _data()
+    generator = torch.Generator().manual_seed(0)
+    cropped = random_crop(images, padding=4, generator=generator)
+    assert cropped.shape == images.shape
+
+    padded = torch.nn.functional.pad(images, (4, 4, 4, 4))
+    for image, crop in zip(padded, cropped):
+        windows = [
+            image[:, y:y + IMAGE_SIZE, x:x + IMAGE_SIZE]
+            for y in range(9) for x in range(9)
+        ]
+        assert any(torch.equal(crop, window) for window in windows)
+
+    flipped = random_flip(images, generator=generator)
+    for image, out in zip(images, flipped):
+        assert torch.equal(out, image) or torch.equal(out, image.flip(-1))
+
+
+def test_epochs_cover_dataset_and_reshuffle():
+    """Every epoch yields each sample once, in a new order when shuffling."""
+    images, labels = _data()
+    loader = TensorBatchLoader(images, labels, BATCH_SIZE, shuffle=True, augment=True)
+    assert len(loader) == 4
+
+    epochs = [torch.cat([batch_labels for _, batch_labels in loader]) for _ in range(2)]
+    for order in epochs:
+        assert torch.equal(order.sort().values, labels)
+    assert not torch.equal(epochs[0], epochs[1])
+
+    drop_last = TensorBatchLoader(images, labels, BATCH_SIZE, drop_last=True)
+    assert len(drop_last) == 3
+    assert all(batch.shape[0] == BATCH_SIZE for batch, _ in drop_last)
+
+
+def test_rejects_float_images():
+    """Images must stay uint8 until a batch is built."""
+    images, labels = _data()
+    with pytest.raises(ValueError):
+        TensorBatchLoader(images.float(), labels, BATCH_SIZE)
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
@@ -0,0 +1,103 @@
+import pytest
+import torch
+import torch.nn as nn
+
+from paGating import EntropyBasedAlpha, PaddingIndex, UnpaddedFFN, activation_map, paGLU
+
+
+# Set reproducible seed
+torch.manual_seed(42)
+
+# Test parameters
+BATCH_SIZE = 4
+SEQ_LEN = 10
+INPUT_DIM = 16
+OUTPUT_DIM = 24
+
+LENGTHS = [10, 3, 7, 1]
+
+
+def _mask(lengths=LENGTHS):
+    return torch.arange(SEQ_LEN).unsqueeze(0) < torch.tensor(lengths).unsqueeze(1)
+
+
+def test_unpad_repad_roundtrip():
+    """Unpad keeps exactly the real tokens; repad restores them and zeros the pads."""
+    x = torch.randn(BATCH_SIZE, SEQ_LEN, INPUT_DIM)
+    mask = _mask()
+    index = PaddingIndex(mask)
+
+    packed = index.unpad(x)
+    assert packed.shape == (sum(LENGTHS), INPUT_DIM)
+    assert torch.equal(packed, x[mask])
+    assert torch.equal(index.lengths, torch.tensor(LENGTHS))
+
+    restored = index.repad(packed)
+    assert torch.equal(restored[mask], x[mask])
+    assert torch.all(restored[~mask] == 0)
+
+
+def test_dense_mask_is_a_view():
+    """Without padding no gather or scatter is performed."""
+    x = torch.randn(BATCH_SIZE, SEQ_LEN, INPUT_DIM)
+    index = PaddingIndex(torch.ones(BATCH_SIZE, SEQ_LEN, dtype=torch.long))
+    assert index.dense
+    packed = index.unpad(x)
+    assert packed.data_ptr() == x.data_ptr()
+    assert torch.equal(index.repad(packed), x)
+
+
+@pytest.mark.parametrize("unit_name", list(activation_map.keys()))
+def test_unpadded_unit_matches_dense(unit_name):
+    """Real-token outputs and parameter gradients match the padded computation."""
+    x = torch.randn(BATCH_SIZE, SEQ_LEN, INPUT_DIM)
+    mask = _mask()
+    unit = activation_map[unit_name](INPUT_DIM, OUTPUT_DIM, alpha="learnable", use_gate_norm=True)
+    ffn = UnpaddedFFN(unit)
+
+    dense = unit(x)
+    dense[mask].square().sum().backward()
+    dense_grads = [param.grad.clone() for param in unit.parameters()]
+    unit.zero_grad()
+
+    x_unpadded = x.clone().requires_grad_()
+    out = ffn(x_unpadded, attention_mask=mask)
+    assert torch.allclose(out[mask], dense[mask], atol=1e-6)
+    assert torch.all(out[~mask] == 0)
+
+    out.square().sum().backward()
+    for grad, param in zip(dense_grads, unit.parameters()):
+        assert torch.allclose(param.grad, grad, atol=1e-5)
+    # Pad positions receive no gradient
+    assert torch.all(x_unpadded.grad[~mask] == 0)
+
+
+def test_packed_stack_and_per_token_alpha():
+    """A stack of FFNs stays packed; per-token α sees only real tokens."""
+    x = torch.randn(BATCH_SIZE, SEQ_LEN, INPUT_DIM)
+    mask = _mask()
+    stack = nn.Sequential(
+        paGLU(INPUT_DIM, OUTPUT_DIM, alpha=EntropyBasedAlpha()),
+        nn.LayerNorm(OUTPUT_DIM),
+        paGLU(OUTPUT_DIM, INPUT_DIM, alpha=0.5),
+    ).eval()
+    index = PaddingIndex(mask)
+
+    out = UnpaddedFFN(stack)(x, padding_index=index)
+    assert out.shape == (BATCH_SIZE, SEQ_LEN, INPUT_DIM)
+    assert torch.allclose(out[mask], stack(x)[mask], atol=1e-6)
+
+
+def test_shape_checks():
+    """Mismatched inputs are rejected."""
+    index = PaddingIndex(_mask())
+    with pytest.raises(ValueError):
+        index.unpad(torch.randn(BATCH_SIZE, SEQ_LEN + 1, INPUT_DIM))
+    with pytest.raises(ValueError):
+        index.repad(torch.randn(sum(LENGTHS) + 1, INPUT_DIM))
+    with pytest.raises(ValueError):
+        PaddingIndex(torch.ones(SEQ_LEN))
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
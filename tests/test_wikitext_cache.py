@@ -0,0 +1,84 @@
+import json
+import os
+import pickle
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+# Add parent directory to path to import the datamodules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from datamodules.wikitext_cache import FORMAT_VERSION, TOKEN_DTYPE, PackedTokenDataset, cache_prefix, default_cache_dir
+
+
+NUM_TOKENS = 1000
+BLOCK_SIZE = 64
+
+
+def _write_cache(directory, num_tokens=NUM_TOKENS):
+    """Write a synthetic cache in the build_packed_cache layout."""
+    prefix = cache_prefix("train", cache_dir=str(directory))
+    tokens = (np.arange(num_tokens) * 7 % 50257).astype(TOKEN_DTYPE)
+    tokens.tofile(prefix + ".bin")
+    np.save(prefix + ".idx.npy", np.arange(0, num_tokens, 50, dtype=np.int64))
+    with open(prefix + ".json", "w") as f:
+        json.dump({"format_version": FORMAT_VERSION, "num_tokens": num_tokens}, f)
+    return prefix, tokens
+
+
+def test_blocks_are_packed_windows(tmp_path):
+    """Blocks are consecutive full-length windows of the token stream."""
+    prefix, tokens = _write_cache(tmp_path)
+    dataset = PackedTokenDataset(prefix, block_size=BLOCK_SIZE)
+
+    assert len(dataset) == NUM_TOKENS // BLOCK_SIZE
+    for index in (0, 3, len(dataset) - 1, -1):
+        start = (index % len(dataset)) * BLOCK_SIZE
+        item = dataset[index]
+        assert item["input_ids"].dtype == torch.long
+        assert item["input_ids"].shape == (BLOCK_SIZE,)
+        assert torch.equal(item["input_ids"], torch.from_numpy(tokens[start:start + BLOCK_SIZE].astype(np.int64)))
+        assert torch.equal(item["labels"], item["input_ids"])
+    with pytest.raises(IndexError):
+        dataset[len(dataset)]
+
+    assert len(PackedTokenDataset(prefix, block_size=BLOCK_SIZE, max_blocks=2)) == 2
+    assert dataset.line_offsets()[1] == 50
+
+
+def test_pickle_reopens_memmap(tmp_path):
+    """Datasets sent to DataLoader workers reopen their memory map."""
+    prefix, _ = _write_cache(tmp_path)
+    dataset = PackedTokenDataset(prefix, block_size=BLOCK_SIZE)
+    expected = dataset[5]["input_ids"]
+
+    clone = pickle.loads(pickle.dumps(dataset))
+    assert clone._tokens is None
+    assert torch.equal(clone[5]["input_ids"], expected)
+
+
+def test_incomplete_cache_is_rejected(tmp_path):
+    """Truncated files and missing metadata are not served."""
+    prefix, tokens = _write_cache(tmp_path)
+    tokens[:-1].tofile(prefix + ".bin")
+    with pytest.raises(ValueError):
+        PackedTokenDataset(prefix)
+
+    with pytest.raises(ValueError):
+        PackedTokenDataset(str(tmp_path / "missing"))
+
+    prefix, _ = _write_cache(tmp_path, num_tokens=10)
+    with pytest.raises(ValueError):
+        PackedTokenDataset(prefix, block_size=BLOCK_SIZE)
+
+
+def test_default_cache_dir_follows_working_directory(tmp_path, monkeypatch):
+    """The default location is resolved when used, not when the module is imported."""
+    monkeypatch.chdir(tmp_path)
+    assert default_cache_dir() == str(tmp_path / ".cache" / "packed")
+    assert cache_prefix("train").startswith(default_cache_dir() + os.sep)
+
+
+if __name__ == "__main__":
+    pytest.main(["-v"])